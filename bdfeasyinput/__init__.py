@@ -12,6 +12,7 @@ XC functional conversion helpers.
 from .xc_functional import (  # noqa: F401
     FunctionalInput,
     FunctionalValidationResult,
+    XCDatabase,
     process_functional_input,
     build_dft_functional_lines,
     load_xc_database,
@@ -23,6 +24,8 @@ from .validator import BDFValidator, ValidationError  # noqa: F401
 from .config import load_config, find_config_file, get_execution_config, get_ai_config, get_analysis_config  # noqa: F401
 from .yaml_generator import YAMLGenerator, generate_yaml_from_xyz, generate_yaml_template  # noqa: F401
 from .conversion_tool import ConversionTool, convert_yaml_to_bdf, batch_convert_yaml  # noqa: F401
+from .template import InputTemplate, compile_template  # noqa: F401
+from .xyz_reader import XYZFrame, iter_xyz_frames  # noqa: F401
 
 # Export schema types for convenience
 try:
@@ -53,6 +56,10 @@ try:
     from .execution import BDFAutotestRunner, BDFDirectRunner, create_runner  # noqa: F401
     __all__ = [
         'BDFConverter',
+        'InputTemplate',
+        'compile_template',
+        'XYZFrame',
+        'iter_xyz_frames',
         'BDFValidator',
         'ValidationError',
         'BDFAutotestRunner',
@@ -67,6 +74,7 @@ try:
         'FunctionalValidationResult',
         'process_functional_input',
         'build_dft_functional_lines',
+        'XCDatabase',
         'load_xc_database',
         'validate_functional',
         # Schema types (if available)
@@ -84,6 +92,10 @@ try:
 except ImportError:
     __all__ = [
         'BDFConverter',
+        'InputTemplate',
+        'compile_template',
+        'XYZFrame',
+        'iter_xyz_frames',
         'BDFValidator',
         'ValidationError',
         'load_config',
@@ -95,6 +107,7 @@ except ImportError:
         'FunctionalValidationResult',
         'process_functional_input',
         'build_dft_functional_lines',
+        'XCDatabase',
         'load_xc_database',
         'validate_functional',
         # Schema types (if available)
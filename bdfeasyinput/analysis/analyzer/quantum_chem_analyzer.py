@@ -8,6 +8,7 @@ from typing import Dict, Optional, Any, List
 from pathlib import Path
 
 from ..parser.output_parser import BDFOutputParser
+from ..parser.cache import ParseCache
 from ..prompt.analysis_prompts import (
     QUANTUM_CHEMISTRY_EXPERT_SYSTEM_PROMPT,
     build_analysis_prompt,
@@ -24,12 +25,13 @@ except ImportError:
 class QuantumChemistryAnalyzer:
     """量子化学专家级结果分析器"""
     
-    def __init__(self, ai_client: AIClient):
+    def __init__(self, ai_client: AIClient, cache: Optional[ParseCache] = None):
         """
         初始化分析器
         
         Args:
             ai_client: AI 客户端实例
+            cache: 解析结果磁盘缓存（可选）
         """
         if AIClient is None:
             raise ImportError(
@@ -42,6 +44,13 @@ class QuantumChemistryAnalyzer:
         
         self.ai_client = ai_client
         self.output_parser = BDFOutputParser()
+        self.cache = cache
+    
+    def parse_output(self, output_file: str) -> Dict[str, Any]:
+        """解析输出文件（配置了缓存时优先使用缓存）"""
+        if self.cache is not None:
+            return self.cache.parse(output_file, self.output_parser)
+        return self.output_parser.parse(output_file)
     
     def analyze(
         self,
@@ -49,7 +58,8 @@ class QuantumChemistryAnalyzer:
         input_file: Optional[str] = None,
         error_file: Optional[str] = None,
         task_type: Optional[str] = None,
-        language: Language = "zh"
+        language: Language = "zh",
+        parsed_data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         分析计算结果
@@ -60,6 +70,7 @@ class QuantumChemistryAnalyzer:
             error_file: 错误文件路径（可选）
             task_type: 计算任务类型（可选，如 'energy', 'optimize', 'frequency'）
             language: 分析语言，'zh' 表示中文，'en' 表示英文
+            parsed_data: 已解析的输出数据（可选，提供时不再重新解析输出文件）
         
         Returns:
             分析结果字典：
@@ -74,8 +85,9 @@ class QuantumChemistryAnalyzer:
                 'raw_analysis': str,         # 原始 AI 分析文本
             }
         """
-        # 1. 解析输出文件
-        parsed_data = self.output_parser.parse(output_file)
+        # 1. 解析输出文件（调用方已解析时直接复用）
+        if parsed_data is None:
+            parsed_data = self.parse_output(output_file)
         
         # 2. 构建分析提示词
         prompt = build_analysis_prompt(
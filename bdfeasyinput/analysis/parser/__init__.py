@@ -5,6 +5,21 @@ This module provides parsers for BDF output files.
 """
 
 from .output_parser import BDFOutputParser
+from .patterns import PATTERNS, PatternRegistry
+from .section_index import SectionIndex
+from .incremental import IncrementalOutputParser, ParseEvent
+from .cache import ParseCache
+from .geometry import Geometry, OptimizationTrajectory, Trajectory
 
-__all__ = ['BDFOutputParser']
-
+__all__ = [
+    'BDFOutputParser',
+    'SectionIndex',
+    'IncrementalOutputParser',
+    'ParseEvent',
+    'PATTERNS',
+    'PatternRegistry',
+    'ParseCache',
+    'Geometry',
+    'Trajectory',
+    'OptimizationTrajectory',
+]
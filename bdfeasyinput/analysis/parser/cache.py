@@ -0,0 +1,297 @@
+"""
+On-disk Parse Cache for BDF Output Files
+
+This module stores the result dictionaries of BDFOutputParser.parse() on
+disk, keyed by the file size, modification time, content hash and parser
+version, so that repeated extraction or analysis of unchanged logs does not
+re-parse them. Entries are pickled, written atomically, and evicted in
+least-recently-used order once the cache exceeds its size cap. Writes only
+update a running size estimate; the cache directory is scanned when that
+estimate crosses the cap or every EVICT_RESCAN_WRITES writes, not on every
+write.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .output_parser import BDFOutputParser, PARSER_VERSION
+
+
+# 缓存目录的环境变量与默认位置
+CACHE_DIR_ENV = 'BDFEASYINPUT_CACHE_DIR'
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'bdfeasyinput' / 'parse'
+
+# 默认缓存容量上限（字节）
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# 计算内容哈希时每次读取的块大小（字节）
+HASH_CHUNK_SIZE = 1 << 20
+
+# 淘汰时删到上限的这一比例，之后的若干次写入无需再扫描目录
+EVICT_LOW_WATER = 0.9
+
+# 每写入这么多条目重新扫描一次目录，以计入其他进程写入的条目
+EVICT_RESCAN_WRITES = 256
+
+_ENTRY_SUFFIX = '.pkl'
+
+
+def default_cache_dir() -> Path:
+    """返回缓存目录（优先使用环境变量 BDFEASYINPUT_CACHE_DIR）"""
+    env = os.environ.get(CACHE_DIR_ENV)
+    return Path(env).expanduser() if env else DEFAULT_CACHE_DIR
+
+
+def file_digest(path: Path) -> str:
+    """流式计算文件内容哈希（BLAKE2b），内存占用与文件大小无关"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    BDF 输出解析结果的磁盘缓存
+
+    缓存键由（文件大小, 修改时间, 内容哈希, 解析器版本, 解析模式）组成，
+    文件内容或解析器任一变化都会使旧条目失效。条目以 pickle 格式保存，
+    命中时更新条目的修改时间，超出容量上限时按最近最少使用顺序淘汰。
+
+    写入时只累加本实例估计的缓存大小，估计值超过上限（或距上次扫描已写入
+    EVICT_RESCAN_WRITES 个条目）时才扫描目录并淘汰到上限的 EVICT_LOW_WATER，
+    N 次写入的扫描开销不再是 O(N²)。其他进程的写入在下次重新扫描时计入，
+    因此多进程共用缓存时总大小可能短暂超出上限。
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Args:
+            cache_dir: 缓存目录（为空则使用 default_cache_dir()）
+            max_bytes: 缓存容量上限（字节），<=0 表示不限制
+        """
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # 估计的缓存大小（首次写入时扫描一次得到）及上次扫描以来的写入数
+        self._estimated_bytes: Optional[int] = None
+        self._writes_since_scan = 0
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+    def key(
+        self,
+        output_file: str,
+        mode: str = 'text',
+        fields: Optional[Iterable[str]] = None,
+    ) -> str:
+        """
+        计算输出文件的缓存键
+
+        Args:
+            output_file: 输出文件路径
+            mode: 解析模式（不同模式的结果分别缓存）
+            fields: 请求的字段（不同字段集合的结果分别缓存，None 表示全部）
+
+        Returns:
+            十六进制缓存键
+        """
+        path = Path(output_file)
+        stat = path.stat()
+        parts = [
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            file_digest(path),
+            PARSER_VERSION,
+            mode,
+            ','.join(sorted(set(fields))) if fields is not None else '*',
+        ]
+        # 优化任务的 SCF 能量来自同名 *.out.tmp，其变化同样使条目失效
+        tmp_path = path.with_suffix('.out.tmp')
+        if tmp_path.exists():
+            tmp_stat = tmp_path.stat()
+            parts.extend([str(tmp_stat.st_size), str(tmp_stat.st_mtime_ns)])
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(
+        self,
+        output_file: str,
+        mode: str = 'text',
+        fields: Optional[Iterable[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存的解析结果
+
+        Returns:
+            解析结果字典；未命中（或条目损坏）时返回 None
+        """
+        return self._load(self.key(output_file, mode, fields))
+
+    def put(
+        self,
+        output_file: str,
+        result: Dict[str, Any],
+        mode: str = 'text',
+        fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        """写入解析结果（原子替换），并在超出容量时淘汰旧条目"""
+        self._record_write(self._write(self.key(output_file, mode, fields), result))
+
+    def parse(
+        self,
+        output_file: str,
+        parser: Optional[BDFOutputParser] = None,
+        mode: str = 'text',
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        带缓存的解析：命中则直接返回，否则解析并写入缓存
+
+        Args:
+            output_file: 输出文件路径
+            parser: 解析器实例（为空则新建）
+            mode: 解析模式（见 BDFOutputParser.parse）
+            fields: 需要的字段（见 BDFOutputParser.parse）
+
+        Returns:
+            与 BDFOutputParser.parse() 相同的结果字典
+        """
+        if not Path(output_file).exists():
+            raise FileNotFoundError(f"Output file not found: {output_file}")
+        if fields is not None:
+            fields = sorted(BDFOutputParser.resolve_fields(fields)[0])
+        key = self.key(output_file, mode, fields)
+        cached = self._load(key)
+        if cached is not None:
+            return cached
+
+        parser = parser or BDFOutputParser()
+        result = parser.parse(output_file, mode=mode, fields=fields)
+        try:
+            self._record_write(self._write(key, result))
+        except OSError:
+            # 缓存目录不可写时不影响解析结果
+            pass
+        return result
+
+    def evict(self, target: Optional[int] = None) -> int:
+        """
+        按最近最少使用顺序删除条目，直到总大小不超过 target
+
+        Args:
+            target: 目标大小（字节），默认为容量上限
+
+        Returns:
+            删除的条目数
+        """
+        if self.max_bytes <= 0:
+            return 0
+        target = self.max_bytes if target is None else target
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= target:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._estimated_bytes = total
+        self._writes_since_scan = 0
+        return removed
+
+    def clear(self) -> None:
+        """删除所有缓存条目"""
+        if not self.cache_dir.exists():
+            return
+        for entry in self.cache_dir.glob(f'*{_ENTRY_SUFFIX}'):
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+        self._estimated_bytes = 0
+        self._writes_since_scan = 0
+
+    def size(self) -> int:
+        """返回当前缓存占用的字节数（扫描目录）"""
+        return sum(size for _, size, _ in self._scan())
+
+    # ------------------------------------------------------------------
+    # 内部工具
+    # ------------------------------------------------------------------
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_ENTRY_SUFFIX}"
+
+    def _scan(self) -> List[Tuple[int, int, Path]]:
+        """扫描缓存目录，返回 [(修改时间, 大小, 路径)]"""
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for entry in self.cache_dir.glob(f'*{_ENTRY_SUFFIX}'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # 被其他进程删除
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        return entries
+
+    def _record_write(self, nbytes: int) -> None:
+        """累加估计大小，仅在超出上限或到达重新扫描间隔时扫描目录并淘汰"""
+        if self.max_bytes <= 0:
+            return
+        if self._estimated_bytes is None:
+            # 首次写入：扫描一次得到现有大小（已包含刚写入的条目）
+            self._estimated_bytes = self.size()
+        else:
+            self._estimated_bytes += nbytes
+            self._writes_since_scan += 1
+        if self._estimated_bytes > self.max_bytes or self._writes_since_scan >= EVICT_RESCAN_WRITES:
+            self.evict(int(self.max_bytes * EVICT_LOW_WATER))
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取条目并更新命中统计；条目不存在或损坏时返回 None"""
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'rb') as f:
+                result = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(entry)  # 标记为最近使用
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def _write(self, key: str, result: Dict[str, Any]) -> int:
+        """先写临时文件再原子替换，避免并发进程读到不完整的条目；返回条目字节数"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                nbytes = f.tell()
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        return nbytes
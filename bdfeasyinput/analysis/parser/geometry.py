@@ -0,0 +1,525 @@
+"""
+Array-backed Geometry and Trajectory Types
+
+This module provides compact NumPy representations of molecular geometries
+extracted from BDF output files: a single structure stores an element array
+and an ``(n_atoms, 3)`` float64 coordinate array, and a trajectory stores an
+``(n_frames, n_atoms, 3)`` array. Unit conversion and input formatting work
+on whole arrays, and ``to_dicts()`` restores the per-atom dict list returned
+by ``BDFOutputParser.extract_geometry``.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# 单位换算系数（与 format_geometry_for_input 一致）
+BOHR_TO_ANGSTROM = 0.529177
+ANGSTROM_TO_BOHR = 1.8897259886
+UNITS = ('angstrom', 'bohr')
+
+# 每个原子的输入格式：元素符号 + 三个坐标（8位小数，右对齐）
+ATOM_LINE_FORMAT = "%3s  %15.8f  %15.8f  %15.8f"
+
+# XYZ 文件中每个原子的格式（坐标单位为 Angstrom）
+XYZ_LINE_FORMAT = "%-2s %15.8f %15.8f %15.8f"
+
+# 按后缀推断是否写出 extended XYZ
+EXTXYZ_SUFFIXES = ('.extxyz',)
+
+# extract_geometry 结果中按原子存储的键；其余键视为整个结构共享的元数据
+_ATOM_KEYS = ('element', 'x', 'y', 'z', 'units', 'index', 'charge')
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "NumPy is required for Geometry/Trajectory. "
+            "Install it with: pip install numpy>=1.24.0"
+        )
+
+
+def _check_units(units: str) -> str:
+    units = units.lower()
+    if units not in UNITS:
+        raise ValueError(f"Unknown units: {units}. Supported units: {', '.join(UNITS)}")
+    return units
+
+
+def conversion_factor(from_units: str, to_units: str) -> float:
+    """
+    返回坐标单位换算系数
+
+    Args:
+        from_units: 原单位（'angstrom' 或 'bohr'）
+        to_units: 目标单位（'angstrom' 或 'bohr'）
+
+    Returns:
+        乘到坐标上的系数
+    """
+    from_units, to_units = _check_units(from_units), _check_units(to_units)
+    if from_units == to_units:
+        return 1.0
+    return BOHR_TO_ANGSTROM if to_units == 'angstrom' else ANGSTROM_TO_BOHR
+
+
+def format_coordinates(elements: Sequence[str], coords: Any, line_format: str = ATOM_LINE_FORMAT) -> str:
+    """
+    将元素和 (n_atoms, 3) 坐标数组格式化为几何结构行
+
+    整个结构只做一次字符串格式化运算，而不是逐个原子拼接。
+    """
+    n_atoms = len(elements)
+    if n_atoms == 0:
+        return ""
+    rows = np.empty((n_atoms, 4), dtype=object)
+    rows[:, 0] = elements
+    rows[:, 1:] = coords
+    return "\n".join([line_format] * n_atoms) % tuple(rows.ravel().tolist())
+
+
+def _format_info_value(value: Any) -> str:
+    if isinstance(value, str):
+        return f'"{value}"' if any(c.isspace() for c in value) else value
+    if isinstance(value, bool):
+        return 'T' if value else 'F'
+    return repr(value)
+
+
+class Geometry:
+    """
+    单个分子结构（NumPy 数组存储）
+
+    Attributes:
+        elements: 元素符号数组，形状 (n_atoms,)
+        coords: 坐标数组，形状 (n_atoms, 3)，float64
+        units: 坐标单位（'angstrom' 或 'bohr'）
+        indices: 原子索引数组（从 1 开始）
+        charges: 原子电荷数组（可选，缺失值为 NaN）
+        metadata: 结构级附加信息（如 'optimized'、'converged'）
+    """
+
+    __slots__ = ('elements', 'coords', 'units', 'indices', 'charges', 'metadata')
+
+    def __init__(
+        self,
+        elements: Sequence[str],
+        coords: Any,
+        units: str = 'angstrom',
+        indices: Optional[Sequence[int]] = None,
+        charges: Optional[Sequence[Optional[float]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            elements: 元素符号
+            coords: 坐标，形状 (n_atoms, 3)
+            units: 坐标单位（'angstrom' 或 'bohr'）
+            indices: 原子索引（默认 1..n_atoms）
+            charges: 原子电荷（None 表示该原子无电荷信息）
+            metadata: 结构级附加信息
+        """
+        _require_numpy()
+        self.elements = np.asarray(elements, dtype=str).reshape(-1)
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(len(self.elements), 3)
+        self.units = _check_units(units)
+        n_atoms = len(self.elements)
+        self.indices = (
+            np.arange(1, n_atoms + 1) if indices is None
+            else np.asarray(indices, dtype=np.int64).reshape(n_atoms)
+        )
+        self.charges = (
+            None if charges is None
+            else np.array([np.nan if c is None else c for c in charges], dtype=np.float64).reshape(n_atoms)
+        )
+        self.metadata = dict(metadata or {})
+
+    @classmethod
+    def from_dicts(cls, atoms: Sequence[Dict[str, Any]]) -> 'Geometry':
+        """
+        从 extract_geometry() 返回的原子字典列表创建
+
+        单位取第一个原子的 'units'（与 format_geometry_for_input 一致），
+        其余非坐标键取第一个原子的值作为结构级元数据。
+        """
+        _require_numpy()
+        if not atoms:
+            return cls([], np.empty((0, 3)))
+        first = atoms[0]
+        coords = np.array(
+            [(atom.get('x', 0.0), atom.get('y', 0.0), atom.get('z', 0.0)) for atom in atoms],
+            dtype=np.float64,
+        )
+        indices = [atom['index'] for atom in atoms] if all('index' in atom for atom in atoms) else None
+        charges = [atom.get('charge') for atom in atoms] if 'charge' in first else None
+        metadata = {key: value for key, value in first.items() if key not in _ATOM_KEYS}
+        return cls(
+            [atom.get('element', '') for atom in atoms],
+            coords,
+            units=first.get('units') or 'bohr',
+            indices=indices,
+            charges=charges,
+            metadata=metadata,
+        )
+
+    @property
+    def n_atoms(self) -> int:
+        return len(self.elements)
+
+    def __len__(self) -> int:
+        return self.n_atoms
+
+    def __repr__(self) -> str:
+        return f"Geometry(n_atoms={self.n_atoms}, units={self.units!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Geometry):
+            return NotImplemented
+        return (
+            self.units == other.units
+            and np.array_equal(self.elements, other.elements)
+            and np.array_equal(self.coords, other.coords)
+            and np.array_equal(self.indices, other.indices)
+            and (self.charges is None) == (other.charges is None)
+            and (self.charges is None or np.array_equal(self.charges, other.charges, equal_nan=True))
+            and self.metadata == other.metadata
+        )
+
+    def to_units(self, units: str) -> 'Geometry':
+        """返回换算到指定单位的新结构（单位相同时返回自身）"""
+        factor = conversion_factor(self.units, units)
+        if factor == 1.0:
+            return self
+        return Geometry(
+            self.elements, self.coords * factor, units=units,
+            indices=self.indices, charges=self.charges, metadata=self.metadata,
+        )
+
+    def format(self, units: str = 'angstrom') -> str:
+        """
+        格式化为下一步计算的输入格式（与 format_geometry_for_input 输出一致）
+
+        Args:
+            units: 输出单位，'angstrom' 或 'bohr'
+
+        Returns:
+            每行格式：元素符号 X Y Z（8位小数）
+        """
+        return format_coordinates(self.elements, self.to_units(units).coords)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        转换为 extract_geometry() 格式的原子字典列表（兼容 GeometryMetrics.final_geometry）
+        """
+        atoms = []
+        charges = None if self.charges is None else self.charges.tolist()
+        for i, (element, (x, y, z), index) in enumerate(
+            zip(self.elements.tolist(), self.coords.tolist(), self.indices.tolist())
+        ):
+            atom = {'element': element, 'x': x, 'y': y, 'z': z, 'units': self.units, 'index': index}
+            if charges is not None:
+                atom['charge'] = None if charges[i] != charges[i] else charges[i]  # NaN -> None
+            atom.update(self.metadata)
+            atoms.append(atom)
+        return atoms
+
+
+class Trajectory:
+    """
+    结构序列（如优化轨迹），所有帧共享同一组原子
+
+    Attributes:
+        elements: 元素符号数组，形状 (n_atoms,)
+        coords: 坐标数组，形状 (n_frames, n_atoms, 3)，float64
+        units: 坐标单位（'angstrom' 或 'bohr'）
+        energies: 每帧能量（可选，形状 (n_frames,)，缺失值为 NaN）
+    """
+
+    __slots__ = ('elements', 'coords', 'units', 'energies')
+
+    def __init__(
+        self,
+        elements: Sequence[str],
+        coords: Any,
+        units: str = 'angstrom',
+        energies: Optional[Sequence[Optional[float]]] = None,
+    ):
+        """
+        Args:
+            elements: 元素符号
+            coords: 坐标，形状 (n_frames, n_atoms, 3)
+            units: 坐标单位（'angstrom' 或 'bohr'）
+            energies: 每帧能量（None 表示该帧无能量）
+        """
+        _require_numpy()
+        self.elements = np.asarray(elements, dtype=str).reshape(-1)
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, len(self.elements), 3)
+        self.units = _check_units(units)
+        self.energies = (
+            None if energies is None
+            else np.array([np.nan if e is None else e for e in energies], dtype=np.float64).reshape(len(self.coords))
+        )
+
+    @classmethod
+    def from_geometries(
+        cls,
+        frames: Sequence[Union[Geometry, Sequence[Dict[str, Any]]]],
+        units: Optional[str] = None,
+        energies: Optional[Sequence[Optional[float]]] = None,
+    ) -> 'Trajectory':
+        """
+        由多个结构（Geometry 或原子字典列表）组成轨迹
+
+        Args:
+            frames: 各帧结构，元素顺序必须一致
+            units: 轨迹单位（默认取第一帧的单位，其余帧自动换算）
+            energies: 每帧能量
+
+        Raises:
+            ValueError: 各帧原子数或元素不一致
+        """
+        _require_numpy()
+        geometries = [f if isinstance(f, Geometry) else Geometry.from_dicts(f) for f in frames]
+        if not geometries:
+            return cls([], np.empty((0, 0, 3)), units=units or 'angstrom', energies=energies)
+        units = units or geometries[0].units
+        elements = geometries[0].elements
+        for i, geometry in enumerate(geometries):
+            if not np.array_equal(geometry.elements, elements):
+                raise ValueError(f"Frame {i} has different atoms than frame 0")
+        coords = np.stack([geometry.to_units(units).coords for geometry in geometries])
+        return cls(elements, coords, units=units, energies=energies)
+
+    @property
+    def n_frames(self) -> int:
+        return self.coords.shape[0]
+
+    @property
+    def n_atoms(self) -> int:
+        return len(self.elements)
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def __repr__(self) -> str:
+        return f"Trajectory(n_frames={self.n_frames}, n_atoms={self.n_atoms}, units={self.units!r})"
+
+    def __getitem__(self, frame: int) -> Geometry:
+        return Geometry(self.elements, self.coords[frame], units=self.units)
+
+    def __iter__(self) -> Iterator[Geometry]:
+        for frame in range(self.n_frames):
+            yield self[frame]
+
+    @property
+    def final(self) -> Optional[Geometry]:
+        """最后一帧（空轨迹返回 None）"""
+        return self[-1] if self.n_frames else None
+
+    def to_units(self, units: str) -> 'Trajectory':
+        """返回换算到指定单位的新轨迹（单位相同时返回自身）"""
+        factor = conversion_factor(self.units, units)
+        if factor == 1.0:
+            return self
+        return Trajectory(self.elements, self.coords * factor, units=units, energies=self.energies)
+
+    def format(self, frame: int = -1, units: str = 'angstrom') -> str:
+        """格式化指定帧为输入格式（默认最后一帧）"""
+        return format_coordinates(self.elements, self.coords[frame] * conversion_factor(self.units, units))
+
+    def to_dicts(self) -> List[List[Dict[str, Any]]]:
+        """转换为每帧一个原子字典列表"""
+        return [geometry.to_dicts() for geometry in self]
+
+    def to_xyz(
+        self,
+        comments: Optional[Sequence[str]] = None,
+        info: Optional[Sequence[Dict[str, Any]]] = None,
+        extended: bool = False,
+    ) -> str:
+        """
+        导出为多帧 XYZ 文本（坐标换算为 Angstrom）
+
+        Args:
+            comments: 每帧注释行（普通 XYZ）
+            info: 每帧 key=value 信息（extended XYZ 的注释行，值为 None 的键被省略）
+            extended: 是否写出 extended XYZ（extxyz）注释行
+
+        Returns:
+            XYZ 文本
+        """
+        coords = self.coords * conversion_factor(self.units, 'angstrom')
+        blocks = []
+        for frame in range(self.n_frames):
+            if extended:
+                items = ['Properties=species:S:1:pos:R:3']
+                for key, value in (info[frame] if info else {}).items():
+                    if value is not None:
+                        items.append(f"{key}={_format_info_value(value)}")
+                items.append('pbc="F F F"')
+                comment = ' '.join(items)
+            else:
+                comment = comments[frame] if comments else ''
+            blocks.append(f"{self.n_atoms}\n{comment}\n{format_coordinates(self.elements, coords[frame], XYZ_LINE_FORMAT)}\n")
+        return ''.join(blocks)
+
+    def write_xyz(self, path: Union[str, Path], extended: Optional[bool] = None, **kwargs: Any) -> Path:
+        """
+        写出多帧 XYZ 文件
+
+        Args:
+            path: 输出路径
+            extended: 是否写出 extxyz（None 时按后缀 .extxyz 推断）
+            **kwargs: 传给 to_xyz() 的 comments / info
+
+        Returns:
+            输出文件路径
+        """
+        path = Path(path)
+        if extended is None:
+            extended = path.suffix.lower() in EXTXYZ_SUFFIXES
+        path.write_text(self.to_xyz(extended=extended, **kwargs), encoding='utf-8')
+        return path
+
+
+# 优化步骤中以数组形式保存的收敛量
+OPTIMIZATION_STEP_ARRAYS = ('energy', 'force_max', 'force_rms', 'step_max', 'step_rms')
+
+
+@dataclass
+class OptimizationTrajectory:
+    """
+    完整的结构优化轨迹
+
+    Attributes:
+        steps: 步号数组，形状 (n_steps,)
+        energies: 每步能量（缺失值为 NaN）
+        force_max / force_rms: 每步 Force-Max / Force-RMS
+        step_max / step_rms: 每步 Step-Max / Step-RMS（位移）
+        trajectory: 各帧结构（Angstrom），没有坐标时为 None
+        frame_steps: 每帧对应的步号（0 表示初始结构）
+    """
+    steps: Any
+    energies: Any
+    force_max: Any
+    force_rms: Any
+    step_max: Any
+    step_rms: Any
+    trajectory: Optional[Trajectory]
+    frame_steps: Any
+
+    @classmethod
+    def from_steps(
+        cls,
+        steps: Sequence[Dict[str, Any]],
+        frames: Sequence[Tuple[Sequence[Tuple[str, float, float, float]], str]] = (),
+        frame_steps: Sequence[int] = (),
+    ) -> 'OptimizationTrajectory':
+        """
+        由步骤字典（extract_optimization_info()['steps'] 格式）和各帧坐标创建
+
+        Args:
+            steps: 步骤字典列表
+            frames: 每帧 ([(元素, x, y, z), ...], 单位)
+            frame_steps: 每帧对应的步号
+        """
+        _require_numpy()
+
+        def column(key: str) -> Any:
+            return np.array(
+                [np.nan if step.get(key) is None else step[key] for step in steps],
+                dtype=np.float64,
+            )
+
+        step_numbers = np.array([step['step'] for step in steps], dtype=np.int64)
+        trajectory = None
+        if frames:
+            geometries = [
+                Geometry([atom[0] for atom in atoms], [atom[1:] for atom in atoms], units=units)
+                for atoms, units in frames
+            ]
+            energy_by_step = {step['step']: step.get('energy') for step in steps}
+            trajectory = Trajectory.from_geometries(
+                geometries,
+                units='angstrom',
+                energies=[energy_by_step.get(step) for step in frame_steps],
+            )
+        return cls(
+            steps=step_numbers,
+            energies=column('energy'),
+            force_max=column('force_max'),
+            force_rms=column('force_rms'),
+            step_max=column('step_max'),
+            step_rms=column('step_rms'),
+            trajectory=trajectory,
+            frame_steps=np.array(list(frame_steps), dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def frame_info(self) -> List[Dict[str, Any]]:
+        """每帧的步号与收敛量（用于 extxyz 注释行）"""
+        index = {step: i for i, step in enumerate(self.steps.tolist())}
+        rows = []
+        for step in self.frame_steps.tolist():
+            row: Dict[str, Any] = {'step': step}
+            i = index.get(step)
+            for key, values in zip(OPTIMIZATION_STEP_ARRAYS, self._arrays()):
+                value = None if i is None else values[i].item()
+                row[key] = None if value is None or value != value else value  # NaN -> None
+            rows.append(row)
+        return rows
+
+    def _arrays(self) -> Tuple[Any, ...]:
+        return (self.energies, self.force_max, self.force_rms, self.step_max, self.step_rms)
+
+    def to_xyz(self, extended: bool = True) -> str:
+        """导出多帧 XYZ/extxyz 文本（没有坐标时返回空字符串）"""
+        if self.trajectory is None:
+            return ''
+        info = self.frame_info()
+        comments = [
+            ' '.join(f"{key}={value}" for key, value in row.items() if value is not None)
+            for row in info
+        ]
+        return self.trajectory.to_xyz(comments=comments, info=info, extended=extended)
+
+    def write_xyz(self, path: Union[str, Path], extended: Optional[bool] = None) -> Path:
+        """
+        写出多帧 XYZ 文件（extended 为 None 时按后缀 .extxyz 推断）
+
+        Raises:
+            ValueError: 输出中没有任何结构坐标
+        """
+        if self.trajectory is None:
+            raise ValueError("No geometries found in optimization output")
+        path = Path(path)
+        if extended is None:
+            extended = path.suffix.lower() in EXTXYZ_SUFFIXES
+        path.write_text(self.to_xyz(extended=extended), encoding='utf-8')
+        return path
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典（NaN 转为 None）"""
+        def as_list(values: Any) -> List[Optional[float]]:
+            return [None if v != v else v for v in values.tolist()]
+
+        return {
+            'steps': self.steps.tolist(),
+            'energies': as_list(self.energies),
+            'force_max': as_list(self.force_max),
+            'force_rms': as_list(self.force_rms),
+            'step_max': as_list(self.step_max),
+            'step_rms': as_list(self.step_rms),
+            'frame_steps': self.frame_steps.tolist(),
+            'geometries': self.trajectory.to_dicts() if self.trajectory is not None else [],
+        }
@@ -0,0 +1,412 @@
+"""
+Incremental BDF Output Parser
+
+This module provides a stateful parser for BDF logs that are still being
+written. It remembers the byte offset it has consumed and the state of the
+section it is in, so each update only reads the newly appended bytes and
+emits progress events (SCF iterations, optimization steps, excited-state
+tables, errors, normal termination).
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .output_parser import BDFOutputParser
+
+
+# 事件类型
+EVENT_SCF_ITERATION = 'scf_iteration'
+EVENT_SCF_ENERGY = 'scf_energy'
+EVENT_OPTIMIZATION_STEP = 'optimization_step'
+EVENT_OPTIMIZATION_CONVERGED = 'optimization_converged'
+EVENT_EXCITED_STATES = 'excited_states'
+EVENT_WARNING = 'warning'
+EVENT_ERROR = 'error'
+EVENT_TERMINATED = 'terminated'
+
+# 每次从文件读取的块大小（字节）
+READ_CHUNK_SIZE = 1 << 20
+
+_NUM = r'([-+]?\d+\.?\d*(?:[EeDd][-+]?\d+)?)'
+
+_SCF_TABLE_HEADER = re.compile(r'Iter\.?\s+.*SCF\s+Energy', re.IGNORECASE)
+_SCF_ITERATION_ROW = re.compile(rf'^\s*(\d+)\s+\d+\s+[\d.]+\s+{_NUM}(?:\s+{_NUM})?')
+_FINAL_SCF = re.compile(r'Final\s+scf\s+result', re.IGNORECASE)
+_E_TOT = re.compile(r'E_tot\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', re.IGNORECASE)
+_OPT_STEP = re.compile(r'Geometry\s+Optimization\s+step\s*:\s*(\d+)', re.IGNORECASE)
+_OPT_ENERGY = re.compile(r'Energy\s*=\s*([-+]?\d+\.\d+)', re.IGNORECASE)
+_GRADIENT_HEADER = re.compile(r'Gradient=\s*$', re.IGNORECASE)
+_GRADIENT_ROW = re.compile(r'^\s+(\w+)\s+([-+]?\d+\.\d+)\s+([-+]?\d+\.\d+)\s+([-+]?\d+\.\d+)\s*$')
+_CURRENT_VALUES = re.compile(
+    r'Current\s+values\s*:\s*' + r'\s+'.join([r'([-+]?\d+\.?\d*[Ee]?[-+]?\d*)'] * 4),
+    re.IGNORECASE
+)
+_OPT_CONVERGED = re.compile(
+    r'Good\s+Job[,\s]+Geometry\s+Optimization\s+converged\s+in\s+(\d+)\s+iterations?',
+    re.IGNORECASE
+)
+_EXCITED_HEADER = re.compile(r'No\.\s+Pair\s+ExSym', re.IGNORECASE)
+_WARNING = re.compile(r'WARNING[:\s]+(.+)', re.IGNORECASE)
+# 与远程轮询使用的 grep -Ei 'ERROR|FATAL|ABORT' 保持一致
+_ERROR = re.compile(r'ERROR|FATAL|ABORT', re.IGNORECASE)
+_NORMAL_TERMINATION = re.compile(r'Congratulations!\s+BDF\s+normal\s+termination', re.IGNORECASE)
+
+
+@dataclass
+class ParseEvent:
+    """增量解析产生的事件"""
+    kind: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    offset: int = 0  # 触发事件的行结束处的字节偏移
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {'kind': self.kind, 'offset': self.offset, **self.data}
+
+    def describe(self) -> str:
+        """返回单行可读描述"""
+        data = self.data
+        if self.kind == EVENT_SCF_ITERATION:
+            return f"SCF iteration {data['iteration']}: E = {data['energy']:.10f}"
+        if self.kind == EVENT_SCF_ENERGY:
+            return f"SCF converged: E_tot = {data['energy']:.10f}"
+        if self.kind == EVENT_OPTIMIZATION_STEP:
+            parts = [f"Optimization step {data['step']}"]
+            if data.get('energy') is not None:
+                parts.append(f"E = {data['energy']:.10f}")
+            if data.get('force_max') is not None:
+                parts.append(f"Force-Max = {data['force_max']:.4e}")
+            if data.get('force_rms') is not None:
+                parts.append(f"Force-RMS = {data['force_rms']:.4e}")
+            return ", ".join(parts)
+        if self.kind == EVENT_OPTIMIZATION_CONVERGED:
+            return f"Geometry optimization converged in {data.get('iterations')} iterations"
+        if self.kind == EVENT_EXCITED_STATES:
+            states = data.get('states', [])
+            if states:
+                lowest = min(s['energy_ev'] for s in states)
+                return f"Excited states: {len(states)} roots, lowest {lowest:.4f} eV"
+            return "Excited states: 0 roots"
+        if self.kind == EVENT_WARNING:
+            return f"Warning: {data.get('message', '')}"
+        if self.kind == EVENT_ERROR:
+            return f"Error: {data.get('message', '')}"
+        if self.kind == EVENT_TERMINATED:
+            return "BDF normal termination"
+        return self.kind
+
+
+class IncrementalOutputParser:
+    """
+    增量 BDF 输出解析器
+
+    记录已消费的字节偏移和当前所在段落的状态，每次调用只处理新追加的字节，
+    因此对正在运行的作业轮询时每次的开销与新增内容成正比，而不是与日志总大小成正比。
+
+    用法：
+        tail = IncrementalOutputParser("job.log")
+        for event in tail.update():
+            print(event.describe())
+    """
+
+    def __init__(self, output_file: Optional[str] = None):
+        """
+        Args:
+            output_file: 要跟踪的输出文件路径（使用 feed() 直接喂入数据时可为空）
+        """
+        self.output_file = Path(output_file) if output_file else None
+        self._parser = BDFOutputParser()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空所有状态（例如日志被截断或重新生成时）"""
+        self.offset = 0            # 已读取的字节数（含未完成的行）
+        self._pending = b''        # 尚未以换行结束的字节
+        self._section: Optional[str] = None   # 'scf_table' | 'gradient' | 'excited_table'
+        self._excited_lines: List[str] = []
+        self._excited_started = False
+        self._awaiting_e_tot = False
+        self._step: Optional[Dict[str, Any]] = None
+        self._step_emitted = False
+
+        self.scf_iterations = 0
+        self.scf_energy: Optional[float] = None
+        self.steps: List[Dict[str, Any]] = []
+        self.excited_states: List[Dict[str, Any]] = []
+        self.optimization_converged = False
+        self.warnings: List[str] = []
+        self.errors: List[str] = []
+        self.finished = False
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+    def update(self) -> List[ParseEvent]:
+        """
+        读取输出文件中新追加的字节并返回产生的事件
+
+        文件尚不存在时返回空列表；文件变短（被截断或重写）时从头重新解析。
+        """
+        if self.output_file is None:
+            raise ValueError("update() requires output_file; use feed() for raw data")
+        try:
+            size = self.output_file.stat().st_size
+        except FileNotFoundError:
+            return []
+        if size < self.offset:
+            self.reset()
+
+        events: List[ParseEvent] = []
+        with open(self.output_file, 'rb') as f:
+            f.seek(self.offset)
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                events.extend(self.feed(chunk))
+        return events
+
+    def feed(self, data: Union[bytes, str]) -> List[ParseEvent]:
+        """
+        喂入新追加的数据并返回产生的事件
+
+        Args:
+            data: 新追加的字节（或文本，按 UTF-8 编码计算偏移）
+
+        Returns:
+            事件列表；不完整的最后一行会被缓存到下次调用
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if not data:
+            return []
+
+        line_end = self.offset - len(self._pending)
+        self.offset += len(data)
+        buffer = self._pending + data
+        cut = buffer.rfind(b'\n')
+        if cut < 0:
+            self._pending = buffer
+            return []
+        self._pending = buffer[cut + 1:]
+
+        events: List[ParseEvent] = []
+        for raw in buffer[:cut + 1].splitlines(keepends=True):
+            line_end += len(raw)
+            line = raw.decode('utf-8', errors='ignore').rstrip('\r\n')
+            self._consume_line(line, line_end, events)
+        return events
+
+    def flush(self) -> List[ParseEvent]:
+        """处理缓存中不以换行结束的最后一行，并结束未完成的段落（作业结束后调用）"""
+        events: List[ParseEvent] = []
+        if self._pending:
+            line = self._pending.decode('utf-8', errors='ignore').rstrip('\r\n')
+            self._pending = b''
+            self._consume_line(line, self.offset, events)
+        self._close_excited_table(self.offset, events)
+        self._emit_step(self.offset, events)
+        return events
+
+    def summary(self) -> Dict[str, Any]:
+        """返回当前进度摘要"""
+        last_step = self.steps[-1] if self.steps else None
+        return {
+            'offset': self.offset,
+            'scf_iterations': self.scf_iterations,
+            'scf_energy': self.scf_energy,
+            'optimization_steps': len(self.steps),
+            'last_step': last_step,
+            'optimization_converged': self.optimization_converged,
+            'excited_states': len(self.excited_states),
+            'warnings': len(self.warnings),
+            'errors': len(self.errors),
+            'finished': self.finished,
+        }
+
+    # ------------------------------------------------------------------
+    # 逐行状态机
+    # ------------------------------------------------------------------
+    def _consume_line(self, line: str, offset: int, events: List[ParseEvent]) -> None:
+        """处理一个完整的行"""
+        if self._section == 'excited_table':
+            if self._consume_excited_line(line, offset, events):
+                return
+        elif self._section == 'scf_table':
+            match = _SCF_ITERATION_ROW.match(line)
+            if match:
+                self._emit_scf_iteration(match, offset, events)
+                return
+            self._section = None
+        elif self._section == 'gradient':
+            match = _GRADIENT_ROW.match(line)
+            if match and self._step is not None:
+                self._step['gradient'].append({
+                    'atom': match.group(1),
+                    'x': float(match.group(2)),
+                    'y': float(match.group(3)),
+                    'z': float(match.group(4)),
+                })
+                return
+            self._section = None
+
+        if _SCF_TABLE_HEADER.search(line):
+            self._section = 'scf_table'
+            return
+
+        if _EXCITED_HEADER.search(line):
+            self._section = 'excited_table'
+            self._excited_lines = [line]
+            self._excited_started = False
+            return
+
+        self._consume_scf_energy(line, offset, events)
+        self._consume_optimization(line, offset, events)
+
+        warning = _WARNING.search(line)
+        if warning and warning.group(1).strip():
+            message = warning.group(1).strip()
+            self.warnings.append(message)
+            events.append(ParseEvent(EVENT_WARNING, {'message': message}, offset))
+
+        if _ERROR.search(line):
+            message = line.strip()
+            self.errors.append(message)
+            events.append(ParseEvent(EVENT_ERROR, {'message': message}, offset))
+
+        if _NORMAL_TERMINATION.search(line):
+            self._emit_step(offset, events)
+            self.finished = True
+            events.append(ParseEvent(EVENT_TERMINATED, {'normal': True}, offset))
+
+    def _emit_scf_iteration(self, match: 're.Match', offset: int, events: List[ParseEvent]) -> None:
+        try:
+            energy = float(match.group(2).replace('D', 'E').replace('d', 'e'))
+        except ValueError:
+            return
+        delta_e = None
+        if match.group(3):
+            try:
+                delta_e = float(match.group(3).replace('D', 'E').replace('d', 'e'))
+            except ValueError:
+                pass
+        self.scf_iterations += 1
+        events.append(ParseEvent(EVENT_SCF_ITERATION, {
+            'iteration': int(match.group(1)),
+            'energy': energy,
+            'delta_e': delta_e,
+        }, offset))
+
+    def _consume_scf_energy(self, line: str, offset: int, events: List[ParseEvent]) -> None:
+        """Final scf result 之后的第一个 E_tot 为本次 SCF 的最终能量"""
+        pos = 0
+        while True:
+            if not self._awaiting_e_tot:
+                marker = _FINAL_SCF.search(line, pos)
+                if not marker:
+                    return
+                self._awaiting_e_tot = True
+                pos = marker.end()
+            match = _E_TOT.search(line, pos)
+            if not match:
+                return
+            self._awaiting_e_tot = False
+            pos = match.end()
+            try:
+                self.scf_energy = float(match.group(1))
+            except ValueError:
+                continue
+            events.append(ParseEvent(EVENT_SCF_ENERGY, {'energy': self.scf_energy}, offset))
+
+    def _consume_optimization(self, line: str, offset: int, events: List[ParseEvent]) -> None:
+        """跟踪结构优化步骤（与 extract_optimization_info 的字段一致）"""
+        step_match = _OPT_STEP.search(line)
+        if step_match:
+            self._emit_step(offset, events)
+            self._step = {
+                'step': int(step_match.group(1)),
+                'energy': None,
+                'scf_energy': None,
+                'gradient': [],
+                'force_rms': None,
+                'force_max': None,
+                'step_rms': None,
+                'step_max': None,
+            }
+            self._step_emitted = False
+            return
+
+        converged = _OPT_CONVERGED.search(line)
+        if converged:
+            self._emit_step(offset, events)
+            self.optimization_converged = True
+            events.append(ParseEvent(
+                EVENT_OPTIMIZATION_CONVERGED,
+                {'iterations': int(converged.group(1))},
+                offset,
+            ))
+            return
+
+        if self._step is None or self._step_emitted:
+            return
+
+        if self._step['energy'] is None:
+            energy = _OPT_ENERGY.search(line)
+            if energy:
+                self._step['energy'] = float(energy.group(1))
+                return
+
+        if _GRADIENT_HEADER.search(line):
+            self._section = 'gradient'
+            return
+
+        current = _CURRENT_VALUES.search(line)
+        if current:
+            try:
+                self._step['force_rms'] = float(current.group(1))
+                self._step['force_max'] = float(current.group(2))
+                self._step['step_rms'] = float(current.group(3))
+                self._step['step_max'] = float(current.group(4))
+            except ValueError:
+                pass
+            self._emit_step(offset, events)
+
+    def _emit_step(self, offset: int, events: List[ParseEvent]) -> None:
+        """当前优化步骤的信息已完整（或被下一步/结束打断）时发出事件"""
+        if self._step is None or self._step_emitted:
+            return
+        step = dict(self._step)
+        step['gradient'] = step['gradient'] or None
+        self.steps.append(step)
+        self._step_emitted = True
+        events.append(ParseEvent(EVENT_OPTIMIZATION_STEP, step, offset))
+
+    def _consume_excited_line(self, line: str, offset: int, events: List[ParseEvent]) -> bool:
+        """
+        收集激发态汇总表的行，表格结束时发出事件
+
+        Returns:
+            该行是否属于激发态表格
+        """
+        stripped = line.strip()
+        if not stripped or stripped.startswith('***'):
+            if self._excited_started:
+                self._close_excited_table(offset, events)
+                return not stripped
+            return True
+        self._excited_started = True
+        self._excited_lines.append(line)
+        return True
+
+    def _close_excited_table(self, offset: int, events: List[ParseEvent]) -> None:
+        if self._section != 'excited_table':
+            return
+        self._section = None
+        states = self._parser._parse_excited_states_block('\n'.join(self._excited_lines))
+        self._excited_lines = []
+        self._excited_started = False
+        if states:
+            self.excited_states = states
+            events.append(ParseEvent(EVENT_EXCITED_STATES, {'states': states}, offset))
@@ -6,9 +6,90 @@ key information such as energies, geometries, frequencies, etc.
 """
 
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple, Union
 from pathlib import Path
 
+from .geometry import Geometry, OptimizationTrajectory
+from .patterns import PATTERNS
+from .section_index import SectionIndex
+
+
+# 解析结果格式版本：修改任何提取器的输出时递增，使磁盘解析缓存中的旧条目失效
+PARSER_VERSION = '4'
+
+# TDDFT 元数据（isf/ialda/JK 内存等）向前回溯的最大字符数
+TDDFT_META_LOOKBEHIND = 100000
+
+# 可按需选择的解析字段及其依赖（parse(..., fields=...)）
+# 顶层字段对应结果字典中的同名键；属性字段对应 result['properties'] 中的同名键
+RESULT_FIELDS = (
+    'energy', 'scf_energy', 'converged', 'geometry', 'frequencies', 'frequency_data',
+    'optimization', 'tddft', 'excited_states', 'warnings', 'errors',
+)
+PROPERTY_FIELDS = (
+    'scf_method', 'thermochemistry', 'final_scf_components', 'resp_gradient',
+    'symmetry', 'irreps', 'occupation', 'scf_state_symmetry',
+)
+FIELD_DEPENDENCIES = {
+    'frequencies': ('frequency_data',),
+    'frequency_data': ('frequencies',),
+    'excited_states': ('tddft',),
+    'final_scf_components': ('optimization',),
+    'occupation': ('scf_method',),
+    # 'properties' 表示 extract_properties() 的基础属性及全部属性字段
+    'properties': PROPERTY_FIELDS,
+}
+
+# 解析模式：text 一次读入全文（提取器需要完整文本，目前没有其他模式）
+PARSE_MODES = ('text',)
+
+# 纯数值行（SCF/Davidson 迭代表、矩阵打印等），流式解析时每段连续数值行只保留最后一行
+_NUMERIC_ROW = re.compile(
+    r'^\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[EeDd][-+]?\d+)?'
+    r'(?:\s+[-+]?(?:\d+\.?\d*|\.\d+)(?:[EeDd][-+]?\d+)?)*\s*$'
+)
+
+_FINAL_SCF_MARKER = re.compile(r'Final\s+scf\s+result', re.IGNORECASE)
+_FINAL_BLOCK_STOP = re.compile(r'\[Final', re.IGNORECASE)
+_E_TOT_VALUE = re.compile(r'E_tot\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', re.IGNORECASE)
+
+# 优化轨迹：步骤标题、坐标块与坐标行
+_OPT_STEP_HEADER = r'Geometry\s+Optimization\s+step\s*:\s*(\d+)'
+_ANGSTROM_COORD_BLOCK = (
+    r'Molecular\s+Cartesian\s+Coordinates\s+\(X,Y,Z\)\s+in\s+Angstrom\s*:'
+    r'(.*?)(?=\n\n|\n\s+Force-RMS|\n\s+Redundant|\Z)'
+)
+_BOHR_COORD_BLOCK = r'Atom\s+Cartcoord\(Bohr\).*?(?=\n\n|\n\[|\n\|\||\nAtom\s+Cartcoord|$)'
+_COORD_ROW = (
+    r'^\s*(\w+)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+'
+    r'([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)'
+)
+# 结构优化输出所在的段落（步骤标题、收敛信息与每步打印的坐标）
+_OPTIMIZATION_SECTIONS = ('opt_step', 'optimization', 'opt_geometry')
+_COORD_HEADER_WORDS = frozenset(['ATOM', 'CARTCOORD', 'CHARGE', 'BASIS', 'MOLECULAR', 'CARTESIAN', 'COORDINATES', 'ANGSTROM'])
+
+Span = Tuple[int, int]
+
+
+def _search_spans(pattern: str, content: str, spans: Iterable[Span], flags: int = 0) -> Optional[re.Match]:
+    """依次在各范围内搜索（不复制内容），返回第一个匹配"""
+    for pos, endpos in spans:
+        match = PATTERNS.search(pattern, content, flags, pos, endpos)
+        if match:
+            return match
+    return None
+
+
+def _finditer_spans(pattern: str, content: str, spans: Iterable[Span], flags: int = 0) -> Iterator[re.Match]:
+    """依次返回各范围内的全部匹配（不复制内容）"""
+    for pos, endpos in spans:
+        yield from PATTERNS.finditer(pattern, content, flags, pos, endpos)
+
+
+def _clip_spans(spans: Iterable[Span], endpos: int) -> List[Span]:
+    """截去各范围中 endpos 之后的部分"""
+    return [(pos, min(end, endpos)) for pos, end in spans if pos < endpos]
+
 
 class BDFOutputParser:
     """BDF 输出文件解析器"""
@@ -58,12 +139,21 @@ class BDFOutputParser:
             r'FAILED',
         ]
     
-    def parse(self, output_file: str) -> Dict[str, Any]:
+    def parse(
+        self,
+        output_file: str,
+        mode: str = 'text',
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
         """
         解析 BDF 输出文件
         
         Args:
             output_file: 输出文件路径
+            mode: 解析模式，目前只支持 'text'（一次读入全文后解析）
+            fields: 需要的字段（见 RESULT_FIELDS / PROPERTY_FIELDS，'properties' 表示全部属性），
+                    为 None 时提取全部字段。只运行所需字段及其依赖的提取器，
+                    结果中只包含请求的字段
         
         Returns:
             包含解析结果的字典：
@@ -78,6 +168,10 @@ class BDFOutputParser:
                 'errors': List[str]        # 错误信息
             }
         """
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode: {mode}. Supported modes: {', '.join(PARSE_MODES)}")
+        selected = self.resolve_fields(fields)
+        
         output_path = Path(output_file)
         if not output_path.exists():
             raise FileNotFoundError(f"Output file not found: {output_file}")
@@ -85,6 +179,129 @@ class BDFOutputParser:
         with open(output_path, 'r', encoding='utf-8', errors='ignore') as f:
             content = f.read()
         
+        return self._parse_content(content, output_path, selected)
+    
+    def parse_stream(
+        self,
+        lines: Iterable[str],
+        output_file: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        从行迭代器解析 BDF 输出（如已打开的文件对象、gzip 流或远程管道）
+        
+        迭代器只被消费一次，连续的纯数值行只保留最后一行（见 _compact_lines()），
+        其余文本拼接为一个字符串后按 parse() 的方式解析，因此内存占用并不固定：
+        与压缩后的文本大小成正比，以文本为主的大日志仍会整体读入内存。
+        
+        Args:
+            lines: 逐行产生文本的可迭代对象（行尾可带换行符）
+            output_file: 对应的输出文件路径（可选，用于查找同名 *.out.tmp 文件）
+            fields: 需要的字段（见 parse()）
+        
+        Returns:
+            与 parse() 相同结构的结果字典
+        """
+        selected = self.resolve_fields(fields)
+        content = self._compact_lines(lines)
+        output_path = Path(output_file) if output_file else None
+        return self._parse_content(content, output_path, selected)
+    
+    @staticmethod
+    def resolve_fields(fields: Optional[Iterable[str]]) -> Optional[Tuple[frozenset, frozenset]]:
+        """
+        校验请求的字段并补全依赖
+        
+        Args:
+            fields: 请求的字段名（None 表示全部）
+        
+        Returns:
+            (请求的字段, 需要运行的字段) 二元组；fields 为 None 时返回 None
+        
+        Raises:
+            ValueError: 存在未知字段名
+        """
+        if fields is None:
+            return None
+        if isinstance(fields, str):
+            fields = [fields]
+        requested = frozenset(f.strip() for f in fields if f and f.strip())
+        valid = set(RESULT_FIELDS) | set(PROPERTY_FIELDS) | {'properties'}
+        unknown = sorted(requested - valid)
+        if unknown:
+            raise ValueError(
+                f"Unknown parse field(s): {', '.join(unknown)}. "
+                f"Supported fields: {', '.join(sorted(valid))}"
+            )
+        needed = set(requested)
+        pending = list(requested)
+        while pending:
+            for dep in FIELD_DEPENDENCIES.get(pending.pop(), ()):
+                if dep not in needed:
+                    needed.add(dep)
+                    pending.append(dep)
+        return requested, frozenset(needed)
+    
+    @staticmethod
+    def _compact_lines(lines: Iterable[str]) -> str:
+        """
+        将行迭代器压缩为供提取器使用的文本
+        
+        所有非数值行原样保留；每段连续的纯数值行（迭代表、矩阵打印）只保留最后一行，
+        以便 SCF 迭代能量的回退提取仍能取到最后一次迭代。
+        
+        这不是有界的流式处理：保留的行先收集到列表再拼接成一个字符串，提取器需要
+        完整文本，峰值内存约为压缩后文本的两倍。只有数值表格占多数的日志才能明显省内存。
+        """
+        kept: List[str] = []
+        pending_numeric: Optional[str] = None
+        ends_with_newline = False
+        for line in lines:
+            ends_with_newline = line.endswith('\n')
+            line = line.rstrip('\r\n')
+            if _NUMERIC_ROW.match(line):
+                pending_numeric = line
+                continue
+            if pending_numeric is not None:
+                kept.append(pending_numeric)
+                pending_numeric = None
+            kept.append(line)
+        if pending_numeric is not None:
+            kept.append(pending_numeric)
+        content = '\n'.join(kept)
+        if kept and ends_with_newline:
+            content += '\n'
+        return content
+    
+    def _parse_content(
+        self,
+        content: str,
+        output_path: Optional[Path] = None,
+        selected: Optional[Tuple[frozenset, frozenset]] = None,
+    ) -> Dict[str, Any]:
+        """
+        解析已读入的输出内容
+        
+        Args:
+            content: BDF 输出内容
+            output_path: 输出文件路径（可选，用于查找同名 *.out.tmp 文件）
+            selected: resolve_fields() 的返回值（None 表示提取全部字段）
+        
+        Returns:
+            解析结果字典（结构见 parse()）
+        """
+        if selected is None:
+            def wanted(name: str) -> bool:
+                return True
+        else:
+            needed = selected[1]
+
+            def wanted(name: str) -> bool:
+                return name in needed
+        
+        # 一次扫描建立段落索引，各提取器只搜索自己段落的有界范围
+        index = SectionIndex.build(content)
+        
         result = {
             'energy': None,
             'scf_energy': None,
@@ -99,38 +316,46 @@ class BDFOutputParser:
         }
         
         # 提取能量
-        result['energy'] = self.extract_energy(content)
-        result['scf_energy'] = self.extract_scf_energy(content)
+        if wanted('energy'):
+            result['energy'] = self.extract_energy(content, index)
+        if wanted('scf_energy'):
+            result['scf_energy'] = self.extract_scf_energy(content, index)
         
         # 检查收敛性
-        result['converged'] = self.check_convergence(content)
+        if wanted('converged'):
+            result['converged'] = self.check_convergence(content, index)
         
         # 提取几何结构
-        result['geometry'] = self.extract_geometry(content)
+        if wanted('geometry'):
+            result['geometry'] = self.extract_geometry(content, index)
         
         # 提取频率（现在返回字典，包含振动和平动/转动频率）
-        freq_data = self.extract_frequencies(content)
-        result['frequencies'] = freq_data.get('all', [])  # 向后兼容：保持列表格式
-        result['frequency_data'] = freq_data  # 新的结构化数据
+        if wanted('frequencies'):
+            freq_data = self.extract_frequencies(content, index)
+            result['frequencies'] = freq_data.get('all', [])  # 向后兼容：保持列表格式
+            result['frequency_data'] = freq_data  # 新的结构化数据
         
         # 提取额外性质
-        result['properties'] = self.extract_properties(content)
+        if wanted('properties'):
+            result['properties'] = self.extract_properties(content, index)
         
         # 提取SCF方法类型（如果有）
-        scf_method = self.extract_scf_method(content)
+        scf_method = self.extract_scf_method(content, index) if wanted('scf_method') else None
         if scf_method:
             result['properties']['scf_method'] = scf_method
         
         # 提取热力学数据
-        thermochemistry = self.extract_thermochemistry(content)
-        if thermochemistry:
-            result['properties']['thermochemistry'] = thermochemistry
+        if wanted('thermochemistry'):
+            thermochemistry = self.extract_thermochemistry(content, index)
+            if thermochemistry:
+                result['properties']['thermochemistry'] = thermochemistry
         
         # 提取优化信息（如果有）
-        result['optimization'] = self.extract_optimization_info(content)
+        if wanted('optimization'):
+            result['optimization'] = self.extract_optimization_info(content, index)
         
         # 如果存在优化步骤，尝试从 *.out.tmp 文件中提取每一步的 SCF 能量
-        if result['optimization'].get('steps'):
+        if result['optimization'].get('steps') and output_path is not None:
             out_tmp_file = output_path.with_suffix('.out.tmp')
             if out_tmp_file.exists():
                 scf_energies = self.extract_scf_energies_from_tmp(str(out_tmp_file))
@@ -140,55 +365,103 @@ class BDFOutputParser:
                         step['scf_energy'] = scf_energies[i]
                 
                 # 提取最后一次 SCF 的能量分解信息
-                final_scf_components = self.extract_final_scf_energy_components(str(out_tmp_file))
-                if final_scf_components:
-                    result['properties']['final_scf_components'] = final_scf_components
+                if wanted('final_scf_components'):
+                    final_scf_components = self.extract_final_scf_energy_components(str(out_tmp_file))
+                    if final_scf_components:
+                        result['properties']['final_scf_components'] = final_scf_components
 
         # 提取激发态信息（如果有，TDDFT）
-        result['tddft'] = self.extract_tddft_calculations(content)
-        # 兼容旧字段：若存在 TDDFT 结果则取第一段激发态，否则回退旧解析
-        if result['tddft']:
-            result['excited_states'] = result['tddft'][0].get('states', [])
-        else:
-            result['excited_states'] = self.extract_excited_states(content)
+        if wanted('tddft'):
+            result['tddft'] = self.extract_tddft_calculations(content, index)
+            # 兼容旧字段：若存在 TDDFT 结果则取第一段激发态，否则回退旧解析
+            if result['tddft']:
+                result['excited_states'] = result['tddft'][0].get('states', [])
+            else:
+                result['excited_states'] = self.extract_excited_states(content, index)
         
         # 提取resp模块的激发态梯度计算信息（如果有）
-        resp_gradient_info = self.extract_resp_gradient_info(content)
-        if resp_gradient_info:
-            result['properties']['resp_gradient'] = resp_gradient_info
+        if wanted('resp_gradient'):
+            resp_gradient_info = self.extract_resp_gradient_info(content, index)
+            if resp_gradient_info:
+                result['properties']['resp_gradient'] = resp_gradient_info
 
         # 提取对称群信息（如果有）
-        symmetry_info = self.extract_symmetry_info(content)
-        if symmetry_info:
-            result['properties']['symmetry'] = symmetry_info
+        if wanted('symmetry'):
+            symmetry_info = self.extract_symmetry_info(content, index)
+            if symmetry_info:
+                result['properties']['symmetry'] = symmetry_info
 
         # 提取不可约表示和分子轨道信息（如果有）
-        irrep_info = self.extract_irrep_info(content)
-        if irrep_info:
-            result['properties']['irreps'] = irrep_info
+        if wanted('irreps'):
+            irrep_info = self.extract_irrep_info(content, index)
+            if irrep_info:
+                result['properties']['irreps'] = irrep_info
 
         # 提取轨道占据信息（如果有）
         # 注意：需要先提取SCF方法信息，以便正确判断限制性/非限制性方法
         # 直接使用上面提取的scf_method变量，而不是从result中重新获取
-        occupation_info = self.extract_occupation_info(content, scf_method=scf_method)
-        if occupation_info:
-            result['properties']['occupation'] = occupation_info
+        if wanted('occupation'):
+            occupation_info = self.extract_occupation_info(content, scf_method=scf_method, index=index)
+            if occupation_info:
+                result['properties']['occupation'] = occupation_info
 
         # 提取SCF State symmetry（如果有）
-        scf_state_symmetry = self.extract_scf_state_symmetry(content)
-        if scf_state_symmetry:
-            result['properties']['scf_state_symmetry'] = scf_state_symmetry
+        if wanted('scf_state_symmetry'):
+            scf_state_symmetry = self.extract_scf_state_symmetry(content, index)
+            if scf_state_symmetry:
+                result['properties']['scf_state_symmetry'] = scf_state_symmetry
 
         # 提取警告和错误
-        result['warnings'] = self.extract_warnings(content)
-        result['errors'] = self.extract_errors(content)
+        if wanted('warnings'):
+            result['warnings'] = self.extract_warnings(content, index)
+        if wanted('errors'):
+            result['errors'] = self.extract_errors(content, index)
         
+        if selected is not None:
+            result = self._select_fields(result, selected[0])
         return result
     
-    def extract_energy(self, content: str) -> Optional[float]:
-        """提取总能量"""
+    @staticmethod
+    def _select_fields(result: Dict[str, Any], requested: frozenset) -> Dict[str, Any]:
+        """只保留请求的字段（依赖字段仅用于计算，不出现在结果中）"""
+        selected = {key: result[key] for key in RESULT_FIELDS if key in requested and key in result}
+        if 'properties' in requested:
+            selected['properties'] = result['properties']
+        else:
+            properties = {
+                key: value for key, value in result['properties'].items()
+                if key in requested
+            }
+            if properties or requested & set(PROPERTY_FIELDS):
+                selected['properties'] = properties
+        return selected
+    
+    @staticmethod
+    def _ranges(content: str, index: Optional[SectionIndex], *names: str, merged: bool = False) -> List[Span]:
+        """
+        提取器的搜索范围
+        
+        Args:
+            content: BDF 输出内容
+            index: 段落索引；为 None 时搜索全文
+            names: 段落名称（见 SECTION_MARKERS）
+            merged: 是否合并为从第一个段落起点到最后一个段落终点的单个范围
+        
+        Returns:
+            [(pos, endpos), ...]；段落不存在时为空列表
+        """
+        if index is None:
+            return [(0, len(content))]
+        if merged:
+            span = index.span(*names)
+            return [span] if span else []
+        return index.spans(*names)
+    
+    def extract_energy(self, content: str, index: Optional[SectionIndex] = None) -> Optional[float]:
+        """提取总能量（给出段落索引时只搜索 Final scf result 与 SCF 段落）"""
+        spans = self._ranges(content, index, 'final_scf', 'scf_iterations')
         for pattern in self.energy_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
+            match = _search_spans(pattern, content, spans, re.IGNORECASE)
             if match:
                 try:
                     return float(match.group(1))
@@ -196,11 +469,12 @@ class BDFOutputParser:
                     continue
         return None
     
-    def extract_scf_energy(self, content: str) -> Optional[float]:
-        """提取 SCF 能量"""
+    def extract_scf_energy(self, content: str, index: Optional[SectionIndex] = None) -> Optional[float]:
+        """提取 SCF 能量（给出段落索引时只搜索 SCF 迭代与 Final scf result 段落）"""
         # 优先使用 SCF 能量专用模式
+        spans = self._ranges(content, index, 'scf_iterations', 'final_scf')
         for pattern in self.scf_energy_patterns:
-            match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
+            match = _search_spans(pattern, content, spans, re.IGNORECASE | re.DOTALL)
             if match:
                 try:
                     return float(match.group(1))
@@ -210,7 +484,7 @@ class BDFOutputParser:
         # 尝试从迭代过程中提取最后的 SCF Energy
         # 格式：Iter. ... SCF Energy ... (最后一行)
         scf_iter_pattern = r'(\d+)\s+\d+\s+[\d.]+\s+([-+]?\d+\.\d+[Ee]?[-+]?\d*)'
-        matches = list(re.finditer(scf_iter_pattern, content))
+        matches = list(_finditer_spans(scf_iter_pattern, content, self._ranges(content, index, 'scf_iterations')))
         if matches:
             # 取最后一行的能量
             last_match = matches[-1]
@@ -220,19 +494,20 @@ class BDFOutputParser:
                 pass
         
         # 如果没有找到 SCF 能量，返回总能量
-        return self.extract_energy(content)
+        return self.extract_energy(content, index)
     
-    def check_convergence(self, content: str) -> bool:
-        """检查计算是否收敛"""
+    def check_convergence(self, content: str, index: Optional[SectionIndex] = None) -> bool:
+        """检查计算是否收敛（给出段落索引时只搜索终止/收敛信息所在的行）"""
+        spans = self._ranges(content, index, 'convergence')
         # 检查正常终止标志
         for pattern in self.convergence_patterns:
-            if re.search(pattern, content, re.IGNORECASE | re.DOTALL):
+            if _search_spans(pattern, content, spans, re.IGNORECASE | re.DOTALL):
                 return True
         
         # 检查 Final DeltaE 和 Final DeltaD（BDF 格式）
         # 如果 DeltaE 和 DeltaD 都很小，说明收敛
-        deltae_match = re.search(r'Final\s+DeltaE\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, re.IGNORECASE)
-        deltad_match = re.search(r'Final\s+DeltaD\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, re.IGNORECASE)
+        deltae_match = _search_spans(r'Final\s+DeltaE\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, spans, re.IGNORECASE)
+        deltad_match = _search_spans(r'Final\s+DeltaD\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, spans, re.IGNORECASE)
         
         if deltae_match and deltad_match:
             try:
@@ -244,16 +519,16 @@ class BDFOutputParser:
             except (ValueError, IndexError):
                 pass
         
-        # 检查是否有错误
-        if self.extract_errors(content):
-            return False
-        
         return False
     
-    def extract_geometry(self, content: str) -> List[Dict[str, Any]]:
+    def extract_geometry(self, content: str, index: Optional[SectionIndex] = None) -> List[Dict[str, Any]]:
         """
         提取几何结构（优化版本，提高精度）
         
+        Args:
+            content: BDF 输出内容
+            index: 段落索引（可选），给出时只在最后一个坐标块标记处匹配，不扫描全文
+        
         Returns:
             原子坐标列表，每个元素为 {
                 'element': str,      # 元素符号
@@ -270,11 +545,12 @@ class BDFOutputParser:
         # 策略0: 最高优先级 - 提取结构优化后的几何结构（Angstrom单位）
         # 支持收敛和未收敛两种情况
         # 查找所有 "Molecular Cartesian Coordinates (X,Y,Z) in Angstrom :" 出现的位置
-        coords_matches = list(re.finditer(
+        coords_matches = self._coordinate_blocks(
             r'Molecular\s+Cartesian\s+Coordinates\s+\(X,Y,Z\)\s+in\s+Angstrom\s*:.*?(?=\n\n|\n\s+Force-RMS|\n\s+Redundant|\Z)',
             content,
-            re.IGNORECASE | re.DOTALL
-        ))
+            index,
+            'opt_geometry',
+        )
         
         if coords_matches:
             # 使用最后一个匹配（最终优化结构，无论是否收敛）
@@ -283,19 +559,19 @@ class BDFOutputParser:
             
             # 检查是否收敛
             is_converged = False
-            # 检查收敛提示（在当前section或之后）
-            match_end = last_match.end()
+            # 检查收敛提示（在当前section或之前的优化输出中）
+            before = _clip_spans(self._ranges(content, index, 'optimization'), last_match.end())
             # 在当前section中查找收敛信息
-            if re.search(r'Geom\.\s+converge\s*:.*?Yes', section_content, re.IGNORECASE):
+            if PATTERNS.search(r'Geom\.\s+converge\s*:.*?Yes', section_content, re.IGNORECASE):
                 is_converged = True
-            elif re.search(r'Good\s+Job,\s+Geometry\s+Optimization\s+converged', content[:match_end], re.IGNORECASE):
+            elif _search_spans(r'Good\s+Job,\s+Geometry\s+Optimization\s+converged', content, before, re.IGNORECASE):
                 is_converged = True
             # 检查未收敛提示
-            elif re.search(r'Geometry\s+Optimization\s+not\s+converged', content[:match_end], re.IGNORECASE):
+            elif _search_spans(r'Geometry\s+Optimization\s+not\s+converged', content, before, re.IGNORECASE):
                 is_converged = False
             
             # 提取坐标部分（跳过标题行）
-            coords_start = re.search(
+            coords_start = PATTERNS.search(
                 r'Molecular\s+Cartesian\s+Coordinates\s+\(X,Y,Z\)\s+in\s+Angstrom\s*:',
                 section_content,
                 re.IGNORECASE
@@ -306,7 +582,7 @@ class BDFOutputParser:
                 # 匹配格式：元素符号 + 三个坐标（支持科学计数法）
                 # 例如：C           1.12766281      -0.06079459       1.22640622
                 pattern = r'^\s*(\w+)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)'
-                matches = re.finditer(pattern, coords_section, re.MULTILINE)
+                matches = PATTERNS.finditer(pattern, coords_section, re.MULTILINE)
                 
                 for idx, match in enumerate(matches, start=1):
                     element = match.group(1).strip()
@@ -339,11 +615,12 @@ class BDFOutputParser:
         
         # 策略1: 提取最后的 Cartcoord(Bohr) 部分（最终几何结构）
         # 查找所有 Cartcoord(Bohr) 部分，取最后一个
-        cartcoord_matches = list(re.finditer(
+        cartcoord_matches = self._coordinate_blocks(
             r'Atom\s+Cartcoord\(Bohr\).*?(?=\n\n|\n\[|\n\|\||\nAtom\s+Cartcoord|$)',
             content,
-            re.IGNORECASE | re.DOTALL
-        ))
+            index,
+            'cartcoord',
+        )
         
         if cartcoord_matches:
             # 使用最后一个匹配（最终几何结构）
@@ -355,7 +632,7 @@ class BDFOutputParser:
             # 例如：C        0.000000     0.000000     0.313990     6.00 ...
             # 或：  H        0.000000    -1.657230    -0.941970     1.00 ...
             pattern = r'^\s*(\w+)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)(?:\s+([-+]?\d+\.?\d*))?'
-            matches = re.finditer(pattern, section_content, re.MULTILINE)
+            matches = PATTERNS.finditer(pattern, section_content, re.MULTILINE)
             
             for idx, match in enumerate(matches, start=1):
                 element = match.group(1).strip()
@@ -384,7 +661,7 @@ class BDFOutputParser:
         # 策略2: 如果没有找到 Cartcoord，尝试查找其他格式的几何结构
         if not geometry:
             # 查找 "Optimized geometry" 或 "Final geometry" 等关键词后的结构
-            optimized_section = re.search(
+            optimized_section = PATTERNS.search(
                 r'(?:Optimized|Final|Converged).*?geometry.*?(?=\n\n|\n\[|\n\|\||$)',
                 content,
                 re.IGNORECASE | re.DOTALL
@@ -394,7 +671,7 @@ class BDFOutputParser:
                 section_content = optimized_section.group(0)
                 # 匹配格式：原子符号后跟坐标（支持科学计数法）
                 geometry_pattern = r'(\w+)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)'
-                matches = re.finditer(geometry_pattern, section_content)
+                matches = PATTERNS.finditer(geometry_pattern, section_content)
                 for idx, match in enumerate(matches, start=1):
                     element = match.group(1)
                     # 跳过关键词行
@@ -416,7 +693,7 @@ class BDFOutputParser:
         # 策略3: 尝试从输入文件格式的几何结构部分提取
         if not geometry:
             # 查找 Geometry ... End geometry 块
-            geometry_block = re.search(
+            geometry_block = PATTERNS.search(
                 r'Geometry\s*\n(.*?)End\s+geometry',
                 content,
                 re.IGNORECASE | re.DOTALL
@@ -426,7 +703,7 @@ class BDFOutputParser:
                 block_content = geometry_block.group(1)
                 # 匹配格式：元素符号 X Y Z
                 pattern = r'(\w+)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)'
-                matches = re.finditer(pattern, block_content)
+                matches = PATTERNS.finditer(pattern, block_content)
                 for idx, match in enumerate(matches, start=1):
                     element = match.group(1)
                     if element.lower() in ['geometry', 'end']:
@@ -446,17 +723,34 @@ class BDFOutputParser:
         
         return geometry
     
-    def format_geometry_for_input(self, geometry: List[Dict[str, Any]], units: str = 'angstrom') -> str:
+    @staticmethod
+    def _coordinate_blocks(pattern: str, content: str, index: Optional[SectionIndex], marker: str) -> List[re.Match]:
+        """
+        坐标块的匹配（extract_geometry 只使用最后一个）
+        
+        未给出索引时返回全文的所有匹配；否则只在该坐标块最后一个标记处匹配一次。
+        """
+        flags = re.IGNORECASE | re.DOTALL
+        if index is None:
+            return list(PATTERNS.finditer(pattern, content, flags))
+        positions = index.positions.get(marker)
+        match = PATTERNS.match(pattern, content, flags, positions[-1]) if positions else None
+        return [match] if match else []
+    
+    def format_geometry_for_input(self, geometry: Union[List[Dict[str, Any]], Geometry], units: str = 'angstrom') -> str:
         """
         格式化几何结构为下一步计算的输入格式
         
         Args:
-            geometry: 几何结构列表（从 extract_geometry 获取）
+            geometry: 几何结构列表（从 extract_geometry 获取）或 Geometry 对象
             units: 输出单位，'angstrom' 或 'bohr'（默认 'angstrom'）
         
         Returns:
             格式化后的几何结构字符串，每行格式：元素符号 X Y Z（8位小数）
         """
+        if isinstance(geometry, Geometry):
+            # 数组存储的结构整体换算单位并一次格式化
+            return geometry.format(units)
         if not geometry:
             return ""
         
@@ -484,10 +778,14 @@ class BDFOutputParser:
         
         return "\n".join(lines)
     
-    def extract_frequencies(self, content: str) -> Dict[str, Any]:
+    def extract_frequencies(self, content: str, index: Optional[SectionIndex] = None) -> Dict[str, Any]:
         """
         提取频率（如果有）
         
+        Args:
+            content: BDF 输出内容
+            index: 段落索引（可选），给出时只搜索振动分析段落
+        
         Returns:
             包含振动频率和平动/转动频率的字典：
             {
@@ -498,13 +796,15 @@ class BDFOutputParser:
         """
         vibrations = []
         translations_rotations = []
+        spans = self._ranges(content, index, 'vibrations', merged=True)
         
         # BDF 格式：区分 "Results of vibrations:" 和 "Results of translations and rotations:"
         
         # 提取振动频率部分
-        vib_section_match = re.search(
+        vib_section_match = _search_spans(
             r'Results\s+of\s+vibrations:.*?(?=Results\s+of\s+translations|$)',
             content,
+            spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -512,11 +812,11 @@ class BDFOutputParser:
             vib_section = vib_section_match.group(0)
             # 在振动部分查找 "Frequencies" 行
             freq_line_pattern = r'^\s*Frequencies\s+([-+]?\d+\.\d+(?:\s+[-+]?\d+\.\d+)*)'
-            matches = re.finditer(freq_line_pattern, vib_section, re.IGNORECASE | re.MULTILINE)
+            matches = PATTERNS.finditer(freq_line_pattern, vib_section, re.IGNORECASE | re.MULTILINE)
             seen = set()
             for match in matches:
                 freq_line = match.group(1)
-                freq_values = re.findall(r'([-+]?\d+\.\d+)', freq_line)
+                freq_values = PATTERNS.findall(r'([-+]?\d+\.\d+)', freq_line)
                 for freq_str in freq_values:
                     try:
                         freq = float(freq_str)
@@ -527,9 +827,10 @@ class BDFOutputParser:
                         continue
         
         # 提取平动/转动频率部分
-        trans_rot_section_match = re.search(
+        trans_rot_section_match = _search_spans(
             r'Results\s+of\s+translations\s+and\s+rotations:.*?(?=\n\s*\*\*\*|Thermal\s+Contributions|\n\s*\[|$)',
             content,
+            spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -537,11 +838,11 @@ class BDFOutputParser:
             trans_rot_section = trans_rot_section_match.group(0)
             # 在平动/转动部分查找 "Frequencies" 行
             freq_line_pattern = r'^\s*Frequencies\s+([-+]?\d+\.\d+(?:\s+[-+]?\d+\.\d+)*)'
-            matches = re.finditer(freq_line_pattern, trans_rot_section, re.IGNORECASE | re.MULTILINE)
+            matches = PATTERNS.finditer(freq_line_pattern, trans_rot_section, re.IGNORECASE | re.MULTILINE)
             seen = set()
             for match in matches:
                 freq_line = match.group(1)
-                freq_values = re.findall(r'([-+]?\d+\.\d+)', freq_line)
+                freq_values = PATTERNS.findall(r'([-+]?\d+\.\d+)', freq_line)
                 for freq_str in freq_values:
                     try:
                         freq = float(freq_str)
@@ -554,12 +855,12 @@ class BDFOutputParser:
         # 如果没有找到明确的分区，尝试通用方法（向后兼容）
         if not vibrations and not translations_rotations:
             freq_line_pattern = r'^\s*Frequencies\s+([-+]?\d+\.\d+(?:\s+[-+]?\d+\.\d+)*)'
-            matches = re.finditer(freq_line_pattern, content, re.IGNORECASE | re.MULTILINE)
+            matches = _finditer_spans(freq_line_pattern, content, spans, re.IGNORECASE | re.MULTILINE)
             seen = set()
             all_freqs = []
             for match in matches:
                 freq_line = match.group(1)
-                freq_values = re.findall(r'([-+]?\d+\.\d+)', freq_line)
+                freq_values = PATTERNS.findall(r'([-+]?\d+\.\d+)', freq_line)
                 for freq_str in freq_values:
                     try:
                         freq = float(freq_str)
@@ -584,22 +885,26 @@ class BDFOutputParser:
             'all': all_frequencies  # 向后兼容
         }
 
-    def extract_tddft_calculations(self, content: str) -> List[Dict[str, Any]]:
+    def extract_tddft_calculations(self, content: str, index: Optional[SectionIndex] = None) -> List[Dict[str, Any]]:
         """
         提取 TDDFT 计算块（支持多次计算，例如不同 isf/ialda）
         返回列表，每个元素包含元数据和对应激发态表
+
+        给出段落索引时只在 TDDFT 段落中查找 "Spin change:"，最后一块到该段落结尾为止。
         """
         calculations: List[Dict[str, Any]] = []
 
-        # 通过出现的 "Spin change:" 分割，每段到下一次出现或文件结尾
-        spin_matches = list(re.finditer(r"Spin change\s*:", content, re.IGNORECASE))
+        # 通过出现的 "Spin change:" 分割，每段到下一次出现或 TDDFT 段落（无索引时为文件）结尾
+        spans = self._ranges(content, index, 'tddft', 'excited_table', merged=True)
+        spin_matches = list(_finditer_spans(r"Spin change\s*:", content, spans, re.IGNORECASE))
         for idx, match in enumerate(spin_matches):
             start = match.start()
-            end = spin_matches[idx + 1].start() if idx + 1 < len(spin_matches) else len(content)
+            end = spin_matches[idx + 1].start() if idx + 1 < len(spin_matches) else spans[-1][1]
             block = content[start:end]
-            meta_block = block[:5000]  # 仅取当前块开头用于元数据，避免跨越到下一次 TDDFT 配置
-            # 元数据检索范围：当前块开头，如缺失再向前回溯但不跨到后续块
-            meta_scope_before = content[max(0, start - 100000):start]
+            # 元数据检索范围（pos, endpos）：当前块开头 5000 字符，避免跨越到下一次 TDDFT 配置；
+            # 如缺失再向前回溯但不跨到后续块
+            meta_block = (start, min(start + 5000, end))
+            meta_scope_before = (max(0, start - TDDFT_META_LOOKBEHIND), start)
             isf = None
             ialda = None
             itda = None
@@ -607,9 +912,9 @@ class BDFOutputParser:
             tda = False
             approximation_method = None
 
-            isf_match = re.search(r'isf\s*=?\s*([+-]?\d+)', meta_block, re.IGNORECASE)
+            isf_match = PATTERNS.search(r'isf\s*=?\s*([+-]?\d+)', content, re.IGNORECASE, *meta_block)
             if not isf_match:
-                matches = list(re.finditer(r'isf\s*=?\s*([+-]?\d+)', meta_scope_before, re.IGNORECASE))
+                matches = list(PATTERNS.finditer(r'isf\s*=?\s*([+-]?\d+)', content, re.IGNORECASE, *meta_scope_before))
                 isf_match = matches[-1] if matches else None
             if isf_match:
                 try:
@@ -617,9 +922,9 @@ class BDFOutputParser:
                 except ValueError:
                     isf = None
 
-            ialda_match = re.search(r'ialda\s*=?\s*([+-]?\d+)', meta_block, re.IGNORECASE)
+            ialda_match = PATTERNS.search(r'ialda\s*=?\s*([+-]?\d+)', content, re.IGNORECASE, *meta_block)
             if not ialda_match:
-                matches = list(re.finditer(r'ialda\s*=?\s*([+-]?\d+)', meta_scope_before, re.IGNORECASE))
+                matches = list(PATTERNS.finditer(r'ialda\s*=?\s*([+-]?\d+)', content, re.IGNORECASE, *meta_scope_before))
                 ialda_match = matches[-1] if matches else None
             if ialda_match:
                 try:
@@ -628,9 +933,9 @@ class BDFOutputParser:
                     ialda = None
 
             # 解析 itda 参数（TDA 近似标志）
-            itda_match = re.search(r'itda\s*=?\s*(\d+)', meta_block, re.IGNORECASE)
+            itda_match = PATTERNS.search(r'itda\s*=?\s*(\d+)', content, re.IGNORECASE, *meta_block)
             if not itda_match:
-                matches = list(re.finditer(r'itda\s*=?\s*(\d+)', meta_scope_before, re.IGNORECASE))
+                matches = list(PATTERNS.finditer(r'itda\s*=?\s*(\d+)', content, re.IGNORECASE, *meta_scope_before))
                 itda_match = matches[-1] if matches else None
             if itda_match:
                 try:
@@ -638,9 +943,9 @@ class BDFOutputParser:
                 except ValueError:
                     itda = None
 
-            method_match = re.search(r'\[method\]\s*\n\s*([^\n]+)', meta_block, re.IGNORECASE)
+            method_match = PATTERNS.search(r'\[method\]\s*\n\s*([^\n]+)', content, re.IGNORECASE, *meta_block)
             if not method_match:
-                matches = list(re.finditer(r'\[method\]\s*\n\s*([^\n]+)', meta_scope_before, re.IGNORECASE))
+                matches = list(PATTERNS.finditer(r'\[method\]\s*\n\s*([^\n]+)', content, re.IGNORECASE, *meta_scope_before))
                 method_match = matches[-1] if matches else None
             if method_match:
                 method = method_match.group(1).strip()
@@ -662,10 +967,10 @@ class BDFOutputParser:
                 # 但实际使用的方法应该从 [method] 字段判断
                 if method:
                     # 检查 method 字段中是否明确标注了 RPA
-                    if re.search(r'\bRPA\b', method, re.IGNORECASE):
+                    if PATTERNS.search(r'\bRPA\b', method, re.IGNORECASE):
                         tda = False
                         approximation_method = "TDDFT (Time-Dependent Density Functional Theory)"
-                    elif re.search(r'\bTDA\b', method, re.IGNORECASE):
+                    elif PATTERNS.search(r'\bTDA\b', method, re.IGNORECASE):
                         tda = True
                         approximation_method = "TDA (Tamm–Dancoff Approximation)"
                     else:
@@ -680,7 +985,7 @@ class BDFOutputParser:
             
             # 提取 JK 算符内存信息
             # 格式：Estimated memory for JK operator: 0.141 M
-            jk_estimated_match = re.search(r'Estimated\s+memory\s+for\s+JK\s+operator:\s+([\d.]+)\s+M', meta_scope_before, re.IGNORECASE)
+            jk_estimated_match = PATTERNS.search(r'Estimated\s+memory\s+for\s+JK\s+operator:\s+([\d.]+)\s+M', content, re.IGNORECASE, *meta_scope_before)
             jk_estimated_memory = None
             if jk_estimated_match:
                 try:
@@ -689,7 +994,7 @@ class BDFOutputParser:
                     pass
             
             # 格式：Maximum memory to calculate JK operator: 512.000 M
-            jk_max_memory_match = re.search(r'Maximum\s+memory\s+to\s+calculate\s+JK\s+operator:\s+([\d.]+)\s+M', meta_scope_before, re.IGNORECASE)
+            jk_max_memory_match = PATTERNS.search(r'Maximum\s+memory\s+to\s+calculate\s+JK\s+operator:\s+([\d.]+)\s+M', content, re.IGNORECASE, *meta_scope_before)
             jk_max_memory = None
             if jk_max_memory_match:
                 try:
@@ -699,7 +1004,7 @@ class BDFOutputParser:
             
             # 提取每次可计算的根数
             # 格式：Allow to calculate 2 roots at one pass for RPA
-            rpa_roots_match = re.search(r'Allow\s+to\s+calculate\s+(\d+)\s+roots\s+at\s+one\s+pass\s+for\s+RPA', meta_scope_before, re.IGNORECASE)
+            rpa_roots_match = PATTERNS.search(r'Allow\s+to\s+calculate\s+(\d+)\s+roots\s+at\s+one\s+pass\s+for\s+RPA', content, re.IGNORECASE, *meta_scope_before)
             rpa_roots_per_pass = None
             if rpa_roots_match:
                 try:
@@ -708,7 +1013,7 @@ class BDFOutputParser:
                     pass
             
             # 格式：Allow to calculate 4 roots at one pass for TDA
-            tda_roots_match = re.search(r'Allow\s+to\s+calculate\s+(\d+)\s+roots\s+at\s+one\s+pass\s+for\s+TDA', meta_scope_before, re.IGNORECASE)
+            tda_roots_match = PATTERNS.search(r'Allow\s+to\s+calculate\s+(\d+)\s+roots\s+at\s+one\s+pass\s+for\s+TDA', content, re.IGNORECASE, *meta_scope_before)
             tda_roots_per_pass = None
             if tda_roots_match:
                 try:
@@ -718,7 +1023,7 @@ class BDFOutputParser:
             
             # 提取用户要求的根数（Nexit）
             # 格式：Nexit: 4 (每个不可约表示计算的根数)
-            nexit_match = re.search(r'Nexit:\s+(\d+)', meta_scope_before, re.IGNORECASE)
+            nexit_match = PATTERNS.search(r'Nexit:\s+(\d+)', content, re.IGNORECASE, *meta_scope_before)
             n_exit = None
             if nexit_match:
                 try:
@@ -750,30 +1055,32 @@ class BDFOutputParser:
 
         return calculations
 
-    def extract_excited_states(self, content: str) -> List[Dict[str, Any]]:
+    def extract_excited_states(self, content: str, index: Optional[SectionIndex] = None) -> List[Dict[str, Any]]:
         """
         提取激发态能量与振子强度（TDDFT汇总表）
 
         解析汇总表格式（在行
         "No. Pair   ExSym   ExEnergies     Wavelengths      f ..."
-        之后出现，空行分隔）
+        之后出现，空行分隔）；给出段落索引时只搜索激发态表段落
         """
         states: List[Dict[str, Any]] = []
 
-        header = re.search(
+        spans = self._ranges(content, index, 'excited_table', merged=True)
+        header = _search_spans(
             r"No\.\s+Pair\s+ExSym\s+ExEnergies\s+Wavelengths\s+f",
             content,
+            spans,
             re.IGNORECASE
         )
         if not header:
             return states
 
         # 从 header 位置开始，逐行解析直到遇到空行
-        lines = content[header.start():].splitlines()
+        lines = content[header.start():spans[-1][1]].splitlines()
         # 跳过 header 行和紧随其后的空行
         start_idx = 0
         for i, line in enumerate(lines):
-            if re.search(r"No\.\s+Pair\s+ExSym", line):
+            if PATTERNS.search(r"No\.\s+Pair\s+ExSym", line):
                 start_idx = i + 1
                 break
 
@@ -824,7 +1131,7 @@ class BDFOutputParser:
         lines = block.splitlines()
         start_idx = None
         for i, line in enumerate(lines):
-            if re.search(r"No\.\s+Pair\s+ExSym", line):
+            if PATTERNS.search(r"No\.\s+Pair\s+ExSym", line):
                 start_idx = i + 1
                 break
         if start_idx is None:
@@ -863,10 +1170,14 @@ class BDFOutputParser:
 
         return states
     
-    def extract_optimization_info(self, content: str) -> Dict[str, Any]:
+    def extract_optimization_info(self, content: str, index: Optional[SectionIndex] = None) -> Dict[str, Any]:
         """
         提取结构优化信息
         
+        Args:
+            content: BDF 输出内容
+            index: 段落索引（可选），给出时步骤边界取自 opt_step 标记，其余信息只在优化段落中搜索
+        
         Returns:
             包含优化信息的字典
         """
@@ -880,93 +1191,24 @@ class BDFOutputParser:
         }
         
         # 检查是否有优化计算
-        if not re.search(r'Geometry\s+Optimization|BDFOPT', content, re.IGNORECASE):
+        spans = self._ranges(content, index, *_OPTIMIZATION_SECTIONS, merged=True)
+        if not _search_spans(r'Geometry\s+Optimization|BDFOPT', content, spans, re.IGNORECASE):
             return opt_info
         
-        # 提取优化步骤
-        step_pattern = r'Geometry\s+Optimization\s+step\s*:\s*(\d+)'
-        steps = []
-        for match in re.finditer(step_pattern, content, re.IGNORECASE):
-            step_num = int(match.group(1))
-            
-            # 查找这一步的能量和梯度
-            step_start = match.end()
-            # 查找下一步或收敛检查
-            next_step_match = re.search(r'Geometry\s+Optimization\s+step\s*:\s*(\d+)', content[step_start:], re.IGNORECASE)
-            if next_step_match:
-                step_end = step_start + next_step_match.start()
-            else:
-                step_end = len(content)
-            
-            step_content = content[step_start:step_end]
-            
-            # 提取这一步的能量
-            energy_match = re.search(r'Energy\s*=\s*([-+]?\d+\.\d+)', step_content, re.IGNORECASE)
-            energy = None
-            if energy_match:
-                try:
-                    energy = float(energy_match.group(1))
-                except (ValueError, IndexError):
-                    pass
-            
-            # 提取梯度信息
-            gradient_match = re.search(r'Gradient=\s*\n((?:\s+\w+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s*\n?)+)', step_content, re.IGNORECASE | re.MULTILINE)
-            gradient = None
-            if gradient_match:
-                gradient_lines = gradient_match.group(1).strip().split('\n')
-                gradient = []
-                for line in gradient_lines:
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        try:
-                            gradient.append({
-                                'atom': parts[0],
-                                'x': float(parts[1]),
-                                'y': float(parts[2]),
-                                'z': float(parts[3]),
-                            })
-                        except (ValueError, IndexError):
-                            pass
-            
-            # 提取这一步的收敛信息：Force-RMS, Force-Max, Step-RMS, Step-Max
-            force_rms = None
-            force_max = None
-            step_rms = None
-            step_max = None
-            
-            # 查找 "Current values" 行
-            current_values_match = re.search(
-                r'Current\s+values\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
-                step_content,
-                re.IGNORECASE
-            )
-            if current_values_match:
-                try:
-                    force_rms = float(current_values_match.group(1))
-                    force_max = float(current_values_match.group(2))
-                    step_rms = float(current_values_match.group(3))
-                    step_max = float(current_values_match.group(4))
-                except (ValueError, IndexError):
-                    pass
-            
-            steps.append({
-                'step': step_num,
-                'energy': energy,
-                'scf_energy': None,  # 将从 *.out.tmp 文件中提取
-                'gradient': gradient,
-                'force_rms': force_rms,
-                'force_max': force_max,
-                'step_rms': step_rms,
-                'step_max': step_max,
-            })
+        # 提取优化步骤（步骤边界一次扫描得到，耗时与文件长度成线性）
+        steps = [
+            self._parse_optimization_step(step_num, content, pos, endpos)
+            for step_num, pos, endpos in self._iter_optimization_steps(content, index)
+        ]
         
         opt_info['steps'] = steps
         
         # 检查优化收敛消息（多种格式）
         # 格式1: "Good Job, Geometry Optimization converged in X iterations!"
-        good_job_match = re.search(
+        good_job_match = _search_spans(
             r'Good\s+Job[,\s]+Geometry\s+Optimization\s+converged\s+in\s+(\d+)\s+iterations?',
             content,
+            spans,
             re.IGNORECASE
         )
         if good_job_match:
@@ -977,9 +1219,10 @@ class BDFOutputParser:
                 pass
         
         # 格式2: "Total number of iterations: X"
-        total_iter_match = re.search(
+        total_iter_match = _search_spans(
             r'Total\s+number\s+of\s+iterations:\s*(\d+)',
             content,
+            spans,
             re.IGNORECASE
         )
         if total_iter_match and 'iterations' not in opt_info:
@@ -990,9 +1233,10 @@ class BDFOutputParser:
         
         # 提取收敛信息
         # 查找包含收敛检查的更大范围（包括前面的收敛标准）
-        converge_section = re.search(
+        converge_section = _search_spans(
             r'Conv\.\s+tolerance.*?Geom\.\s+converge\s*:.*?(?=\n\n|\n\w|\n\||$)',
             content,
+            spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -1000,11 +1244,11 @@ class BDFOutputParser:
             section = converge_section.group(0)
             
             # 检查是否收敛（如果还没检测到）
-            if not opt_info.get('converged') and re.search(r'Geom\.\s+converge\s*:.*?Yes', section, re.IGNORECASE):
+            if not opt_info.get('converged') and PATTERNS.search(r'Geom\.\s+converge\s*:.*?Yes', section, re.IGNORECASE):
                 opt_info['converged'] = True
             
             # 提取收敛标准
-            conv_tol_match = re.search(
+            conv_tol_match = PATTERNS.search(
                 r'Conv\.\s+tolerance\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
                 section,
                 re.IGNORECASE
@@ -1021,7 +1265,7 @@ class BDFOutputParser:
                     pass
             
             # 提取当前值
-            current_match = re.search(
+            current_match = PATTERNS.search(
                 r'Current\s+values\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
                 section,
                 re.IGNORECASE
@@ -1042,21 +1286,198 @@ class BDFOutputParser:
             opt_info['final_energy'] = steps[-1].get('energy')
         
         # 提取最终几何结构（如果有）
-        final_geom_match = re.search(
+        final_geom_match = _search_spans(
             r'Optimized\s+geometry|Final\s+geometry|Optimized\s+structure',
             content,
+            spans,
             re.IGNORECASE
         )
         if final_geom_match:
             # 尝试提取优化后的几何结构
-            opt_info['final_geometry'] = self.extract_geometry(content)
+            opt_info['final_geometry'] = self.extract_geometry(content, index)
         
         return opt_info
     
+    def _iter_optimization_steps(
+        self,
+        content: str,
+        index: Optional[SectionIndex] = None,
+    ) -> Iterator[Tuple[int, int, int]]:
+        """
+        按顺序返回每个优化步骤的 (步号, 该步起点, 该步终点)
+        
+        每步为当前标题之后到下一个标题之间的范围，不复制内容。给出段落索引时
+        直接在 opt_step 标记处匹配标题，最后一步到优化段落结尾为止；否则扫描一次全文，
+        最后一步到文件结尾为止。整体为线性时间（不对每一步重新搜索剩余全文）。
+        """
+        if index is None:
+            headers = list(PATTERNS.finditer(_OPT_STEP_HEADER, content, re.IGNORECASE))
+            end = len(content)
+        else:
+            headers = [
+                header for header in (
+                    PATTERNS.match(_OPT_STEP_HEADER, content, re.IGNORECASE, pos)
+                    for pos in index.positions['opt_step']
+                ) if header
+            ]
+            span = index.span(*_OPTIMIZATION_SECTIONS)
+            end = span[1] if span else len(content)
+        for i, header in enumerate(headers):
+            step_end = headers[i + 1].start() if i + 1 < len(headers) else max(end, header.end())
+            yield int(header.group(1)), header.end(), step_end
+    
+    def _parse_optimization_step(
+        self,
+        step_num: int,
+        content: str,
+        pos: int = 0,
+        endpos: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        解析单个优化步骤的能量、梯度和收敛信息
+        
+        Args:
+            step_num: 步号
+            content: BDF 输出内容（或单步内容）
+            pos: 该步起点（见 _iter_optimization_steps）
+            endpos: 该步终点，默认为内容结尾
+        
+        Returns:
+            步骤字典（extract_optimization_info()['steps'] 的元素）
+        """
+        # 提取这一步的能量
+        energy_match = PATTERNS.search(r'Energy\s*=\s*([-+]?\d+\.\d+)', content, re.IGNORECASE, pos, endpos)
+        energy = None
+        if energy_match:
+            try:
+                energy = float(energy_match.group(1))
+            except (ValueError, IndexError):
+                pass
+        
+        # 提取梯度信息（每行：原子 + 三个分量；行尾只吃掉换行符，避免吞掉下一行的缩进）
+        gradient_match = PATTERNS.search(
+            r'Gradient=[ \t]*\n((?:[ \t]+\w+[ \t]+[-+]?\d+\.\d+[ \t]+[-+]?\d+\.\d+[ \t]+[-+]?\d+\.\d+[ \t]*(?:\n|$))+)',
+            content,
+            re.IGNORECASE,
+            pos,
+            endpos,
+        )
+        gradient = None
+        if gradient_match:
+            gradient_lines = gradient_match.group(1).strip().split('\n')
+            gradient = []
+            for line in gradient_lines:
+                parts = line.split()
+                if len(parts) >= 4:
+                    try:
+                        gradient.append({
+                            'atom': parts[0],
+                            'x': float(parts[1]),
+                            'y': float(parts[2]),
+                            'z': float(parts[3]),
+                        })
+                    except (ValueError, IndexError):
+                        pass
+        
+        # 提取这一步的收敛信息：Force-RMS, Force-Max, Step-RMS, Step-Max
+        force_rms = None
+        force_max = None
+        step_rms = None
+        step_max = None
+        
+        # 查找 "Current values" 行
+        current_values_match = PATTERNS.search(
+            r'Current\s+values\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
+            content,
+            re.IGNORECASE,
+            pos,
+            endpos,
+        )
+        if current_values_match:
+            try:
+                force_rms = float(current_values_match.group(1))
+                force_max = float(current_values_match.group(2))
+                step_rms = float(current_values_match.group(3))
+                step_max = float(current_values_match.group(4))
+            except (ValueError, IndexError):
+                pass
+        
+        return {
+            'step': step_num,
+            'energy': energy,
+            'scf_energy': None,  # 将从 *.out.tmp 文件中提取
+            'gradient': gradient,
+            'force_rms': force_rms,
+            'force_max': force_max,
+            'step_rms': step_rms,
+            'step_max': step_max,
+        }
+    
+    def _parse_coordinate_rows(self, block: str) -> List[Tuple[str, float, float, float]]:
+        """解析坐标块中的 "元素 X Y Z ..." 行（跳过表头）"""
+        atoms = []
+        for match in PATTERNS.finditer(_COORD_ROW, block, re.MULTILINE):
+            element = match.group(1)
+            if element.upper() in _COORD_HEADER_WORDS:
+                continue
+            try:
+                atoms.append((element, float(match.group(2)), float(match.group(3)), float(match.group(4))))
+            except ValueError:
+                continue
+        return atoms
+    
+    def extract_optimization_trajectory(
+        self,
+        content: str,
+        index: Optional[SectionIndex] = None,
+    ) -> OptimizationTrajectory:
+        """
+        一次扫描提取完整的优化轨迹
+        
+        每一步的能量、Force-Max/RMS、Step-Max/RMS 以数组形式返回；
+        每一步内打印的 "Molecular Cartesian Coordinates (X,Y,Z) in Angstrom" 结构作为该步的帧，
+        第一步之前 compass 输出的 Cartcoord(Bohr) 结构作为第 0 步（初始结构）。
+        
+        Args:
+            content: BDF 输出内容
+            index: 段落索引（可选），见 _iter_optimization_steps
+        
+        Returns:
+            OptimizationTrajectory（需要 NumPy）
+        """
+        steps = []
+        frames = []
+        frame_steps = []
+        first_step = None
+        for step_num, pos, endpos in self._iter_optimization_steps(content, index):
+            if first_step is None:
+                first_step = pos
+            steps.append(self._parse_optimization_step(step_num, content, pos, endpos))
+            blocks = list(PATTERNS.finditer(_ANGSTROM_COORD_BLOCK, content, re.IGNORECASE | re.DOTALL, pos, endpos))
+            if blocks:
+                atoms = self._parse_coordinate_rows(blocks[-1].group(1))
+                if atoms:
+                    frames.append((atoms, 'angstrom'))
+                    frame_steps.append(step_num)
+        
+        if steps:
+            # 第一步标题之前的 Bohr 坐标块
+            prefix_end = PATTERNS.search(_OPT_STEP_HEADER, content, re.IGNORECASE, 0, first_step).start()
+            blocks = list(PATTERNS.finditer(_BOHR_COORD_BLOCK, content, re.IGNORECASE | re.DOTALL, 0, prefix_end))
+            if blocks:
+                atoms = self._parse_coordinate_rows(blocks[-1].group(0))
+                if atoms:
+                    frames.insert(0, (atoms, 'bohr'))
+                    frame_steps.insert(0, 0)
+        
+        return OptimizationTrajectory.from_steps(steps, frames, frame_steps)
+    
     def extract_scf_energies_from_tmp(self, tmp_file: str) -> List[float]:
         """
         从 *.out.tmp 文件中提取每一步优化步骤的 SCF 能量
         
+        逐行扫描文件，内存占用与文件大小无关。
+        
         Args:
             tmp_file: *.out.tmp 文件路径
         
@@ -1068,43 +1489,29 @@ class BDFOutputParser:
         if not tmp_path.exists():
             return scf_energies
         
-        with open(tmp_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        # 查找所有的 "E_tot = " 行，这些是每次优化步骤的最终 SCF 能量
+        # 每次 "Final scf result" 之后的第一个 E_tot 即为该优化步骤的最终 SCF 能量
         # 格式：E_tot =              -114.37036631
         # 注意：*.out.tmp 文件中可能包含多次 SCF 计算，每次优化步骤对应一次
-        # 我们需要找到每次 "Final scf result" 后的 E_tot
-        
-        # 方法1：查找 "Final scf result" 后的 E_tot
-        final_scf_pattern = r'Final\s+scf\s+result.*?E_tot\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)'
-        matches = re.finditer(final_scf_pattern, content, re.IGNORECASE | re.DOTALL)
-        for match in matches:
-            try:
-                energy = float(match.group(1))
-                scf_energies.append(energy)
-            except (ValueError, IndexError):
-                continue
-        
-        # 如果方法1没有找到，尝试方法2：直接查找所有 E_tot = 行
-        # 但需要过滤掉重复的（同一优化步骤可能有多次迭代）
-        if not scf_energies:
-            e_tot_pattern = r'E_tot\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)'
-            matches = list(re.finditer(e_tot_pattern, content, re.IGNORECASE))
-            # 只取每个 "Final scf result" 块后的第一个 E_tot
-            last_final_pos = -1
-            for match in matches:
-                # 检查这个 E_tot 是否在 "Final scf result" 之后
-                pos = match.start()
-                # 向前查找最近的 "Final scf result"
-                before_text = content[max(0, pos - 500):pos]
-                if re.search(r'Final\s+scf\s+result', before_text, re.IGNORECASE):
+        # （等价于对全文使用 Final scf result.*?E_tot 的非重叠匹配）
+        awaiting_e_tot = False
+        with open(tmp_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                pos = 0
+                while True:
+                    if not awaiting_e_tot:
+                        marker = _FINAL_SCF_MARKER.search(line, pos)
+                        if not marker:
+                            break
+                        awaiting_e_tot = True
+                        pos = marker.end()
+                    match = _E_TOT_VALUE.search(line, pos)
+                    if not match:
+                        break
+                    awaiting_e_tot = False
+                    pos = match.end()
                     try:
-                        energy = float(match.group(1))
-                        # 避免重复（如果能量值相同且位置接近，可能是同一优化步骤）
-                        if not scf_energies or abs(energy - scf_energies[-1]) > 1e-6:
-                            scf_energies.append(energy)
-                    except (ValueError, IndexError):
+                        scf_energies.append(float(match.group(1)))
+                    except ValueError:
                         continue
         
         return scf_energies
@@ -1113,6 +1520,8 @@ class BDFOutputParser:
         """
         从 *.out.tmp 文件中提取最后一次 SCF 计算的能量分解信息
         
+        逐行扫描文件，只保留当前 "Final scf result" 块中已匹配到的能量分量。
+        
         Args:
             tmp_file: *.out.tmp 文件路径
         
@@ -1123,24 +1532,6 @@ class BDFOutputParser:
         if not tmp_path.exists():
             return None
         
-        with open(tmp_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        # 查找最后一个 "Final scf result" 块
-        final_scf_blocks = list(re.finditer(
-            r'Final\s+scf\s+result(.*?)(?=Final\s+scf\s+result|\[Final|$)',
-            content,
-            re.IGNORECASE | re.DOTALL
-        ))
-        
-        if not final_scf_blocks:
-            return None
-        
-        # 取最后一个块
-        last_block = final_scf_blocks[-1].group(1)
-        
-        components = {}
-        
         # 提取各种能量分量
         energy_patterns = {
             'E_tot': r'E_tot\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
@@ -1154,39 +1545,69 @@ class BDFOutputParser:
             'E_xc': r'E_xc\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             'virial_ratio': r'Virial\s+Ratio\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
         }
+        compiled = {key: PATTERNS.get(pattern, re.IGNORECASE) for key, pattern in energy_patterns.items()}
         
-        for key, pattern in energy_patterns.items():
-            match = re.search(pattern, last_block, re.IGNORECASE)
-            if match:
-                try:
-                    components[key] = float(match.group(1))
-                except (ValueError, IndexError):
+        # 最后一个 "Final scf result" 块：到下一个 "Final scf result" 或 "[Final" 为止
+        components: Optional[Dict[str, float]] = None
+        seen: set = set()
+        in_block = False
+        with open(tmp_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                marker = None
+                for marker in _FINAL_SCF_MARKER.finditer(line):
+                    pass
+                if marker is not None:
+                    components, seen, in_block = {}, set(), True
+                    line = line[marker.end():]
+                if not in_block:
                     continue
+                stop = _FINAL_BLOCK_STOP.search(line)
+                if stop:
+                    line = line[:stop.start()]
+                    in_block = False
+                for key, pattern in compiled.items():
+                    if key in seen:
+                        continue
+                    match = pattern.search(line)
+                    if match:
+                        # 与块内 re.search 一致：只使用每个分量的第一个匹配
+                        seen.add(key)
+                        try:
+                            components[key] = float(match.group(1))
+                        except ValueError:
+                            continue
         
         return components if components else None
     
-    def extract_thermochemistry(self, content: str) -> Optional[Dict[str, Any]]:
+    def extract_thermochemistry(self, content: str, index: Optional[SectionIndex] = None) -> Optional[Dict[str, Any]]:
         """
         提取热力学数据
         
+        Args:
+            content: BDF 输出内容
+            index: 段落索引（可选），给出时只搜索热化学段落
+        
         Returns:
             包含热力学数据的字典，如果未找到则返回 None
         """
         thermochemistry = {}
+        spans = self._ranges(content, index, 'thermochemistry', merged=True)
         
         # 查找热力学部分
         # 更宽松的匹配模式，因为可能有不同的分隔符
-        thermo_section_match = re.search(
+        thermo_section_match = _search_spans(
             r'Thermal\s+Contributions\s+to\s+Energies.*?(?:Sum\s+of\s+electronic\s+and\s+thermal\s+Free\s+Energies.*?[-+]?\d+\.\d+).*?(?=\n\s*\*\*\*|$|\n\s*\[)',
             content,
+            spans,
             re.IGNORECASE | re.DOTALL
         )
         
         # 如果没找到，尝试更简单的模式
         if not thermo_section_match:
-            thermo_section_match = re.search(
+            thermo_section_match = _search_spans(
                 r'Zero-point\s+Energy.*?Sum\s+of\s+electronic.*?Free\s+Energies.*?[-+]?\d+\.\d+.*?(?=\n\s*===|$)',
                 content,
+                spans,
                 re.IGNORECASE | re.DOTALL
             )
         
@@ -1196,7 +1617,7 @@ class BDFOutputParser:
         thermo_section = thermo_section_match.group(0)
         
         # 提取温度
-        temp_match = re.search(r'Temperature\s*=\s*([-+]?\d+\.?\d*)\s*Kelvin', thermo_section, re.IGNORECASE)
+        temp_match = PATTERNS.search(r'Temperature\s*=\s*([-+]?\d+\.?\d*)\s*Kelvin', thermo_section, re.IGNORECASE)
         if temp_match:
             try:
                 thermochemistry['temperature'] = float(temp_match.group(1))
@@ -1204,7 +1625,7 @@ class BDFOutputParser:
                 pass
         
         # 提取压力
-        press_match = re.search(r'Pressure\s*=\s*([-+]?\d+\.?\d*)\s*Atm', thermo_section, re.IGNORECASE)
+        press_match = PATTERNS.search(r'Pressure\s*=\s*([-+]?\d+\.?\d*)\s*Atm', thermo_section, re.IGNORECASE)
         if press_match:
             try:
                 thermochemistry['pressure'] = float(press_match.group(1))
@@ -1212,7 +1633,7 @@ class BDFOutputParser:
                 pass
         
         # 提取零点能（ZPE）
-        zpe_match = re.search(
+        zpe_match = PATTERNS.search(
             r'Zero-point\s+Energy\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1227,7 +1648,7 @@ class BDFOutputParser:
                 pass
         
         # 提取热校正能
-        thermal_energy_match = re.search(
+        thermal_energy_match = PATTERNS.search(
             r'Thermal\s+correction\s+to\s+Energy\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1242,7 +1663,7 @@ class BDFOutputParser:
                 pass
         
         # 提取热校正焓
-        thermal_enthalpy_match = re.search(
+        thermal_enthalpy_match = PATTERNS.search(
             r'Thermal\s+correction\s+to\s+Enthalpy\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1257,7 +1678,7 @@ class BDFOutputParser:
                 pass
         
         # 提取热校正 Gibbs 自由能
-        thermal_gibbs_match = re.search(
+        thermal_gibbs_match = PATTERNS.search(
             r'Thermal\s+correction\s+to\s+Gibbs\s+Free\s+Energy\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1273,7 +1694,7 @@ class BDFOutputParser:
         
         # 提取组合能量（电子能 + 各种校正）
         # Sum of electronic and zero-point Energies
-        zpe_sum_match = re.search(
+        zpe_sum_match = PATTERNS.search(
             r'Sum\s+of\s+electronic\s+and\s+zero-point\s+Energies\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1285,7 +1706,7 @@ class BDFOutputParser:
                 pass
         
         # Sum of electronic and thermal Energies
-        thermal_sum_match = re.search(
+        thermal_sum_match = PATTERNS.search(
             r'Sum\s+of\s+electronic\s+and\s+thermal\s+Energies\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1297,7 +1718,7 @@ class BDFOutputParser:
                 pass
         
         # Sum of electronic and thermal Enthalpies
-        enthalpy_sum_match = re.search(
+        enthalpy_sum_match = PATTERNS.search(
             r'Sum\s+of\s+electronic\s+and\s+thermal\s+Enthalpies\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1309,7 +1730,7 @@ class BDFOutputParser:
                 pass
         
         # Sum of electronic and thermal Free Energies
-        gibbs_sum_match = re.search(
+        gibbs_sum_match = PATTERNS.search(
             r'Sum\s+of\s+electronic\s+and\s+thermal\s+Free\s+Energies\s*:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             thermo_section,
             re.IGNORECASE
@@ -1322,13 +1743,13 @@ class BDFOutputParser:
         
         return thermochemistry if thermochemistry else None
     
-    def extract_warnings(self, content: str) -> List[str]:
-        """提取警告信息"""
+    def extract_warnings(self, content: str, index: Optional[SectionIndex] = None) -> List[str]:
+        """提取警告信息（给出段落索引时只搜索警告/错误所在的行）"""
         warnings = []
         
         # 查找警告行
         warning_pattern = r'WARNING[:\s]+(.+)'
-        matches = re.finditer(warning_pattern, content, re.IGNORECASE)
+        matches = _finditer_spans(warning_pattern, content, self._ranges(content, index, 'messages'), re.IGNORECASE)
         
         for match in matches:
             warning = match.group(1).strip()
@@ -1337,9 +1758,10 @@ class BDFOutputParser:
         
         return warnings
     
-    def extract_errors(self, content: str) -> List[str]:
-        """提取错误信息"""
+    def extract_errors(self, content: str, index: Optional[SectionIndex] = None) -> List[str]:
+        """提取错误信息（给出段落索引时只搜索警告/错误所在的行）"""
         errors = []
+        spans = self._ranges(content, index, 'messages')
         
         # 查找错误行
         error_patterns = [
@@ -1349,7 +1771,7 @@ class BDFOutputParser:
         ]
         
         for pattern in error_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
+            matches = _finditer_spans(pattern, content, spans, re.IGNORECASE)
             for match in matches:
                 error = match.group(1).strip()
                 if error:
@@ -1357,7 +1779,7 @@ class BDFOutputParser:
         
         return errors
     
-    def extract_resp_gradient_info(self, content: str) -> Optional[Dict[str, Any]]:
+    def extract_resp_gradient_info(self, content: str, index: Optional[SectionIndex] = None) -> Optional[Dict[str, Any]]:
         """
         提取resp模块的激发态梯度计算信息
         
@@ -1370,6 +1792,7 @@ class BDFOutputParser:
         
         Args:
             content: BDF输出文件内容
+            index: 段落索引（可选），给出时只搜索 Root 标记所在的行
             
         Returns:
             包含激发态梯度信息的字典，如果未找到则返回None：
@@ -1381,14 +1804,15 @@ class BDFOutputParser:
             }
         """
         resp_info = {}
+        spans = self._ranges(content, index, 'resp_gradient')
         
         # 匹配 "<Now following: Root    N>" 格式
         pattern1 = r'<Now\s+following:\s*Root\s+(\d+)>'
-        matches1 = re.finditer(pattern1, content, re.IGNORECASE)
+        matches1 = _finditer_spans(pattern1, content, spans, re.IGNORECASE)
         
         # 匹配 "Root    N" 格式（独立行）
         pattern2 = r'^\s*Root\s+(\d+)\s*$'
-        matches2 = re.finditer(pattern2, content, re.MULTILINE | re.IGNORECASE)
+        matches2 = _finditer_spans(pattern2, content, spans, re.MULTILINE | re.IGNORECASE)
         
         # 收集所有根号
         root_numbers = []
@@ -1444,19 +1868,24 @@ class BDFOutputParser:
         
         return resp_info
     
-    def extract_properties(self, content: str) -> Dict[str, Any]:
+    def extract_properties(self, content: str, index: Optional[SectionIndex] = None) -> Dict[str, Any]:
         """
         提取额外性质
         
+        Args:
+            content: BDF 输出内容
+            index: 段落索引（可选），给出时每项性质只搜索其所在的段落
+        
         Returns:
             包含各种性质的字典
         """
         properties = {}
         
         # 提取能量分量（BDF 格式：Final scf result 部分）
-        scf_result_section = re.search(
+        scf_result_section = _search_spans(
             r'Final\s+scf\s+result.*?(?=\n\n|\n\[|\n\|\||$)',
             content,
+            self._ranges(content, index, 'final_scf'),
             re.IGNORECASE | re.DOTALL
         )
         
@@ -1476,7 +1905,7 @@ class BDFOutputParser:
             }
             
             for key, pattern in energy_components.items():
-                match = re.search(pattern, section, re.IGNORECASE)
+                match = PATTERNS.search(pattern, section, re.IGNORECASE)
                 if match:
                     try:
                         properties[key] = float(match.group(1))
@@ -1484,7 +1913,7 @@ class BDFOutputParser:
                         pass
             
             # 提取 Virial Ratio
-            virial_match = re.search(r'Virial\s+Ratio\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', section, re.IGNORECASE)
+            virial_match = PATTERNS.search(r'Virial\s+Ratio\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', section, re.IGNORECASE)
             if virial_match:
                 try:
                     properties['virial_ratio'] = float(virial_match.group(1))
@@ -1492,14 +1921,14 @@ class BDFOutputParser:
                     pass
         
         # 提取 SCF 收敛标准（THRENE 和 THRDEN）
-        threne_match = re.search(r'THRENE\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d+)', content, re.IGNORECASE)
+        threne_match = _search_spans(r'THRENE\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d+)', content, self._ranges(content, index, 'scf_input'), re.IGNORECASE)
         if threne_match:
             try:
                 properties['scf_conv_thresh_ene'] = float(threne_match.group(1))
             except (ValueError, IndexError):
                 pass
         
-        thrden_match = re.search(r'THRDEN\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d+)', content, re.IGNORECASE)
+        thrden_match = _search_spans(r'THRDEN\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d+)', content, self._ranges(content, index, 'scf_input'), re.IGNORECASE)
         if thrden_match:
             try:
                 properties['scf_conv_thresh_den'] = float(thrden_match.group(1))
@@ -1507,14 +1936,14 @@ class BDFOutputParser:
                 pass
         
         # 提取最终收敛值（Final DeltaE 和 Final DeltaD）
-        deltae_match = re.search(r'Final\s+DeltaE\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, re.IGNORECASE)
+        deltae_match = _search_spans(r'Final\s+DeltaE\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, self._ranges(content, index, 'convergence'), re.IGNORECASE)
         if deltae_match:
             try:
                 properties['final_deltae'] = float(deltae_match.group(1))
             except (ValueError, IndexError):
                 pass
         
-        deltad_match = re.search(r'Final\s+DeltaD\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, re.IGNORECASE)
+        deltad_match = _search_spans(r'Final\s+DeltaD\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', content, self._ranges(content, index, 'convergence'), re.IGNORECASE)
         if deltad_match:
             try:
                 properties['final_deltad'] = float(deltad_match.group(1))
@@ -1524,7 +1953,7 @@ class BDFOutputParser:
         # 提取 SCF 迭代次数
         # 格式：diis/vshift is closed at iter =   9
         # 注意：如果显示 iter = 9，实际SCF计算用了10次（iter 0到iter 9）
-        diis_close_match = re.search(r'diis/vshift\s+is\s+closed\s+at\s+iter\s*=\s*(\d+)', content, re.IGNORECASE)
+        diis_close_match = _search_spans(r'diis/vshift\s+is\s+closed\s+at\s+iter\s*=\s*(\d+)', content, self._ranges(content, index, 'scf_iterations'), re.IGNORECASE)
         if diis_close_match:
             try:
                 iter_when_closed = int(diis_close_match.group(1))
@@ -1535,9 +1964,11 @@ class BDFOutputParser:
                 pass
         
         # 提取溶剂效应信息
-        solvent_section = re.search(
+        solvent_spans = self._ranges(content, index, 'solvent', merged=True)
+        solvent_section = _search_spans(
             r'\*Initializing\s+informations\s+for\s+solvent\s+effect\.\.\..*?(?=\n\n|\n\[|\n\|\||Check\s+basis|\n\s*\[init_smh\]|$)',
             content,
+            solvent_spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -1546,17 +1977,17 @@ class BDFOutputParser:
             solvent_info = {}
             
             # 提取溶剂模型方法
-            method_match = re.search(r'Method:\s*(\w+)', section, re.IGNORECASE)
+            method_match = PATTERNS.search(r'Method:\s*(\w+)', section, re.IGNORECASE)
             if method_match:
                 solvent_info['method'] = method_match.group(1).strip()
             
             # 提取溶剂名称
-            solvent_match = re.search(r'Solvent:\s*(\w+)', section, re.IGNORECASE)
+            solvent_match = PATTERNS.search(r'Solvent:\s*(\w+)', section, re.IGNORECASE)
             if solvent_match:
                 solvent_info['solvent'] = solvent_match.group(1).strip()
             
             # 提取介电常数
-            dielectric_match = re.search(r'Dielectric\s+constant:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', section, re.IGNORECASE)
+            dielectric_match = PATTERNS.search(r'Dielectric\s+constant:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', section, re.IGNORECASE)
             if dielectric_match:
                 try:
                     solvent_info['dielectric_constant'] = float(dielectric_match.group(1))
@@ -1564,7 +1995,7 @@ class BDFOutputParser:
                     pass
             
             # 提取光学介电常数
-            optical_dielectric_match = re.search(r'Optical\s+dielectric\s+constant:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', section, re.IGNORECASE)
+            optical_dielectric_match = PATTERNS.search(r'Optical\s+dielectric\s+constant:\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)', section, re.IGNORECASE)
             if optical_dielectric_match:
                 try:
                     solvent_info['optical_dielectric_constant'] = float(optical_dielectric_match.group(1))
@@ -1572,22 +2003,22 @@ class BDFOutputParser:
                     pass
             
             # 提取镶嵌方法
-            tessellation_match = re.search(r'Method\s+of\s+tessellation:\s*(\w+)', section, re.IGNORECASE)
+            tessellation_match = PATTERNS.search(r'Method\s+of\s+tessellation:\s*(\w+)', section, re.IGNORECASE)
             if tessellation_match:
                 solvent_info['tessellation_method'] = tessellation_match.group(1).strip()
             
             # 提取半径类型
-            radius_type_match = re.search(r'Type\s+of\s+Radius:\s*([^\n]+)', section, re.IGNORECASE)
+            radius_type_match = PATTERNS.search(r'Type\s+of\s+Radius:\s*([^\n]+)', section, re.IGNORECASE)
             if radius_type_match:
                 solvent_info['radius_type'] = radius_type_match.group(1).strip()
             
             # 提取网格精度
-            mesh_accuracy_match = re.search(r'Accuracy\s+of\s+Mesh:\s*([^\n(]+)', section, re.IGNORECASE)
+            mesh_accuracy_match = PATTERNS.search(r'Accuracy\s+of\s+Mesh:\s*([^\n(]+)', section, re.IGNORECASE)
             if mesh_accuracy_match:
                 solvent_info['mesh_accuracy'] = mesh_accuracy_match.group(1).strip()
             
             # 提取镶嵌数量
-            tesseraes_match = re.search(r'Number\s+of\s+tesseraes:\s*(\d+)', section, re.IGNORECASE)
+            tesseraes_match = PATTERNS.search(r'Number\s+of\s+tesseraes:\s*(\d+)', section, re.IGNORECASE)
             if tesseraes_match:
                 try:
                     solvent_info['num_tesseraes'] = int(tesseraes_match.group(1))
@@ -1599,7 +2030,7 @@ class BDFOutputParser:
                 properties['solvent'] = solvent_info
         
         # 检查是否有隐式溶剂计算的提示（即使没有详细的溶剂信息部分）
-        if re.search(r'Implicit\s+solvent\s+calculation\s+used', content, re.IGNORECASE):
+        if _search_spans(r'Implicit\s+solvent\s+calculation\s+used', content, solvent_spans, re.IGNORECASE):
             if 'solvent' not in properties:
                 properties['solvent'] = {}
             properties['solvent']['implicit_solvent'] = True
@@ -1608,9 +2039,10 @@ class BDFOutputParser:
         # 格式: "solvent\nwater\nsolmodel\nsmd" 或类似格式
         if 'solvent' not in properties or not properties['solvent']:
             # 查找溶剂关键词附近的内容
-            solvent_simple_match = re.search(
+            solvent_simple_match = _search_spans(
                 r'solvent\s*\n\s*(\w+)',
                 content,
+                solvent_spans,
                 re.IGNORECASE | re.MULTILINE
             )
             if solvent_simple_match:
@@ -1618,9 +2050,10 @@ class BDFOutputParser:
                 properties['solvent']['solvent'] = solvent_simple_match.group(1).strip()
             
             # 查找溶剂模型
-            solmodel_match = re.search(
+            solmodel_match = _search_spans(
                 r'solmodel\s*\n\s*(\w+)',
                 content,
+                solvent_spans,
                 re.IGNORECASE | re.MULTILINE
             )
             if solmodel_match:
@@ -1640,15 +2073,14 @@ class BDFOutputParser:
         #  Equilibrium solvation free energy                  =   -0.1744 eV
         #  -------------------------------------------------------------------------------
         #  Excitation energy correction(cLR)                  =   -0.0377 eV
-        noneq_pattern = re.compile(
+        noneq_pattern = (
             r'\*State\s+(\d+)\s+->\s+(\d+)\s*\n'
             r'\s*Corrected\s+vertical\s+absorption\s+energy\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s*eV\s*\n'
             r'\s*Nonequilibrium\s+solvation\s+free\s+energy\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s*eV\s*\n'
             r'\s*Equilibrium\s+solvation\s+free\s+energy\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s*eV\s*\n'
-            r'(?:.*?\n)?\s*Excitation\s+energy\s+correction\(cLR\)\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s*eV',
-            re.IGNORECASE
+            r'(?:.*?\n)?\s*Excitation\s+energy\s+correction\(cLR\)\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s*eV'
         )
-        noneq_matches = list(noneq_pattern.finditer(content))
+        noneq_matches = list(_finditer_spans(noneq_pattern, content, solvent_spans, re.IGNORECASE))
         if noneq_matches:
             corrections = []
             seen = set()
@@ -1676,12 +2108,13 @@ class BDFOutputParser:
         
         # 如果未检测到 ptSS，但存在 solneqlr 关键字，标记为 cLR 线性响应
         if 'solvent_noneq_method' not in properties:
-            if re.search(r'\bsolneqlr\b', content, re.IGNORECASE):
+            if _search_spans(r'\bsolneqlr\b', content, solvent_spans, re.IGNORECASE):
                 properties['solvent_noneq_method'] = "clr_linear_response"
         
         # 提取 HOMO-LUMO gap
         # 格式：HOMO-LUMO gap:       0.13091934 au       3.56249790 eV
-        gap_match = re.search(r'HOMO-LUMO\s+gap:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, re.IGNORECASE)
+        orbital_spans = self._ranges(content, index, 'orbital_energies')
+        gap_match = _search_spans(r'HOMO-LUMO\s+gap:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, orbital_spans, re.IGNORECASE)
         if gap_match:
             try:
                 properties['homo_lumo_gap'] = {
@@ -1693,7 +2126,7 @@ class BDFOutputParser:
         
         # 提取 HOMO 和 LUMO 轨道能量（Alpha 和 Beta）
         # 格式：Alpha   HOMO energy:      -0.24291496 au      -6.61005529 eV  Irrep: B2
-        homo_alpha_match = re.search(r'Alpha\s+HOMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, re.IGNORECASE)
+        homo_alpha_match = _search_spans(r'Alpha\s+HOMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, orbital_spans, re.IGNORECASE)
         if homo_alpha_match:
             try:
                 properties['homo_alpha'] = {
@@ -1703,7 +2136,7 @@ class BDFOutputParser:
             except (ValueError, IndexError):
                 pass
         
-        lumo_alpha_match = re.search(r'Alpha\s+LUMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, re.IGNORECASE)
+        lumo_alpha_match = _search_spans(r'Alpha\s+LUMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, orbital_spans, re.IGNORECASE)
         if lumo_alpha_match:
             try:
                 properties['lumo_alpha'] = {
@@ -1713,7 +2146,7 @@ class BDFOutputParser:
             except (ValueError, IndexError):
                 pass
         
-        homo_beta_match = re.search(r'Beta\s+HOMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, re.IGNORECASE)
+        homo_beta_match = _search_spans(r'Beta\s+HOMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, orbital_spans, re.IGNORECASE)
         if homo_beta_match:
             try:
                 properties['homo_beta'] = {
@@ -1723,7 +2156,7 @@ class BDFOutputParser:
             except (ValueError, IndexError):
                 pass
         
-        lumo_beta_match = re.search(r'Beta\s+LUMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, re.IGNORECASE)
+        lumo_beta_match = _search_spans(r'Beta\s+LUMO\s+energy:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+au\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+eV', content, orbital_spans, re.IGNORECASE)
         if lumo_beta_match:
             try:
                 properties['lumo_beta'] = {
@@ -1734,9 +2167,11 @@ class BDFOutputParser:
                 pass
         
         # 提取偶极矩（BDF 格式）
-        dipole_section = re.search(
+        population_spans = self._ranges(content, index, 'population', merged=True)
+        dipole_section = _search_spans(
             r'\[Dipole\s+moment:.*?Totl:\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)\s+([-+]?\d+\.?\d*[Ee]?[-+]?\d*)',
             content,
+            population_spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -1753,9 +2188,10 @@ class BDFOutputParser:
                 pass
         
         # 提取 Mulliken 布居分析
-        mulliken_section = re.search(
+        mulliken_section = _search_spans(
             r'\[Mulliken\s+Population\s+Analysis\].*?(?=\n\s*\[|\n\n|\n\|\||$)',
             content,
+            population_spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -1766,7 +2202,7 @@ class BDFOutputParser:
             spin_densities = {}
             # 匹配格式：    1C      -0.1309    2.0149
             charge_pattern = r'^\s*(\d+\w+)\s+([-+]?\d+\.\d+)\s+([-+]?\d+\.\d+)\s*$'
-            matches = re.finditer(charge_pattern, section, re.MULTILINE)
+            matches = PATTERNS.finditer(charge_pattern, section, re.MULTILINE)
             for match in matches:
                 atom_label = match.group(1)
                 charge = float(match.group(2))
@@ -1779,9 +2215,10 @@ class BDFOutputParser:
                 properties['mulliken_spin_densities'] = spin_densities
         
         # 提取 Lowdin 布居分析
-        lowdin_section = re.search(
+        lowdin_section = _search_spans(
             r'\[Lowdin\s+Population\s+Analysis\].*?(?=\n\s*\[|\n\n|\n\|\||$)',
             content,
+            population_spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -1791,7 +2228,7 @@ class BDFOutputParser:
             charges = {}
             spin_densities = {}
             charge_pattern = r'^\s*(\d+\w+)\s+([-+]?\d+\.\d+)\s+([-+]?\d+\.\d+)\s*$'
-            matches = re.finditer(charge_pattern, section, re.MULTILINE)
+            matches = PATTERNS.finditer(charge_pattern, section, re.MULTILINE)
             for match in matches:
                 atom_label = match.group(1)
                 charge = float(match.group(2))
@@ -1805,7 +2242,7 @@ class BDFOutputParser:
         
         return properties
     
-    def extract_scf_method(self, content: str) -> Optional[Dict[str, Any]]:
+    def extract_scf_method(self, content: str, index: Optional[SectionIndex] = None) -> Optional[Dict[str, Any]]:
         """
         提取SCF计算方法类型
         
@@ -1821,6 +2258,7 @@ class BDFOutputParser:
         
         Args:
             content: BDF输出文件内容
+            index: 段落索引（可选），给出时只搜索 $SCF 输入回显与方法名所在的行
             
         Returns:
             包含SCF方法信息的字典，如果未找到则返回None：
@@ -1855,9 +2293,11 @@ class BDFOutputParser:
         found_method = None
         # 优先从输入文件回显部分查找（更准确）
         # 查找 $SCF ... $end 之间的方法标识
-        scf_input_match = re.search(
+        scf_input_spans = self._ranges(content, index, 'scf_input', 'scf_method')
+        scf_input_match = _search_spans(
             r'\$SCF[^\$]*?(?=\$|\n\n|\n\|\||$)',
             content,
+            scf_input_spans,
             re.IGNORECASE | re.DOTALL
         )
         
@@ -1865,7 +2305,7 @@ class BDFOutputParser:
             scf_input_section = scf_input_match.group(0)
             # 在SCF输入部分查找方法标识（通常在$SCF和$end之间）
             for pattern, method_name in method_patterns:
-                if re.search(pattern, scf_input_section, re.IGNORECASE):
+                if PATTERNS.search(pattern, scf_input_section, re.IGNORECASE):
                     found_method = method_name
                     break
         
@@ -1873,15 +2313,16 @@ class BDFOutputParser:
         if not found_method:
             for pattern, method_name in method_patterns:
                 # 在SCF相关部分查找
-                scf_section_match = re.search(
+                scf_section_match = _search_spans(
                     r'\$SCF.*?(?=\$|\n\n|\n\|\||$)',
                     content,
+                    scf_input_spans,
                     re.IGNORECASE | re.DOTALL
                 )
                 
                 if scf_section_match:
                     scf_section = scf_section_match.group(0)
-                    if re.search(pattern, scf_section, re.IGNORECASE):
+                    if PATTERNS.search(pattern, scf_section, re.IGNORECASE):
                         found_method = method_name
                         break
         
@@ -1890,7 +2331,7 @@ class BDFOutputParser:
             for pattern, method_name in method_patterns:
                 # 查找方法名称，但排除一些误匹配（如变量名）
                 # 确保是独立的方法标识
-                match = re.search(rf'\b{method_name}\b', content, re.IGNORECASE)
+                match = _search_spans(rf'\b{method_name}\b', content, self._ranges(content, index, 'scf_method'), re.IGNORECASE)
                 if match:
                     # 检查上下文，确保是SCF方法而不是其他
                     start = max(0, match.start() - 50)
@@ -1915,7 +2356,7 @@ class BDFOutputParser:
         
         return None
     
-    def extract_symmetry_info(self, content: str) -> Optional[Dict[str, Any]]:
+    def extract_symmetry_info(self, content: str, index: Optional[SectionIndex] = None) -> Optional[Dict[str, Any]]:
         """
         提取对称群信息
         
@@ -1928,6 +2369,7 @@ class BDFOutputParser:
         
         Args:
             content: BDF输出文件内容
+            index: 段落索引（可选），给出时只搜索 compass 对称性信息所在的行
             
         Returns:
             包含对称群信息的字典，如果未找到则返回None：
@@ -1942,10 +2384,11 @@ class BDFOutputParser:
             }
         """
         symmetry_info = {}
+        spans = self._ranges(content, index, 'compass')
         
         # 提取 gsym 和 noper
         # 格式：gsym: D06H, noper=   24
-        gsym_match = re.search(r'gsym:\s*([^\s,]+)', content, re.IGNORECASE)
+        gsym_match = _search_spans(r'gsym:\s*([^\s,]+)', content, spans, re.IGNORECASE)
         if gsym_match:
             # 将格式从 D06H 转换为 D(6H)
             gsym_raw = gsym_match.group(1).strip()
@@ -1955,7 +2398,7 @@ class BDFOutputParser:
             symmetry_info['detected_group_raw'] = gsym_raw
             symmetry_info['detected_group'] = gsym_normalized
         
-        noper_match = re.search(r'noper\s*=\s*(\d+)', content, re.IGNORECASE)
+        noper_match = _search_spans(r'noper\s*=\s*(\d+)', content, spans, re.IGNORECASE)
         if noper_match:
             try:
                 symmetry_info['noper'] = int(noper_match.group(1))
@@ -1964,14 +2407,14 @@ class BDFOutputParser:
         
         # 提取 Point group name（BDF自动判断的对称群）
         # 格式：Point group name D(6H)   
-        point_group_match = re.search(r'Point\s+group\s+name\s+([^\s]+)', content, re.IGNORECASE)
+        point_group_match = _search_spans(r'Point\s+group\s+name\s+([^\s]+)', content, spans, re.IGNORECASE)
         if point_group_match:
             point_group = point_group_match.group(1).strip()
             symmetry_info['detected_group'] = point_group
         
         # 提取 User set point group（用户设定的对称群）
         # 格式：User set point group as D(6H)   
-        user_group_match = re.search(r'User\s+set\s+point\s+group\s+as\s+([^\s]+)', content, re.IGNORECASE)
+        user_group_match = _search_spans(r'User\s+set\s+point\s+group\s+as\s+([^\s]+)', content, spans, re.IGNORECASE)
         if user_group_match:
             user_group = user_group_match.group(1).strip()
             symmetry_info['user_set_group'] = user_group
@@ -1986,7 +2429,7 @@ class BDFOutputParser:
         
         # 提取 Largest Abelian Subgroup（最大阿贝尔子群）
         # 格式：Largest Abelian Subgroup D(2H)                       8
-        abelian_match = re.search(r'Largest\s+Abelian\s+Subgroup\s+([^\s]+)\s+(\d+)', content, re.IGNORECASE)
+        abelian_match = _search_spans(r'Largest\s+Abelian\s+Subgroup\s+([^\s]+)\s+(\d+)', content, spans, re.IGNORECASE)
         if abelian_match:
             abelian_group = abelian_match.group(1).strip()
             abelian_noper = abelian_match.group(2).strip()
@@ -1998,13 +2441,13 @@ class BDFOutputParser:
         
         # 提取 Symmetry check 结果
         # 格式：Symmetry check OK
-        symmetry_check_match = re.search(r'Symmetry\s+check\s+(\w+)', content, re.IGNORECASE)
+        symmetry_check_match = _search_spans(r'Symmetry\s+check\s+(\w+)', content, spans, re.IGNORECASE)
         if symmetry_check_match:
             symmetry_info['symmetry_check'] = symmetry_check_match.group(1).strip()
         
         return symmetry_info if symmetry_info else None
     
-    def extract_irrep_info(self, content: str) -> Optional[Dict[str, Any]]:
+    def extract_irrep_info(self, content: str, index: Optional[SectionIndex] = None) -> Optional[Dict[str, Any]]:
         """
         提取不可约表示（Irrep）和分子轨道信息
         
@@ -2016,6 +2459,7 @@ class BDFOutputParser:
         
         Args:
             content: BDF输出文件内容
+            index: 段落索引（可选），给出时只搜索 compass 中的基函数与不可约表示段落
             
         Returns:
             包含不可约表示信息的字典，如果未找到则返回None：
@@ -2033,13 +2477,17 @@ class BDFOutputParser:
             }
         """
         irrep_info = {}
+        spans = self._ranges(content, index, 'irreps', merged=True)
+        if not spans:
+            return None
         
         # 提取总基函数数目
         # 格式：Total number of basis functions:     114     114
         # 注意：可能有两个数字，第一个是alpha，第二个是beta（对于开壳层）
-        total_basis_match = re.search(
+        total_basis_match = _search_spans(
             r'Total\s+number\s+of\s+basis\s+functions:\s+(\d+)(?:\s+(\d+))?',
             content,
+            spans,
             re.IGNORECASE
         )
         if total_basis_match:
@@ -2054,9 +2502,10 @@ class BDFOutputParser:
         
         # 提取不可约表示数目
         # 格式：Number of irreps:   8
-        num_irreps_match = re.search(
+        num_irreps_match = _search_spans(
             r'Number\s+of\s+irreps:\s*(\d+)',
             content,
+            spans,
             re.IGNORECASE
         )
         if num_irreps_match:
@@ -2071,20 +2520,21 @@ class BDFOutputParser:
         #   Irrep :   Ag        B1g       B2g       B3g       Au        B1u       B2u       B3u
         #   Norb  :     24        18         9         6         6         9        18        24
         
-        lines = content.split('\n')
+        pos, endpos = spans[0]
+        lines = content[pos:endpos].split('\n')
         irreps = []
         
         # 查找包含这三行的区域
         for i, line in enumerate(lines):
             # 查找 "Irrep :" 行（包含所有不可约表示标记）
-            irrep_line_match = re.search(r'Irrep\s*:\s*(.+)', line, re.IGNORECASE)
+            irrep_line_match = PATTERNS.search(r'Irrep\s*:\s*(.+)', line, re.IGNORECASE)
             if irrep_line_match:
                 # 提取这一行中的所有不可约表示标记
                 irrep_line = irrep_line_match.group(1).strip()
                 # 不可约表示标记通常格式：字母+可选数字+可选字母（如 Ag, B1g, B2g, B3g, Au, B1u, B2u, B3u）
                 # 使用正则表达式提取所有不可约表示标记
                 irrep_pattern = r'\b([A-Z][0-9]?[a-z]?[0-9]?[a-z]?)\b'
-                irrep_labels = re.findall(irrep_pattern, irrep_line)
+                irrep_labels = PATTERNS.findall(irrep_pattern, irrep_line)
                 # 过滤：只保留看起来像不可约表示标记的（长度通常1-5个字符，排除常见英文单词）
                 irrep_labels = [irrep for irrep in irrep_labels 
                                if 1 <= len(irrep) <= 5 
@@ -2093,11 +2543,11 @@ class BDFOutputParser:
                 # 查找下一行的 "Norb :" 行（包含所有轨道数）
                 if i + 1 < len(lines):
                     norb_line = lines[i + 1]
-                    norb_line_match = re.search(r'Norb\s*:\s*(.+)', norb_line, re.IGNORECASE)
+                    norb_line_match = PATTERNS.search(r'Norb\s*:\s*(.+)', norb_line, re.IGNORECASE)
                     if norb_line_match:
                         norb_line_content = norb_line_match.group(1).strip()
                         # 提取所有数字（轨道数）
-                        norb_values = re.findall(r'(\d+)', norb_line_content)
+                        norb_values = PATTERNS.findall(r'(\d+)', norb_line_content)
                         norb_values = [int(val) for val in norb_values]
                         
                         # 匹配不可约表示和轨道数
@@ -2117,12 +2567,12 @@ class BDFOutputParser:
             current_irrep = None
             for i, line in enumerate(lines):
                 # 匹配 "Irrep :     A" 格式
-                irrep_match = re.search(r'Irrep\s*:\s*([A-Z0-9]+)', line, re.IGNORECASE)
+                irrep_match = PATTERNS.search(r'Irrep\s*:\s*([A-Z0-9]+)', line, re.IGNORECASE)
                 if irrep_match:
                     current_irrep = irrep_match.group(1).strip()
                 
                 # 匹配 "Norb  :     22" 格式
-                norb_match = re.search(r'Norb\s*:\s*(\d+)', line, re.IGNORECASE)
+                norb_match = PATTERNS.search(r'Norb\s*:\s*(\d+)', line, re.IGNORECASE)
                 if norb_match and current_irrep:
                     try:
                         norb_value = int(norb_match.group(1))
@@ -2146,7 +2596,12 @@ class BDFOutputParser:
         
         return irrep_info if irrep_info else None
     
-    def extract_occupation_info(self, content: str, scf_method: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    def extract_occupation_info(
+        self,
+        content: str,
+        scf_method: Optional[Dict[str, Any]] = None,
+        index: Optional[SectionIndex] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         提取SCF计算分子轨道占据信息
         
@@ -2165,6 +2620,7 @@ class BDFOutputParser:
         Args:
             content: BDF输出文件内容
             scf_method: 已解析的SCF方法信息（可选），用于判断是否为限制性方法
+            index: 段落索引（可选），给出时只在占据数段落中查找 [Final occupation pattern: ]
             
         Returns:
             包含轨道占据信息的字典，如果未找到则返回None：
@@ -2182,27 +2638,28 @@ class BDFOutputParser:
         occupation_info = {}
         
         # 查找 [Final occupation pattern: ] 部分
-        pattern_section = re.search(
+        pattern_section = _search_spans(
             r'\[Final\s+occupation\s+pattern:\s*\]',
             content,
+            self._ranges(content, index, 'occupation'),
             re.IGNORECASE
         )
         
         if not pattern_section:
             return None
         
-        # 从pattern_section开始提取后续内容（限制在合理范围内，比如5000字符）
-        start_pos = pattern_section.end()
-        section_content = content[start_pos:start_pos + 5000]
+        # 从pattern_section开始搜索后续内容（限制在合理范围内，比如5000字符）
+        window = (pattern_section.end(), pattern_section.end() + 5000)
         
         # 提取不可约表示标记行
         # 格式：Irreps:        Ag      B1g     B2g     B3g     Au      B1u     B2u     B3u
         # 注意：不可约表示标记通常包含字母和数字，如 A, A1, B1g, E1u等
         # 需要匹配到下一行开始之前（通常是"detailed occupation"或"Alpha"行）
-        irrep_line_match = re.search(
+        irrep_line_match = PATTERNS.search(
             r'Irreps:\s+([A-Z0-9\s]+?)(?=\n\s*(?:detailed|Alpha|Beta|\n))',
-            section_content,
-            re.IGNORECASE | re.MULTILINE
+            content,
+            re.IGNORECASE | re.MULTILINE,
+            *window
         )
         
         irreps = []
@@ -2212,39 +2669,41 @@ class BDFOutputParser:
             # 不可约表示标记通常格式：字母+可选数字+可选字母（如 A, A1, B1g, E1u, A1G等）
             # 排除常见英文单词
             irrep_pattern = r'\b([A-Z][0-9]?[a-z]?[0-9]?[a-z]?)\b'
-            irrep_matches = re.findall(irrep_pattern, irrep_line)
+            irrep_matches = PATTERNS.findall(irrep_pattern, irrep_line)
             # 进一步过滤：只保留看起来像不可约表示标记的（长度通常1-5个字符）
             irreps = [irrep for irrep in irrep_matches if 1 <= len(irrep) <= 5 and not irrep.lower() in ['for', 'iden', 'irep']]
             occupation_info['irreps'] = irreps
         
         # 提取Alpha轨道占据数
         # 格式：Alpha       6.00    3.00    1.00    1.00    0.00    1.00    4.00    5.00
-        alpha_match = re.search(
+        alpha_match = PATTERNS.search(
             r'Alpha\s+([\d.\s]+)',
-            section_content,
-            re.IGNORECASE
+            content,
+            re.IGNORECASE,
+            *window
         )
         
         alpha_occupation = []
         if alpha_match:
             alpha_line = alpha_match.group(1)
             # 提取所有数字
-            alpha_values = re.findall(r'(\d+\.\d+)', alpha_line)
+            alpha_values = PATTERNS.findall(r'(\d+\.\d+)', alpha_line)
             alpha_occupation = [float(val) for val in alpha_values]
             occupation_info['alpha_occupation'] = alpha_occupation
         
         # 提取Beta轨道占据数（如果有）
         # 格式：Beta        6.00    3.00    1.00    1.00    0.00    1.00    4.00    5.00
-        beta_match = re.search(
+        beta_match = PATTERNS.search(
             r'Beta\s+([\d.\s]+)',
-            section_content,
-            re.IGNORECASE
+            content,
+            re.IGNORECASE,
+            *window
         )
         
         beta_occupation = []
         if beta_match:
             beta_line = beta_match.group(1)
-            beta_values = re.findall(r'(\d+\.\d+)', beta_line)
+            beta_values = PATTERNS.findall(r'(\d+\.\d+)', beta_line)
             beta_occupation = [float(val) for val in beta_values]
             occupation_info['beta_occupation'] = beta_occupation
         else:
@@ -2258,7 +2717,9 @@ class BDFOutputParser:
                 is_restricted = scf_method.get('is_restricted', False)
             else:
                 # 从content中查找SCF方法标识
-                scf_method_match = re.search(r'\b(RHF|RKS|ROHF|ROKS|UHF|UKS)\b', content, re.IGNORECASE)
+                scf_method_match = _search_spans(
+                    r'\b(RHF|RKS|ROHF|ROKS|UHF|UKS)\b', content, self._ranges(content, index, 'scf_method'), re.IGNORECASE
+                )
                 if scf_method_match:
                     method_name = scf_method_match.group(1).upper()
                     is_restricted = method_name in ['RHF', 'RKS', 'ROHF', 'ROKS']
@@ -2307,7 +2768,7 @@ class BDFOutputParser:
         
         return occupation_info if occupation_info else None
     
-    def extract_scf_state_symmetry(self, content: str) -> Optional[Dict[str, Any]]:
+    def extract_scf_state_symmetry(self, content: str, index: Optional[SectionIndex] = None) -> Optional[Dict[str, Any]]:
         """
         提取SCF State symmetry（SCF计算的Slater行列式对称性）
         
@@ -2319,6 +2780,7 @@ class BDFOutputParser:
         
         Args:
             content: BDF输出文件内容
+            index: 段落索引（可选），给出时只搜索 SCF State symmetry 所在的行
             
         Returns:
             包含SCF State symmetry信息的字典，如果未找到则返回None：
@@ -2332,7 +2794,7 @@ class BDFOutputParser:
         # 查找SCF State symmetry
         # 格式：SCF State symmetry : Ag
         pattern = r'SCF\s+State\s+symmetry\s*:\s*([A-Z0-9]+)'
-        match = re.search(pattern, content, re.IGNORECASE)
+        match = _search_spans(pattern, content, self._ranges(content, index, 'scf_state_symmetry'), re.IGNORECASE)
         
         if match:
             irrep = match.group(1).strip()
@@ -2359,7 +2821,7 @@ class BDFOutputParser:
         # 匹配模式：字母 + 数字 + 字母（如 D06H, C2V, D2H）
         # 或者：字母 + 数字（如 C2, D3）
         pattern = r'^([A-Za-z]+)(\d+)([A-Za-z]*)$'
-        match = re.match(pattern, group)
+        match = PATTERNS.match(pattern, group)
         
         if match:
             prefix = match.group(1)  # D, C, etc.
@@ -2400,7 +2862,7 @@ class BDFOutputParser:
             # 移除括号
             clean = group_str.replace('(', '').replace(')', '')
             # 提取字母前缀和数字
-            match = re.match(r'^([A-Za-z]+)(\d+)([A-Za-z]*)$', clean)
+            match = PATTERNS.match(r'^([A-Za-z]+)(\d+)([A-Za-z]*)$', clean)
             if match:
                 return {
                     'prefix': match.group(1),
@@ -0,0 +1,106 @@
+"""
+Compiled Regex Registry for BDF Output Parsing
+
+This module keeps every regular expression used by the output parser
+compiled once per process, independent of the size-limited cache of the
+``re`` module, and counts how often each pattern is used and how many
+matches it produced. Searches accept ``pos``/``endpos`` like the methods of
+compiled patterns, so callers can restrict them to a range of a large string
+without slicing it.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class PatternRegistry:
+    """
+    已编译正则表达式注册表
+
+    提供与 ``re.search`` / ``re.match`` / ``re.finditer`` / ``re.findall`` 相同签名的方法
+    （另加已编译正则的 pos/endpos 参数，只搜索 string[pos:endpos] 而不复制），
+    首次使用时编译并永久缓存，同时记录每个模式的调用次数和命中（匹配）次数。
+    """
+
+    def __init__(self):
+        # (pattern, flags) -> [compiled, calls, hits]
+        self._entries: Dict[Tuple[str, int], List[Any]] = {}
+        self.cache_enabled = True  # 关闭后每次都经由 re.compile（仅用于基准对比）
+
+    def _entry(self, pattern: str, flags: int) -> List[Any]:
+        key = (pattern, flags)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [re.compile(pattern, flags), 0, 0]
+        elif not self.cache_enabled:
+            entry[0] = re.compile(pattern, flags)
+        return entry
+
+    def get(self, pattern: str, flags: int = 0) -> re.Pattern:
+        """返回已编译的正则（不计入调用统计）"""
+        return self._entry(pattern, flags)[0]
+
+    def search(
+        self, pattern: str, string: str, flags: int = 0, pos: int = 0, endpos: Optional[int] = None
+    ) -> Optional[re.Match]:
+        entry = self._entry(pattern, flags)
+        entry[1] += 1
+        match = entry[0].search(string, pos, len(string) if endpos is None else endpos)
+        if match:
+            entry[2] += 1
+        return match
+
+    def match(
+        self, pattern: str, string: str, flags: int = 0, pos: int = 0, endpos: Optional[int] = None
+    ) -> Optional[re.Match]:
+        entry = self._entry(pattern, flags)
+        entry[1] += 1
+        match = entry[0].match(string, pos, len(string) if endpos is None else endpos)
+        if match:
+            entry[2] += 1
+        return match
+
+    def findall(
+        self, pattern: str, string: str, flags: int = 0, pos: int = 0, endpos: Optional[int] = None
+    ) -> List[Any]:
+        entry = self._entry(pattern, flags)
+        entry[1] += 1
+        found = entry[0].findall(string, pos, len(string) if endpos is None else endpos)
+        entry[2] += len(found)
+        return found
+
+    def finditer(
+        self, pattern: str, string: str, flags: int = 0, pos: int = 0, endpos: Optional[int] = None
+    ) -> Iterator[re.Match]:
+        entry = self._entry(pattern, flags)
+        entry[1] += 1
+        for match in entry[0].finditer(string, pos, len(string) if endpos is None else endpos):
+            entry[2] += 1
+            yield match
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        返回各模式的使用统计，按调用次数降序排列
+
+        Returns:
+            [{'pattern': str, 'flags': int, 'calls': int, 'hits': int}, ...]
+        """
+        rows = [
+            {'pattern': pattern, 'flags': flags, 'calls': entry[1], 'hits': entry[2]}
+            for (pattern, flags), entry in self._entries.items()
+            if entry[1]
+        ]
+        rows.sort(key=lambda row: row['calls'], reverse=True)
+        return rows
+
+    def reset_stats(self) -> None:
+        """清空调用与命中计数（保留已编译的模式）"""
+        for entry in self._entries.values():
+            entry[1] = entry[2] = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 输出解析器共享的全局注册表
+PATTERNS = PatternRegistry()
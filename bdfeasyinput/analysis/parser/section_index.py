@@ -0,0 +1,278 @@
+"""
+BDF Output Section Index
+
+This module provides a single-pass scanner that locates the section markers
+of a BDF output file (COMPASS, SCF iterations, Final scf result, geometry
+optimization steps, TDDFT blocks, vibrations, thermochemistry, irreps,
+warnings ...). Each section is reported as bounded [start, end) character
+ranges that end where the next section begins, so that the extractors of
+BDFOutputParser search only their own ranges of the content (with
+``pattern.search(content, pos, endpos)``, without copying it) instead of
+re-scanning the whole log. The scan itself runs once over a lowercased copy
+of the content, which is released as soon as the index is built.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# 各段落的标记。每个标记必须与对应提取器中正则的前缀一致（或更宽松），
+# 这样提取器的每个匹配都从某个标记所在行开始，只搜索该段落的范围即可得到与全文搜索相同的结果。
+# 标记在转为小写的内容上匹配，因此一律写成小写；每个标记都以普通字符开头（不以 \b、分组或
+# 字符类开头），这样合并后的正则可以先按首字符跳过不可能匹配的位置。
+# 注意：同一位置可能匹配多个标记时，排在前面的优先（如 opt_step 先于 optimization）。
+SECTION_MARKERS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('compass', (
+        r'gsym:',
+        r'noper\s*=',
+        r'point\s+group\s+name',
+        r'user\s+set\s+point\s+group\s+as',
+        r'largest\s+abelian\s+subgroup',
+        r'symmetry\s+check',
+    )),
+    ('irreps', (
+        r'total\s+number\s+of\s+basis\s+functions:',
+        r'number\s+of\s+irreps:',
+        r'irrep\s*:',
+    )),
+    ('scf_state_symmetry', (
+        r'scf\s+state\s+symmetry',
+    )),
+    ('scf_input', (
+        r'\$scf',
+        r'threne\s*=',
+        r'thrden\s*=',
+    )),
+    ('scf_method', (
+        r'rhf\b(?<!\wrhf)',
+        r'uhf\b(?<!\wuhf)',
+        r'rohf\b(?<!\wrohf)',
+        r'rks\b(?<!\wrks)',
+        r'uks\b(?<!\wuks)',
+        r'roks\b(?<!\wroks)',
+    )),
+    ('scf_iterations', (
+        r'scf\s+energy',
+        r'e\(scf\)\s*=',
+        r'diis/vshift\s+is\s+closed',
+    )),
+    ('final_scf', (
+        r'final\s+scf\s+result',
+        r'e_tot\s*=',
+        r'total\s+(?:scf\s+)?energy\s*[:=]',
+        r'final\s+energy\s*[:=]',
+    )),
+    ('convergence', (
+        r'bdf\s+normal\s+termination',
+        r'scf\s+converged',
+        r'converged',
+        r'convergence\s+achieved',
+        r'final\s+delta[ed]',
+    )),
+    ('orbital_energies', (
+        r'homo-lumo\s+gap:',
+        r'alpha\s+(?:homo|lumo)\s+energy:',
+        r'beta\s+(?:homo|lumo)\s+energy:',
+    )),
+    ('population', (
+        r'\[(?:mulliken|lowdin)\s+population\s+analysis\]',
+        r'\[dipole\s+moment:',
+    )),
+    ('solvent', (
+        r'\*initializing\s+informations\s+for\s+solvent\s+effect',
+        r'implicit\s+solvent\s+calculation\s+used',
+        r'solvent\s*\n',
+        r'solmodel\s*\n',
+        r'solneqlr\b(?<!\wsolneqlr)',
+        r'\*state\s+\d+\s+->',
+    )),
+    ('occupation', (
+        r'\[final\s+occupation\s+pattern:\s*\]',
+    )),
+    ('opt_step', (
+        r'geometry\s+optimization\s+step\s*:',
+    )),
+    ('optimization', (
+        r'geometry\s+optimization',
+        r'bdfopt',
+    )),
+    ('opt_geometry', (
+        r'molecular\s+cartesian\s+coordinates\s+\(x,y,z\)\s+in\s+angstrom',
+    )),
+    ('cartcoord', (
+        r'atom\s+cartcoord\(bohr\)',
+    )),
+    ('tddft', (
+        r'spin change\s*:',
+    )),
+    ('excited_table', (
+        r'no\.\s+pair\s+exsym',
+    )),
+    ('vibrations', (
+        r'results\s+of\s+vibrations:',
+        r'results\s+of\s+translations\s+and\s+rotations:',
+        r'frequencies',
+    )),
+    ('thermochemistry', (
+        r'thermal\s+contributions\s+to\s+energies',
+        r'zero-point\s+energy',
+    )),
+    ('resp_gradient', (
+        r'root\s+\d+',
+    )),
+    ('messages', (
+        r'warning',
+        r'error',
+        r'fatal',
+        r'abort',
+    )),
+)
+
+
+def _build_scanner() -> Tuple[str, Tuple[Optional[str], ...]]:
+    """
+    将所有段落标记合并为一个正则，一次扫描即可定位全部段落
+
+    每个标记后跟一个空分组，match.lastindex 即该分组的编号。各分支直接以普通字符开头
+    （不包在命名分组里），re 会据此按首字符跳过不可能匹配的位置，比逐个标记、
+    或整体 IGNORECASE 的扫描快一个数量级。
+
+    Returns:
+        (正则源码, 分组编号 -> 段落名称)
+    """
+    alternatives = []
+    names: List[Optional[str]] = [None]
+    for name, patterns in SECTION_MARKERS:
+        for pattern in patterns:
+            alternatives.append(f'(?:{pattern})()')
+            names.append(name)
+    return '|'.join(alternatives), tuple(names)
+
+
+_SCANNER_SOURCE, _SCANNER_GROUPS = _build_scanner()
+_SCANNER = re.compile(_SCANNER_SOURCE)
+# 小写后长度改变的内容（少数非 ASCII 字符）无法按位置对应，改用忽略大小写的扫描
+_SCANNER_IGNORECASE = re.compile(_SCANNER_SOURCE, re.IGNORECASE)
+
+
+class SectionIndex:
+    """
+    BDF 输出文件段落索引
+
+    通过一次扫描记录每个段落标记出现的所有位置。一个段落由连续的同名标记组成：
+    从第一个标记所在行的行首开始，到其后第一个位于新行上的其他段落标记的行首结束
+    （或文件末尾）。提取器在这些有界范围内用 ``pattern.search(content, pos, endpos)``
+    搜索，不复制内容；范围从行首开始，以 ``^`` 锚定的多行正则与全文搜索一致。
+    """
+
+    def __init__(self, positions: Optional[Dict[str, List[int]]] = None, length: int = 0):
+        """
+        Args:
+            positions: 段落名称 -> 标记起始位置列表（按出现顺序）
+            length: 内容长度（最后一个段落的结束位置）
+        """
+        self.positions: Dict[str, List[int]] = {
+            name: [] for name, _ in SECTION_MARKERS
+        }
+        if positions:
+            for name, offsets in positions.items():
+                self.positions.setdefault(name, []).extend(offsets)
+        self.length = length
+        # 按出现顺序排列的 (标记所在行的行首, 段落名称)
+        self.markers: List[Tuple[int, str]] = sorted(
+            (offset, name) for name, offsets in self.positions.items() for offset in offsets
+        )
+        self._spans: Dict[Tuple[str, ...], List[Tuple[int, int]]] = {}
+
+    @classmethod
+    def build(cls, content: str) -> 'SectionIndex':
+        """
+        扫描一次输出内容并建立段落索引
+
+        Args:
+            content: BDF 输出文件内容
+
+        Returns:
+            SectionIndex 实例
+        """
+        index = cls(length=len(content))
+        positions = index.positions
+        markers = index.markers
+        lowered = content.lower()
+        if len(lowered) == len(content):
+            matches = _SCANNER.finditer(lowered)
+        else:
+            matches = _SCANNER_IGNORECASE.finditer(content)
+        for match in matches:
+            start = match.start()
+            name = _SCANNER_GROUPS[match.lastindex]
+            positions[name].append(start)
+            markers.append((content.rfind('\n', 0, start) + 1, name))
+        return index
+
+    def has(self, *names: str) -> bool:
+        """是否存在任一指定段落"""
+        return any(self.positions.get(name) for name in names)
+
+    def first(self, *names: str) -> Optional[int]:
+        """返回指定段落中最早出现的标记位置，不存在时返回 None"""
+        starts = [self.positions[name][0] for name in names if self.positions.get(name)]
+        return min(starts) if starts else None
+
+    def count(self, name: str) -> int:
+        """返回段落标记出现的次数"""
+        return len(self.positions.get(name, []))
+
+    def spans(self, *names: str) -> List[Tuple[int, int]]:
+        """
+        返回指定段落（视为同一段落）的所有有界范围
+
+        Args:
+            names: 段落名称
+
+        Returns:
+            [(start, end), ...]（按出现顺序，互不重叠）；段落不存在时为空列表
+        """
+        key = tuple(sorted(names))
+        cached = self._spans.get(key)
+        if cached is not None:
+            return cached
+        wanted = set(names)
+        spans = []
+        start = last_line = None
+        for line, name in self.markers:
+            if name in wanted:
+                if start is None:
+                    start = line
+                last_line = line
+            elif start is not None and line > last_line:
+                # 与本段落标记同一行的其他标记不结束段落
+                spans.append((start, line))
+                start = None
+        if start is not None:
+            spans.append((start, self.length))
+        self._spans[key] = spans
+        return spans
+
+    def span(self, *names: str) -> Optional[Tuple[int, int]]:
+        """返回从指定段落第一个范围的起点到最后一个范围终点的范围，不存在时返回 None"""
+        spans = self.spans(*names)
+        return (spans[0][0], spans[-1][1]) if spans else None
+
+    def section(self, content: str, *names: str, lookbehind: int = 0) -> str:
+        """
+        返回指定段落（span()）的内容切片
+
+        Args:
+            content: 建立索引时使用的同一份内容
+            names: 段落名称
+            lookbehind: 额外向前保留的字符数（切片从段落起点向前 lookbehind 个字符处开始）
+
+        Returns:
+            内容切片；若段落不存在则返回空字符串
+        """
+        span = self.span(*names)
+        if span is None:
+            return ''
+        start, end = span
+        return content[max(0, start - lookbehind):end]
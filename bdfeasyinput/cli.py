@@ -541,6 +541,88 @@ def run(input_file: str, output_dir: Optional[str], config: Optional[str], timeo
         sys.exit(1)
 
 
+@main.command("run-many")
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("-c", "--config", type=click.Path(exists=True), help="Configuration file path (execution.type must be 'direct')")
+@click.option("--bdf-home", type=click.Path(exists=True), help="BDF installation directory (if no config is given)")
+@click.option("--cores", type=int, help="Total cores to use (default: all available CPUs)")
+@click.option("--threads", type=int, help="OpenMP threads per job (default: execution omp_num_threads)")
+@click.option("--pin", is_flag=True, help="Pin each job to the CPUs it was assigned")
+@click.option("--timeout", type=int, help="Timeout per job in seconds")
+@click.option("--report", type=click.Path(), help="Write the scheduler report as JSON")
+def run_many_cmd(
+    inputs: tuple,
+    config: Optional[str],
+    bdf_home: Optional[str],
+    cores: Optional[int],
+    threads: Optional[int],
+    pin: bool,
+    timeout: Optional[int],
+    report: Optional[str],
+):
+    """Run many BDF inputs locally, packing jobs onto the available cores."""
+    try:
+        import glob
+        import json
+        from .config import load_config, merge_config_with_defaults
+        from .execution import BDFDirectRunner, LocalScheduler, create_runner
+
+        if config:
+            runner = create_runner(config=merge_config_with_defaults(load_config(config)))
+        elif bdf_home:
+            runner = create_runner(bdf_home=bdf_home)
+        else:
+            click.echo("Error: --config or --bdf-home is required", err=True)
+            sys.exit(1)
+        if not isinstance(runner, BDFDirectRunner):
+            click.echo("Error: run-many requires direct execution (execution.type: direct)", err=True)
+            sys.exit(1)
+
+        input_files = []
+        for pattern in inputs:
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            input_files.extend(m for m in matches if m not in input_files)
+        missing = [f for f in input_files if not Path(f).is_file()]
+        if missing:
+            click.echo(f"Error: Input file(s) not found: {', '.join(missing)}", err=True)
+            sys.exit(1)
+        if not input_files:
+            click.echo("Error: No input files found", err=True)
+            sys.exit(1)
+
+        scheduler = LocalScheduler(runner, total_cores=cores, threads_per_job=threads, pin=pin)
+        click.echo(
+            f"Running {len(input_files)} jobs on {scheduler.total_cores} cores "
+            f"({scheduler.threads_per_job} threads/job, "
+            f"up to {scheduler.total_cores // scheduler.threads_per_job} concurrent)...",
+            err=True,
+        )
+
+        def on_complete(job):
+            mark = "✓" if job.status == "success" else "✗"
+            click.echo(f"  {mark} {job.input_file} ({job.status}, {job.run_time:.1f}s)", err=True)
+
+        result = scheduler.run(input_files, timeout=timeout, on_complete=on_complete)
+
+        click.echo(f"\nRun complete:", err=True)
+        click.echo(f"  ✓ Success: {result.succeeded}", err=True)
+        if result.failed:
+            click.echo(f"  ✗ Failed: {len(result.failed)}", err=True)
+        click.echo(f"  Wall time: {result.wall_time:.1f}s", err=True)
+        click.echo(f"  Throughput: {result.throughput:.1f} jobs/hour", err=True)
+        click.echo(f"  Core utilization: {result.utilization:.1%}", err=True)
+        click.echo(f"  Peak concurrency: {result.peak_concurrency} jobs", err=True)
+        if report:
+            with open(report, "w", encoding="utf-8") as f:
+                json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+            click.echo(f"✓ Report written to: {report}", err=True)
+        if result.failed:
+            sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
 @main.command()
 @click.argument("output_file", type=click.Path(exists=True))
 @click.option("-i", "--input", type=click.Path(exists=True), help="BDF input file (optional)")
@@ -549,6 +631,7 @@ def run(input_file: str, output_dir: Optional[str], config: Optional[str], timeo
 @click.option("-c", "--config", type=click.Path(exists=True), help="Configuration file path")
 @click.option("--format", type=click.Choice(["markdown", "html", "text"]), default="markdown", help="Report format")
 @click.option("--task-type", help="Task type (e.g., energy, optimize, frequency)")
+@click.option("--no-cache", is_flag=True, help="Do not use the on-disk parse cache")
 def analyze(
     output_file: str,
     input: Optional[str],
@@ -556,13 +639,14 @@ def analyze(
     output: Optional[str],
     config: Optional[str],
     format: str,
-    task_type: Optional[str]
+    task_type: Optional[str],
+    no_cache: bool,
 ):
     """Analyze BDF calculation results using AI."""
     try:
         from .config import load_config, merge_config_with_defaults, get_ai_config
         from .analysis import QuantumChemistryAnalyzer, AnalysisReportGenerator
-        from .analysis.parser import BDFOutputParser
+        from .analysis.parser import ParseCache
         
         # Get AI client
         client = get_ai_client_from_config(config)
@@ -573,7 +657,11 @@ def analyze(
         language = ai_config.get('language', 'zh')  # Default to Chinese
         
         # Create analyzer
-        analyzer = QuantumChemistryAnalyzer(ai_client=client)
+        cache = None if no_cache else ParseCache()
+        analyzer = QuantumChemistryAnalyzer(ai_client=client, cache=cache)
+        
+        # Parse output once; reused by the analyzer and the report
+        parsed_data = analyzer.parse_output(output_file)
         
         # Analyze
         click.echo("Analyzing results with AI...", err=True)
@@ -582,13 +670,10 @@ def analyze(
             input_file=input,
             error_file=error,
             task_type=task_type,
-            language=language
+            language=language,
+            parsed_data=parsed_data,
         )
         
-        # Parse output for report
-        parser = BDFOutputParser()
-        parsed_data = parser.parse(output_file)
-        
         # Generate report
         report_generator = AnalysisReportGenerator(format=format, language=language)
         report = report_generator.generate(
@@ -614,15 +699,34 @@ def analyze(
 @click.argument("output_file", type=click.Path(exists=True))
 @click.option("-o", "--output", type=click.Path(), help="Output JSON file")
 @click.option("--task-type", help="Task type (auto-detect if not specified): single_point, optimize, frequency, optimize_frequency, excited")
-def extract(output_file: str, output: Optional[str], task_type: Optional[str]):
+@click.option("--no-cache", is_flag=True, help="Do not use the on-disk parse cache")
+@click.option("--fields", help="Comma-separated raw parser fields to extract instead of metrics (e.g. energy,occupation)")
+@click.option("--trajectory", type=click.Path(), help="Also write the optimization trajectory as multi-frame XYZ (.extxyz for extended XYZ)")
+def extract(
+    output_file: str,
+    output: Optional[str],
+    task_type: Optional[str],
+    no_cache: bool,
+    fields: Optional[str],
+    trajectory: Optional[str],
+):
     """Extract metrics from BDF output file."""
     try:
         from .extraction import BDFResultExtractor
+        from .analysis.parser import ParseCache
         
-        extractor = BDFResultExtractor()
-        metrics = extractor.extract_metrics(output_file, task_type)
-        
-        result = metrics.to_dict()
+        extractor = BDFResultExtractor(cache=None if no_cache else ParseCache())
+        if trajectory:
+            opt_trajectory = extractor.extract_trajectory(output_file)
+            opt_trajectory.write_xyz(trajectory)
+            n_frames = len(opt_trajectory.trajectory)
+            click.echo(f"✓ Trajectory ({n_frames} frames, {len(opt_trajectory)} steps) written to: {trajectory}", err=True)
+        if fields:
+            # 只运行所请求字段（及其依赖）的提取器，输出原始解析结果
+            result = extractor.extract_fields(output_file, fields.split(","))
+        else:
+            metrics = extractor.extract_metrics(output_file, task_type)
+            result = metrics.to_dict()
         
         if output:
             import json
@@ -639,13 +743,447 @@ def extract(output_file: str, output: Optional[str], task_type: Optional[str]):
         sys.exit(1)
 
 
+@main.command("extract-batch")
+@click.argument("targets", nargs=-1, required=True)
+@click.option("-o", "--output", type=click.Path(), help="Output file (.jsonl, .csv, .parquet, .h5 or .npz); defaults to JSONL on stdout")
+@click.option("--format", "fmt", type=click.Choice(["jsonl", "csv", "parquet", "hdf5", "npz"]), help="Output format (inferred from --output suffix)")
+@click.option("-j", "--jobs", type=int, default=1, show_default=True, help="Number of worker processes")
+@click.option("--chunksize", type=int, help="Files per work chunk (auto if not specified)")
+@click.option("--pattern", "patterns", multiple=True, help="File pattern when walking directories (default: *.log)")
+@click.option("--task-type", help="Task type for all files (auto-detect per file if not specified)")
+@click.option("--no-cache", is_flag=True, help="Do not use the on-disk parse cache")
+def extract_batch_cmd(
+    targets: tuple,
+    output: Optional[str],
+    fmt: Optional[str],
+    jobs: int,
+    chunksize: Optional[int],
+    patterns: tuple,
+    task_type: Optional[str],
+    no_cache: bool,
+):
+    """Extract metrics from many BDF output files (directories or globs) in parallel."""
+    try:
+        from .extraction.batch import (
+            DEFAULT_OUTPUT_PATTERNS,
+            extract_batch,
+            find_output_files,
+            write_csv,
+            write_jsonl,
+        )
+        from .extraction.columnar import COLUMNAR_FORMATS, infer_format, write_columnar
+
+        if fmt is None:
+            if output and output.lower().endswith(".csv"):
+                fmt = "csv"
+            else:
+                fmt = (infer_format(output) if output else None) or "jsonl"
+        if fmt in COLUMNAR_FORMATS and not output:
+            click.echo(f"Error: --output is required for {fmt} format", err=True)
+            sys.exit(1)
+
+        files = find_output_files(targets, patterns or DEFAULT_OUTPUT_PATTERNS)
+        if not files:
+            click.echo("Error: No output files found", err=True)
+            sys.exit(1)
+
+        click.echo(f"Extracting metrics from {len(files)} files with {jobs} job(s)...", err=True)
+        failed = []
+
+        def tracked(records):
+            for record in records:
+                if record["status"] != "success":
+                    failed.append(record)
+                yield record
+
+        records = tracked(extract_batch(
+            files,
+            jobs=jobs,
+            task_type=task_type,
+            chunksize=chunksize,
+            use_cache=not no_cache,
+        ))
+        if fmt in COLUMNAR_FORMATS:
+            # 列式格式：依赖未安装时回退为同名 .npz 文件
+            count, written = write_columnar(records, output, fmt)
+            output = str(written)
+        else:
+            writer = write_csv if fmt == "csv" else write_jsonl
+            if output:
+                with open(output, "w", encoding="utf-8", newline="") as f:
+                    count = writer(records, f)
+            else:
+                count = writer(records, click.get_text_stream("stdout"))
+
+        click.echo(f"\nExtraction complete:", err=True)
+        click.echo(f"  ✓ Success: {count - len(failed)}", err=True)
+        if failed:
+            click.echo(f"  ✗ Errors: {len(failed)}", err=True)
+            for record in failed:
+                click.echo(f"    - {record['file']}: {record['error']}", err=True)
+        if output:
+            click.echo(f"✓ Metrics written to: {output}", err=True)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+def _slurm_monitor(config: str, state_file: Optional[str], download: bool = True):
+    """根据配置文件创建 SlurmMonitor（execution.type 必须为 remote_slurm）"""
+    from .config import load_config, merge_config_with_defaults
+    from .execution import create_runner
+    from .execution.remote_slurm import SSHSlurmRunner
+    from .execution.slurm_monitor import SlurmMonitor
+
+    runner = create_runner(config=merge_config_with_defaults(load_config(config)))
+    if not isinstance(runner, SSHSlurmRunner):
+        raise ValueError("slurm commands require execution.type: remote_slurm")
+    return SlurmMonitor(runner, state_file=state_file, download=download)
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    hours, rest = divmod(int(round(value)), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+@main.group()
+def slurm():
+    """Submit and monitor Slurm jobs (execution.type: remote_slurm)."""
+    pass
+
+
+@slurm.command("submit")
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("-c", "--config", type=click.Path(exists=True), required=True, help="Configuration file path")
+@click.option("--array", "array_name", help="Submit all inputs as one job array with this name")
+@click.option("--max-parallel", type=int, help="Maximum concurrently running array tasks (%K)")
+@click.option("--state-file", type=click.Path(), help="Job state file (default: $BDFEASYINPUT_SLURM_STATE or ~/.bdfeasyinput/slurm_jobs.json)")
+def slurm_submit(inputs: tuple, config: str, array_name: Optional[str], max_parallel: Optional[int], state_file: Optional[str]):
+    """Submit BDF inputs to Slurm and track them in the job state file."""
+    try:
+        import glob
+
+        input_files = []
+        for pattern in inputs:
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            input_files.extend(m for m in matches if m not in input_files)
+        missing = [f for f in input_files if not Path(f).is_file()]
+        if missing:
+            click.echo(f"Error: Input file(s) not found: {', '.join(missing)}", err=True)
+            sys.exit(1)
+        if max_parallel and not array_name:
+            click.echo("Error: --max-parallel requires --array", err=True)
+            sys.exit(1)
+
+        monitor = _slurm_monitor(config, state_file)
+        if array_name:
+            job_ids = monitor.submit_array(input_files, array_name=array_name, max_parallel=max_parallel)
+        else:
+            job_ids = monitor.submit(input_files)
+        for job_id in job_ids:
+            click.echo(job_id)
+        click.echo(f"✓ Submitted {len(job_ids)}/{len(input_files)} jobs (state: {monitor.state_file})", err=True)
+        if len(job_ids) < len(input_files):
+            sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@slurm.command("status")
+@click.option("-c", "--config", type=click.Path(exists=True), required=True, help="Configuration file path")
+@click.option("--state-file", type=click.Path(), help="Job state file (default: $BDFEASYINPUT_SLURM_STATE or ~/.bdfeasyinput/slurm_jobs.json)")
+@click.option("--watch", is_flag=True, help="Keep refreshing until all jobs have finished")
+@click.option("--interval", type=float, default=60, show_default=True, help="Refresh interval in seconds (with --watch)")
+@click.option("--timeout", type=float, help="Give up watching after this many seconds")
+@click.option("--no-download", is_flag=True, help="Do not download outputs of finished jobs")
+@click.option("--summary", is_flag=True, help="Show queue wait / run time per partition and CPU count")
+@click.option("--forget", is_flag=True, help="Remove finished jobs from the state file afterwards")
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+def slurm_status(
+    config: str,
+    state_file: Optional[str],
+    watch: bool,
+    interval: float,
+    timeout: Optional[float],
+    no_download: bool,
+    summary: bool,
+    forget: bool,
+    as_json: bool,
+):
+    """Refresh tracked Slurm jobs with one squeue/sacct call and show their state."""
+    try:
+        import json
+
+        monitor = _slurm_monitor(config, state_file, download=not no_download)
+
+        def on_transition(job_id, job):
+            click.echo(f"  {job_id} {job['name']}: {job['state']}", err=True)
+
+        if watch:
+            monitor.watch(interval=interval, timeout=timeout, on_transition=on_transition)
+        else:
+            monitor.refresh(on_transition)
+
+        rows = monitor.summary() if summary else monitor.report()
+        if as_json:
+            click.echo(json.dumps(rows, indent=2, ensure_ascii=False))
+        elif summary:
+            click.echo(f"{'partition':<12} {'cpus':>5} {'jobs':>5} {'done':>5} {'wait(mean)':>11} {'wait(med)':>10} {'run(mean)':>10} {'run(med)':>10} {'core-h':>8}")
+            for row in rows:
+                core_hours = f"{row['core_hours']:.2f}" if row["core_hours"] is not None else "-"
+                click.echo(
+                    f"{row['partition'] or '-':<12} {row['cpus'] or '-':>5} {row['jobs']:>5} {row['finished']:>5} "
+                    f"{_format_seconds(row['mean_queue_wait']):>11} {_format_seconds(row['median_queue_wait']):>10} "
+                    f"{_format_seconds(row['mean_run_time']):>10} {_format_seconds(row['median_run_time']):>10} {core_hours:>8}"
+                )
+        else:
+            click.echo(f"{'job_id':<14} {'name':<24} {'state':<12} {'partition':<12} {'cpus':>5} {'queue wait':>11} {'run time':>10}")
+            for row in rows:
+                click.echo(
+                    f"{row['job_id']:<14} {row['name']:<24} {row['state']:<12} {row['partition'] or '-':<12} "
+                    f"{row['cpus'] or '-':>5} {_format_seconds(row['queue_wait']):>11} {_format_seconds(row['run_time']):>10}"
+                )
+        if forget:
+            removed = monitor.forget()
+            click.echo(f"✓ Removed {removed} finished jobs from {monitor.state_file}", err=True)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@main.command("chain")
+@click.argument("spec", type=click.Path(exists=True))
+@click.option("-c", "--config", type=click.Path(exists=True), help="Configuration file path")
+@click.option("--workdir", type=click.Path(), help="Directory for generated inputs (overrides the workflow file)")
+@click.option("--timeout", type=float, help="Give up waiting after this many seconds (local/SSH execution)")
+@click.option("--log-name", default="{job_name}.log", show_default=True, help="Remote log file name written by the Slurm job script")
+@click.option("--state-file", type=click.Path(), help="Slurm job state file (default: $BDFEASYINPUT_SLURM_STATE or ~/.bdfeasyinput/slurm_jobs.json)")
+@click.option("--json", "as_json", is_flag=True, help="Output the step summary as JSON")
+def chain_cmd(
+    spec: str,
+    config: Optional[str],
+    workdir: Optional[str],
+    timeout: Optional[float],
+    log_name: str,
+    state_file: Optional[str],
+    as_json: bool,
+):
+    """Run a dependency-chained workflow (e.g. opt -> freq -> TDDFT) described by a YAML file.
+
+    With execution.type: remote_slurm the whole chain is queued at once
+    (--dependency=afterok); otherwise steps run as their inputs become ready.
+    """
+    try:
+        import json
+        from .config import load_config, merge_config_with_defaults
+        from .execution import Workflow, create_runner
+        from .execution.remote_slurm import SSHSlurmRunner
+        from .execution.slurm_monitor import SlurmMonitor
+
+        yaml_config = merge_config_with_defaults(load_config(config)) if config else None
+        runner = create_runner(config=yaml_config)
+        wf = Workflow.from_yaml(spec, workdir=workdir)
+
+        if isinstance(runner, SSHSlurmRunner):
+            monitor = SlurmMonitor(runner, state_file=state_file)
+            wf.queue(runner, monitor=monitor, log_name=log_name)
+            click.echo(f"✓ Queued workflow {wf.name} (state: {monitor.state_file})", err=True)
+        else:
+            def on_step(step):
+                click.echo(f"  {step.name}: {step.status}", err=True)
+
+            click.echo(f"Running workflow {wf.name} in {wf.workdir}", err=True)
+            wf.run(runner, timeout=timeout, on_step=on_step)
+
+        rows = wf.summary()
+        if as_json:
+            click.echo(json.dumps(rows, indent=2, ensure_ascii=False))
+        else:
+            click.echo(f"{'step':<16} {'status':<10} {'job_id':<12} {'depends_on':<24} input")
+            for name, row in rows.items():
+                click.echo(
+                    f"{name:<16} {row['status']:<10} {row['job_id'] or '-':<12} "
+                    f"{','.join(row['depends_on']) or '-':<24} {row['input_file'] or '-'}"
+                )
+        if any(row["status"] not in ("success", "pending") for row in rows.values()):
+            sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
 @main.group()
-def yaml():
+def db():
+    """Results database commands (SQLite)."""
+    pass
+
+
+@db.command("ingest")
+@click.argument("targets", nargs=-1, required=True)
+@click.option("--db", "db_path", type=click.Path(), help="Database file (default: $BDFEASYINPUT_DB or ~/.bdfeasyinput/results.db)")
+@click.option("--pattern", "patterns", multiple=True, help="File pattern when walking directories (default: *.log)")
+@click.option("--force", is_flag=True, help="Re-ingest files even if they are unchanged")
+@click.option("--no-cache", is_flag=True, help="Do not use the on-disk parse cache")
+def db_ingest(targets: tuple, db_path: Optional[str], patterns: tuple, force: bool, no_cache: bool):
+    """Parse BDF output files (directories or globs) into the results database."""
+    try:
+        from .analysis.parser import ParseCache
+        from .extraction.batch import DEFAULT_OUTPUT_PATTERNS, find_output_files
+        from .store import ResultStore
+
+        files = find_output_files(targets, patterns or DEFAULT_OUTPUT_PATTERNS)
+        if not files:
+            click.echo("Error: No output files found", err=True)
+            sys.exit(1)
+
+        with ResultStore(db_path, cache=None if no_cache else ParseCache()) as store:
+            click.echo(f"Ingesting {len(files)} files into {store.db_path}...", err=True)
+            summary = store.ingest_many(files, force=force)
+            total = store.count()
+
+        click.echo(f"\nIngest complete:", err=True)
+        click.echo(f"  ✓ Ingested: {summary['inserted']}", err=True)
+        click.echo(f"  - Unchanged: {summary['skipped']}", err=True)
+        if summary["failed"]:
+            click.echo(f"  ✗ Errors: {len(summary['failed'])}", err=True)
+            for path, error in summary["failed"]:
+                click.echo(f"    - {path}: {error}", err=True)
+        click.echo(f"  Calculations in database: {total}", err=True)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@db.command("query")
+@click.option("--db", "db_path", type=click.Path(), help="Database file (default: $BDFEASYINPUT_DB or ~/.bdfeasyinput/results.db)")
+@click.option("--formula", help="Molecular formula in Hill notation (e.g. CH2O)")
+@click.option("--method", help="Functional or SCF method (e.g. PBE0)")
+@click.option("--basis", help="Basis set (e.g. cc-pVDZ)")
+@click.option("--task-type", help="Task type (energy, optimize, frequency, tddft, ...)")
+@click.option("--energy-min", type=float, help="Minimum total energy (Hartree)")
+@click.option("--energy-max", type=float, help="Maximum total energy (Hartree)")
+@click.option("--s1-min", type=float, help="Minimum lowest excitation energy (eV)")
+@click.option("--s1-max", type=float, help="Maximum lowest excitation energy (eV)")
+@click.option("--sql", help="Run a raw SQL query instead of the filters")
+@click.option("--limit", type=int, help="Maximum number of rows")
+@click.option("--json", "as_json", is_flag=True, help="Output rows as JSON")
+def db_query(
+    db_path: Optional[str],
+    formula: Optional[str],
+    method: Optional[str],
+    basis: Optional[str],
+    task_type: Optional[str],
+    energy_min: Optional[float],
+    energy_max: Optional[float],
+    s1_min: Optional[float],
+    s1_max: Optional[float],
+    sql: Optional[str],
+    limit: Optional[int],
+    as_json: bool,
+):
+    """Query the results database.
+
+    Example: PBE0/cc-pVDZ TDDFT runs with S1 below 3 eV
+
+      bdfeasyinput db query --method PBE0 --basis cc-pVDZ --task-type tddft --s1-max 3
+    """
+    try:
+        import json
+        from .store import ResultStore
+
+        with ResultStore(db_path) as store:
+            if sql:
+                rows = store.execute(sql)
+            else:
+                rows = store.query(
+                    limit=limit,
+                    formula=formula,
+                    method=method,
+                    basis=basis,
+                    task_type=task_type,
+                    energy_min=energy_min,
+                    energy_max=energy_max,
+                    s1_min=s1_min,
+                    s1_max=s1_max,
+                )
+
+        if as_json:
+            click.echo(json.dumps(rows, indent=2, ensure_ascii=False))
+            return
+        if not rows:
+            click.echo("No matching calculations", err=True)
+            return
+        columns = list(rows[0].keys())
+        click.echo("\t".join(columns))
+        for row in rows:
+            click.echo("\t".join("" if row[c] is None else str(row[c]) for c in columns))
+        click.echo(f"{len(rows)} row(s)", err=True)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("log_file", type=click.Path())
+@click.option("--interval", type=float, default=5.0, show_default=True, help="Polling interval in seconds")
+@click.option("--timeout", type=float, help="Stop watching after this many seconds")
+@click.option("--once", is_flag=True, help="Process the current contents once and exit")
+@click.option("--json", "as_json", is_flag=True, help="Print events as JSON lines")
+def watch(log_file: str, interval: float, timeout: Optional[float], once: bool, as_json: bool):
+    """Follow a running BDF log and print progress events."""
+    try:
+        import json
+        import time
+        from .analysis.parser.incremental import IncrementalOutputParser
+
+        tail = IncrementalOutputParser(log_file)
+        start_time = time.time()
+
+        def emit(events):
+            for event in events:
+                if as_json:
+                    click.echo(json.dumps(event.to_dict(), ensure_ascii=False))
+                else:
+                    click.echo(event.describe())
+
+        while True:
+            emit(tail.update())
+            if tail.finished or tail.errors or once:
+                break
+            if timeout is not None and time.time() - start_time >= timeout:
+                click.echo("Watch timed out before the calculation finished", err=True)
+                break
+            time.sleep(interval)
+
+        if tail.finished or tail.errors or once:
+            emit(tail.flush())
+
+        summary = tail.summary()
+        click.echo(
+            f"Progress: {summary['scf_iterations']} SCF iterations, "
+            f"{summary['optimization_steps']} optimization steps, "
+            f"{summary['excited_states']} excited states, "
+            f"{summary['errors']} errors",
+            err=True
+        )
+        if tail.errors:
+            sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@main.group("yaml")
+def yaml_group():
     """YAML generation and manipulation commands."""
     pass
 
 
-@yaml.command("generate")
+@yaml_group.command("generate")
 @click.argument("task_type", type=click.Choice(["energy", "optimize", "frequency", "tddft"]))
 @click.option("-o", "--output", type=click.Path(), help="Output YAML file")
 @click.option("--no-comments", is_flag=True, help="Don't include comments in template")
@@ -668,25 +1206,31 @@ def yaml_generate(task_type: str, output: Optional[str], no_comments: bool):
         sys.exit(1)
 
 
-@yaml.command("from-xyz")
+@yaml_group.command("from-xyz")
 @click.argument("xyz_file", type=click.Path(exists=True))
 @click.option("-o", "--output", type=click.Path(), help="Output YAML file")
 @click.option("-t", "--task-type", type=click.Choice(["energy", "optimize", "frequency", "tddft"]), 
               default="energy", help="Task type")
-@click.option("--charge", type=int, default=0, help="Molecular charge")
-@click.option("--multiplicity", type=int, default=1, help="Spin multiplicity")
+@click.option("--charge", type=int, help="Molecular charge (default: extxyz metadata, else 0)")
+@click.option("--multiplicity", type=int, help="Spin multiplicity (default: extxyz metadata, else 1)")
 @click.option("--functional", default="pbe0", help="DFT functional")
 @click.option("--basis", default="cc-pvdz", help="Basis set")
 @click.option("--no-validate", is_flag=True, help="Skip validation")
+@click.option("--frame", type=int, help="Frame index of a multi-frame XYZ file (negative counts from the end)")
+@click.option("--all-frames", is_flag=True, help="One YAML per frame (<name>_<index>.yaml in --output-dir, else a multi-document stream)")
+@click.option("-d", "--output-dir", type=click.Path(), help="Output directory for --all-frames")
 def yaml_from_xyz(
     xyz_file: str,
     output: Optional[str],
     task_type: str,
-    charge: int,
-    multiplicity: int,
+    charge: Optional[int],
+    multiplicity: Optional[int],
     functional: str,
     basis: str,
-    no_validate: bool
+    no_validate: bool,
+    frame: Optional[int],
+    all_frames: bool,
+    output_dir: Optional[str]
 ):
     """Generate YAML configuration from XYZ file."""
     try:
@@ -696,6 +1240,24 @@ def yaml_from_xyz(
             'basis': basis
         }
         
+        if all_frames:
+            generator = YAMLGenerator(validate_output=not no_validate)
+            frames = generator.iter_from_xyz(
+                xyz_file, task_type=task_type, charge=charge, multiplicity=multiplicity, method=method
+            )
+            if output_dir:
+                Path(output_dir).mkdir(parents=True, exist_ok=True)
+                count = 0
+                for frame_name, config in frames:
+                    generator.save_yaml(config, Path(output_dir) / f"{frame_name}.yaml")
+                    count += 1
+                click.echo(f"✓ {count} YAML files generated in: {output_dir}")
+            else:
+                for frame_name, config in frames:
+                    click.echo("---")
+                    click.echo(yaml.dump(config, default_flow_style=False, allow_unicode=True))
+            return
+        
         config = generate_yaml_from_xyz(
             xyz_path=xyz_file,
             task_type=task_type,
@@ -703,7 +1265,8 @@ def yaml_from_xyz(
             multiplicity=multiplicity,
             method=method,
             output_path=output,
-            validate=not no_validate
+            validate=not no_validate,
+            frame=frame
         )
         
         if output:
@@ -721,31 +1284,92 @@ def yaml_from_xyz(
 @click.option("-d", "--output-dir", type=click.Path(), help="Output directory")
 @click.option("--overwrite", is_flag=True, help="Overwrite existing files")
 @click.option("--no-validate", is_flag=True, help="Skip validation")
-def batch_convert(yaml_files: tuple, output_dir: Optional[str], overwrite: bool, no_validate: bool):
-    """Convert multiple YAML files to BDF input files."""
+@click.option("-j", "--jobs", type=int, default=1, show_default=True, help="Number of worker processes")
+@click.option("--chunksize", type=int, help="Files (or XYZ frames) per work chunk (auto if not specified)")
+@click.option("--base", type=click.Path(exists=True),
+              help="Base YAML for .xyz/.extxyz arguments: one input per frame, named <stem>_<index>.inp")
+@click.option("--force", is_flag=True, help="Regenerate inputs even if the manifest says they are up to date")
+def batch_convert(
+    yaml_files: tuple,
+    output_dir: Optional[str],
+    overwrite: bool,
+    no_validate: bool,
+    jobs: int,
+    chunksize: Optional[int],
+    base: Optional[str],
+    force: bool,
+):
+    """Convert multiple YAML files (or XYZ trajectory frames) to BDF input files.
+
+    Inputs generated from YAML are tracked in a manifest in each output
+    directory; files whose YAML and generator are unchanged are skipped.
+    """
     if not yaml_files:
         click.echo("Error: No YAML files specified", err=True)
         sys.exit(1)
+    xyz_files = [f for f in yaml_files if Path(f).suffix.lower() in ('.xyz', '.extxyz')]
+    yaml_files = [f for f in yaml_files if f not in xyz_files]
+    if xyz_files and not base:
+        click.echo("Error: XYZ inputs need --base YAML for the method and task settings", err=True)
+        sys.exit(1)
     
     try:
+        import itertools
+        import time
+        from .conversion_tool import CONVERSION_STAGES
+
         tool = ConversionTool(validate_input=not no_validate)
-        results = tool.batch_convert(
-            list(yaml_files),
-            output_dir=output_dir,
-            overwrite=overwrite,
-            continue_on_error=True
+        totals = dict.fromkeys(CONVERSION_STAGES, 0.0)
+        errors = []
+        success_count = 0
+        regenerated = 0
+        skipped = 0
+        start = time.perf_counter()
+        records = itertools.chain(
+            tool.iter_batch_convert(
+                yaml_files,
+                output_dir=output_dir,
+                overwrite=overwrite,
+                jobs=jobs,
+                chunksize=chunksize,
+                incremental=True,
+                force=force,
+            ),
+            *(tool.iter_convert_frames(
+                base, xyz_file, output_dir=output_dir, overwrite=overwrite, jobs=jobs, chunksize=chunksize
+            ) for xyz_file in xyz_files),
         )
-        
-        success_count = sum(1 for v in results.values() if isinstance(v, Path))
-        error_count = len(results) - success_count
+        count = 0
+        for record in records:
+            if record["status"] == "skipped":
+                skipped += 1
+                continue
+            count += 1
+            for stage, seconds in record["timings"].items():
+                totals[stage] += seconds
+            if record["status"] == "success":
+                success_count += 1
+                regenerated += record.get("change") == "stale"
+            elif "frame" in record:
+                errors.append((f"{record['file']} (frame {record['frame']})", record["error"]))
+            else:
+                errors.append((record["file"], record["error"]))
+        wall = time.perf_counter() - start
         
         click.echo(f"\nConversion complete:")
         click.echo(f"  ✓ Success: {success_count}")
-        if error_count > 0:
-            click.echo(f"  ✗ Errors: {error_count}")
-            for path, result in results.items():
-                if isinstance(result, Exception):
-                    click.echo(f"    - {path}: {result}", err=True)
+        click.echo(f"  ↻ Regenerated: {regenerated}")
+        click.echo(f"  - Skipped (unchanged): {skipped}")
+        if errors:
+            click.echo(f"  ✗ Errors: {len(errors)}")
+            for path, error in errors:
+                click.echo(f"    - {path}: {error}", err=True)
+        
+        # 各阶段耗时为所有文件（所有工作进程）之和
+        click.echo(f"\nStage timings ({count} files, {max(jobs, 1)} worker(s)):")
+        for stage, seconds in totals.items():
+            click.echo(f"  {stage:<9} {seconds:9.3f}s  {seconds / max(count, 1) * 1000:8.3f} ms/file")
+        click.echo(f"  {'wall':<9} {wall:9.3f}s  {count / wall if wall > 0 else 0:8.1f} files/s")
         
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -5,17 +5,158 @@ This module provides enhanced utilities for converting YAML files to BDF input f
 including batch conversion, validation, and preview functionality.
 """
 
-from typing import Dict, Any, List, Optional, Union, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Union, Tuple
 from pathlib import Path
+import collections
+import functools
+import hashlib
+import importlib.metadata
+import itertools
+import json
+import os
 import yaml
 import logging
+import math
+import pickle
+import time
 
 from .converter import BDFConverter
 from .validator import BDFValidator, ValidationError
+from .template import InputTemplate
+from .xyz_reader import FRAME_NAME_FORMAT, XYZFrame, iter_xyz_frames
 from .yaml_generator import YAMLGenerator
 
 logger = logging.getLogger(__name__)
 
+# Stages timed for every file in a batch conversion
+CONVERSION_STAGES = ('load', 'validate', 'generate', 'write')
+
+# Chunks per worker process (more chunks balance load better, fewer reduce scheduling overhead)
+CHUNKS_PER_WORKER = 4
+
+# Frames per work chunk when converting trajectories (the frame count is not known up front)
+FRAME_CHUNKSIZE = 256
+
+# Conversion tool reused inside a worker process (created once per validation setting)
+_WORKER_TOOL: Optional['ConversionTool'] = None
+
+# Compiled template reused inside a worker process, keyed by (base configuration, validation setting)
+_WORKER_TEMPLATE: Optional[Tuple[Tuple[str, bool], InputTemplate]] = None
+
+# Manifest of generated inputs, one per output directory (see ConversionManifest)
+MANIFEST_NAME = '.bdfeasyinput-manifest.json'
+MANIFEST_VERSION = 1
+
+# Package sources (relative to this package) whose changes alter generated inputs
+GENERATOR_SOURCES = ('converter.py', 'utils.py', 'xc_functional.py', 'modules')
+
+
+def _file_hash(path: Union[str, Path]) -> Optional[str]:
+    """SHA-256 of a file's content, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def generator_fingerprint() -> str:
+    """
+    Fingerprint of everything that shapes generated inputs besides the YAML itself.
+    
+    Combines the installed versions of bdfeasyinput and bdfeasyinput-schema with
+    the converter sources, so both upgrades and local edits invalidate manifests.
+    """
+    digest = hashlib.sha256()
+    for dist in ('bdfeasyinput', 'bdfeasyinput-schema'):
+        try:
+            version = importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            version = 'unknown'
+        digest.update(f"{dist}={version}\n".encode())
+    root = Path(__file__).parent
+    for name in GENERATOR_SOURCES:
+        path = root / name
+        for source in (sorted(path.rglob('*.py')) if path.is_dir() else [path]):
+            digest.update(source.relative_to(root).as_posix().encode())
+            digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ConversionManifest:
+    """
+    Record of the BDF inputs generated into one output directory.
+    
+    Each entry maps an output file name to the hash of the YAML it was
+    generated from, the generator fingerprint and the hash of the written
+    content. On the next run an input is skipped when all three still
+    match, regenerated when the source or generator changed, and treated
+    as foreign (subject to the usual overwrite rules) when the output was
+    deleted or edited by hand.
+    """
+    
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Args:
+            directory: Output directory; the manifest is MANIFEST_NAME inside it
+        """
+        self.path = Path(directory) / MANIFEST_NAME
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.dirty = False
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+    
+    def state(self, output_path: Union[str, Path], source_hash: Optional[str], generator: str) -> str:
+        """
+        Classify an output against the manifest.
+        
+        Returns:
+            'unchanged' (up to date), 'stale' (generated by us, needs regeneration)
+            or 'new' (not tracked, missing, or modified since it was written)
+        """
+        entry = self.entries.get(Path(output_path).name)
+        if entry is None or _file_hash(output_path) != entry.get('output_hash'):
+            return 'new'
+        if source_hash is not None and entry.get('source_hash') == source_hash and entry.get('generator') == generator:
+            return 'unchanged'
+        return 'stale'
+    
+    def record(
+        self,
+        output_path: Union[str, Path],
+        source: Union[str, Path],
+        source_hash: str,
+        output_hash: str,
+        generator: str
+    ) -> None:
+        """Record a freshly written output."""
+        self.entries[Path(output_path).name] = {
+            'source': str(source),
+            'source_hash': source_hash,
+            'generator': generator,
+            'output_hash': output_hash,
+        }
+        self.dirty = True
+    
+    def save(self) -> None:
+        """Write the manifest if it changed (atomically, via a temporary file)."""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(
+            json.dumps({'version': MANIFEST_VERSION, 'entries': self.entries}, indent=2, sort_keys=True),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
 
 class ConversionTool:
     """Enhanced tool for YAML to BDF conversion."""
@@ -124,12 +265,251 @@ class ConversionTool:
         logger.info(f"Saved BDF input to {output_path}")
         return output_path
     
+    def convert_timed(
+        self,
+        yaml_path: Union[str, Path],
+        output_path: Union[str, Path],
+        overwrite: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Convert one YAML file and time each stage (load, validate, generate, write).
+        
+        Errors are captured in the returned record instead of being raised.
+        
+        Args:
+            yaml_path: Path to input YAML file
+            output_path: Path to output BDF file
+            overwrite: Whether to overwrite existing output file
+        
+        Returns:
+            {'file': str, 'output': Optional[str], 'status': 'success'|'failed',
+             'error': Optional[Exception], 'timings': {stage: seconds},
+             'source_hash': Optional[str], 'output_hash': Optional[str]}
+            (SHA-256 of the YAML and of the written input, for ConversionManifest)
+        """
+        yaml_path, output_path = Path(yaml_path), Path(output_path)
+        timings = dict.fromkeys(CONVERSION_STAGES, 0.0)
+        record = {
+            'file': str(yaml_path), 'output': None, 'status': 'failed', 'error': None, 'timings': timings,
+            'source_hash': None, 'output_hash': None,
+        }
+        try:
+            if output_path.exists() and not overwrite:
+                raise FileExistsError(
+                    f"Output file already exists: {output_path}. "
+                    f"Use overwrite=True to overwrite."
+                )
+            start = time.perf_counter()
+            if not yaml_path.exists():
+                raise FileNotFoundError(f"YAML file not found: {yaml_path}")
+            source = yaml_path.read_bytes()
+            record['source_hash'] = hashlib.sha256(source).hexdigest()
+            config = yaml.safe_load(source.decode('utf-8'))
+            timings['load'], start = time.perf_counter() - start, time.perf_counter()
+            if self.converter.validate_input:
+                self.converter.validate(config)
+            timings['validate'], start = time.perf_counter() - start, time.perf_counter()
+            bdf_content = self.converter.generate(config)
+            timings['generate'], start = time.perf_counter() - start, time.perf_counter()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(bdf_content)
+            record['output_hash'] = hashlib.sha256(bdf_content.encode('utf-8')).hexdigest()
+            timings['write'] = time.perf_counter() - start
+        except Exception as e:
+            logger.error(f"Failed to convert {yaml_path}: {e}")
+            record['error'] = e
+            return record
+        logger.info(f"Converted {yaml_path} -> {output_path}")
+        record.update(output=str(output_path), status='success')
+        return record
+    
+    def iter_batch_convert(
+        self,
+        yaml_files: Sequence[Union[str, Path]],
+        output_dir: Optional[Union[str, Path]] = None,
+        overwrite: bool = False,
+        jobs: int = 1,
+        chunksize: Optional[int] = None,
+        incremental: bool = False,
+        force: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Convert multiple YAML files, yielding one record per file as results arrive.
+        
+        With jobs > 1 the files are split into chunks and distributed over a
+        process pool; every worker keeps one ConversionTool (and its schema
+        validator) for all the chunks it handles.
+        
+        With incremental=True every output directory keeps a ConversionManifest:
+        inputs whose YAML content and generator are unchanged are skipped
+        without loading, and inputs written by an earlier run are regenerated
+        in place when their source or the generator changed.
+        
+        Args:
+            yaml_files: List of YAML file paths
+            output_dir: Optional output directory (if None, uses same directory as input)
+            overwrite: Whether to overwrite existing files
+            jobs: Number of worker processes (1 converts in the current process)
+            chunksize: Files per chunk (None picks a size from the number of workers)
+            incremental: Skip inputs that are up to date according to the manifest
+            force: With incremental, regenerate tracked inputs even if up to date
+        
+        Yields:
+            convert_timed() records, in input order; with incremental each record
+            has a 'change' key ('unchanged', 'stale' or 'new') and unchanged
+            inputs have status 'skipped'
+        """
+        if output_dir:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+        generator = generator_fingerprint() if incremental else None
+        manifests: Dict[Path, ConversionManifest] = {}
+        plan = []
+        for yaml_file in yaml_files:
+            yaml_path = Path(yaml_file)
+            if output_dir:
+                output_path = output_dir / yaml_path.with_suffix('.inp').name
+            else:
+                output_path = yaml_path.with_suffix('.inp')
+            change = None
+            if incremental:
+                manifest = manifests.get(output_path.parent)
+                if manifest is None:
+                    manifest = manifests[output_path.parent] = ConversionManifest(output_path.parent)
+                change = manifest.state(output_path, _file_hash(yaml_path), generator)
+                if change == 'unchanged' and force:
+                    change = 'stale'
+            # Outputs this tool wrote before may be replaced without overwrite=True
+            plan.append(((str(yaml_path), str(output_path), overwrite or change == 'stale'), change))
+        tasks = [task for task, change in plan if change != 'unchanged']
+        
+        executor = None
+        if jobs <= 1 or not tasks:
+            results = (self.convert_timed(*task) for task in tasks)
+        else:
+            if chunksize is None:
+                chunksize = max(1, math.ceil(len(tasks) / (jobs * CHUNKS_PER_WORKER)))
+            chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            results = itertools.chain.from_iterable(
+                executor.map(_convert_chunk, chunks, [self.converter.validate_input] * len(chunks))
+            )
+        try:
+            for (yaml_path, output_path, _), change in plan:
+                if change == 'unchanged':
+                    record = {
+                        'file': yaml_path, 'output': output_path, 'status': 'skipped', 'error': None,
+                        'timings': dict.fromkeys(CONVERSION_STAGES, 0.0),
+                    }
+                else:
+                    record = next(results)
+                    if change is not None and record['status'] == 'success':
+                        manifests[Path(output_path).parent].record(
+                            output_path, yaml_path, record['source_hash'], record['output_hash'], generator
+                        )
+                if change is not None:
+                    record['change'] = change
+                yield record
+        finally:
+            for manifest in manifests.values():
+                manifest.save()
+            if executor is not None:
+                # Stop queued chunks if the caller stops early (e.g. continue_on_error=False)
+                executor.shutdown(wait=True, cancel_futures=True)
+    
+    def iter_convert_frames(
+        self,
+        config: Union[Dict[str, Any], str, Path],
+        xyz_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        overwrite: bool = False,
+        charge: Optional[int] = None,
+        multiplicity: Optional[int] = None,
+        name: Optional[str] = None,
+        jobs: int = 1,
+        chunksize: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Write one BDF input per frame of a (multi-frame) XYZ file.
+        
+        The base configuration supplies everything but the geometry; it is
+        compiled once into an InputTemplate and every frame is rendered from
+        it. Frames are read lazily and, with jobs > 1, handed to a process
+        pool a chunk at a time with a bounded read-ahead, so a trajectory is
+        never held in memory as a whole. Validation happens when a new
+        (elements, charge, multiplicity) variant is compiled and is counted
+        in the 'generate' stage.
+        
+        Args:
+            config: Base YAML configuration dictionary or YAML file path
+            xyz_path: XYZ or extended XYZ file
+            output_dir: Output directory (if None, uses the XYZ file's directory)
+            overwrite: Whether to overwrite existing files
+            charge: Charge for all frames (default: frame metadata, else the base configuration's)
+            multiplicity: Multiplicity for all frames (default: frame metadata, else the base configuration's)
+            name: Output name stem (default: XYZ file stem); files are "<name>_<index:05d>.inp"
+            jobs: Number of worker processes (1 converts in the current process)
+            chunksize: Frames per chunk for the process pool
+        
+        Yields:
+            convert_timed()-style records with an extra 'frame' index, in frame order
+        """
+        if not isinstance(config, dict):
+            config = self.yaml_generator.load_yaml(config)
+        # Frame coordinates are in Angstrom whatever units the base configuration uses
+        config = {**config, 'molecule': {**(config.get('molecule') or {}), 'units': 'angstrom'}}
+        xyz_path = Path(xyz_path)
+        output_dir = Path(output_dir) if output_dir else xyz_path.parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        name = name or xyz_path.stem
+        
+        def tasks() -> Iterator[Tuple[XYZFrame, str, float]]:
+            frames = iter_xyz_frames(xyz_path)
+            while True:
+                start = time.perf_counter()
+                xyz_frame = next(frames, None)
+                if xyz_frame is None:
+                    return
+                output_path = output_dir / (FRAME_NAME_FORMAT.format(name=name, index=xyz_frame.index) + '.inp')
+                yield xyz_frame, str(output_path), time.perf_counter() - start
+        
+        options = (str(xyz_path), overwrite, charge, multiplicity)
+        if jobs <= 1:
+            template = InputTemplate(config, converter=self.converter)
+            for task in tasks():
+                yield _render_frame(template, task, *options)
+            return
+        
+        key = yaml.safe_dump(config, sort_keys=True)
+        task_iter = tasks()
+        pending: collections.deque = collections.deque()
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        try:
+            while True:
+                chunk = list(itertools.islice(task_iter, chunksize or FRAME_CHUNKSIZE))
+                if chunk:
+                    pending.append(executor.submit(
+                        _render_frame_chunk, key, config, self.converter.validate_input, chunk, options
+                    ))
+                # Keep at most two chunks per worker in flight
+                if pending and (not chunk or len(pending) >= 2 * jobs):
+                    yield from pending.popleft().result()
+                if not chunk and not pending:
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
     def batch_convert(
         self,
         yaml_files: List[Union[str, Path]],
         output_dir: Optional[Union[str, Path]] = None,
         overwrite: bool = False,
-        continue_on_error: bool = True
+        continue_on_error: bool = True,
+        jobs: int = 1,
+        chunksize: Optional[int] = None,
+        incremental: bool = False,
+        force: bool = False
     ) -> Dict[str, Union[Path, Exception]]:
         """
         Convert multiple YAML files to BDF input files.
@@ -139,39 +519,24 @@ class ConversionTool:
             output_dir: Optional output directory (if None, uses same directory as input)
             overwrite: Whether to overwrite existing files
             continue_on_error: Whether to continue on errors
+            jobs: Number of worker processes (see iter_batch_convert())
+            chunksize: Files per chunk for the process pool
+            incremental: Skip up-to-date inputs (see iter_batch_convert())
+            force: With incremental, regenerate up-to-date inputs too
         
         Returns:
-            Dictionary mapping input paths to output paths or exceptions
+            Dictionary mapping input paths to output paths (also for skipped inputs) or exceptions
         """
         results = {}
-        
-        if output_dir:
-            output_dir = Path(output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
-        
-        for yaml_file in yaml_files:
-            yaml_path = Path(yaml_file)
-            
-            try:
-                # Determine output path
-                if output_dir:
-                    output_path = output_dir / yaml_path.with_suffix('.inp').name
-                else:
-                    output_path = yaml_path.with_suffix('.inp')
-                
-                result_path = self.convert_file(
-                    yaml_path,
-                    output_path=output_path,
-                    overwrite=overwrite
-                )
-                results[str(yaml_path)] = result_path
-                
-            except Exception as e:
-                logger.error(f"Failed to convert {yaml_path}: {e}")
-                results[str(yaml_path)] = e
-                
+        for record in self.iter_batch_convert(
+            yaml_files, output_dir, overwrite, jobs=jobs, chunksize=chunksize, incremental=incremental, force=force
+        ):
+            if record['status'] in ('success', 'skipped'):
+                results[record['file']] = Path(record['output'])
+            else:
+                results[record['file']] = record['error']
                 if not continue_on_error:
-                    raise
+                    raise record['error']
         
         return results
     
@@ -221,7 +586,7 @@ class ConversionTool:
         config = self.yaml_generator.load_yaml(yaml_path)
         
         try:
-            validated_model, warnings = self.validator.validate(config)
+            validated_model, warnings = self.validator.validate(config, as_dict=False)
             return True, [], warnings
         except ValidationError as e:
             return False, [str(e)], []
@@ -230,12 +595,13 @@ class ConversionTool:
         self,
         xyz_path: Union[str, Path],
         task_type: str = 'energy',
-        charge: int = 0,
-        multiplicity: int = 1,
+        charge: Optional[int] = None,
+        multiplicity: Optional[int] = None,
         method: Optional[Dict[str, Any]] = None,
         settings: Optional[Dict[str, Any]] = None,
         output_path: Optional[Union[str, Path]] = None,
-        overwrite: bool = False
+        overwrite: bool = False,
+        frame: Optional[int] = None
     ) -> Path:
         """
         Convert XYZ file directly to BDF input file.
@@ -243,12 +609,13 @@ class ConversionTool:
         Args:
             xyz_path: Path to XYZ file
             task_type: Type of calculation
-            charge: Molecular charge
-            multiplicity: Spin multiplicity
+            charge: Molecular charge (default: extxyz metadata, else 0)
+            multiplicity: Spin multiplicity (default: extxyz metadata, else 1)
             method: Method configuration
             settings: Optional settings
             output_path: Optional output BDF file path
             overwrite: Whether to overwrite existing file
+            frame: Frame index for multi-frame files (see iter_convert_frames() for all frames)
         
         Returns:
             Path to generated BDF file
@@ -260,7 +627,8 @@ class ConversionTool:
             charge=charge,
             multiplicity=multiplicity,
             method=method,
-            settings=settings
+            settings=settings,
+            frame=frame
         )
         
         # Determine output path
@@ -288,6 +656,89 @@ class ConversionTool:
         return output_path
 
 
+def _convert_chunk(
+    tasks: List[Tuple[str, str, bool]],
+    validate_input: bool
+) -> List[Dict[str, Any]]:
+    """Worker entry point: convert one chunk of (yaml_path, output_path, overwrite) tasks."""
+    global _WORKER_TOOL
+    if _WORKER_TOOL is None or _WORKER_TOOL.converter.validate_input != validate_input:
+        _WORKER_TOOL = ConversionTool(validate_input=validate_input)
+    records = [_WORKER_TOOL.convert_timed(*task) for task in tasks]
+    for record in records:
+        # Results travel back through pickle; replace exceptions that cannot be pickled
+        if record['error'] is not None:
+            try:
+                pickle.dumps(record['error'])
+            except Exception:
+                record['error'] = RuntimeError(f"{type(record['error']).__name__}: {record['error']}")
+    return records
+
+
+def _render_frame(
+    template: InputTemplate,
+    task: Tuple[XYZFrame, str, float],
+    xyz_path: str,
+    overwrite: bool,
+    charge: Optional[int],
+    multiplicity: Optional[int]
+) -> Dict[str, Any]:
+    """Render and write the input for one frame, timing each stage like convert_timed()."""
+    xyz_frame, output_path, load_time = task
+    timings = dict.fromkeys(CONVERSION_STAGES, 0.0)
+    timings['load'] = load_time
+    record = {
+        'file': xyz_path, 'frame': xyz_frame.index, 'output': None,
+        'status': 'failed', 'error': None, 'timings': timings,
+    }
+    try:
+        if not overwrite and Path(output_path).exists():
+            raise FileExistsError(
+                f"Output file already exists: {output_path}. "
+                f"Use overwrite=True to overwrite."
+            )
+        start = time.perf_counter()
+        bdf_content = template.render(
+            xyz_frame.coordinates,
+            charge=charge if charge is not None else xyz_frame.charge,
+            multiplicity=multiplicity if multiplicity is not None else xyz_frame.multiplicity,
+            elements=xyz_frame.symbols,
+        )
+        timings['generate'], start = time.perf_counter() - start, time.perf_counter()
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(bdf_content)
+        timings['write'] = time.perf_counter() - start
+    except Exception as e:
+        logger.error(f"Failed to convert frame {xyz_frame.index} of {xyz_path}: {e}")
+        record['error'] = e
+        return record
+    record.update(output=output_path, status='success')
+    return record
+
+
+def _render_frame_chunk(
+    key: str,
+    config: Dict[str, Any],
+    validate_input: bool,
+    tasks: List[Tuple[XYZFrame, str, float]],
+    options: Tuple[str, bool, Optional[int], Optional[int]]
+) -> List[Dict[str, Any]]:
+    """Worker entry point: render one chunk of trajectory frames."""
+    global _WORKER_TEMPLATE
+    if _WORKER_TEMPLATE is None or _WORKER_TEMPLATE[0] != (key, validate_input):
+        template = InputTemplate(config, converter=BDFConverter(validate_input=validate_input))
+        _WORKER_TEMPLATE = ((key, validate_input), template)
+    records = [_render_frame(_WORKER_TEMPLATE[1], task, *options) for task in tasks]
+    for record in records:
+        # Results travel back through pickle; replace exceptions that cannot be pickled
+        if record['error'] is not None:
+            try:
+                pickle.dumps(record['error'])
+            except Exception:
+                record['error'] = RuntimeError(f"{type(record['error']).__name__}: {record['error']}")
+    return records
+
+
 def convert_yaml_to_bdf(
     yaml_path: Union[str, Path],
     output_path: Optional[Union[str, Path]] = None,
@@ -314,7 +765,8 @@ def batch_convert_yaml(
     yaml_files: List[Union[str, Path]],
     output_dir: Optional[Union[str, Path]] = None,
     validate: bool = True,
-    overwrite: bool = False
+    overwrite: bool = False,
+    jobs: int = 1
 ) -> Dict[str, Union[Path, Exception]]:
     """
     Convenience function for batch conversion.
@@ -324,9 +776,10 @@ def batch_convert_yaml(
         output_dir: Optional output directory
         validate: Whether to validate inputs
         overwrite: Whether to overwrite existing files
+        jobs: Number of worker processes
     
     Returns:
         Dictionary mapping input paths to output paths or exceptions
     """
     tool = ConversionTool(validate_input=validate)
-    return tool.batch_convert(yaml_files, output_dir, overwrite)
+    return tool.batch_convert(yaml_files, output_dir, overwrite, jobs=jobs)
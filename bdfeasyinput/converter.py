@@ -130,14 +130,39 @@ class BDFConverter:
         """
         # Validate input if enabled
         if self.validate_input:
-            try:
-                validated_model, validation_warnings = self.validator.validate(config)
-                # Show warnings if any
-                for warning in validation_warnings:
-                    warnings.warn(warning, UserWarning)
-            except ValidationError as e:
-                raise ValidationError(f"Input validation failed: {e}") from e
-        
+            self.validate(config)
+        return self.generate(config)
+
+    def validate(self, config: Dict[str, Any]) -> None:
+        """
+        Validate a YAML configuration and emit its warnings.
+
+        Only the schema check is run; the validated model is not converted
+        back to a dictionary because generate() works on the raw config.
+
+        Raises:
+            ValidationError: If input validation fails
+        """
+        if self.validator is None:
+            self.validator = BDFValidator()
+        try:
+            _, validation_warnings = self.validator.validate(config, as_dict=False)
+            # Show warnings if any
+            for warning in validation_warnings:
+                warnings.warn(warning, UserWarning)
+        except ValidationError as e:
+            raise ValidationError(f"Input validation failed: {e}") from e
+
+    def generate(self, config: Dict[str, Any]) -> str:
+        """
+        Generate BDF input from an (already validated) YAML configuration.
+
+        Args:
+            config: YAML configuration dictionary
+
+        Returns:
+            BDF input file content as string
+        """
         blocks = []
         
         task_type = config.get('task', {}).get('type', 'energy')
@@ -327,6 +352,22 @@ class BDFConverter:
         
         return '\n'.join(result_lines)
 
+    def compile_template(self, config: Dict[str, Any]) -> 'InputTemplate':
+        """
+        Compile a configuration into an InputTemplate for ensemble generation.
+
+        The template renders inputs that differ only in coordinates (and
+        optionally charge/multiplicity) without regenerating every block.
+
+        Args:
+            config: YAML configuration dictionary
+
+        Returns:
+            InputTemplate that converts with this converter
+        """
+        from .template import InputTemplate
+        return InputTemplate(config, converter=self)
+
     def convert_file(self, yaml_path: str, output_path: Optional[str] = None) -> str:
         """
         Convert YAML file to BDF input file.
@@ -6,11 +6,26 @@ This module provides functionality to execute BDF calculations.
 
 from .bdfautotest import BDFAutotestRunner
 from .bdf_direct import BDFDirectRunner
+from .jobs import JobHandle, as_completed
+from .poller import StatusPoller, poll_many
 from .runner import create_runner
+from .scheduler import LocalScheduler, SchedulerReport, run_many
+from .slurm_monitor import SlurmMonitor
+from .workflow import Workflow, WorkflowStep
 
 __all__ = [
     'BDFAutotestRunner',
     'BDFDirectRunner',
     'create_runner',
+    'JobHandle',
+    'as_completed',
+    'StatusPoller',
+    'poll_many',
+    'LocalScheduler',
+    'SchedulerReport',
+    'run_many',
+    'SlurmMonitor',
+    'Workflow',
+    'WorkflowStep',
 ]
 
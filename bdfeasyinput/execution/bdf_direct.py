@@ -10,7 +10,9 @@ import random
 import subprocess
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
+
+from .jobs import DEFAULT_POLL_INTERVAL, FinishedJobHandle, JobHandle, ProcessJobHandle
 
 
 class BDFDirectRunner:
@@ -73,6 +75,9 @@ class BDFDirectRunner:
         input_file: str,
         timeout: Optional[int] = None,
         use_debug_dir: bool = False,
+        omp_num_threads: Optional[int] = None,
+        cpu_affinity: Optional[Sequence[int]] = None,
+        bdf_tmpdir: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -82,6 +87,9 @@ class BDFDirectRunner:
             input_file: BDF 输入文件路径（.inp 文件）
             timeout: 超时时间（秒，可选）
             use_debug_dir: 是否使用 bdfeasyinput/debug 作为工作目录（用于测试）
+            omp_num_threads: 本次运行的 OpenMP 线程数（覆盖初始化时的设置）
+            cpu_affinity: 将 BDF 进程绑定到这些 CPU（需要 os.sched_setaffinity，可选）
+            bdf_tmpdir: 本次运行的临时目录（覆盖初始化时的模板）
             **kwargs: 其他参数（暂未使用）
         
         Returns:
@@ -96,6 +104,100 @@ class BDFDirectRunner:
                 'execution_time': float # 执行时间（秒）
             }
         """
+        job = self._prepare(input_file, use_debug_dir, omp_num_threads, cpu_affinity, bdf_tmpdir)
+        start_time = time.time()
+        
+        try:
+            # 运行 BDF 命令
+            # 标准输出和标准错误都保存到文件
+            with open(job['log_file'], "w", encoding="utf-8") as log_f, \
+                 open(job['err_file'], "w", encoding="utf-8") as err_f:
+                process = subprocess.run(
+                    job['cmd'],
+                    cwd=str(job['work_dir']),
+                    env=job['env'],
+                    stdout=log_f,
+                    stderr=err_f,
+                    timeout=timeout,
+                    check=False,
+                    text=True,
+                    **job['popen_kwargs']
+                )
+            
+            execution_time = time.time() - start_time
+            timed_out = bool(timeout and execution_time >= timeout)
+            return self._build_result(job, process.returncode, execution_time, timed_out)
+            
+        except subprocess.TimeoutExpired:
+            execution_time = time.time() - start_time
+            return self._timeout_result(job, timeout, execution_time)
+        except Exception as e:
+            execution_time = time.time() - start_time
+            return self._error_result(job, e, execution_time)
+    
+    def submit(
+        self,
+        input_file: str,
+        timeout: Optional[int] = None,
+        use_debug_dir: bool = False,
+        omp_num_threads: Optional[int] = None,
+        cpu_affinity: Optional[Sequence[int]] = None,
+        bdf_tmpdir: Optional[str] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        **kwargs
+    ) -> JobHandle:
+        """
+        启动 BDF 计算并立即返回作业句柄（不阻塞）
+        
+        参数与 run() 相同；handle.result() 返回与 run() 相同格式的字典。
+        
+        Args:
+            poll_interval: handle.wait() 的轮询间隔（秒）
+        
+        Returns:
+            JobHandle
+        """
+        job = self._prepare(input_file, use_debug_dir, omp_num_threads, cpu_affinity, bdf_tmpdir)
+        log_f = open(job['log_file'], "w", encoding="utf-8")
+        err_f = open(job['err_file'], "w", encoding="utf-8")
+        
+        def cleanup():
+            log_f.close()
+            err_f.close()
+        
+        try:
+            process = subprocess.Popen(
+                job['cmd'],
+                cwd=str(job['work_dir']),
+                env=job['env'],
+                stdout=log_f,
+                stderr=err_f,
+                text=True,
+                **job['popen_kwargs']
+            )
+        except Exception as e:
+            cleanup()
+            return FinishedJobHandle(job['name'], self._error_result(job, e, 0.0))
+        
+        def finalize(returncode: int, execution_time: float, timed_out: bool) -> Dict[str, Any]:
+            if timed_out:
+                return self._timeout_result(job, timeout, execution_time)
+            return self._build_result(job, returncode, execution_time, False)
+        
+        return ProcessJobHandle(
+            job['name'], process, finalize,
+            timeout=timeout, poll_interval=poll_interval, cleanup=cleanup,
+        )
+    
+    def _prepare(
+        self,
+        input_file: str,
+        use_debug_dir: bool,
+        omp_num_threads: Optional[int],
+        cpu_affinity: Optional[Sequence[int]],
+        bdf_tmpdir: Optional[str],
+    ) -> Dict[str, Any]:
+        """准备工作目录、临时目录、命令和环境变量（run() 与 submit() 共用）"""
         input_path = Path(input_file).resolve()
         
         if not input_path.exists():
@@ -134,11 +236,12 @@ class BDFDirectRunner:
         
         # 为本次运行生成临时目录（支持 $RANDOM 占位符）
         # 每次运行都使用新的随机目录，避免冲突
-        if "$RANDOM" in self.bdf_tmpdir_template:
+        tmpdir_template = bdf_tmpdir or self.bdf_tmpdir_template
+        if "$RANDOM" in tmpdir_template:
             rnd = random.randint(0, 999999)
-            run_tmpdir_str = self.bdf_tmpdir_template.replace("$RANDOM", str(rnd))
+            run_tmpdir_str = tmpdir_template.replace("$RANDOM", str(rnd))
         else:
-            run_tmpdir_str = self.bdf_tmpdir_template
+            run_tmpdir_str = tmpdir_template
         run_tmpdir = Path(run_tmpdir_str).resolve()
         run_tmpdir.mkdir(parents=True, exist_ok=True)
         
@@ -155,99 +258,101 @@ class BDFDirectRunner:
         env["BDFHOME"] = str(self.bdf_home)
         env["BDF_WORKDIR"] = str(work_dir)
         env["BDF_TMPDIR"] = str(run_tmpdir)  # 使用本次运行的临时目录
-        env["OMP_NUM_THREADS"] = str(self.omp_num_threads)
+        env["OMP_NUM_THREADS"] = str(omp_num_threads or self.omp_num_threads)
         env["OMP_STACKSIZE"] = str(self.omp_stacksize)
         
-        start_time = time.time()
+        # CPU 绑定：进程启动前设置亲和性，OpenMP 线程在分配的核上就近放置
+        popen_kwargs = {}
+        if cpu_affinity and hasattr(os, "sched_setaffinity"):
+            cpus = set(cpu_affinity)
+            popen_kwargs["preexec_fn"] = lambda: os.sched_setaffinity(0, cpus)
+            env["OMP_PROC_BIND"] = "close"
+            env["OMP_PLACES"] = "cores"
         
-        try:
-            # 运行 BDF 命令
-            # 标准输出和标准错误都保存到文件
-            with open(log_file, "w", encoding="utf-8") as log_f, \
-                 open(err_file, "w", encoding="utf-8") as err_f:
-                process = subprocess.run(
-                    cmd,
-                    cwd=str(work_dir),
-                    env=env,
-                    stdout=log_f,
-                    stderr=err_f,
-                    timeout=timeout,
-                    check=False,
-                    text=True
-                )
-            
-            execution_time = time.time() - start_time
-            
-            # 读取输出文件内容
-            stdout_content = ""
-            stderr_content = ""
-            if log_file.exists():
-                try:
-                    stdout_content = log_file.read_text(encoding="utf-8")
-                except Exception:
-                    stdout_content = f"Failed to read log file: {log_file}"
-            
-            if err_file.exists():
-                try:
-                    stderr_content = err_file.read_text(encoding="utf-8")
-                except Exception:
-                    stderr_content = f"Failed to read error file: {err_file}"
-            
-            # 确定状态
-            if process.returncode == 0:
-                status = 'success'
-            elif timeout and execution_time >= timeout:
-                status = 'timeout'
-            else:
-                status = 'failed'
-            
-            result = {
-                'status': status,
-                'output_file': str(log_file),
-                'error_file': str(err_file),
-                'exit_code': process.returncode,
-                'stdout': stdout_content,
-                'stderr': stderr_content,
-                'execution_time': execution_time,
-                'command': ' '.join(cmd),
-                'bdf_home': str(self.bdf_home),
-                'bdf_workdir': str(work_dir),
-                'bdf_tmpdir': str(run_tmpdir)  # 本次运行使用的临时目录
-            }
-            
-            return result
-            
-        except subprocess.TimeoutExpired:
-            execution_time = time.time() - start_time
-            return {
-                'status': 'timeout',
-                'output_file': str(log_file),
-                'error_file': str(err_file),
-                'exit_code': -1,
-                'stdout': '',
-                'stderr': f'Calculation timed out after {timeout} seconds',
-                'execution_time': execution_time,
-                'command': ' '.join(cmd),
-                'bdf_home': str(self.bdf_home),
-                'bdf_workdir': str(work_dir),
-                'bdf_tmpdir': str(run_tmpdir)  # 本次运行使用的临时目录
-            }
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return {
-                'status': 'failed',
-                'output_file': str(log_file),
-                'error_file': str(err_file),
-                'exit_code': -1,
-                'stdout': '',
-                'stderr': str(e),
-                'execution_time': execution_time,
-                'command': ' '.join(cmd),
-                'bdf_home': str(self.bdf_home),
-                'bdf_workdir': str(work_dir),
-                'bdf_tmpdir': str(run_tmpdir) if 'run_tmpdir' in locals() else str(self.bdf_tmpdir_template),
-                'error': str(e)
-            }
+        return {
+            'name': input_name,
+            'cmd': cmd,
+            'env': env,
+            'work_dir': work_dir,
+            'log_file': log_file,
+            'err_file': err_file,
+            'run_tmpdir': run_tmpdir,
+            'popen_kwargs': popen_kwargs,
+        }
+    
+    def _base_result(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """结果字典中与运行状态无关的字段"""
+        return {
+            'output_file': str(job['log_file']),
+            'error_file': str(job['err_file']),
+            'command': ' '.join(job['cmd']),
+            'bdf_home': str(self.bdf_home),
+            'bdf_workdir': str(job['work_dir']),
+            'bdf_tmpdir': str(job['run_tmpdir'])  # 本次运行使用的临时目录
+        }
+    
+    def _build_result(
+        self,
+        job: Dict[str, Any],
+        returncode: int,
+        execution_time: float,
+        timed_out: bool,
+    ) -> Dict[str, Any]:
+        """进程正常退出后构造结果字典"""
+        log_file, err_file = job['log_file'], job['err_file']
+        
+        # 读取输出文件内容
+        stdout_content = ""
+        stderr_content = ""
+        if log_file.exists():
+            try:
+                stdout_content = log_file.read_text(encoding="utf-8")
+            except Exception:
+                stdout_content = f"Failed to read log file: {log_file}"
+        
+        if err_file.exists():
+            try:
+                stderr_content = err_file.read_text(encoding="utf-8")
+            except Exception:
+                stderr_content = f"Failed to read error file: {err_file}"
+        
+        # 确定状态
+        if returncode == 0:
+            status = 'success'
+        elif timed_out:
+            status = 'timeout'
+        else:
+            status = 'failed'
+        
+        return {
+            'status': status,
+            'exit_code': returncode,
+            'stdout': stdout_content,
+            'stderr': stderr_content,
+            'execution_time': execution_time,
+            **self._base_result(job),
+        }
+    
+    def _timeout_result(self, job: Dict[str, Any], timeout: Optional[int], execution_time: float) -> Dict[str, Any]:
+        return {
+            'status': 'timeout',
+            'exit_code': -1,
+            'stdout': '',
+            'stderr': f'Calculation timed out after {timeout} seconds',
+            'execution_time': execution_time,
+            **self._base_result(job),
+        }
+    
+    def _error_result(self, job: Dict[str, Any], error: Exception, execution_time: float) -> Dict[str, Any]:
+        return {
+            'status': 'failed',
+            'exit_code': -1,
+            'stdout': '',
+            'stderr': str(error),
+            'execution_time': execution_time,
+            **self._base_result(job),
+            'error': str(error)
+        }
     
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> 'BDFDirectRunner':
@@ -6,10 +6,13 @@ This module provides a simple interface to run BDF calculations through BDFAutot
 
 import os
 import subprocess
+import tempfile
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from .jobs import DEFAULT_POLL_INTERVAL, FinishedJobHandle, JobHandle, ProcessJobHandle
+
 
 class BDFAutotestRunner:
     """
@@ -89,6 +92,94 @@ class BDFAutotestRunner:
                 'execution_time': float # 执行时间（秒）
             }
         """
+        job = self._prepare(input_file, output_dir, use_debug_dir, kwargs)
+        start_time = time.time()
+        
+        try:
+            # 运行命令
+            # 需要在 BDFAutoTest 目录下运行，并设置 PYTHONPATH
+            process = subprocess.run(
+                job['cmd'],
+                cwd=str(self.bdfautotest_path),  # 在 BDFAutoTest 目录下运行
+                env=job['env'],  # 设置环境变量
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=False
+            )
+            
+            execution_time = time.time() - start_time
+            timed_out = bool(timeout and execution_time >= timeout)
+            return self._build_result(job, process.returncode, process.stdout, process.stderr, execution_time, timed_out)
+            
+        except subprocess.TimeoutExpired:
+            execution_time = time.time() - start_time
+            return self._timeout_result(job, timeout, execution_time)
+        except Exception as e:
+            execution_time = time.time() - start_time
+            return self._error_result(job, e, execution_time)
+    
+    def submit(
+        self,
+        input_file: str,
+        output_dir: Optional[str] = None,
+        timeout: Optional[int] = None,
+        use_debug_dir: bool = False,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        **kwargs
+    ) -> JobHandle:
+        """
+        启动 BDFAutotest 计算并立即返回作业句柄（不阻塞）
+        
+        参数与 run() 相同；handle.result() 返回与 run() 相同格式的字典。
+        
+        Args:
+            poll_interval: handle.wait() 的轮询间隔（秒）
+        
+        Returns:
+            JobHandle
+        """
+        job = self._prepare(input_file, output_dir, use_debug_dir, kwargs)
+        # 输出写入临时文件而不是管道，避免输出较多时子进程阻塞
+        stdout_f = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+        stderr_f = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+        
+        def read_and_close(f) -> str:
+            f.seek(0)
+            content = f.read()
+            f.close()
+            return content
+        
+        try:
+            process = subprocess.Popen(
+                job['cmd'],
+                cwd=str(self.bdfautotest_path),
+                env=job['env'],
+                stdout=stdout_f,
+                stderr=stderr_f,
+                text=True
+            )
+        except Exception as e:
+            stdout_f.close()
+            stderr_f.close()
+            return FinishedJobHandle(job['name'], self._error_result(job, e, 0.0))
+        
+        def finalize(returncode: int, execution_time: float, timed_out: bool) -> Dict[str, Any]:
+            stdout, stderr = read_and_close(stdout_f), read_and_close(stderr_f)
+            if timed_out:
+                return self._timeout_result(job, timeout, execution_time)
+            return self._build_result(job, returncode, stdout, stderr, execution_time, False)
+        
+        return ProcessJobHandle(job['name'], process, finalize, timeout=timeout, poll_interval=poll_interval)
+    
+    def _prepare(
+        self,
+        input_file: str,
+        output_dir: Optional[str],
+        use_debug_dir: bool,
+        extra_args: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """确定输出目录并构造命令和环境变量（run() 与 submit() 共用）"""
         input_path = Path(input_file).resolve()
         
         if not input_path.exists():
@@ -133,106 +224,106 @@ class BDFAutotestRunner:
         ]
         
         # 添加额外参数
-        for key, value in kwargs.items():
+        for key, value in extra_args.items():
             if value is not None:
                 cmd.extend([f'--{key.replace("_", "-")}', str(value)])
         
-        start_time = time.time()
+        env = os.environ.copy()
+        env['PYTHONPATH'] = str(self.bdfautotest_path) + (os.pathsep + env.get('PYTHONPATH', ''))
         
-        try:
-            # 运行命令
-            # 需要在 BDFAutoTest 目录下运行，并设置 PYTHONPATH
-            env = os.environ.copy()
-            env['PYTHONPATH'] = str(self.bdfautotest_path) + (os.pathsep + env.get('PYTHONPATH', ''))
-            
-            process = subprocess.run(
-                cmd,
-                cwd=str(self.bdfautotest_path),  # 在 BDFAutoTest 目录下运行
-                env=env,  # 设置环境变量
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False
-            )
-            
-            execution_time = time.time() - start_time
-            
-            # 确定实际输出文件（BDFAutotest 会在工作目录生成 .log 文件）
-            # 根据 BDFAutotest 的 run_input_command，输出文件在工作目录
-            work_dir = output_path  # 使用输出目录作为工作目录
-            log_file_work = work_dir / input_path.with_suffix('.log').name
-            err_file_work = work_dir / input_path.with_suffix('.err').name
-            
-            actual_output_file = None
-            if log_file_work.exists():
-                actual_output_file = str(log_file_work)
-            elif output_file.exists():
-                actual_output_file = str(output_file)
-            elif log_file.exists():
-                actual_output_file = str(log_file)
-            else:
-                # 尝试查找其他可能的输出文件
-                for ext in ['.log', '.out', '.out.tmp']:
-                    candidate = work_dir / input_path.with_suffix(ext).name
-                    if candidate.exists():
-                        actual_output_file = str(candidate)
-                        break
-            
-            # 确定状态
-            if process.returncode == 0:
-                status = 'success'
-            elif timeout and execution_time >= timeout:
-                status = 'timeout'
-            else:
-                status = 'failed'
-            
-            result = {
-                'status': status,
-                'output_file': actual_output_file or str(output_file),
-                'exit_code': process.returncode,
-                'stdout': process.stdout,
-                'stderr': process.stderr,
-                'execution_time': execution_time,
-                'command': ' '.join(cmd)
-            }
-            
-            # 如果有错误输出，尝试提取错误文件路径
-            if process.stderr:
-                result['error_info'] = process.stderr[:500]  # 前500字符
-            
-            # 检查是否有错误文件
-            if err_file_work.exists():
-                result['error_file'] = str(err_file_work)
-            
-            # 检查是否有错误文件
-            if err_file_work.exists():
-                result['error_file'] = str(err_file_work)
-            
-            return result
-            
-        except subprocess.TimeoutExpired:
-            execution_time = time.time() - start_time
-            return {
-                'status': 'timeout',
-                'output_file': str(output_file),
-                'exit_code': -1,
-                'stdout': '',
-                'stderr': f'Calculation timed out after {timeout} seconds',
-                'execution_time': execution_time,
-                'command': ' '.join(cmd)
-            }
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return {
-                'status': 'failed',
-                'output_file': str(output_file),
-                'exit_code': -1,
-                'stdout': '',
-                'stderr': str(e),
-                'execution_time': execution_time,
-                'command': ' '.join(cmd),
-                'error': str(e)
-            }
+        return {
+            'name': input_path.stem,
+            'input_path': input_path,
+            'output_path': output_path,
+            'output_file': output_file,
+            'log_file': log_file,
+            'cmd': cmd,
+            'env': env,
+        }
+    
+    def _build_result(
+        self,
+        job: Dict[str, Any],
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        execution_time: float,
+        timed_out: bool,
+    ) -> Dict[str, Any]:
+        """进程退出后查找输出文件并构造结果字典"""
+        input_path, output_file, log_file = job['input_path'], job['output_file'], job['log_file']
+        
+        # 确定实际输出文件（BDFAutotest 会在工作目录生成 .log 文件）
+        # 根据 BDFAutotest 的 run_input_command，输出文件在工作目录
+        work_dir = job['output_path']  # 使用输出目录作为工作目录
+        log_file_work = work_dir / input_path.with_suffix('.log').name
+        err_file_work = work_dir / input_path.with_suffix('.err').name
+        
+        actual_output_file = None
+        if log_file_work.exists():
+            actual_output_file = str(log_file_work)
+        elif output_file.exists():
+            actual_output_file = str(output_file)
+        elif log_file.exists():
+            actual_output_file = str(log_file)
+        else:
+            # 尝试查找其他可能的输出文件
+            for ext in ['.log', '.out', '.out.tmp']:
+                candidate = work_dir / input_path.with_suffix(ext).name
+                if candidate.exists():
+                    actual_output_file = str(candidate)
+                    break
+        
+        # 确定状态
+        if returncode == 0:
+            status = 'success'
+        elif timed_out:
+            status = 'timeout'
+        else:
+            status = 'failed'
+        
+        result = {
+            'status': status,
+            'output_file': actual_output_file or str(output_file),
+            'exit_code': returncode,
+            'stdout': stdout,
+            'stderr': stderr,
+            'execution_time': execution_time,
+            'command': ' '.join(job['cmd'])
+        }
+        
+        # 如果有错误输出，尝试提取错误文件路径
+        if stderr:
+            result['error_info'] = stderr[:500]  # 前500字符
+        
+        # 检查是否有错误文件
+        if err_file_work.exists():
+            result['error_file'] = str(err_file_work)
+        
+        return result
+    
+    def _timeout_result(self, job: Dict[str, Any], timeout: Optional[int], execution_time: float) -> Dict[str, Any]:
+        return {
+            'status': 'timeout',
+            'output_file': str(job['output_file']),
+            'exit_code': -1,
+            'stdout': '',
+            'stderr': f'Calculation timed out after {timeout} seconds',
+            'execution_time': execution_time,
+            'command': ' '.join(job['cmd'])
+        }
+    
+    def _error_result(self, job: Dict[str, Any], error: Exception, execution_time: float) -> Dict[str, Any]:
+        return {
+            'status': 'failed',
+            'output_file': str(job['output_file']),
+            'exit_code': -1,
+            'stdout': '',
+            'stderr': str(error),
+            'execution_time': execution_time,
+            'command': ' '.join(job['cmd']),
+            'error': str(error)
+        }
     
     def check_bdf_installation(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,309 @@
+"""
+Job Handles
+
+This module provides the non-blocking job API shared by all runners:
+``runner.submit(input_file) -> JobHandle``. A handle can be polled, waited
+on, cancelled and awaited from an asyncio event loop. Polling never blocks:
+local jobs check their process with ``Popen.poll()`` and remote jobs run
+their status command in the background and pick up its output on the next
+poll, so a single driver loop can keep many jobs in flight.
+"""
+
+import asyncio
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# 作业状态
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCESS = 'success'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+CANCELLED = 'cancelled'
+FINAL_STATES = frozenset({SUCCESS, FAILED, TIMEOUT, CANCELLED})
+
+# 本地进程的默认轮询间隔（秒）；远程作业使用各自 runner 的 poll_interval
+DEFAULT_POLL_INTERVAL = 0.5
+
+# cancel() 发送 SIGTERM 后等待进程退出的时间（秒），超时后 SIGKILL
+TERMINATE_GRACE = 5.0
+
+
+class JobHandle:
+    """
+    作业句柄基类
+
+    子类实现 _poll()（非阻塞地更新状态，结束时调用 _finish()）和
+    _cancel()（终止作业并返回结果字典，无法取消时返回 None）。
+    result() 返回的字典与对应 runner.run() 的返回值格式相同。
+    """
+
+    def __init__(self, name: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            name: 作业名（通常为输入文件名去掉扩展名）
+            poll_interval: wait() 两次轮询之间的间隔（秒）
+        """
+        self.name = name
+        self.poll_interval = poll_interval
+        self.status = PENDING
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._result: Optional[Dict[str, Any]] = None
+        self._callbacks: List[Callable[['JobHandle'], None]] = []
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r} {self.status}>"
+
+    def done(self) -> bool:
+        """作业是否已结束（成功、失败、超时或取消）"""
+        return self.status in FINAL_STATES
+
+    def poll(self) -> str:
+        """
+        非阻塞地更新并返回作业状态
+
+        Returns:
+            'pending' | 'running' | 'success' | 'failed' | 'timeout' | 'cancelled'
+        """
+        if not self.done():
+            self._poll()
+        return self.status
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        阻塞等待作业结束
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            作业结果字典
+
+        Raises:
+            TimeoutError: 超过 timeout 时作业仍未结束（作业本身不会被取消）
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while self.poll() not in FINAL_STATES:
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Job {self.name} still {self.status} after {timeout} seconds")
+            delay = self.poll_interval
+            if deadline is not None:
+                delay = max(0.0, min(delay, deadline - time.time()))
+            time.sleep(delay)
+        return self._result
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """等待作业结束并返回结果字典（同 wait()）"""
+        return self.wait(timeout)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        在 asyncio 事件循环中等待作业结束（await handle 等价于 await handle.wait_async()）
+
+        Raises:
+            TimeoutError: 超过 timeout 时作业仍未结束
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while self.poll() not in FINAL_STATES:
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Job {self.name} still {self.status} after {timeout} seconds")
+            await asyncio.sleep(self.poll_interval)
+        return self._result
+
+    def __await__(self):
+        return self.wait_async().__await__()
+
+    def cancel(self) -> bool:
+        """
+        取消作业
+
+        Returns:
+            是否成功取消（已结束的作业返回 False）
+        """
+        if self.done():
+            return False
+        result = self._cancel()
+        if result is None:
+            return False
+        result['status'] = CANCELLED
+        self._finish(CANCELLED, result)
+        return True
+
+    def add_done_callback(self, callback: Callable[['JobHandle'], None]) -> None:
+        """作业结束时调用 callback(handle)；已结束时立即调用"""
+        if self.done():
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _finish(self, status: str, result: Dict[str, Any]) -> None:
+        result['status'] = status
+        self.status = status
+        self.finished_at = time.time()
+        self._result = result
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def _poll(self) -> None:
+        raise NotImplementedError
+
+    def _cancel(self) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class FinishedJobHandle(JobHandle):
+    """已有结果的句柄（如提交阶段即失败的作业）"""
+
+    def __init__(self, name: str, result: Dict[str, Any]):
+        super().__init__(name)
+        self._finish(result.get('status', FAILED), result)
+
+    def _poll(self) -> None:
+        pass
+
+    def _cancel(self) -> Optional[Dict[str, Any]]:
+        return None
+
+
+class ProcessJobHandle(JobHandle):
+    """
+    本地子进程作业句柄
+
+    finalize(returncode, execution_time, timed_out) 在进程结束后构造结果字典，
+    由 runner 提供，保证与 runner.run() 的返回值一致。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process: subprocess.Popen,
+        finalize: Callable[[int, float, bool], Dict[str, Any]],
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        cleanup: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+            name: 作业名
+            process: 已启动的子进程
+            finalize: 构造结果字典的回调
+            timeout: 超时时间（秒），超时后终止进程并返回 status='timeout'
+            poll_interval: wait() 的轮询间隔（秒）
+            cleanup: 进程结束后调用（如关闭重定向的文件）
+        """
+        super().__init__(name, poll_interval)
+        self.process = process
+        self.status = RUNNING
+        self._finalize = finalize
+        self._cleanup = cleanup
+        self._deadline = None if not timeout else self.submitted_at + timeout
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def _poll(self) -> None:
+        returncode = self.process.poll()
+        timed_out = False
+        if returncode is None:
+            if self._deadline is None or time.time() < self._deadline:
+                return
+            returncode = self._terminate()
+            timed_out = True
+        self._complete(returncode, timed_out)
+
+    def _complete(self, returncode: int, timed_out: bool) -> None:
+        if self._cleanup is not None:
+            self._cleanup()
+        result = self._finalize(returncode, time.time() - self.submitted_at, timed_out)
+        self._finish(result.get('status', FAILED), result)
+
+    def _terminate(self) -> int:
+        self.process.terminate()
+        try:
+            return self.process.wait(TERMINATE_GRACE)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            return self.process.wait()
+
+    def _cancel(self) -> Optional[Dict[str, Any]]:
+        returncode = self._terminate()
+        if self._cleanup is not None:
+            self._cleanup()
+        return self._finalize(returncode, time.time() - self.submitted_at, False)
+
+
+class BackgroundCommand:
+    """
+    在后台运行的本地命令（如一次 ssh 状态查询）
+
+    输出写入临时文件而不是管道，避免输出较多时子进程因管道写满而阻塞。
+    """
+
+    def __init__(self, cmd: List[str]):
+        self.cmd = cmd
+        self._stdout = tempfile.TemporaryFile()
+        self._stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdout=self._stdout, stderr=self._stderr)
+
+    def poll(self) -> Optional[Tuple[int, bytes, bytes]]:
+        """
+        Returns:
+            命令结束时返回 (returncode, stdout, stderr)，否则返回 None
+        """
+        returncode = self.process.poll()
+        if returncode is None:
+            return None
+        outputs = []
+        for f in (self._stdout, self._stderr):
+            f.seek(0)
+            outputs.append(f.read())
+            f.close()
+        return returncode, outputs[0], outputs[1]
+
+    def kill(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self._stdout.close()
+        self._stderr.close()
+
+
+def as_completed(
+    handles: Iterable[JobHandle],
+    timeout: Optional[float] = None,
+    poll_interval: Optional[float] = None,
+) -> Iterator[JobHandle]:
+    """
+    按完成顺序依次产出作业句柄（在一个循环中轮询所有作业，不为每个作业创建线程）
+
+    Args:
+        handles: 作业句柄
+        timeout: 最长等待时间（秒）
+        poll_interval: 每轮轮询之间的间隔（默认取各句柄 poll_interval 的最小值）
+
+    Raises:
+        TimeoutError: 超过 timeout 时仍有作业未结束
+    """
+    pending = list(handles)
+    if poll_interval is None:
+        poll_interval = min((h.poll_interval for h in pending), default=DEFAULT_POLL_INTERVAL)
+    deadline = None if timeout is None else time.time() + timeout
+    while pending:
+        still_pending = []
+        for handle in pending:
+            if handle.poll() in FINAL_STATES:
+                yield handle
+            else:
+                still_pending.append(handle)
+        pending = still_pending
+        if not pending:
+            break
+        if deadline is not None and time.time() >= deadline:
+            raise TimeoutError(f"{len(pending)} job(s) still running after {timeout} seconds")
+        time.sleep(poll_interval)
@@ -0,0 +1,259 @@
+"""
+Batched Remote Status Polling
+
+This module provides StatusPoller, which watches many remote job handles
+(SSHRemoteRunner / SSHSlurmRunner) at once. Instead of one ssh session per
+job per interval, all jobs on the same host that are due for a check are
+queried with a single remote command that prints a compact status table
+(split into several commands once more than max_batch jobs are due).
+Each job backs off its polling interval while it shows no progress and
+drops back to the base interval as soon as something changes, so long
+calculations cost fewer and fewer checks.
+"""
+
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .jobs import BackgroundCommand, JobHandle
+
+
+# 默认的轮询间隔（秒）、退避倍数和最大间隔（秒）
+DEFAULT_MIN_INTERVAL = 30.0
+DEFAULT_BACKOFF = 1.5
+DEFAULT_MAX_INTERVAL = 600.0
+
+# 一次远程查询最多包含的作业数（限制 ssh 远程命令参数的长度）
+DEFAULT_MAX_BATCH = 200
+
+
+class _Watch:
+    """StatusPoller 中一个作业的轮询状态"""
+
+    __slots__ = ("handle", "interval", "next_poll")
+
+    def __init__(self, handle: JobHandle, interval: float):
+        self.handle = handle
+        self.interval = interval
+        self.next_poll = 0.0
+
+
+class StatusPoller:
+    """
+    批量轮询远程作业状态
+
+    支持批量查询的句柄（SSHJobHandle、SlurmJobHandle）提供：
+    - batch_key：同一 key 的作业可以合并为一次远程命令（主机 + 作业类型）
+    - _batch_command(handles)：类方法，构造一次查询所有 handles 的 ssh 命令
+    - _parse_batch(handles, stdout)：类方法，按 handles 顺序返回各自的状态（缺失为 None）
+    - _apply_status(status)：处理本作业的状态，返回是否有进展（新日志、状态变化）
+    - _check_deadline()：超过最大等待时间时结束作业并返回 True
+
+    加入 poller 的句柄仍可照常使用 poll()/wait()/result()/as_completed()，
+    它们会转而驱动 poller，不再单独发起 ssh 查询。
+    """
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        on_complete: Optional[Callable[[JobHandle], None]] = None,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """
+        Args:
+            min_interval: 作业有进展时的轮询间隔（秒）
+            max_interval: 退避后的最大轮询间隔（秒）
+            backoff: 一次轮询无进展时间隔乘以的倍数（1 表示不退避）
+            on_complete: 任一作业结束时调用 on_complete(handle)
+            max_batch: 一次远程查询最多包含的作业数，更多的到期作业分为多个并发查询
+        """
+        if backoff < 1:
+            raise ValueError(f"backoff must be >= 1, got {backoff}")
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.on_complete = on_complete
+        self.max_batch = max_batch
+        self.remote_calls = 0
+        self._watches: Dict[Hashable, List[_Watch]] = {}
+        self._inflight: Dict[Hashable, List[Tuple[BackgroundCommand, List[_Watch]]]] = {}
+        self._completed: List[JobHandle] = []
+
+    def __len__(self) -> int:
+        return sum(len(watches) for watches in self._watches.values())
+
+    def add(self, handle: JobHandle, callback: Optional[Callable[[JobHandle], None]] = None) -> JobHandle:
+        """
+        开始批量轮询一个作业
+
+        Args:
+            handle: 作业句柄（已结束的句柄只触发回调）
+            callback: 该作业结束时调用 callback(handle)
+
+        Returns:
+            handle 本身
+        """
+        if not handle.done():
+            if not hasattr(handle, "batch_key"):
+                raise TypeError(f"{type(handle).__name__} does not support batched polling")
+            handle._poller = self
+            self._watches.setdefault(handle.batch_key, []).append(_Watch(handle, self.min_interval))
+            if self.on_complete is not None:
+                handle.add_done_callback(self.on_complete)
+        else:
+            self._completed.append(handle)
+            if self.on_complete is not None:
+                self.on_complete(handle)
+        if callback is not None:
+            handle.add_done_callback(callback)
+        return handle
+
+    def submit(
+        self,
+        runner: Any,
+        input_file: str,
+        callback: Optional[Callable[[JobHandle], None]] = None,
+        **kwargs: Any,
+    ) -> JobHandle:
+        """调用 runner.submit(input_file, **kwargs) 并将返回的句柄加入轮询。"""
+        return self.add(runner.submit(input_file, **kwargs), callback)
+
+    def pending(self) -> List[JobHandle]:
+        """尚未结束的作业"""
+        return [w.handle for watches in self._watches.values() for w in watches]
+
+    def poll(self) -> List[JobHandle]:
+        """
+        非阻塞地推进一轮轮询：处理已返回的查询结果，并在某个主机的上一轮
+        查询全部返回后，为其到期的作业发起新的查询（每 max_batch 个作业一次）。
+
+        Returns:
+            本轮结束的作业
+        """
+        first_new = len(self._completed)
+        now = time.time()
+        for key in list(self._watches):
+            inflight = []
+            for command, batch in self._inflight.pop(key, []):
+                output = command.poll()
+                if output is None:
+                    inflight.append((command, batch))
+                else:
+                    self._dispatch(batch, output[1], now)
+            watches = []
+            for watch in self._watches[key]:
+                if not watch.handle.done():
+                    watch.handle._check_deadline()
+                if watch.handle.done():
+                    self._completed.append(watch.handle)
+                else:
+                    watches.append(watch)
+            if not watches:
+                del self._watches[key]
+                for command, _ in inflight:
+                    command.kill()
+                continue
+            self._watches[key] = watches
+            if inflight:
+                self._inflight[key] = inflight
+                continue
+            due = [w for w in watches if w.next_poll <= now]
+            for start in range(0, len(due), self.max_batch):
+                batch = due[start:start + self.max_batch]
+                handles = [w.handle for w in batch]
+                cmd = type(handles[0])._batch_command(handles)
+                inflight.append((BackgroundCommand(cmd), batch))
+                self.remote_calls += 1
+            if inflight:
+                self._inflight[key] = inflight
+        return self._completed[first_new:]
+
+    def _dispatch(self, batch: List[_Watch], stdout: bytes, now: float) -> None:
+        live = [w for w in batch if not w.handle.done()]
+        if not live:
+            return
+        handles = [w.handle for w in live]
+        statuses = type(handles[0])._parse_batch(handles, stdout)
+        for watch, status in zip(live, statuses):
+            changed = status is not None and watch.handle._apply_status(status)
+            if changed:
+                watch.interval = self.min_interval
+            else:
+                watch.interval = min(watch.interval * self.backoff, self.max_interval)
+            watch.next_poll = now + watch.interval
+
+    def _tick(self) -> float:
+        """距下一次需要处理的时间（秒），用于阻塞循环的休眠"""
+        if self._inflight:
+            return min(0.2, self.min_interval)
+        now = time.time()
+        next_poll = min((w.next_poll for w in self._iter_watches()), default=now)
+        return max(0.0, min(next_poll - now, self.max_interval))
+
+    def _iter_watches(self) -> Iterator[_Watch]:
+        for watches in self._watches.values():
+            yield from watches
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[JobHandle]:
+        """
+        按完成顺序产出本 poller 中的作业（包括已结束的作业，每个只产出一次）
+
+        Raises:
+            TimeoutError: 超过 timeout 时仍有作业未结束
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        yielded = 0
+        while True:
+            self.poll()
+            while yielded < len(self._completed):
+                yielded += 1
+                yield self._completed[yielded - 1]
+            if not self._watches:
+                return
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"{len(self)} job(s) still running after {timeout} seconds")
+            delay = self._tick()
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.time()))
+            time.sleep(delay)
+
+    def wait_all(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        阻塞直到所有作业结束
+
+        Returns:
+            按结束顺序排列的结果字典
+        """
+        return [handle.result() for handle in self.as_completed(timeout)]
+
+    def close(self) -> None:
+        """终止尚未返回的查询（作业本身不受影响）"""
+        for inflight in self._inflight.values():
+            for command, _ in inflight:
+                command.kill()
+        self._inflight.clear()
+
+
+def poll_many(
+    handles: Iterable[JobHandle],
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> Iterator[JobHandle]:
+    """
+    以批量方式轮询一组远程作业并按完成顺序产出（StatusPoller 的简便入口）
+
+    Args:
+        handles: 远程作业句柄
+        timeout: 最长等待时间（秒）
+        **kwargs: 传给 StatusPoller（min_interval、max_interval、backoff、on_complete、max_batch）
+    """
+    poller = StatusPoller(**kwargs)
+    for handle in handles:
+        poller.add(handle)
+    try:
+        yield from poller.as_completed(timeout)
+    finally:
+        poller.close()
@@ -0,0 +1,155 @@
+"""
+Incremental Remote Log Access
+
+This module provides RemoteLogTail, which follows a BDF log on a remote
+host by byte offset. Each fetch transfers only the bytes appended since the
+previous one (``tail -c +N``), optionally gzip-compressed in transit, feeds
+them to the local IncrementalOutputParser and appends them to a local
+mirror of the log, so the final download after a job ends is only the last
+delta instead of a full copy.
+"""
+
+import gzip
+import subprocess
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ..analysis.parser.incremental import IncrementalOutputParser, ParseEvent
+from .ssh import SSHConnection
+
+
+# 批量轮询中增量小于该字节数时不压缩（gzip 头和字典对很小的增量得不偿失）
+COMPRESS_MIN_BYTES = 4096
+
+
+def decompress_delta(data: bytes) -> Optional[bytes]:
+    """
+    解压一段 gzip 压缩的日志增量
+
+    Returns:
+        解压后的字节；数据不完整（如 ssh 中途断开）时返回 None
+    """
+    if not data:
+        return b""
+    try:
+        return gzip.decompress(data)
+    except (OSError, EOFError, zlib.error):
+        return None
+
+
+class RemoteLogTail:
+    """
+    按字节偏移跟踪一个远程日志文件
+
+    偏移量即本地增量解析器已消费的字节数，因此每次只需传输之后追加的内容；
+    设置 local_path 时收到的字节同时追加到本地镜像文件。
+    """
+
+    def __init__(
+        self,
+        connection: SSHConnection,
+        remote_path: str,
+        local_path: Optional[Union[str, Path]] = None,
+        compress: bool = False,
+        parser: Optional[IncrementalOutputParser] = None,
+    ):
+        """
+        Args:
+            connection: 远程主机连接
+            remote_path: 远程日志路径
+            local_path: 本地镜像文件路径（为空则不保存日志，只做解析）
+            compress: 传输时是否用 gzip 压缩增量
+            parser: 增量解析器（默认新建）
+        """
+        self.connection = connection
+        self.remote_path = remote_path
+        self.local_path = Path(local_path) if local_path else None
+        self.compress = compress
+        self.parser = parser or IncrementalOutputParser()
+        self.bytes_transferred = 0
+        self._mirror_started = False
+
+    @property
+    def offset(self) -> int:
+        """已接收的日志字节数（下一次从该偏移之后开始传输）"""
+        return self.parser.offset
+
+    @property
+    def finished(self) -> bool:
+        return self.parser.finished
+
+    @property
+    def errors(self) -> List[str]:
+        return self.parser.errors
+
+    def summary(self) -> Dict[str, Any]:
+        """增量解析摘要（同 IncrementalOutputParser.summary()）"""
+        return self.parser.summary()
+
+    def fetch_command(self) -> str:
+        """构造取回 offset 之后新增内容的远程命令。"""
+        cmd = f"tail -c +{self.offset + 1} {self.remote_path} 2>/dev/null"
+        if self.compress:
+            cmd += " | gzip -c"
+        return cmd + "; true"
+
+    def feed(self, data: bytes, transferred: Optional[int] = None) -> List[ParseEvent]:
+        """
+        处理一段新增的日志字节：追加到本地镜像并送入增量解析器
+
+        Args:
+            data: 解压后的新增字节
+            transferred: 实际传输的字节数（压缩时小于 len(data)），用于统计
+
+        Returns:
+            本次解析产生的事件
+        """
+        self.bytes_transferred += len(data) if transferred is None else transferred
+        if data and self.local_path is not None:
+            # 第一次写入时如果偏移为 0 则覆盖旧文件，否则续写
+            mode = "ab" if self._mirror_started or self.offset > 0 else "wb"
+            with open(self.local_path, mode) as f:
+                f.write(data)
+            self._mirror_started = True
+        return self.parser.feed(data)
+
+    def fetch(self) -> List[ParseEvent]:
+        """
+        通过 ssh 取回新增内容并处理（阻塞）
+
+        Raises:
+            RuntimeError: ssh 命令失败或压缩数据不完整
+        """
+        proc = subprocess.run(self.connection.ssh_cmd(self.fetch_command()), capture_output=True)
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"Failed to fetch {self.remote_path} from {self.connection.target}: "
+                f"{proc.stderr.decode('utf-8', errors='ignore').strip()}"
+            )
+        data = proc.stdout
+        if self.compress:
+            data = decompress_delta(proc.stdout)
+            if data is None:
+                raise RuntimeError(f"Incomplete compressed data for {self.remote_path}")
+        return self.feed(data, len(proc.stdout))
+
+    def download(self) -> Path:
+        """
+        取回剩余的增量，使本地镜像与远程日志一致
+
+        Returns:
+            本地镜像文件路径
+
+        Raises:
+            ValueError: 未设置 local_path
+            RuntimeError: 传输失败
+        """
+        if self.local_path is None:
+            raise ValueError("local_path is required to download the log")
+        self.fetch()
+        if not self._mirror_started and self.offset == 0:
+            # 远程日志为空：同样生成（空的）本地文件
+            self.local_path.write_bytes(b"")
+            self._mirror_started = True
+        return self.local_path
@@ -6,15 +6,96 @@ Slurm cluster via password-less SSH.
 
 当前设计：
 - 在本地渲染 Slurm 作业脚本（基于一个简单模板）
-- 通过 scp 上传 BDF 输入和作业脚本
+- 将 BDF 输入、引用的几何文件和作业脚本打包为一个 tar 流经 ssh 上传（跳过内容未变的文件）
 - 在远程执行 sbatch，返回 jobid
-- 不轮询作业状态，仅负责“提交”
+- run() 不轮询作业状态，仅负责“提交”；submit() 返回可轮询/等待/取消的作业句柄
+- submit_array() 将一批输入作为作业数组提交（一次上传、一次 ssh；超过 max_array_size
+  时拆分为多个数组），返回每个任务的句柄
+- run()/submit() 支持 dependency=[jobid, ...]（sbatch --dependency=afterok:...）和
+  prologue（插入作业脚本头部之后的 shell 片段），供工作流一次排队整条依赖链
 """
 
 import re
 import subprocess
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from .jobs import (
+    CANCELLED,
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCESS,
+    TIMEOUT,
+    BackgroundCommand,
+    FinishedJobHandle,
+    JobHandle,
+)
+from .ssh import DEFAULT_CONTROL_PERSIST, SSHConnection
+from .staging import Stager, job_files
+
+
+# 状态查询输出中分隔 squeue 与 sacct 部分的标记
+SACCT_MARKER = "__BDF_SACCT__"
+
+# 作业句柄默认的状态查询间隔（秒）
+DEFAULT_SLURM_POLL_INTERVAL = 30
+
+# 单个作业数组的默认最大任务数（Slurm 默认 MaxArraySize=1001，即下标 0-1000）
+DEFAULT_MAX_ARRAY_SIZE = 1000
+
+# Slurm 作业状态到句柄状态的映射（未列出的状态视为运行中）
+SLURM_STATE_MAP = {
+    "PENDING": PENDING,
+    "CONFIGURING": PENDING,
+    "REQUEUED": PENDING,
+    "RUNNING": RUNNING,
+    "COMPLETING": RUNNING,
+    "SUSPENDED": RUNNING,
+    "COMPLETED": SUCCESS,
+    "FAILED": FAILED,
+    "NODE_FAIL": FAILED,
+    "BOOT_FAIL": FAILED,
+    "OUT_OF_MEMORY": FAILED,
+    "DEADLINE": FAILED,
+    "PREEMPTED": FAILED,
+    "TIMEOUT": TIMEOUT,
+    "CANCELLED": CANCELLED,
+}
+
+
+def _slurm_time(value: str) -> Optional[str]:
+    """Slurm 时间字段（如 2026-01-01T12:00:00）；Unknown、N/A、None 等返回 None"""
+    value = (value or "").strip()
+    if not value or value.upper() in ("UNKNOWN", "N/A", "NONE", "(NULL)"):
+        return None
+    return value
+
+
+def slurm_timing(record: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """
+    由状态记录计算排队时间和运行时间
+
+    Args:
+        record: _parse_status_output() 返回的单个作业记录
+
+    Returns:
+        {'queue_wait': 提交到开始的秒数, 'run_time': 开始到结束的秒数}，未知时为 None
+    """
+    def seconds(start: Optional[str], end: Optional[str]) -> Optional[float]:
+        if not start or not end:
+            return None
+        try:
+            return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+        except ValueError:
+            return None
+
+    return {
+        "queue_wait": seconds(record.get("submit_time"), record.get("start_time")),
+        "run_time": seconds(record.get("start_time"), record.get("end_time")),
+    }
 
 
 class SSHSlurmRunner:
@@ -31,6 +112,12 @@ class SSHSlurmRunner:
         job_script_template: Optional[str] = None,
         env_setup: Optional[List[str]] = None,
         default_slurm: Optional[Dict[str, Any]] = None,
+        port: Optional[int] = None,
+        multiplex: bool = True,
+        control_persist: Union[int, str] = DEFAULT_CONTROL_PERSIST,
+        control_dir: Optional[str] = None,
+        staging_manifest: bool = True,
+        max_array_size: int = DEFAULT_MAX_ARRAY_SIZE,
     ):
         """
         Args:
@@ -41,7 +128,16 @@ class SSHSlurmRunner:
             job_script_template: 本地 Slurm 脚本模板路径
             env_setup: 远程环境初始化命令列表
             default_slurm: 默认 Slurm 参数（partition, ntasks, cpus_per_task, time 等）
+            port: SSH 端口号
+            multiplex: 是否复用 SSH 连接（OpenSSH ControlMaster/ControlPersist）
+            control_persist: 主连接空闲后保持的时间（秒或 "10m" 等）
+            control_dir: 控制套接字目录（默认 ~/.bdfeasyinput/ssh）
+            staging_manifest: 是否按本地内容哈希清单跳过已上传且未改变的文件
+            max_array_size: 单个作业数组的最大任务数（不超过集群的 MaxArraySize），
+                submit_array() 据此拆分
         """
+        if max_array_size < 1:
+            raise ValueError(f"max_array_size must be >= 1, got {max_array_size}")
         self.host = host
         self.user = user
         self.workdir = workdir.rstrip("/") or "."
@@ -49,11 +145,45 @@ class SSHSlurmRunner:
         self.job_script_template = job_script_template
         self.env_setup = env_setup or []
         self.default_slurm = default_slurm or {}
+        self.port = port
+        self.max_array_size = max_array_size
+
+        # 同一主机的所有 ssh/scp 调用复用一个主连接
+        self.connection = SSHConnection(
+            host,
+            user=user,
+            port=port,
+            multiplex=multiplex,
+            control_persist=control_persist,
+            control_dir=control_dir,
+        )
+        self.stager = Stager(self.connection, use_manifest=staging_manifest)
 
     def _remote_target(self) -> str:
-        if self.user:
-            return f"{self.user}@{self.host}"
-        return self.host
+        return self.connection.target
+
+    def close(self) -> None:
+        """关闭复用的 SSH 主连接（未启用复用时不做任何事）。"""
+        self.connection.close()
+
+    def stage(self, input_files: List[str], force: bool = False, **kwargs: Any) -> Dict[str, Any]:
+        """
+        渲染多个作业的 Slurm 脚本，并将它们与输入文件一次性上传（一个 tar 流、一次 ssh）。
+
+        之后对这些作业调用 run()/submit() 时，内容未变的文件不会再次上传。
+
+        Args:
+            input_files: 本地 BDF 输入文件路径 (.inp) 列表
+            force: 忽略哈希清单，全部重新上传
+            **kwargs: 同 run()（如 slurm={...}）
+
+        Returns:
+            {'sent': [...], 'skipped': [...], 'bytes': n}，路径相对于 workdir
+        """
+        files: Dict[str, Path] = {}
+        for input_file in input_files:
+            files.update(self._prepare_job(input_file, kwargs)["files"])
+        return self.stager.stage(self.workdir, files, force=force)
 
     def _run_local_cmd(self, cmd: List[str]) -> subprocess.CompletedProcess:
         try:
@@ -90,6 +220,17 @@ class SSHSlurmRunner:
         - {{BDF_COMMAND}}
         """
         content = template_path.read_text(encoding="utf-8")
+        return self._substitute(content, job_name, input_filename, slurm_opts, bdf_command)
+
+    @staticmethod
+    def _substitute(
+        content: str,
+        job_name: str,
+        input_filename: str,
+        slurm_opts: Dict[str, Any],
+        bdf_command: str,
+    ) -> str:
+        """替换模板中的占位符（见 _render_job_script()）。"""
         # 填充缺省值
         partition = slurm_opts.get("partition", "compute")
         ntasks = slurm_opts.get("ntasks", 1)
@@ -109,6 +250,55 @@ class SSHSlurmRunner:
             content = content.replace(key, value)
         return content
 
+    @staticmethod
+    def _split_header(content: str) -> Tuple[str, str]:
+        """
+        将脚本分为头部（开头的空行和注释行：shebang、#SBATCH 等）和正文
+
+        Returns:
+            (header, body)，非空的 header 以换行结尾
+        """
+        lines = content.splitlines(keepends=True)
+        header_end = 0
+        while header_end < len(lines) and (not lines[header_end].strip() or lines[header_end].lstrip().startswith("#")):
+            header_end += 1
+        header = "".join(lines[:header_end])
+        if header and not header.endswith("\n"):
+            header += "\n"
+        return header, "".join(lines[header_end:])
+
+    def _render_array_script(
+        self,
+        template_path: Path,
+        array_name: str,
+        tasks_filename: str,
+        slurm_opts: Dict[str, Any],
+        bdf_command: str,
+    ) -> str:
+        """
+        由同一个模板渲染作业数组脚本：
+
+        - #SBATCH 行中的 {{JOB_NAME}} 替换为数组名
+        - 其余行中的 {{JOB_NAME}}、{{INPUT_FILE}} 替换为 $BDF_JOB_NAME、$BDF_INPUT_FILE，
+          它们由插入在脚本头部注释之后的片段根据 SLURM_ARRAY_TASK_ID 从任务列表中读取，
+          该片段同时 cd 到任务自己的目录
+        - 脚本的第一个参数是该数组在任务列表中的起始行偏移（拆分提交时使用，默认 0）
+        """
+        header, body = self._split_header(template_path.read_text(encoding="utf-8"))
+        prologue = (
+            "# 作业数组：按 SLURM_ARRAY_TASK_ID（加上脚本参数给出的偏移）取得本任务的作业名和输入文件\n"
+            "BDF_TASK_INDEX=$((SLURM_ARRAY_TASK_ID + ${1:-0}))\n"
+            f"BDF_TASK_LINE=$(sed -n \"$((BDF_TASK_INDEX + 1))p\" \"$SLURM_SUBMIT_DIR/{tasks_filename}\")\n"
+            "BDF_JOB_NAME=${BDF_TASK_LINE%% *}\n"
+            "BDF_INPUT_FILE=${BDF_TASK_LINE#* }\n"
+            "cd \"$SLURM_SUBMIT_DIR/$BDF_JOB_NAME\" || exit 1\n"
+        )
+        return (
+            self._substitute(header, array_name, "$BDF_INPUT_FILE", slurm_opts, bdf_command)
+            + prologue
+            + self._substitute(body, "$BDF_JOB_NAME", "$BDF_INPUT_FILE", slurm_opts, bdf_command)
+        )
+
     def run(
         self,
         input_file: str,
@@ -118,12 +308,243 @@ class SSHSlurmRunner:
     ) -> Dict[str, Any]:
         """
         将 BDF 计算作为 Slurm 作业提交到远程集群（非阻塞，只返回 jobid）。
+
+        可选的 kwargs：
+        - slurm: 覆盖默认 Slurm 参数的字典
+        - dependency: 上游作业的 jobid 列表，全部成功后本作业才开始（afterok）
+        - prologue: 插入作业脚本头部之后的 shell 片段
         """
+        return self._submit_job(input_file, kwargs)
+
+    def submit(
+        self,
+        input_file: str,
+        timeout: Optional[int] = None,
+        use_debug_dir: bool = False,
+        poll_interval: float = DEFAULT_SLURM_POLL_INTERVAL,
+        **kwargs: Any,
+    ) -> JobHandle:
+        """
+        提交 Slurm 作业并返回作业句柄。
+
+        handle.poll() 在后台查询 squeue/sacct，作业结束后 handle.result()
+        返回 run() 的提交信息以及 slurm_state（Slurm 最终状态）。
+
+        Args:
+            input_file: 本地 BDF 输入文件路径 (.inp)
+            timeout: 最大等待时间（秒），超时后 status='timeout'（作业不会被取消）
+            poll_interval: 查询间隔（秒）
+            **kwargs: 同 run()（如 slurm={...} 覆盖默认 Slurm 参数）
+
+        Returns:
+            JobHandle
+        """
+        submission = self._submit_job(input_file, kwargs)
+        name = Path(input_file).stem
+        if submission["status"] != "submitted":
+            return FinishedJobHandle(name, submission)
+        return SlurmJobHandle(self, name, submission, timeout=timeout, poll_interval=poll_interval)
+
+    def submit_array(
+        self,
+        input_files: List[str],
+        array_name: Optional[str] = None,
+        max_parallel: Optional[int] = None,
+        timeout: Optional[int] = None,
+        poll_interval: float = DEFAULT_SLURM_POLL_INTERVAL,
+        **kwargs: Any,
+    ) -> List[JobHandle]:
+        """
+        将一批输入作为 Slurm 作业数组提交（一次上传、一次 ssh）。
+
+        远程目录结构为 <workdir>/<array_name>/<job_name>/，数组脚本与任务列表
+        位于 <workdir>/<array_name>/。输入超过 self.max_array_size 个时按顺序拆分为
+        多个数组（同一 ssh 中依次 sbatch），每个数组的下标从 0 开始，并以脚本参数
+        传入它在任务列表中的偏移：偏移为 k 的数组中第 i 个任务在 input_files[k + i]
+        对应的目录中运行。模板写法同单个作业，见 _render_array_script()。
+
+        Args:
+            input_files: 本地 BDF 输入文件路径 (.inp) 列表（文件名不能重复）
+            array_name: 数组名（默认取第一个输入文件名加 "_array"）
+            max_parallel: 每个数组同时运行的最大任务数（--array=0-N%K 中的 K）
+            timeout: 每个任务的最大等待时间（秒）
+            poll_interval: 查询间隔（秒）
+            **kwargs: slurm={...} 覆盖默认 Slurm 参数
+
+        Returns:
+            与 input_files 顺序一致的任务句柄（job_id 形如 "1234_5"，下标相对于所在数组）；
+            提交失败的数组中每个句柄都已结束且 status='failed'
+        """
+        if not input_files:
+            raise ValueError("input_files must not be empty")
+        if max_parallel is not None and max_parallel < 1:
+            raise ValueError(f"max_parallel must be >= 1, got {max_parallel}")
+        if not self.job_script_template:
+            raise ValueError("job_script_template is required for SSHSlurmRunner")
+        template_path = Path(self.job_script_template).resolve()
+        if not template_path.exists():
+            raise FileNotFoundError(f"Slurm job script template not found: {template_path}")
+
+        input_paths = [self._check_input(f) for f in input_files]
+        names = [p.stem for p in input_paths]
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate job names in array: {', '.join(duplicates)}")
+        array_name = array_name or f"{names[0]}_array"
+        array_root = f"{self.workdir}/{array_name}"
+
+        slurm_opts = dict(self.default_slurm)
+        slurm_opts.update(kwargs.get("slurm", {}))
+
+        # 在本地（第一个输入文件所在目录）写出任务列表和数组脚本
+        local_dir = input_paths[0].parent
+        tasks_file = local_dir / f"{array_name}.tasks"
+        tasks_file.write_text("".join(f"{p.stem} {p.name}\n" for p in input_paths), encoding="utf-8")
+        script_file = local_dir / f"{array_name}.slurm.sh"
+        script_file.write_text(self._render_array_script(
+            template_path=template_path,
+            array_name=array_name,
+            tasks_filename=tasks_file.name,
+            slurm_opts=slurm_opts,
+            bdf_command=slurm_opts.get("bdf_command", "run.x"),
+        ), encoding="utf-8")
+
+        # 所有任务的文件打包为一个 tar 流上传
+        files: Dict[str, Path] = {
+            f"{array_name}/{tasks_file.name}": tasks_file,
+            f"{array_name}/{script_file.name}": script_file,
+        }
+        for input_path in input_paths:
+            for name, path in job_files(input_path).items():
+                files[f"{array_name}/{input_path.stem}/{name}"] = path
+        staging = self.stager.stage(self.workdir, files)
+
+        # 按 max_array_size 拆分；各数组的 sbatch 在同一 ssh 中依次执行，任一失败即停止
+        offsets = list(range(0, len(input_paths), self.max_array_size))
+        sbatch_cmds = []
+        for offset in offsets:
+            size = min(self.max_array_size, len(input_paths) - offset)
+            array_spec = f"0-{size - 1}"
+            if max_parallel:
+                array_spec += f"%{max_parallel}"
+            sbatch_cmd = f"{self.sbatch_command} --array={array_spec} {script_file.name}"
+            sbatch_cmds.append(f"{sbatch_cmd} {offset}" if offset else sbatch_cmd)
+        setup_cmd = " && ".join(self.env_setup) if self.env_setup else ""
+        full_remote_cmd = " && ".join([c for c in [setup_cmd, f"cd {array_root}", *sbatch_cmds] if c])
+        proc = subprocess.run(self.connection.ssh_cmd(full_remote_cmd), text=True, capture_output=True)
+        stdout = proc.stdout or ""
+        # 各数组的作业号按提交顺序出现；缺失的数组（及其后的数组）提交失败
+        array_job_ids = re.findall(r"Submitted batch job\s+(\d+)", stdout)
+
+        base = {
+            "ssh_target": self._remote_target(),
+            "remote_command": full_remote_cmd,
+            "array_count": len(offsets),
+            "stdout": stdout,
+            "stderr": proc.stderr or "",
+            "staged_files": staging["sent"],
+        }
+        handles: List[JobHandle] = []
+        for index, input_path in enumerate(input_paths):
+            chunk, task_id = divmod(index, self.max_array_size)
+            array_job_id = array_job_ids[chunk] if chunk < len(array_job_ids) else None
+            submission = {
+                "status": "submitted" if array_job_id else "failed",
+                "remote_workdir": f"{array_root}/{input_path.stem}",
+                "job_id": f"{array_job_id}_{task_id}" if array_job_id else None,
+                "array_job_id": array_job_id,
+                "array_task_id": task_id,
+                "array_offset": offsets[chunk],
+                "array_size": min(self.max_array_size, len(input_paths) - offsets[chunk]),
+                **base,
+            }
+            if submission["status"] != "submitted":
+                handles.append(FinishedJobHandle(input_path.stem, submission))
+            else:
+                handles.append(SlurmJobHandle(
+                    self, input_path.stem, submission, timeout=timeout, poll_interval=poll_interval
+                ))
+        return handles
+
+    def _build_status_cmd(self, job_ids: List[str]) -> str:
+        """
+        构造查询一组作业状态的远程命令：先 squeue（排队/运行中），再 sacct（已结束），
+        一次 ssh 即可得到所有作业的状态表。每行依次为作业号、状态、提交时间、
+        开始时间、（sacct）结束时间、分区和 CPU 数。
+
+        作业数组任务（"1234_5"）按数组作业号查询一次，squeue -r 将排队中的任务逐个列出。
+        """
+        ids = ",".join(dict.fromkeys(job_id.split("_")[0] for job_id in job_ids))
+        return (
+            f"squeue -h -r -j {ids} -o '%i|%T|%V|%S|%P|%C' 2>/dev/null; "
+            f"echo {SACCT_MARKER}; "
+            f"sacct -n -X -P -j {ids} -o JobID,State,Submit,Start,End,Partition,AllocCPUS 2>/dev/null; true"
+        )
+
+    @staticmethod
+    def _parse_status_output(stdout: str) -> Dict[str, Dict[str, Any]]:
+        """
+        从状态查询输出中取得各作业的状态记录。
+
+        Returns:
+            {job_id: {'state', 'submit_time', 'start_time', 'end_time', 'partition', 'cpus'}}，
+            state 为 Slurm 状态（如 'RUNNING'、'COMPLETED'、'CANCELLED'），时间为 Slurm 的
+            ISO 时间字符串（未知时为 None）；squeue 的状态优先，两者都没有记录的作业不出现
+        """
+        squeue_out, sep, sacct_out = stdout.partition(SACCT_MARKER)
+        if not sep:
+            return {}
+        records: Dict[str, Dict[str, Any]] = {}
+        for line in sacct_out.splitlines():
+            fields = [f.strip() for f in line.strip().split("|")]
+            if len(fields) >= 2 and fields[1]:
+                fields += [""] * (7 - len(fields))
+                records[fields[0]] = {
+                    # sacct 的取消状态形如 "CANCELLED by 1000"
+                    "state": fields[1].split()[0].upper(),
+                    "submit_time": _slurm_time(fields[2]),
+                    "start_time": _slurm_time(fields[3]),
+                    "end_time": _slurm_time(fields[4]),
+                    "partition": fields[5] or None,
+                    "cpus": int(fields[6]) if fields[6].isdigit() else None,
+                }
+        for line in squeue_out.splitlines():
+            fields = [f.strip() for f in line.strip().split("|")]
+            if len(fields) < 2 or not fields[1]:
+                continue
+            fields += [""] * (6 - len(fields))
+            record = records.setdefault(fields[0], {
+                "submit_time": None, "start_time": None, "end_time": None, "partition": None, "cpus": None,
+            })
+            state = fields[1].upper()
+            record["state"] = state
+            record["submit_time"] = _slurm_time(fields[2]) or record["submit_time"]
+            if state != "PENDING":
+                # 排队中的作业 %S 为预计开始时间，不记录
+                record["start_time"] = _slurm_time(fields[3]) or record["start_time"]
+            record["partition"] = fields[4] or record["partition"]
+            if fields[5].isdigit():
+                record["cpus"] = int(fields[5])
+        return records
+
+    @staticmethod
+    def _check_input(input_file: str) -> Path:
         input_path = Path(input_file).resolve()
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_file}")
         if input_path.suffix.lower() != ".inp":
             raise ValueError(f"Input file must have .inp extension, got: {input_path.suffix}")
+        return input_path
+
+    def _prepare_job(self, input_file: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        检查输入并在本地渲染 Slurm 脚本。
+
+        Returns:
+            {'input_path', 'job_name', 'remote_workdir', 'job_script', 'files'}，
+            files 为 {相对 workdir 的远程路径: 本地路径}
+        """
+        input_path = self._check_input(input_file)
 
         if not self.job_script_template:
             raise ValueError("job_script_template is required for SSHSlurmRunner")
@@ -133,8 +554,6 @@ class SSHSlurmRunner:
             raise FileNotFoundError(f"Slurm job script template not found: {template_path}")
 
         job_name = input_path.stem
-        ssh_target = self._remote_target()
-        remote_workdir = f"{self.workdir}/{job_name}"
 
         # 合并默认 Slurm 参数和调用时传入的覆盖参数
         slurm_opts = dict(self.default_slurm)
@@ -148,26 +567,52 @@ class SSHSlurmRunner:
             slurm_opts=slurm_opts,
             bdf_command=slurm_opts.get("bdf_command", "run.x"),
         )
+        if kwargs.get("prologue"):
+            # 在 #SBATCH 头部之后、正文之前插入（如从上游作业输出中取出几何结构）
+            header, body = self._split_header(job_script_content)
+            prologue = kwargs["prologue"]
+            job_script_content = header + prologue + ("" if prologue.endswith("\n") else "\n") + body
         local_job_script = input_path.with_suffix(".slurm.sh")
         local_job_script.write_text(job_script_content, encoding="utf-8")
 
-        # 1) 在远程创建工作目录
-        self._run_local_cmd(["ssh", ssh_target, f"mkdir -p {remote_workdir}"])
+        # 输入文件、引用的几何文件和作业脚本都放在 <workdir>/<job_name> 下
+        files = {
+            f"{job_name}/{name}": path
+            for name, path in job_files(input_path, [local_job_script]).items()
+        }
+        return {
+            "input_path": input_path,
+            "job_name": job_name,
+            "remote_workdir": f"{self.workdir}/{job_name}",
+            "job_script": local_job_script,
+            "files": files,
+        }
+
+    def _submit_job(self, input_file: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """渲染脚本、上传并执行 sbatch（run() 与 submit() 共用）。"""
+        job = self._prepare_job(input_file, kwargs)
+        ssh_target = self._remote_target()
+        remote_workdir = job["remote_workdir"]
+        local_job_script = job["job_script"]
 
-        # 2) 上传输入文件和脚本
-        remote_input = f"{ssh_target}:{remote_workdir}/{input_path.name}"
-        remote_script = f"{ssh_target}:{remote_workdir}/{local_job_script.name}"
-        self._run_local_cmd(["scp", str(input_path), remote_input])
-        self._run_local_cmd(["scp", str(local_job_script), remote_script])
+        # 1) 输入文件、引用的几何文件和脚本打包为一个 tar 流上传（跳过内容未变的文件）
+        staging = self.stager.stage(self.workdir, job["files"])
 
-        # 3) 远程执行 sbatch
+        # 2) 远程执行 sbatch
         setup_cmd = " && ".join(self.env_setup) if self.env_setup else ""
         cd_cmd = f"cd {remote_workdir}"
         sbatch_cmd = f"{self.sbatch_command} {local_job_script.name}"
+        dependency = [str(job_id) for job_id in kwargs.get("dependency") or []]
+        if dependency:
+            # 上游作业全部成功后才开始；任一上游失败时 Slurm 直接取消本作业，而不是永远排队
+            sbatch_cmd = (
+                f"{self.sbatch_command} --dependency=afterok:{':'.join(dependency)} "
+                f"--kill-on-invalid-dep=yes {local_job_script.name}"
+            )
         full_remote_cmd = " && ".join([c for c in [setup_cmd, cd_cmd, sbatch_cmd] if c])
 
         proc = subprocess.run(
-            ["ssh", ssh_target, full_remote_cmd],
+            self.connection.ssh_cmd(full_remote_cmd),
             text=True,
             capture_output=True,
         )
@@ -191,5 +636,100 @@ class SSHSlurmRunner:
             "job_id": job_id,
             "stdout": stdout,
             "stderr": stderr,
+            "staged_files": staging["sent"],
+            "dependency": dependency,
         }
 
+
+
+class SlurmJobHandle(JobHandle):
+    """
+    SSHSlurmRunner 提交的 Slurm 作业句柄。
+
+    poll() 不阻塞：squeue/sacct 查询在后台运行，其输出在下一次 poll() 时处理。
+    加入 StatusPoller 后，同一集群上的作业改为由 poller 合并查询。
+    """
+
+    def __init__(
+        self,
+        runner: SSHSlurmRunner,
+        name: str,
+        submission: Dict[str, Any],
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_SLURM_POLL_INTERVAL,
+    ):
+        super().__init__(name, poll_interval)
+        self.runner = runner
+        self.job_id = submission["job_id"]
+        self.slurm_state: Optional[str] = "PENDING"
+        self.slurm_record: Dict[str, Any] = {}
+        self._submission = submission
+        self._deadline = None if not timeout else self.submitted_at + timeout
+        self._check: Optional[BackgroundCommand] = None
+        self._poller = None
+
+    @property
+    def batch_key(self) -> Tuple[str, str, Optional[int]]:
+        """同一集群上的 Slurm 作业可合并为一次 squeue/sacct 查询。"""
+        connection = self.runner.connection
+        return ("slurm", connection.target, connection.port)
+
+    @classmethod
+    def _batch_command(cls, handles: List["SlurmJobHandle"]) -> List[str]:
+        runner = handles[0].runner
+        return runner.connection.ssh_cmd(runner._build_status_cmd([h.job_id for h in handles]))
+
+    @classmethod
+    def _parse_batch(cls, handles: List["SlurmJobHandle"], stdout: bytes) -> List[Optional[Dict[str, Any]]]:
+        records = SSHSlurmRunner._parse_status_output(stdout.decode("utf-8", errors="ignore"))
+        return [records.get(h.job_id) for h in handles]
+
+    def _apply_status(self, record: Dict[str, Any]) -> bool:
+        state = record["state"]
+        changed = state != self.slurm_state
+        self.slurm_state = state
+        self.slurm_record = record
+        self.status = SLURM_STATE_MAP.get(state, RUNNING)
+        if self.done():
+            self._finish(self.status, self._result_dict())
+        return changed
+
+    def _result_dict(self) -> Dict[str, Any]:
+        """提交信息 + Slurm 状态、时间、分区/CPU 以及排队时间和运行时间"""
+        record = {k: v for k, v in self.slurm_record.items() if k != "state"}
+        return {**self._submission, "slurm_state": self.slurm_state, **record, **slurm_timing(self.slurm_record)}
+
+    def _check_deadline(self) -> bool:
+        if self._deadline is not None and time.time() >= self._deadline:
+            self._finish(TIMEOUT, self._result_dict())
+            return True
+        return False
+
+    def _poll(self) -> None:
+        if self._poller is not None:
+            self._poller.poll()
+            return
+        if self._check is not None:
+            output = self._check.poll()
+            if output is None:
+                return
+            self._check = None
+            record = self._parse_batch([self], output[1])[0]
+            if record:
+                self._apply_status(record)
+                if self.done():
+                    return
+        if self._check_deadline():
+            return
+        self._check = BackgroundCommand(self._batch_command([self]))
+
+    def _cancel(self) -> Optional[Dict[str, Any]]:
+        if self._check is not None:
+            self._check.kill()
+            self._check = None
+        try:
+            self.runner._run_local_cmd(self.runner.connection.ssh_cmd(f"scancel {self.job_id}"))
+        except RuntimeError:
+            return None
+        self.slurm_state = "CANCELLED"
+        return self._result_dict()
@@ -9,11 +9,28 @@ machine via password-less SSH.
 - 支持“提交 + 轮询 + 拉回输出”的简单同步工作流
 """
 
+import shlex
 import subprocess
 import time
-import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+
+from .jobs import RUNNING, BackgroundCommand, FinishedJobHandle, JobHandle
+from .remote_log import COMPRESS_MIN_BYTES, RemoteLogTail, decompress_delta
+from .staging import Stager, job_files
+from .ssh import DEFAULT_CONTROL_PERSIST, SSHConnection
+
+
+# 轮询输出第一行的标记，用于区分 .err 文件状态和日志内容
+POLL_ERR_FILE_MARKER = "__BDF_ERR_FILE__"
+POLL_NO_ERR_FILE_MARKER = "__BDF_NO_ERR_FILE__"
+
+# 批量轮询输出中每个作业一行的表头：<标记> <序号> <.err 是否存在> <随后的字节数> [z]
+# 末尾的 z 表示随后的字节是 gzip 压缩的日志增量
+POLL_JOB_MARKER = "__BDF_JOB__"
+
+# 未配置 poll_interval 时作业句柄使用的轮询间隔（秒）
+DEFAULT_REMOTE_POLL_INTERVAL = 30
 
 
 class SSHRemoteRunner:
@@ -22,7 +39,7 @@ class SSHRemoteRunner:
 
     典型流程：
     1. 本地生成 BDF 输入文件 (.inp)
-    2. 通过 scp 上传到远程工作目录
+    2. 打包为 tar 流经 ssh 上传到远程工作目录（跳过内容未变的文件）
     3. 通过 ssh 在远程执行类似命令：
        - source 环境
        - cd 到工作目录
@@ -41,6 +58,11 @@ class SSHRemoteRunner:
         poll_interval: Optional[int] = 30,
         max_wait: Optional[int] = None,
         download: bool = True,
+        multiplex: bool = True,
+        control_persist: Union[int, str] = DEFAULT_CONTROL_PERSIST,
+        control_dir: Optional[str] = None,
+        compress: bool = False,
+        staging_manifest: bool = True,
     ):
         """
         Args:
@@ -53,6 +75,11 @@ class SSHRemoteRunner:
             poll_interval: 轮询远程作业状态的时间间隔（秒），None 或 <=0 表示不轮询
             max_wait: 最大等待时间（秒），None 或 <=0 表示不限制（受上层超时时间约束）
             download: 作业结束后是否尝试将远程输出文件拉回本地
+            multiplex: 是否复用 SSH 连接（OpenSSH ControlMaster/ControlPersist）
+            control_persist: 主连接空闲后保持的时间（秒或 "10m" 等）
+            control_dir: 控制套接字目录（默认 ~/.bdfeasyinput/ssh）
+            compress: 轮询和下载日志增量时是否用 gzip 压缩传输（适合慢速链路上的大日志）
+            staging_manifest: 是否按本地内容哈希清单跳过已上传且未改变的文件
         """
         self.host = host
         self.user = user
@@ -72,15 +99,25 @@ class SSHRemoteRunner:
         # 最大等待时间：None 或 <=0 表示不限制（由上层 timeout 控制）
         self.max_wait = max_wait if (max_wait and max_wait > 0) else None
         self.download = download
+        self.compress = compress
+
+        # 同一主机的所有 ssh/scp 调用复用一个主连接
+        self.connection = SSHConnection(
+            host,
+            user=user,
+            port=port,
+            multiplex=multiplex,
+            control_persist=control_persist,
+            control_dir=control_dir,
+        )
+        self.stager = Stager(self.connection, use_manifest=staging_manifest)
 
     # ------------------------------------------------------------------
     # 内部工具
     # ------------------------------------------------------------------
     def _remote_target(self) -> str:
         """返回 user@host 形式的 SSH 目标。"""
-        if self.user:
-            return f"{self.user}@{self.host}"
-        return self.host
+        return self.connection.target
 
     def _run_local_cmd(self, cmd: List[str]) -> subprocess.CompletedProcess:
         """运行本地命令，抛出异常时包含命令信息。"""
@@ -99,46 +136,292 @@ class SSHRemoteRunner:
                 f"Stderr: {e.stderr}"
             ) from e
 
-    def _extract_referenced_geometry_files(self, inp_path: Path) -> List[Path]:
+    def _build_poll_cmd(self, remote_workdir: str, job_name: str, offset: int) -> str:
         """
-        从 BDF 输入文件中提取引用的外部几何文件（如 file=xxx.xyz）。
+        构造一次轮询的远程命令：第一行输出 .err 文件是否存在的标记，
+        其后为日志中从 offset 字节之后新追加的内容。
+        """
+        return (
+            f"cd {remote_workdir} && "
+            f"if [ -f {job_name}.err ]; then echo {POLL_ERR_FILE_MARKER}; "
+            f"else echo {POLL_NO_ERR_FILE_MARKER}; fi && "
+            f"tail -c +{offset + 1} {job_name}.log 2>/dev/null"
+            + (" | gzip -c" if self.compress else "")
+            + "; true"
+        )
 
-        Args:
-            inp_path: BDF 输入文件路径
+    @staticmethod
+    def _split_poll_output(stdout: bytes, compressed: bool = False) -> Tuple[bool, bytes]:
+        """拆分轮询输出为 (.err 是否存在, 新增日志字节)，compressed=True 时先解压。"""
+        marker, sep, new_bytes = stdout.partition(b"\n")
+        if not sep or marker.strip() not in (
+            POLL_ERR_FILE_MARKER.encode(), POLL_NO_ERR_FILE_MARKER.encode()
+        ):
+            # 远程命令未正常执行（如 ssh 连接失败），本轮不消费任何字节
+            return False, b""
+        if compressed:
+            new_bytes = decompress_delta(new_bytes)
+            if new_bytes is None:
+                return False, b""
+        return marker.strip() == POLL_ERR_FILE_MARKER.encode(), new_bytes
+
+    def _build_batch_poll_cmd(self, jobs: List[Tuple[str, str, int]]) -> str:
+        """
+        构造一次查询多个作业的远程命令。
 
-        Returns:
-            引用的几何文件路径列表（相对于输入文件所在目录）
+        对每个 (remote_workdir, job_name, offset) 输出一行
+        "__BDF_JOB__ <序号> <0|1> <n>"，紧跟该作业日志 offset 之后的 n 个字节，
+        因此日志内容不会与表头混淆；目录不存在时 n 为 0。
+        启用 compress 且增量不小于 COMPRESS_MIN_BYTES 时，增量先在远程写入临时
+        文件并 gzip 压缩，表头为 "__BDF_JOB__ <序号> <0|1> <压缩后字节数> z"。
+
+        查询逻辑只在远程 shell 函数 q 中出现一次；共同的工作目录只写一次（变量 b），
+        每个作业只占 "q <序号> <作业名> <offset>" 一小段，
+        300 个作业的命令也远小于单个参数 128 KiB 的限制（MAX_ARG_STRLEN）。
         """
-        referenced = []
-        try:
-            content = inp_path.read_text(encoding="utf-8")
-            # 查找 Geometry ... End geometry 块中的 file= 行
-            # 模式：Geometry ... file=filename.xyz ... End geometry
-            geometry_block_pattern = re.compile(
-                r"Geometry\s+(.*?)End\s+geometry",
-                re.IGNORECASE | re.DOTALL,
+        delta = 'tail -c +$(($3 + 1)) "$2.log" | head -c $n'
+        raw = f'echo "{POLL_JOB_MARKER} $1 $e $n"; [ $n -gt 0 ] && {delta}'
+        if self.compress:
+            send = (
+                f"if [ $n -ge {COMPRESS_MIN_BYTES} ]; then "
+                f"{delta} | gzip -c > $z; "
+                f'echo "{POLL_JOB_MARKER} $1 $e $(wc -c < $z | tr -d \' \') z"; cat $z; '
+                f"else {raw}; fi"
             )
-            match = geometry_block_pattern.search(content)
-            if match:
-                geometry_content = match.group(1)
-                # 查找 file= 行
-                file_pattern = re.compile(r"file\s*=\s*([^\s\n]+)", re.IGNORECASE)
-                for file_match in file_pattern.finditer(geometry_content):
-                    filename = file_match.group(1).strip()
-                    # 如果是相对路径，相对于输入文件所在目录
-                    if not Path(filename).is_absolute():
-                        ref_path = inp_path.parent / filename
-                    else:
-                        ref_path = Path(filename)
-                    referenced.append(ref_path)
-        except Exception:
-            # 解析失败不影响主流程，只是不会上传引用的文件
-            pass
-        return referenced
+        else:
+            send = raw
+        # q <序号> <作业名> <offset> [目录（相对 $b，默认与作业名相同）]
+        parts = [
+            "q() { ( e=0; s=$3; "
+            'if cd "$b/${4:-$2}" 2>/dev/null; then '
+            '[ -f "$2.err" ] && e=1; '
+            "s=$(wc -c 2>/dev/null < \"$2.log\" | tr -d ' '); s=${s:-$3}; fi; "
+            "n=$((s - $3)); [ $n -gt 0 ] || n=0; "
+            f"{send}; true ); }}"
+        ]
+        base = None
+        for index, (remote_workdir, job_name, offset) in enumerate(jobs):
+            parent, sep, directory = remote_workdir.rstrip("/").rpartition("/")
+            parent = parent or ("/" if sep else ".")
+            if parent != base:
+                # 不加引号，与 cd {remote_workdir} 一样允许 ~ 展开
+                base = parent
+                parts.append(f"b={parent}")
+            call = f"q {index} {shlex.quote(job_name)} {int(offset)}"
+            if directory != job_name:
+                call += f" {shlex.quote(directory)}"
+            parts.append(call)
+        if self.compress:
+            # 所有作业共用一个远程临时文件存放压缩后的增量
+            return "z=$(mktemp); " + "; ".join(parts) + "; rm -f $z"
+        return "; ".join(parts)
+
+    @staticmethod
+    def _split_batch_poll_output(stdout: bytes, count: int) -> List[Optional[Tuple[bool, bytes, int]]]:
+        """
+        拆分批量轮询输出。
+
+        Returns:
+            与查询顺序一致的 (.err 是否存在, 新增日志字节, 传输字节数) 列表；
+            输出缺失或不完整的作业为 None
+        """
+        results: List[Optional[Tuple[bool, bytes, int]]] = [None] * count
+        marker = POLL_JOB_MARKER.encode()
+        pos = 0
+        while True:
+            start = stdout.find(marker, pos)
+            if start < 0:
+                break
+            line_end = stdout.find(b"\n", start)
+            if line_end < 0:
+                break
+            fields = stdout[start:line_end].split()
+            try:
+                index, err_flag, size = int(fields[1]), fields[2] == b"1", int(fields[3])
+            except (IndexError, ValueError):
+                pos = line_end + 1
+                continue
+            data = stdout[line_end + 1:line_end + 1 + size]
+            if len(data) < size:
+                # 输出被截断（如 ssh 中途断开），只接受完整的部分
+                break
+            if len(fields) > 4 and fields[4] == b"z":
+                data = decompress_delta(data)
+            if 0 <= index < count and data is not None:
+                results[index] = (err_flag, data, size)
+            pos = line_end + 1 + size
+        return results
+
+    def _ssh_cmd(self, remote_cmd: str) -> List[str]:
+        """构造在远程执行 remote_cmd 的 ssh 命令。"""
+        return self.connection.ssh_cmd(remote_cmd)
+
+    def _launch(self, input_path: Path) -> Tuple[Dict[str, Any], int]:
+        """
+        上传输入及其引用的几何文件，并在后台启动 BDF。
+
+        Returns:
+            (结果字典的公共字段, 启动命令的退出码)
+        """
+        job_name = input_path.stem
+
+        # 远程作业目录：<workdir>/<job_name>
+        remote_workdir = f"{self.workdir}/{job_name}"
+        ssh_target = self._remote_target()
+
+        # 1) 输入文件及其引用的外部几何文件（如 file=xxx.xyz）打包为一个 tar 流上传，
+        #    内容未变的文件（按哈希清单）不再重复上传
+        staging = self.stager.stage(self.workdir, self._job_files(input_path))
+
+        # 2) 组装远程命令
+        #    env_setup1 && env_setup2 && cd workdir && { nohup bdf_command input.inp > job.log 2>&1 & echo $! > job.pid; }
+        #    job.pid 记录后台进程号，供 cancel() 使用
+        setup_cmd = " && ".join(self.env_setup) if self.env_setup else ""
+        cd_cmd = f"cd {remote_workdir}"
+        run_cmd = (
+            f"{{ nohup {self.bdf_command} {input_path.name} > {job_name}.log 2>&1 < /dev/null & "
+            f"echo $! > {job_name}.pid; }}"
+        )
+        full_remote_cmd = " && ".join([c for c in [setup_cmd, cd_cmd, run_cmd] if c])
+
+        # 3) 通过 SSH 启动远程作业
+        proc = subprocess.run(
+            self._ssh_cmd(full_remote_cmd),
+            text=True,
+            capture_output=True,
+        )
+        base = {
+            "remote_workdir": remote_workdir,
+            "remote_command": full_remote_cmd,
+            "ssh_target": ssh_target,
+            "stdout": proc.stdout,
+            "stderr": proc.stderr,
+            "staged_files": staging["sent"],
+        }
+        return base, proc.returncode
+
+    @staticmethod
+    def _job_files(input_path: Path) -> Dict[str, Path]:
+        """作业需要上传的文件：{相对 workdir 的远程路径: 本地路径}"""
+        return {f"{input_path.stem}/{name}": path for name, path in job_files(input_path).items()}
+
+    def _consume_poll_output(
+        self,
+        tail: RemoteLogTail,
+        stdout: bytes,
+        on_event: Optional[Callable[[Any], None]] = None,
+    ) -> Optional[str]:
+        """
+        将一次轮询的输出送入增量解析器（及本地日志镜像）。
+
+        Returns:
+            'DONE_OK' | 'DONE_ERR'，作业仍在运行时返回 None
+        """
+        err_file_exists, new_bytes = self._split_poll_output(stdout or b"", self.compress)
+        return self._consume_log_delta(tail, err_file_exists, new_bytes, on_event, len(stdout or b""))
+
+    @staticmethod
+    def _consume_log_delta(
+        tail: RemoteLogTail,
+        err_file_exists: bool,
+        new_bytes: bytes,
+        on_event: Optional[Callable[[Any], None]] = None,
+        transferred: Optional[int] = None,
+    ) -> Optional[str]:
+        """将新增日志字节送入增量解析器，返回值同 _consume_poll_output()。"""
+        events = tail.feed(new_bytes, transferred)
+        if on_event:
+            for event in events:
+                on_event(event)
+
+        if tail.finished:
+            return "DONE_OK"
+        if tail.errors or err_file_exists:
+            return "DONE_ERR"
+        return None
+
+    def _finalize(
+        self,
+        input_path: Path,
+        base: Dict[str, Any],
+        final_state: Optional[str],
+        tail: RemoteLogTail,
+    ) -> Dict[str, Any]:
+        """作业结束后（如需）下载输出并构造结果字典。"""
+        local_output_file: Optional[Path] = None
+        if self.download:
+            # 轮询期间收到的日志已写入本地镜像，这里只取回剩余的增量
+            try:
+                local_output_file = tail.download()
+            except Exception:
+                # 下载失败不视为致命错误，只是不提供本地输出路径
+                local_output_file = None
+
+        # 映射 final_state 到对外 status
+        if final_state == "DONE_OK":
+            result_status = "success"
+        elif final_state == "DONE_ERR":
+            result_status = "failed"
+        else:  # TIMEOUT 或 None
+            result_status = "timeout"
+
+        result: Dict[str, Any] = {"status": result_status, **base}
+        if local_output_file:
+            result["output_file"] = str(local_output_file)
+        result["progress"] = tail.summary()
+        result["log_bytes_transferred"] = tail.bytes_transferred
+        return result
+
+    def _log_tail(self, input_path: Path, remote_workdir: str) -> RemoteLogTail:
+        """为作业创建远程日志跟踪器；download=True 时日志镜像到输入文件旁的 .log。"""
+        return RemoteLogTail(
+            self.connection,
+            f"{remote_workdir}/{input_path.stem}.log",
+            local_path=input_path.with_suffix(".log") if self.download else None,
+            compress=self.compress,
+        )
+
+    def _max_wait(self, timeout: Optional[int]) -> Optional[float]:
+        """优先使用 runner 自己的 max_wait，其次用调用者传入的 timeout"""
+        max_wait = self.max_wait
+        if max_wait is None and timeout:
+            max_wait = timeout
+        return max_wait
+
+    @staticmethod
+    def _check_input(input_file: str) -> Path:
+        input_path = Path(input_file).resolve()
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {input_file}")
+        if input_path.suffix.lower() != ".inp":
+            raise ValueError(f"Input file must have .inp extension, got: {input_path.suffix}")
+        return input_path
 
     # ------------------------------------------------------------------
     # 对外接口
     # ------------------------------------------------------------------
+    def close(self) -> None:
+        """关闭复用的 SSH 主连接（未启用复用时不做任何事）。"""
+        self.connection.close()
+
+    def stage(self, input_files: List[str], force: bool = False) -> Dict[str, Any]:
+        """
+        将多个作业的输入文件一次性上传（一个 tar 流、一次 ssh）。
+
+        之后对这些作业调用 run()/submit() 时，内容未变的文件不会再次上传。
+
+        Args:
+            input_files: 本地 BDF 输入文件路径 (.inp) 列表
+            force: 忽略哈希清单，全部重新上传
+
+        Returns:
+            {'sent': [...], 'skipped': [...], 'bytes': n}，路径相对于 workdir
+        """
+        files: Dict[str, Path] = {}
+        for input_file in input_files:
+            files.update(self._job_files(self._check_input(input_file)))
+        return self.stager.stage(self.workdir, files, force=force)
+
     def run(
         self,
         input_file: str,
@@ -158,7 +441,7 @@ class SSHRemoteRunner:
             input_file: 本地 BDF 输入文件路径 (.inp)
             timeout: 当前版本忽略（仅保留接口兼容性）
             use_debug_dir: 与本地 Runner 接口兼容，此处不使用
-            **kwargs: 预留扩展
+            **kwargs: 预留扩展；on_event=callable 可在轮询时接收增量解析事件（ParseEvent）
 
         Returns:
             result: 字典，字段视执行模式而定，典型字段包括：
@@ -168,118 +451,34 @@ class SSHRemoteRunner:
                 - ssh_target: user@host
                 - output_file: 本地输出文件路径（如果已下载）
                 - stdout/stderr: 提交阶段的输出
+                - progress: 轮询结束时的增量解析摘要（仅轮询模式）
         """
-        input_path = Path(input_file).resolve()
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {input_file}")
-        if input_path.suffix.lower() != ".inp":
-            raise ValueError(f"Input file must have .inp extension, got: {input_path.suffix}")
-
+        input_path = self._check_input(input_file)
         job_name = input_path.stem
-
-        # 远程作业目录：<workdir>/<job_name>
-        remote_workdir = f"{self.workdir}/{job_name}"
-        ssh_target = self._remote_target()
-
-        # 1) 在远程创建工作目录
-        ssh_cmd = ["ssh"]
-        if self.port:
-            ssh_cmd.extend(["-p", str(self.port)])
-        ssh_cmd.extend([ssh_target, f"mkdir -p {remote_workdir}"])
-        self._run_local_cmd(ssh_cmd)
-
-        # 2) 上传输入文件到远程
-        remote_input = f"{ssh_target}:{remote_workdir}/{input_path.name}"
-        scp_cmd = ["scp"]
-        if self.port:
-            scp_cmd.extend(["-P", str(self.port)])
-        scp_cmd.extend([str(input_path), remote_input])
-        self._run_local_cmd(scp_cmd)
-
-        # 2.5) 检查输入文件中是否引用了外部几何文件（如 file=xxx.xyz），如果有则上传
-        referenced_files = self._extract_referenced_geometry_files(input_path)
-        for ref_file in referenced_files:
-            if ref_file.exists():
-                remote_ref = f"{ssh_target}:{remote_workdir}/{ref_file.name}"
-                scp_ref_cmd = ["scp"]
-                if self.port:
-                    scp_ref_cmd.extend(["-P", str(self.port)])
-                scp_ref_cmd.extend([str(ref_file), remote_ref])
-                self._run_local_cmd(scp_ref_cmd)
-            else:
-                # 警告：引用的文件不存在，但继续执行（BDF 会在运行时报错）
-                import warnings
-                warnings.warn(
-                    f"Referenced geometry file not found: {ref_file}. "
-                    f"BDF calculation may fail if the file is not available on remote."
-                )
-
-        # 3) 组装远程命令
-        #    env_setup1 && env_setup2 && cd workdir && nohup bdf_command input.inp > job.log 2>&1 &
-        setup_cmd = " && ".join(self.env_setup) if self.env_setup else ""
-        cd_cmd = f"cd {remote_workdir}"
-        run_cmd = f"nohup {self.bdf_command} {input_path.name} > {job_name}.log 2>&1 &"
-        full_remote_cmd = " && ".join([c for c in [setup_cmd, cd_cmd, run_cmd] if c])
-
-        # 4) 通过 SSH 启动远程作业
-        ssh_run_cmd = ["ssh"]
-        if self.port:
-            ssh_run_cmd.extend(["-p", str(self.port)])
-        ssh_run_cmd.extend([ssh_target, full_remote_cmd])
-        proc = subprocess.run(
-            ssh_run_cmd,
-            text=True,
-            capture_output=True,
-        )
+        base, returncode = self._launch(input_path)
 
         # 提交阶段失败，直接返回
-        if proc.returncode != 0:
+        if returncode != 0:
             return {
                 "status": "failed",
-                "remote_workdir": remote_workdir,
-                "remote_command": full_remote_cmd,
-                "ssh_target": ssh_target,
-                "stdout": proc.stdout,
-                "stderr": proc.stderr,
-                "error": f"SSH submission failed with exit code {proc.returncode}",
+                **base,
+                "error": f"SSH submission failed with exit code {returncode}",
             }
 
         # 如果未配置轮询，则只返回提交成功
         if self.poll_interval <= 0:
-            return {
-                "status": "submitted",
-                "remote_workdir": remote_workdir,
-                "remote_command": full_remote_cmd,
-                "ssh_target": ssh_target,
-                "stdout": proc.stdout,
-                "stderr": proc.stderr,
-            }
+            return {"status": "submitted", **base}
 
         # --------------------
         # 轮询远程作业状态
         # --------------------
         start_time = time.time()
-        status = "running"
         final_state = None  # DONE_OK, DONE_ERR, TIMEOUT
+        max_wait = self._max_wait(timeout)
 
-        # 优先使用 runner 自己的 max_wait，其次用调用者传入的 timeout
-        max_wait = self.max_wait
-        if max_wait is None and timeout:
-            max_wait = timeout
-
-        # 状态检查命令：在远程工作目录中检查日志内容
-        check_cmd = (
-            f"cd {remote_workdir} && "
-            f"if grep -q 'Congratulations! BDF normal termination' {job_name}.log 2>/dev/null; then "
-            f"echo DONE_OK; "
-            f"elif grep -Ei 'ERROR|FATAL|ABORT' {job_name}.log 2>/dev/null; then "
-            f"echo DONE_ERR; "
-            f"elif [ -f {job_name}.err ]; then "
-            f"echo DONE_ERR; "
-            f"else "
-            f"echo RUNNING; "
-            f"fi"
-        )
+        # 增量解析远程日志：每次轮询只传输上次偏移之后新追加的字节
+        tail = self._log_tail(input_path, base["remote_workdir"])
+        on_event = kwargs.get("on_event")
 
         while True:
             elapsed = time.time() - start_time
@@ -287,64 +486,155 @@ class SSHRemoteRunner:
                 final_state = "TIMEOUT"
                 break
 
-            ssh_check_cmd = ["ssh"]
-            if self.port:
-                ssh_check_cmd.extend(["-p", str(self.port)])
-            ssh_check_cmd.extend([ssh_target, check_cmd])
             proc_check = subprocess.run(
-                ssh_check_cmd,
-                text=True,
+                self._ssh_cmd(self._build_poll_cmd(base["remote_workdir"], job_name, tail.offset)),
                 capture_output=True,
             )
-            out = (proc_check.stdout or "").strip()
-
-            if "DONE_OK" in out:
-                final_state = "DONE_OK"
-                break
-            elif "DONE_ERR" in out:
-                final_state = "DONE_ERR"
+            final_state = self._consume_poll_output(tail, proc_check.stdout, on_event)
+            if final_state:
                 break
 
             # 未识别为结束状态，继续等待
             time.sleep(self.poll_interval)
 
-        # --------------------
-        # 如需，尝试下载输出文件
-        # --------------------
-        local_output_file: Optional[Path] = None
-        if self.download:
-            # 下载主日志文件到本地输入文件所在目录
-            local_log = input_path.with_suffix(".log")
-            remote_log = f"{ssh_target}:{remote_workdir}/{job_name}.log"
-            try:
-                scp_back_cmd = ["scp"]
-                if self.port:
-                    scp_back_cmd.extend(["-P", str(self.port)])
-                scp_back_cmd.extend([remote_log, str(local_log)])
-                self._run_local_cmd(scp_back_cmd)
-                local_output_file = local_log
-            except Exception:
-                # 下载失败不视为致命错误，只是不提供本地输出路径
-                local_output_file = None
+        return self._finalize(input_path, base, final_state, tail)
 
-        # 映射 final_state 到对外 status
-        if final_state == "DONE_OK":
-            result_status = "success"
-        elif final_state == "DONE_ERR":
-            result_status = "failed"
-        else:  # TIMEOUT 或 None
-            result_status = "timeout"
+    def submit(
+        self,
+        input_file: str,
+        timeout: Optional[int] = None,
+        use_debug_dir: bool = False,
+        **kwargs: Any,
+    ) -> JobHandle:
+        """
+        在远程节点上启动 BDF 计算并立即返回作业句柄（不阻塞）。
 
-        result: Dict[str, Any] = {
-            "status": result_status,
-            "remote_workdir": remote_workdir,
-            "remote_command": full_remote_cmd,
-            "ssh_target": ssh_target,
-            "stdout": proc.stdout,
-            "stderr": proc.stderr,
-        }
-        if local_output_file:
-            result["output_file"] = str(local_output_file)
+        句柄每次 poll() 时在后台发出一次增量日志查询（同 run() 的轮询），
+        handle.result() 返回与轮询模式下 run() 相同格式的字典。
+        未配置 poll_interval 时句柄使用默认 30 秒间隔。
 
-        return result
+        Args:
+            input_file: 本地 BDF 输入文件路径 (.inp)
+            timeout: 最大等待时间（秒，runner 的 max_wait 优先）
+            **kwargs: on_event=callable 可接收增量解析事件（ParseEvent）
+
+        Returns:
+            JobHandle
+        """
+        input_path = self._check_input(input_file)
+        base, returncode = self._launch(input_path)
+        if returncode != 0:
+            return FinishedJobHandle(input_path.stem, {
+                "status": "failed",
+                **base,
+                "error": f"SSH submission failed with exit code {returncode}",
+            })
+        return SSHJobHandle(
+            self,
+            input_path,
+            base,
+            max_wait=self._max_wait(timeout),
+            on_event=kwargs.get("on_event"),
+        )
 
+
+class SSHJobHandle(JobHandle):
+    """
+    SSHRemoteRunner 提交的远程作业句柄。
+
+    poll() 不阻塞：状态查询（ssh + tail -c）在后台运行，其输出在下一次 poll() 时处理。
+    加入 StatusPoller 后，同一主机上的作业改为由 poller 合并查询。
+    """
+
+    def __init__(
+        self,
+        runner: SSHRemoteRunner,
+        input_path: Path,
+        base: Dict[str, Any],
+        max_wait: Optional[float] = None,
+        on_event: Optional[Callable[[Any], None]] = None,
+    ):
+        super().__init__(input_path.stem, runner.poll_interval or DEFAULT_REMOTE_POLL_INTERVAL)
+        self.runner = runner
+        self.input_path = input_path
+        self.remote_workdir = base["remote_workdir"]
+        self.status = RUNNING
+        self.tail = runner._log_tail(input_path, self.remote_workdir)
+        self._base = base
+        self._deadline = None if max_wait is None else self.submitted_at + max_wait
+        self._on_event = on_event
+        self._check: Optional[BackgroundCommand] = None
+        self._poller = None
+
+    @property
+    def batch_key(self) -> Tuple[str, str, Optional[int]]:
+        """同一主机（及端口）上的 SSH 作业可合并为一次查询。"""
+        connection = self.runner.connection
+        return ("ssh", connection.target, connection.port)
+
+    @classmethod
+    def _batch_command(cls, handles: List["SSHJobHandle"]) -> List[str]:
+        runner = handles[0].runner
+        return runner._ssh_cmd(runner._build_batch_poll_cmd(
+            [(h.remote_workdir, h.name, h.tail.offset) for h in handles]
+        ))
+
+    @classmethod
+    def _parse_batch(cls, handles: List["SSHJobHandle"], stdout: bytes) -> List[Optional[Tuple[bool, bytes, int]]]:
+        return SSHRemoteRunner._split_batch_poll_output(stdout, len(handles))
+
+    def _apply_status(self, status: Tuple[bool, bytes, int]) -> bool:
+        err_file_exists, new_bytes, transferred = status
+        final_state = self.runner._consume_log_delta(
+            self.tail, err_file_exists, new_bytes, self._on_event, transferred
+        )
+        if final_state:
+            self._finish_with(final_state)
+        return bool(new_bytes) or final_state is not None
+
+    def _check_deadline(self) -> bool:
+        if self._deadline is not None and time.time() >= self._deadline:
+            self._finish_with("TIMEOUT")
+            return True
+        return False
+
+    def progress(self) -> Dict[str, Any]:
+        """当前的增量解析摘要。"""
+        return self.tail.summary()
+
+    def _poll(self) -> None:
+        if self._poller is not None:
+            self._poller.poll()
+            return
+        if self._check is not None:
+            output = self._check.poll()
+            if output is None:
+                return
+            self._check = None
+            final_state = self.runner._consume_poll_output(self.tail, output[1], self._on_event)
+            if final_state:
+                self._finish_with(final_state)
+                return
+        if self._check_deadline():
+            return
+        self._check = BackgroundCommand(self.runner._ssh_cmd(
+            self.runner._build_poll_cmd(self.remote_workdir, self.name, self.tail.offset)
+        ))
+
+    def _finish_with(self, final_state: str) -> None:
+        result = self.runner._finalize(self.input_path, self._base, final_state, self.tail)
+        self._finish(result["status"], result)
+
+    def _cancel(self) -> Optional[Dict[str, Any]]:
+        if self._check is not None:
+            self._check.kill()
+            self._check = None
+        pid_file = f"{self.name}.pid"
+        try:
+            self.runner._run_local_cmd(self.runner._ssh_cmd(
+                f"cd {self.remote_workdir} && pid=$(cat {pid_file}) && "
+                f"pkill -TERM -P $pid; kill -TERM $pid"
+            ))
+        except RuntimeError:
+            return None
+        return {**self._base, "progress": self.tail.summary()}
@@ -9,7 +9,8 @@ from typing import Dict, Any, Optional, Union
 from .bdfautotest import BDFAutotestRunner
 from .bdf_direct import BDFDirectRunner
 from .remote_ssh import SSHRemoteRunner
-from .remote_slurm import SSHSlurmRunner
+from .remote_slurm import DEFAULT_MAX_ARRAY_SIZE, SSHSlurmRunner
+from .ssh import DEFAULT_CONTROL_PERSIST
 
 
 def create_runner(
@@ -106,6 +107,11 @@ def create_runner(
                 poll_interval=ssh_cfg.get('poll_interval'),
                 max_wait=ssh_cfg.get('max_wait'),
                 download=ssh_cfg.get('download', True),
+                multiplex=ssh_cfg.get('multiplex', True),
+                control_persist=ssh_cfg.get('control_persist', DEFAULT_CONTROL_PERSIST),
+                control_dir=ssh_cfg.get('control_dir'),
+                compress=ssh_cfg.get('compress', False),
+                staging_manifest=ssh_cfg.get('staging_manifest', True),
             )
         elif execution_type == 'remote_slurm':
             # 远程 Slurm 提交模式
@@ -121,6 +127,12 @@ def create_runner(
                 job_script_template=slurm_cfg.get('job_script_template'),
                 env_setup=slurm_cfg.get('env_setup') or [],
                 default_slurm=slurm_cfg.get('default_slurm') or {},
+                port=slurm_cfg.get('port'),
+                multiplex=slurm_cfg.get('multiplex', True),
+                control_persist=slurm_cfg.get('control_persist', DEFAULT_CONTROL_PERSIST),
+                control_dir=slurm_cfg.get('control_dir'),
+                staging_manifest=slurm_cfg.get('staging_manifest', True),
+                max_array_size=slurm_cfg.get('max_array_size', DEFAULT_MAX_ARRAY_SIZE),
             )
         else:
             raise ValueError(
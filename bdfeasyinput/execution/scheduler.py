@@ -0,0 +1,288 @@
+"""
+Local Job Scheduler
+
+This module runs many BDF inputs on one node with BDFDirectRunner. Each job
+gets an OpenMP thread budget and concurrent jobs are packed so that the sum
+of their threads never exceeds the available cores. Jobs can optionally be
+pinned to the CPUs they were assigned. Once a job's completion callback has
+run, the log text is dropped from its stored result so that large batches do
+not keep every log in memory.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .bdf_direct import BDFDirectRunner
+from .jobs import FINAL_STATES, FinishedJobHandle, JobHandle
+
+
+# 调度循环轮询运行中作业的间隔（秒）
+SCHEDULER_POLL_INTERVAL = 0.1
+
+# 作业完成回调之后从结果中丢弃的字段（整个日志文本，输出文件仍在 output_file）
+RESULT_LOG_FIELDS = ('stdout', 'stderr')
+
+
+def available_cpus() -> List[int]:
+    """返回当前进程可用的 CPU 编号（支持 sched_getaffinity 时遵循其限制）"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+@dataclass
+class ScheduledJob:
+    """
+    调度队列中的一个作业
+
+    Attributes:
+        index: 提交顺序
+        input_file: BDF 输入文件路径
+        threads: 分配的 OpenMP 线程数（占用的核数）
+        cpus: 分配的 CPU 编号
+        result: BDFDirectRunner.run 的返回值（on_complete 之后不含 RESULT_LOG_FIELDS）
+    """
+    index: int
+    input_file: str
+    threads: int
+    cpus: Tuple[int, ...] = ()
+    result: Optional[Dict[str, Any]] = None
+    queued_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if self.result is None:
+            return 'running' if self.started_at is not None else 'queued'
+        return self.result.get('status', 'failed')
+
+    @property
+    def run_time(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def wait_time(self) -> float:
+        return (self.started_at or self.queued_at) - self.queued_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'input_file': self.input_file,
+            'status': self.status,
+            'threads': self.threads,
+            'cpus': list(self.cpus),
+            'wait_time': self.wait_time,
+            'run_time': self.run_time,
+            'output_file': (self.result or {}).get('output_file'),
+            'exit_code': (self.result or {}).get('exit_code'),
+        }
+
+
+@dataclass
+class SchedulerReport:
+    """
+    一次调度运行的统计
+
+    utilization 为所有作业占用的 核·秒 与 总核数 × 墙钟时间 之比。
+    """
+    jobs: List[ScheduledJob]
+    total_cores: int
+    wall_time: float
+    failed: List[ScheduledJob] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for job in self.jobs if job.status == 'success')
+
+    @property
+    def throughput(self) -> float:
+        """每小时完成的作业数"""
+        return len(self.jobs) * 3600.0 / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def core_seconds(self) -> float:
+        return sum(job.threads * job.run_time for job in self.jobs)
+
+    @property
+    def utilization(self) -> float:
+        capacity = self.total_cores * self.wall_time
+        return self.core_seconds / capacity if capacity > 0 else 0.0
+
+    @property
+    def peak_concurrency(self) -> int:
+        """同时运行的最大作业数"""
+        events = []
+        for job in self.jobs:
+            if job.started_at is not None and job.finished_at is not None:
+                events.append((job.started_at, 1))
+                events.append((job.finished_at, -1))
+        peak = running = 0
+        for _, delta in sorted(events, key=lambda e: (e[0], e[1])):
+            running += delta
+            peak = max(peak, running)
+        return peak
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_cores': self.total_cores,
+            'wall_time': self.wall_time,
+            'jobs': len(self.jobs),
+            'succeeded': self.succeeded,
+            'failed': len(self.failed),
+            'throughput_per_hour': self.throughput,
+            'core_seconds': self.core_seconds,
+            'utilization': self.utilization,
+            'peak_concurrency': self.peak_concurrency,
+            'job_results': [job.to_dict() for job in self.jobs],
+        }
+
+
+class LocalScheduler:
+    """
+    本地作业调度器
+
+    按提交顺序排队，每当有空闲核时依次启动能放入剩余核数的作业（先到先放，
+    较小的作业可以填补大作业留下的空隙），保证同时运行作业的线程数之和
+    不超过 total_cores。
+    """
+
+    def __init__(
+        self,
+        runner: BDFDirectRunner,
+        total_cores: Optional[int] = None,
+        threads_per_job: Optional[int] = None,
+        pin: bool = False,
+        poll_interval: float = SCHEDULER_POLL_INTERVAL,
+    ):
+        """
+        Args:
+            runner: 直接 BDF 执行器
+            total_cores: 可使用的总核数（默认为当前进程可用的全部 CPU）
+            threads_per_job: 每个作业的线程数（默认使用 runner.omp_num_threads）
+            pin: 是否将作业绑定到分配的 CPU（需要 os.sched_setaffinity）
+            poll_interval: 轮询运行中作业的间隔（秒）
+        """
+        cpus = available_cpus()
+        if total_cores is not None:
+            if total_cores < 1:
+                raise ValueError(f"total_cores must be positive, got {total_cores}")
+            if total_cores > len(cpus):
+                # 核数超过实际 CPU 时仍按 total_cores 调度，绑定时循环使用真实 CPU
+                cpus = [cpus[i % len(cpus)] for i in range(total_cores)]
+            else:
+                cpus = cpus[:total_cores]
+        self.runner = runner
+        self.cpus = cpus
+        self.total_cores = len(cpus)
+        threads = threads_per_job or runner.omp_num_threads
+        if threads < 1:
+            raise ValueError(f"threads_per_job must be positive, got {threads}")
+        self.threads_per_job = min(threads, self.total_cores)
+        self.pin = pin and hasattr(os, 'sched_setaffinity')
+        self.poll_interval = poll_interval
+
+    def run(
+        self,
+        input_files: Iterable[str],
+        timeout: Optional[int] = None,
+        on_complete: Optional[Callable[[ScheduledJob], None]] = None,
+    ) -> SchedulerReport:
+        """
+        运行所有输入文件并等待完成
+
+        Args:
+            input_files: BDF 输入文件（.inp）
+            timeout: 单个作业的超时时间（秒）
+            on_complete: 每个作业完成时调用的回调（此时 job.result 仍含 stdout/stderr）
+
+        Returns:
+            SchedulerReport
+        """
+        start = time.time()
+        pending = [
+            ScheduledJob(index=i, input_file=str(path), threads=self.threads_per_job, queued_at=start)
+            for i, path in enumerate(input_files)
+        ]
+        jobs = list(pending)
+        free = list(self.cpus)
+        running: List[Tuple[ScheduledJob, JobHandle]] = []
+
+        while pending or running:
+            waiting = []
+            for job in pending:
+                if job.threads <= len(free):
+                    job.cpus, free = tuple(free[:job.threads]), free[job.threads:]
+                    running.append((job, self._start(job, timeout)))
+                else:
+                    waiting.append(job)
+            pending = waiting
+
+            # 在同一个循环中轮询所有运行中的作业（不为每个作业创建线程）
+            still_running = []
+            for job, handle in running:
+                if handle.poll() not in FINAL_STATES:
+                    still_running.append((job, handle))
+                    continue
+                job.result = handle.result()
+                job.finished_at = handle.finished_at or time.time()
+                free = sorted(free + list(job.cpus))
+                if on_complete is not None:
+                    on_complete(job)
+                for key in RESULT_LOG_FIELDS:
+                    job.result.pop(key, None)
+            if len(still_running) == len(running) and still_running:
+                time.sleep(self.poll_interval)
+            running = still_running
+
+        wall_time = time.time() - start
+        return SchedulerReport(
+            jobs=jobs,
+            total_cores=self.total_cores,
+            wall_time=wall_time,
+            failed=[job for job in jobs if job.status != 'success'],
+        )
+
+    def _start(self, job: ScheduledJob, timeout: Optional[int]) -> JobHandle:
+        job.started_at = time.time()
+        try:
+            return self.runner.submit(
+                job.input_file,
+                timeout=timeout,
+                omp_num_threads=job.threads,
+                cpu_affinity=sorted(set(job.cpus)) if self.pin else None,
+                bdf_tmpdir=self._job_tmpdir(job),
+                poll_interval=self.poll_interval,
+            )
+        except Exception as e:
+            return FinishedJobHandle(Path(job.input_file).stem, {'status': 'failed', 'error': str(e), 'exit_code': -1})
+
+    def _job_tmpdir(self, job: ScheduledJob) -> Optional[str]:
+        """并发作业不能共用固定的 BDF_TMPDIR：模板中没有 $RANDOM 时为每个作业使用子目录"""
+        template = self.runner.bdf_tmpdir_template
+        if '$RANDOM' in template:
+            return None
+        return str(Path(template) / f"{Path(job.input_file).stem}-{job.index}")
+
+
+def run_many(
+    runner: BDFDirectRunner,
+    input_files: Sequence[str],
+    total_cores: Optional[int] = None,
+    threads_per_job: Optional[int] = None,
+    pin: bool = False,
+    timeout: Optional[int] = None,
+    on_complete: Optional[Callable[[ScheduledJob], None]] = None,
+) -> SchedulerReport:
+    """
+    使用 LocalScheduler 运行多个输入文件（便捷函数）
+
+    Returns:
+        SchedulerReport
+    """
+    scheduler = LocalScheduler(runner, total_cores=total_cores, threads_per_job=threads_per_job, pin=pin)
+    return scheduler.run(input_files, timeout=timeout, on_complete=on_complete)
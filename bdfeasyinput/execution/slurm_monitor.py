@@ -0,0 +1,333 @@
+"""
+Slurm Job Monitor
+
+This module provides SlurmMonitor, which tracks Slurm jobs submitted by
+SSHSlurmRunner across sessions. All tracked jobs are refreshed with one
+squeue/sacct call, state transitions are cached in a local JSON state file,
+outputs are downloaded when a job finishes, and each job's queue wait and
+run time are recorded so partitions and cpus_per_task can be tuned from
+real numbers.
+"""
+
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from .jobs import FINAL_STATES, RUNNING
+from .remote_slurm import SLURM_STATE_MAP, SSHSlurmRunner, slurm_timing
+from .staging import atomic_write_text, fetch_files, file_lock
+
+
+# 状态文件的环境变量与默认位置
+STATE_FILE_ENV = 'BDFEASYINPUT_SLURM_STATE'
+DEFAULT_STATE_FILE = Path.home() / '.bdfeasyinput' / 'slurm_jobs.json'
+
+# 作业结束后默认下载的文件（作业目录中的通配符）
+DEFAULT_DOWNLOAD_PATTERNS = ["*.log", "*.out", "*.err"]
+
+# watch() 默认的刷新间隔（秒）
+DEFAULT_WATCH_INTERVAL = 60
+
+
+def default_state_file() -> Path:
+    """返回状态文件路径（优先使用环境变量 BDFEASYINPUT_SLURM_STATE）"""
+    env = os.environ.get(STATE_FILE_ENV)
+    return Path(env).expanduser() if env else DEFAULT_STATE_FILE
+
+
+class SlurmMonitor:
+    """
+    跟踪 Slurm 作业状态
+
+    状态文件中每个作业一条记录：
+    {job_id: {name, host, remote_workdir, local_dir, state, status, submit_time,
+              start_time, end_time, partition, cpus, queue_wait, run_time,
+              history: [[state, 本地时间戳], ...], downloaded: [本地文件]}}
+
+    状态文件默认由所有会话共用（如 slurm status --watch 与并发的 slurm submit）：
+    save() 在文件锁内重新读取状态文件，只写入本实例新增、更新或删除的作业。
+    """
+
+    def __init__(
+        self,
+        runner: SSHSlurmRunner,
+        state_file: Optional[Union[str, Path]] = None,
+        download: bool = True,
+        patterns: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            runner: 用于连接集群的 SSHSlurmRunner
+            state_file: 状态文件（默认 default_state_file()）
+            download: 作业结束后是否下载输出文件
+            patterns: 下载的文件通配符（默认 *.log、*.out、*.err）
+        """
+        self.runner = runner
+        self.state_file = Path(state_file).expanduser() if state_file else default_state_file()
+        self.download = download
+        self.patterns = list(patterns or DEFAULT_DOWNLOAD_PATTERNS)
+        self.jobs: Dict[str, Dict[str, Any]] = self._read()
+        # 自上次 save() 以来本实例改动过 / 删除的作业
+        self._dirty: Set[str] = set()
+        self._removed: Set[str] = set()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_file.exists():
+            return {}
+        with open(self.state_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    @property
+    def host(self) -> str:
+        return self.runner.connection.target
+
+    def _host_jobs(self) -> Dict[str, Dict[str, Any]]:
+        """本 runner 所连接集群上的作业（同一状态文件可记录多个集群）"""
+        return {job_id: job for job_id, job in self.jobs.items() if job.get("host") == self.host}
+
+    def save(self) -> None:
+        """
+        写回状态文件
+
+        加锁后重新读取磁盘上的状态，按 job_id 合并本实例改动过的作业并删除已 forget 的作业，
+        再经临时文件原子替换；其他会话同时新增或更新的作业不会被覆盖。
+        合并后的结果同时成为本实例的 self.jobs。
+        """
+        with file_lock(self.state_file):
+            jobs = self._merged()
+            atomic_write_text(self.state_file, json.dumps(jobs, indent=2, ensure_ascii=False))
+        self.jobs = jobs
+        self._dirty.clear()
+        self._removed.clear()
+
+    def reload(self) -> None:
+        """重新读取状态文件（保留本实例尚未保存的改动），以看到其他会话提交或更新的作业"""
+        with file_lock(self.state_file):
+            self.jobs = self._merged()
+
+    def _merged(self) -> Dict[str, Dict[str, Any]]:
+        """磁盘上的状态叠加本实例的改动（调用方持有文件锁）"""
+        jobs = self._read()
+        for job_id in self._removed:
+            jobs.pop(job_id, None)
+        for job_id in self._dirty:
+            if job_id in self.jobs:
+                jobs[job_id] = self.jobs[job_id]
+        return jobs
+
+    def track(self, submission: Dict[str, Any], name: str, local_dir: Optional[Union[str, Path]] = None) -> None:
+        """
+        开始跟踪一个已提交的作业
+
+        Args:
+            submission: runner.run() 的返回值（或作业句柄的提交信息），需包含 job_id 和 remote_workdir
+            name: 作业名
+            local_dir: 输出文件的下载目录（默认为当前目录下的 <name>/）
+        """
+        job_id = submission.get("job_id")
+        if not job_id:
+            raise ValueError(f"Submission of {name} has no job_id (status: {submission.get('status')})")
+        self.jobs[str(job_id)] = {
+            "name": name,
+            "host": self.host,
+            "remote_workdir": submission["remote_workdir"],
+            "local_dir": str(Path(local_dir) if local_dir else Path.cwd() / name),
+            "state": "PENDING",
+            "status": SLURM_STATE_MAP["PENDING"],
+            "history": [["SUBMITTED", time.time()]],
+            "downloaded": [],
+        }
+        self._dirty.add(str(job_id))
+        self._removed.discard(str(job_id))
+
+    def submit(self, input_files: List[str], **kwargs: Any) -> List[str]:
+        """
+        逐个提交作业并开始跟踪（输出下载到输入文件所在目录）
+
+        Args:
+            input_files: 本地 BDF 输入文件路径 (.inp)
+            **kwargs: 传给 runner.run()（如 slurm={...}）
+
+        Returns:
+            提交成功的 job_id 列表
+        """
+        job_ids = []
+        try:
+            for input_file in input_files:
+                submission = self.runner.run(input_file, **kwargs)
+                if submission.get("status") == "submitted":
+                    self.track(submission, Path(input_file).stem, Path(input_file).resolve().parent)
+                    job_ids.append(str(submission["job_id"]))
+        finally:
+            self.save()
+        return job_ids
+
+    def submit_array(self, input_files: List[str], **kwargs: Any) -> List[str]:
+        """
+        以作业数组提交并跟踪每个任务（参数同 runner.submit_array()）
+
+        Returns:
+            各任务的 job_id（如 "1234_0"）；提交失败时为空列表
+        """
+        handles = self.runner.submit_array(input_files, **kwargs)
+        job_ids = []
+        for handle, input_file in zip(handles, input_files):
+            if handle.status in FINAL_STATES:
+                continue
+            self.track(handle._submission, handle.name, Path(input_file).resolve().parent)
+            job_ids.append(handle.job_id)
+        self.save()
+        return job_ids
+
+    def active(self) -> List[str]:
+        """本集群上尚未结束（或尚未下载输出）的作业"""
+        return [
+            job_id for job_id, job in self._host_jobs().items()
+            if job["status"] not in FINAL_STATES or (self.download and job.get("pending_download"))
+        ]
+
+    def refresh(self, on_transition: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> List[str]:
+        """
+        用一次 squeue/sacct 查询更新所有未结束的作业，记录状态变化，下载已结束作业的输出
+
+        Args:
+            on_transition: 状态变化时调用 on_transition(job_id, job)
+
+        Returns:
+            本次状态发生变化的 job_id
+        """
+        self.reload()
+        active = self.active()
+        if not active:
+            return []
+        proc = self.runner._run_local_cmd(
+            self.runner.connection.ssh_cmd(self.runner._build_status_cmd(active))
+        )
+        records = self.runner._parse_status_output(proc.stdout)
+        now = time.time()
+        changed = []
+        for job_id in active:
+            job = self.jobs[job_id]
+            record = records.get(job_id)
+            if record is not None or job.get("pending_download"):
+                self._dirty.add(job_id)
+            if record is not None:
+                job.update({k: v for k, v in record.items() if v is not None})
+                job.update({k: v for k, v in slurm_timing(job).items() if v is not None})
+                status = SLURM_STATE_MAP.get(record["state"], RUNNING)
+                if record["state"] != job["history"][-1][0]:
+                    job["history"].append([record["state"], now])
+                    job["status"] = status
+                    if status in FINAL_STATES:
+                        job["pending_download"] = self.download
+                    changed.append(job_id)
+                    if on_transition is not None:
+                        on_transition(job_id, job)
+            if job.get("pending_download"):
+                try:
+                    files = fetch_files(self.runner.connection, job["remote_workdir"], self.patterns, job["local_dir"])
+                except RuntimeError:
+                    # 下载失败时保留标记，下次刷新重试
+                    continue
+                job["downloaded"] = [str(f) for f in files]
+                job.pop("pending_download")
+        self.save()
+        return changed
+
+    def watch(
+        self,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        timeout: Optional[float] = None,
+        on_transition: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ) -> None:
+        """
+        周期性刷新，直到本集群上的所有作业结束
+
+        Raises:
+            TimeoutError: 超过 timeout 时仍有作业未结束
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            self.refresh(on_transition)
+            if not self.active():
+                return
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"{len(self.active())} Slurm job(s) still active after {timeout} seconds")
+            time.sleep(interval)
+
+    def forget(self, finished_only: bool = True) -> int:
+        """
+        从状态文件中删除本集群上的作业
+
+        Args:
+            finished_only: 只删除已结束且已下载的作业
+
+        Returns:
+            删除的作业数
+        """
+        self.reload()
+        active = set(self.active())
+        removed = [
+            job_id for job_id in self._host_jobs()
+            if not finished_only or job_id not in active
+        ]
+        for job_id in removed:
+            del self.jobs[job_id]
+            self._dirty.discard(job_id)
+            self._removed.add(job_id)
+        self.save()
+        return len(removed)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        每个作业一行：job_id、name、state、partition、cpus、queue_wait、run_time 等
+
+        Returns:
+            按提交顺序排列的记录列表
+        """
+        rows = []
+        for job_id, job in self._host_jobs().items():
+            rows.append({
+                "job_id": job_id,
+                "name": job["name"],
+                "state": job["state"],
+                "status": job["status"],
+                "partition": job.get("partition"),
+                "cpus": job.get("cpus"),
+                "queue_wait": job.get("queue_wait"),
+                "run_time": job.get("run_time"),
+                "submit_time": job.get("submit_time"),
+                "start_time": job.get("start_time"),
+                "end_time": job.get("end_time"),
+            })
+        return sorted(rows, key=lambda r: self.jobs[r["job_id"]]["history"][0][1])
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        按 (分区, CPU 数) 汇总：作业数、排队时间和运行时间的平均值/中位数、核时
+
+        Returns:
+            每个 (partition, cpus) 一行
+        """
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in self.report():
+            groups.setdefault((row["partition"], row["cpus"]), []).append(row)
+        summary = []
+        for (partition, cpus), rows in groups.items():
+            waits = [r["queue_wait"] for r in rows if r["queue_wait"] is not None]
+            runs = [r["run_time"] for r in rows if r["run_time"] is not None]
+            summary.append({
+                "partition": partition,
+                "cpus": cpus,
+                "jobs": len(rows),
+                "finished": sum(1 for r in rows if r["status"] in FINAL_STATES),
+                "mean_queue_wait": statistics.mean(waits) if waits else None,
+                "median_queue_wait": statistics.median(waits) if waits else None,
+                "mean_run_time": statistics.mean(runs) if runs else None,
+                "median_run_time": statistics.median(runs) if runs else None,
+                "core_hours": sum(runs) * cpus / 3600 if runs and cpus else None,
+            })
+        return summary
@@ -0,0 +1,138 @@
+"""
+SSH Connection Helper
+
+This module builds ssh/scp command lines for the remote runners. By default
+it enables OpenSSH connection multiplexing (ControlMaster/ControlPersist):
+the first command to a host opens a master connection whose socket is kept
+alive in the background, and every later ssh/scp to the same host, port and
+user reuses it instead of paying a new TCP and key-exchange handshake.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Union
+
+
+# 控制套接字目录的环境变量与默认位置
+CONTROL_DIR_ENV = 'BDFEASYINPUT_SSH_CONTROL_DIR'
+DEFAULT_CONTROL_DIR = Path.home() / '.bdfeasyinput' / 'ssh'
+
+# 最后一个会话结束后主连接保持的时间（秒或 OpenSSH 时间格式，如 "10m"）
+DEFAULT_CONTROL_PERSIST = 600
+
+
+def default_control_dir() -> Path:
+    """返回控制套接字目录（优先使用环境变量 BDFEASYINPUT_SSH_CONTROL_DIR）"""
+    env = os.environ.get(CONTROL_DIR_ENV)
+    return Path(env).expanduser() if env else DEFAULT_CONTROL_DIR
+
+
+class SSHConnection:
+    """
+    一个远程主机的 SSH 连接参数
+
+    multiplex=True 时所有命令共用 ControlPath（按 %C，即本地主机、远程主机、
+    端口和用户的哈希命名），因此同一主机的不同作业、不同 runner 实例乃至
+    不同进程都复用同一个主连接。
+    """
+
+    def __init__(
+        self,
+        host: str,
+        user: Optional[str] = None,
+        port: Optional[int] = None,
+        multiplex: bool = True,
+        control_persist: Union[int, str] = DEFAULT_CONTROL_PERSIST,
+        control_dir: Optional[Union[str, Path]] = None,
+        ssh_options: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            host: 远程主机名或 IP
+            user: 远程用户名（为空则使用 ssh_config 中的配置）
+            port: SSH 端口号（为空则使用默认 22 或 ssh_config 中的配置）
+            multiplex: 是否启用 ControlMaster 连接复用
+            control_persist: 主连接空闲后保持的时间（秒或 "10m" 等）
+            control_dir: 控制套接字目录（默认 default_control_dir()）
+            ssh_options: 额外的 -o 选项（如 ["ServerAliveInterval=60"]）
+        """
+        self.host = host
+        self.user = user
+        self.port = port
+        self.multiplex = multiplex
+        self.control_persist = control_persist
+        self.control_dir = Path(control_dir).expanduser() if control_dir else default_control_dir()
+        self.ssh_options = list(ssh_options or [])
+        self._control_dir_ready = False
+
+    @property
+    def target(self) -> str:
+        """返回 user@host 形式的 SSH 目标。"""
+        if self.user:
+            return f"{self.user}@{self.host}"
+        return self.host
+
+    @property
+    def control_path(self) -> str:
+        return str(self.control_dir / "%C")
+
+    def options(self) -> List[str]:
+        """ssh 与 scp 共用的 -o 选项。"""
+        opts: List[str] = []
+        if self.multiplex:
+            if not self._control_dir_ready:
+                # 套接字目录只允许当前用户访问
+                self.control_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+                self._control_dir_ready = True
+            opts += [
+                "-o", "ControlMaster=auto",
+                "-o", f"ControlPath={self.control_path}",
+                "-o", f"ControlPersist={self.control_persist}",
+            ]
+        for option in self.ssh_options:
+            opts += ["-o", option]
+        return opts
+
+    def ssh_cmd(self, remote_cmd: str) -> List[str]:
+        """构造在远程执行 remote_cmd 的 ssh 命令。"""
+        cmd = ["ssh"]
+        if self.port:
+            cmd.extend(["-p", str(self.port)])
+        cmd.extend(self.options())
+        cmd.extend([self.target, remote_cmd])
+        return cmd
+
+    def scp_cmd(self, sources: List[str], destination: str) -> List[str]:
+        """构造 scp 命令（一次调用可传输多个文件）。"""
+        cmd = ["scp"]
+        if self.port:
+            cmd.extend(["-P", str(self.port)])
+        cmd.extend(self.options())
+        cmd.extend(sources)
+        cmd.append(destination)
+        return cmd
+
+    def remote_path(self, path: str) -> str:
+        """返回 scp 使用的 user@host:path。"""
+        return f"{self.target}:{path}"
+
+    def _control_cmd(self, command: str) -> List[str]:
+        cmd = ["ssh"]
+        if self.port:
+            cmd.extend(["-p", str(self.port)])
+        cmd.extend(self.options())
+        cmd.extend(["-O", command, self.target])
+        return cmd
+
+    def is_connected(self) -> bool:
+        """主连接是否存在（ssh -O check）。"""
+        if not self.multiplex:
+            return False
+        proc = subprocess.run(self._control_cmd("check"), capture_output=True, text=True)
+        return proc.returncode == 0
+
+    def close(self) -> None:
+        """关闭主连接（ssh -O exit）；不存在主连接时不做任何事。"""
+        if self.multiplex:
+            subprocess.run(self._control_cmd("exit"), capture_output=True, text=True)
@@ -0,0 +1,330 @@
+"""
+Remote Job Staging
+
+This module uploads the input files of remote jobs in a single transfer:
+the files of one job, or of many jobs at once, are packed into one
+gzip-compressed tar stream that is piped over one ssh channel and unpacked
+in the remote work root. A local content-hash manifest remembers what has
+already been sent to each remote path; before such a file is skipped its
+remote copy is checked (sha256sum, in one ssh call), so files removed or
+changed on the remote side are sent again. fetch_files() does the reverse
+for job outputs.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import subprocess
+import tarfile
+import tempfile
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows：清单更新不加锁
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+from .ssh import SSHConnection
+
+
+# 清单目录的环境变量与默认位置
+STAGING_DIR_ENV = 'BDFEASYINPUT_STAGING_DIR'
+DEFAULT_STAGING_DIR = Path.home() / '.bdfeasyinput' / 'staging'
+
+_GEOMETRY_BLOCK = re.compile(r"Geometry\s+(.*?)End\s+geometry", re.IGNORECASE | re.DOTALL)
+_FILE_REFERENCE = re.compile(r"file\s*=\s*([^\s\n]+)", re.IGNORECASE)
+
+
+def default_staging_dir() -> Path:
+    """返回清单目录（优先使用环境变量 BDFEASYINPUT_STAGING_DIR）"""
+    env = os.environ.get(STAGING_DIR_ENV)
+    return Path(env).expanduser() if env else DEFAULT_STAGING_DIR
+
+
+def referenced_geometry_files(inp_path: Path) -> List[Path]:
+    """
+    从 BDF 输入文件中提取引用的外部几何文件（如 file=xxx.xyz）。
+
+    Args:
+        inp_path: BDF 输入文件路径
+
+    Returns:
+        引用的几何文件路径列表（相对路径相对于输入文件所在目录）
+    """
+    referenced = []
+    try:
+        content = inp_path.read_text(encoding="utf-8")
+        match = _GEOMETRY_BLOCK.search(content)
+        if match:
+            for file_match in _FILE_REFERENCE.finditer(match.group(1)):
+                filename = file_match.group(1).strip()
+                ref_path = Path(filename)
+                if not ref_path.is_absolute():
+                    ref_path = inp_path.parent / filename
+                referenced.append(ref_path)
+    except Exception:
+        # 解析失败不影响主流程，只是不会上传引用的文件
+        pass
+    return referenced
+
+
+def job_files(input_path: Path, extra: Optional[List[Path]] = None) -> Dict[str, Path]:
+    """
+    收集一个作业需要上传的文件：输入文件、其引用的几何文件以及 extra（如作业脚本）
+
+    Returns:
+        {远程文件名: 本地路径}（远程文件均放在作业目录下）
+    """
+    files = {input_path.name: input_path}
+    for ref_file in referenced_geometry_files(input_path):
+        if ref_file.exists():
+            files[ref_file.name] = ref_file
+        else:
+            # 警告：引用的文件不存在，但继续执行（BDF 会在运行时报错）
+            warnings.warn(
+                f"Referenced geometry file not found: {ref_file}. "
+                f"BDF calculation may fail if the file is not available on remote."
+            )
+    for path in extra or []:
+        files[path.name] = path
+    return files
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    在 path 旁的 .lock 文件上加排他锁（无 fcntl 的平台不加锁）
+
+    用于多个进程共用的本地 JSON 文件（暂存清单、Slurm 作业状态文件）的读-合并-写。
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix(".lock"), "a") as lock:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """先写同目录下的唯一临时文件再 os.replace，并发写入者不会共用临时文件"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def file_digest(path: Path) -> str:
+    """文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StagingManifest:
+    """
+    已上传文件的内容哈希清单（本地 JSON 文件，按远程路径记录 SHA-256）
+
+    清单只记录本机上传过的内容，只用于挑选需要到远程核对的文件；
+    Stager 跳过上传前总会确认远程文件存在且哈希一致。
+    多个 runner（或进程）共用同一清单时，update() 在文件锁内合并磁盘上的条目再写回。
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.entries: Dict[str, str] = self._read()
+
+    def _read(self) -> Dict[str, str]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # 清单损坏时视为空清单（最多重新上传一次）
+            return {}
+
+    def unchanged(self, remote_path: str, digest: str) -> bool:
+        return self.entries.get(remote_path) == digest
+
+    def update(self, digests: Mapping[str, str]) -> None:
+        """记录新上传的文件：加锁后与磁盘上的清单合并并原子写回，不覆盖其他 runner 的条目"""
+        with file_lock(self.path):
+            self.entries = {**self._read(), **digests}
+            atomic_write_text(self.path, json.dumps(self.entries, indent=0, sort_keys=True))
+
+
+class Stager:
+    """
+    将作业文件以一个 tar.gz 流经一次 ssh 上传到远程根目录
+
+    清单文件按 SSH 目标和端口命名（如 user@host_22.json），
+    同一主机的所有 runner 共用。
+    """
+
+    def __init__(
+        self,
+        connection: SSHConnection,
+        staging_dir: Optional[Union[str, Path]] = None,
+        use_manifest: bool = True,
+    ):
+        """
+        Args:
+            connection: 远程主机连接
+            staging_dir: 清单目录（默认 default_staging_dir()）
+            use_manifest: 是否跳过内容未变的文件
+        """
+        self.connection = connection
+        self.use_manifest = use_manifest
+        staging_dir = Path(staging_dir).expanduser() if staging_dir else default_staging_dir()
+        name = re.sub(r"[^\w@.-]", "_", f"{connection.target}_{connection.port or 22}")
+        self.manifest = StagingManifest(staging_dir / f"{name}.json")
+
+    def stage(
+        self,
+        root: str,
+        files: Mapping[str, Path],
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        上传文件到远程 root 目录下（tar 流经标准输入传输）
+
+        清单中内容未变的文件先在一次 ssh 中核对（同时 mkdir -p root）：
+        远程文件缺失或 SHA-256 不一致的仍会上传，所以远程被清理、
+        或由其他机器运行过后不会漏传。其余文件再用一次 ssh 上传。
+
+        Args:
+            root: 远程根目录
+            files: {相对 root 的远程路径: 本地路径}
+            force: 忽略清单，全部重新上传
+
+        Returns:
+            {'sent': [相对路径], 'skipped': [相对路径], 'bytes': 传输的压缩字节数}
+
+        Raises:
+            RuntimeError: 远程核对或解包失败
+        """
+        root = root.rstrip("/") or "/"
+        digests = {rel: file_digest(path) for rel, path in files.items()}
+        candidates = []
+        if self.use_manifest and not force:
+            candidates = [rel for rel, digest in digests.items() if self.manifest.unchanged(f"{root}/{rel}", digest)]
+        remote = self._remote_digests(root, candidates) if candidates else {}
+        skipped = [rel for rel in candidates if remote.get(rel) == digests[rel]]
+        verified = set(skipped)
+        sent = [rel for rel in digests if rel not in verified]
+        if not sent:
+            return {"sent": [], "skipped": skipped, "bytes": 0}
+
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for rel in sent:
+                tar.add(str(files[rel]), arcname=rel, recursive=False)
+        data = buffer.getvalue()
+
+        proc = subprocess.run(
+            self.connection.ssh_cmd(f"mkdir -p {root} && tar -xzf - -C {root}"),
+            input=data,
+            capture_output=True,
+        )
+        if proc.returncode != 0:
+            stderr = proc.stderr.decode("utf-8", errors="ignore") if isinstance(proc.stderr, bytes) else proc.stderr
+            raise RuntimeError(
+                f"Staging to {self.connection.target}:{root} failed with exit code {proc.returncode}: "
+                f"{(stderr or '').strip()}"
+            )
+        if self.use_manifest:
+            self.manifest.update({f"{root}/{rel}": digests[rel] for rel in sent})
+        return {"sent": sent, "skipped": skipped, "bytes": len(data)}
+
+    def _remote_digests(self, root: str, paths: List[str]) -> Dict[str, str]:
+        """
+        创建远程 root 并返回其中已有文件的 SHA-256（路径列表经标准输入传入，不受参数长度限制）
+
+        Returns:
+            {相对路径: SHA-256}；不存在的文件（或远程没有 sha256sum）不在结果中
+        """
+        proc = subprocess.run(
+            self.connection.ssh_cmd(
+                f"mkdir -p {root} && cd {root} && {{ tr '\\n' '\\000' | xargs -0 sha256sum 2>/dev/null; true; }}"
+            ),
+            input="".join(f"{rel}\n" for rel in paths),
+            text=True,
+            capture_output=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"Checking staged files on {self.connection.target}:{root} failed with exit code "
+                f"{proc.returncode}: {(proc.stderr or '').strip()}"
+            )
+        # 输出格式："<64 位十六进制>  <路径>"（二进制模式为 " *<路径>"）
+        remote = {}
+        for line in proc.stdout.splitlines():
+            if len(line) > 66 and line[64] == " ":
+                remote[line[66:]] = line[:64]
+        return remote
+
+
+def fetch_files(
+    connection: SSHConnection,
+    remote_dir: str,
+    patterns: List[str],
+    local_dir: Union[str, Path],
+) -> List[Path]:
+    """
+    将远程目录中匹配 patterns 的文件以一个 tar.gz 流经一次 ssh 取回（不含子目录）
+
+    Args:
+        connection: 远程主机连接
+        remote_dir: 远程目录
+        patterns: shell 通配符（如 ["*.log", "*.out"]）
+        local_dir: 本地目标目录
+
+    Returns:
+        取回的本地文件路径（没有匹配的文件时为空列表）
+
+    Raises:
+        RuntimeError: ssh 命令失败
+    """
+    globs = " ".join(patterns)
+    proc = subprocess.run(
+        connection.ssh_cmd(
+            f"cd {remote_dir} && f=$(ls -d {globs} 2>/dev/null); "
+            f"if [ -n \"$f\" ]; then tar -czf - $f; fi"
+        ),
+        capture_output=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"Fetching {connection.target}:{remote_dir} failed with exit code {proc.returncode}: "
+            f"{proc.stderr.decode('utf-8', errors='ignore').strip()}"
+        )
+    if not proc.stdout:
+        return []
+    local_dir = Path(local_dir)
+    local_dir.mkdir(parents=True, exist_ok=True)
+    fetched = []
+    with tarfile.open(fileobj=io.BytesIO(proc.stdout), mode="r:gz") as tar:
+        for member in tar.getmembers():
+            # 只接受目录下的普通文件，忽略子目录、链接和带路径的成员
+            if not member.isfile() or Path(member.name).name != member.name:
+                continue
+            source = tar.extractfile(member)
+            target = local_dir / member.name
+            target.write_bytes(source.read())
+            fetched.append(target)
+    return fetched
@@ -0,0 +1,470 @@
+"""
+Multi-Step Workflows
+
+This module provides Workflow, a DAG of BDF calculations described by YAML
+task configurations (e.g. optimization -> frequency -> TDDFT). A step can
+take its starting geometry from an upstream step: run() waits for the
+parent, parses its final structure and writes it to the child's .xyz file
+before converting the child's YAML; queue() submits the whole chain to
+Slurm at once with ``--dependency=afterok:`` and the child's job script
+extracts the geometry from the parent's log when it starts, so no wall time
+is lost between steps.
+"""
+
+import copy
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import yaml
+
+from .jobs import FAILED, FINAL_STATES, PENDING, RUNNING, SUCCESS, JobHandle
+
+
+# 因上游步骤失败而未运行的步骤状态
+SKIPPED = 'skipped'
+
+# 步骤名只允许字母、数字、下划线、点和连字符（用于文件名和 Slurm 作业名）
+_STEP_NAME = re.compile(r'^[\w.-]+$')
+
+# 作业脚本中从上游日志提取最后一个 "Molecular Cartesian Coordinates (X,Y,Z) in Angstrom"
+# 坐标块并输出为 XYZ 格式的 awk 程序（与 BDFOutputParser.extract_geometry 的首选策略一致）
+_GEOMETRY_AWK = (
+    'function num(s) { return s ~ /^[-+]?[0-9]*[.]?[0-9]+([EeDd][-+]?[0-9]+)?$/ } '
+    '/Molecular Cartesian Coordinates \\(X,Y,Z\\) in Angstrom/ { grab = 1; m = 0; next } '
+    'grab && NF >= 4 && $1 ~ /^[A-Za-z]/ && num($2) && num($3) && num($4) '
+    '{ b[++m] = $1 "  " $2 "  " $3 "  " $4; next } '
+    'grab && m > 0 { grab = 0; n = m; for (i = 1; i <= m; i++) a[i] = b[i] } '
+    'END { if (grab && m > 0) { n = m; for (i = 1; i <= m; i++) a[i] = b[i] } '
+    'if (n > 0) { print n; print "workflow geometry"; for (i = 1; i <= n; i++) print a[i] } }'
+)
+
+
+def _deep_merge(base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """递归合并字典（update 覆盖 base，列表整体替换）"""
+    result = copy.deepcopy(base)
+    for key, value in update.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = _deep_merge(result[key], value)
+        else:
+            result[key] = copy.deepcopy(value)
+    return result
+
+
+@dataclass
+class WorkflowStep:
+    """
+    工作流中的一步
+
+    Attributes:
+        name: 步骤名（工作流内唯一）
+        config: YAML 任务配置（BDFConverter.convert() 的输入）
+        depends_on: 必须先成功完成的上游步骤
+        geometry_from: 提供起始几何结构的上游步骤（为 None 时使用 config 中的结构）
+        options: 传给 runner.submit() 的额外参数（如 slurm={...}）
+        status: 'pending' | 'running' | 'success' | 'failed' | 'timeout' | 'cancelled' | 'skipped'
+        input_file: 生成的 BDF 输入文件
+        job_id: 远程作业号（Slurm）
+        result: 作业结果字典（runner.run() 的格式）
+    """
+    name: str
+    config: Dict[str, Any]
+    depends_on: List[str] = field(default_factory=list)
+    geometry_from: Optional[str] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+    status: str = PENDING
+    input_file: Optional[str] = None
+    job_id: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'step': self.name,
+            'status': self.status,
+            'depends_on': list(self.depends_on),
+            'geometry_from': self.geometry_from,
+            'input_file': self.input_file,
+            'job_id': self.job_id,
+            'output_file': (self.result or {}).get('output_file'),
+            'error': (self.result or {}).get('error'),
+        }
+
+
+class Workflow:
+    """
+    由 YAML 任务配置组成的多步计算（有向无环图）
+
+    每一步生成 <workdir>/<工作流名>_<步骤名>.inp；从上游取几何结构的步骤使用
+    同名的 .xyz 文件（BDF 输入中为 file=<作业名>.xyz）。
+
+    示例：
+        wf = Workflow("h2o", workdir="runs")
+        wf.add_step("opt", "h2o_opt.yaml")
+        wf.add_step("freq", "h2o_freq.yaml", depends_on="opt")
+        wf.add_step("td", "h2o_td.yaml", depends_on="opt")
+        wf.run(runner)                 # 本地：逐步运行
+        wf.queue(slurm_runner)         # Slurm：一次提交整条依赖链
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workdir: Optional[Union[str, Path]] = None,
+        converter: Any = None,
+    ):
+        """
+        Args:
+            name: 工作流名（作业名前缀）
+            workdir: 生成输入文件的目录（默认为当前目录下的 <name>/）
+            converter: BDFConverter 实例（默认新建，启用输入校验）
+        """
+        if not _STEP_NAME.match(name):
+            raise ValueError(f"Invalid workflow name: {name!r}")
+        self.name = name
+        self.workdir = Path(workdir) if workdir else Path.cwd() / name
+        self._converter = converter
+        self.steps: Dict[str, WorkflowStep] = {}
+
+    @property
+    def converter(self) -> Any:
+        if self._converter is None:
+            from ..converter import BDFConverter
+            self._converter = BDFConverter()
+        return self._converter
+
+    def add_step(
+        self,
+        name: str,
+        config: Union[Dict[str, Any], str, Path],
+        depends_on: Optional[Union[str, List[str]]] = None,
+        geometry_from: Optional[str] = None,
+        inherit_geometry: bool = True,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> WorkflowStep:
+        """
+        添加一步
+
+        Args:
+            name: 步骤名
+            config: YAML 任务配置（字典或 YAML 文件路径）
+            depends_on: 上游步骤名（一个或多个）
+            geometry_from: 提供几何结构的上游步骤（默认 depends_on 的第一个；
+                           不在 depends_on 中时自动加入）
+            inherit_geometry: 为 False 时不从上游取几何结构
+            options: 传给 runner.submit() 的额外参数
+
+        Returns:
+            新建的步骤
+        """
+        if not _STEP_NAME.match(name):
+            raise ValueError(f"Invalid step name: {name!r}")
+        if name in self.steps:
+            raise ValueError(f"Duplicate step name: {name}")
+        if not isinstance(config, dict):
+            with open(config, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+        parents = [depends_on] if isinstance(depends_on, str) else list(depends_on or [])
+        if inherit_geometry:
+            geometry_from = geometry_from or (parents[0] if parents else None)
+            if geometry_from and geometry_from not in parents:
+                parents.insert(0, geometry_from)
+        else:
+            geometry_from = None
+        step = WorkflowStep(
+            name=name,
+            config=copy.deepcopy(config),
+            depends_on=parents,
+            geometry_from=geometry_from,
+            options=dict(options or {}),
+        )
+        self.steps[name] = step
+        return step
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path], workdir: Optional[Union[str, Path]] = None, **kwargs: Any) -> 'Workflow':
+        """
+        从工作流描述文件创建工作流
+
+        格式：
+            workflow:
+              name: h2o_spectrum
+              workdir: runs            # 可选，相对于描述文件
+            base:                      # 可选，所有步骤共用的配置（molecule、method 等）
+              molecule: {...}
+            steps:
+              - name: opt
+                config: {task: {type: optimize}}   # 与 base 合并
+              - name: freq
+                yaml: h2o_freq.yaml                # 或引用单独的 YAML 文件（相对于描述文件）
+                depends_on: [opt]
+                geometry_from: opt                 # 可选，默认第一个上游步骤
+                options: {slurm: {time: "04:00:00"}}
+
+        Args:
+            path: 描述文件路径
+            workdir: 覆盖描述文件中的 workdir
+            **kwargs: 传给 Workflow()（如 converter）
+        """
+        path = Path(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = yaml.safe_load(f) or {}
+        meta = spec.get('workflow', {})
+        steps = spec.get('steps')
+        if not steps:
+            raise ValueError(f"Workflow file {path} has no steps")
+        if workdir is None and meta.get('workdir'):
+            workdir = path.parent / meta['workdir']
+        workflow = cls(meta.get('name', path.stem), workdir=workdir, **kwargs)
+        base = spec.get('base', {})
+        for entry in steps:
+            if 'name' not in entry:
+                raise ValueError(f"Workflow step without a name in {path}")
+            config = base
+            if entry.get('yaml'):
+                with open(path.parent / entry['yaml'], 'r', encoding='utf-8') as f:
+                    config = _deep_merge(config, yaml.safe_load(f) or {})
+            config = _deep_merge(config, entry.get('config', {}))
+            workflow.add_step(
+                entry['name'],
+                config,
+                depends_on=entry.get('depends_on'),
+                geometry_from=entry.get('geometry_from'),
+                inherit_geometry=entry.get('inherit_geometry', True),
+                options=entry.get('options'),
+            )
+        return workflow
+
+    def order(self) -> List[WorkflowStep]:
+        """
+        按依赖关系排序的步骤（同一层内保持添加顺序）
+
+        Raises:
+            ValueError: 依赖不存在的步骤或存在环
+        """
+        for step in self.steps.values():
+            unknown = [p for p in step.depends_on if p not in self.steps]
+            if unknown:
+                raise ValueError(f"Step {step.name} depends on unknown step(s): {', '.join(unknown)}")
+        ordered: List[WorkflowStep] = []
+        placed = set()
+        remaining = list(self.steps.values())
+        while remaining:
+            ready = [s for s in remaining if all(p in placed for p in s.depends_on)]
+            if not ready:
+                raise ValueError(f"Dependency cycle among steps: {', '.join(s.name for s in remaining)}")
+            for step in ready:
+                ordered.append(step)
+                placed.add(step.name)
+            remaining = [s for s in remaining if s.name not in placed]
+        return ordered
+
+    def job_name(self, step: WorkflowStep) -> str:
+        """步骤的作业名（输入文件名去掉扩展名）"""
+        return f"{self.name}_{step.name}"
+
+    def write_input(self, step: WorkflowStep, geometry: Any = None) -> Path:
+        """
+        将步骤的 YAML 配置转换为 BDF 输入文件
+
+        从上游取几何结构的步骤改为引用 <作业名>.xyz：给出 geometry 时写入该结构，
+        否则写入占位文件（由作业脚本在运行时填充，见 queue()）。
+
+        Args:
+            step: 步骤
+            geometry: 起始几何结构（BDFOutputParser.extract_geometry() 的结果或 Geometry）
+
+        Returns:
+            输入文件路径
+        """
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        job_name = self.job_name(step)
+        config = copy.deepcopy(step.config)
+        if step.geometry_from:
+            xyz_path = self.workdir / f"{job_name}.xyz"
+            if geometry is not None:
+                from ..analysis.parser import BDFOutputParser
+                coordinates = BDFOutputParser().format_geometry_for_input(geometry, units='angstrom')
+                atoms = coordinates.count('\n') + 1 if coordinates else 0
+                xyz_path.write_text(
+                    f"{atoms}\nworkflow {self.name}: geometry from step {step.geometry_from}\n{coordinates}\n",
+                    encoding='utf-8',
+                )
+            else:
+                xyz_path.write_text(
+                    f"0\nworkflow {self.name}: filled in from step {step.geometry_from} when the job starts\n",
+                    encoding='utf-8',
+                )
+            molecule = config.setdefault('molecule', {})
+            molecule.pop('coordinates', None)
+            molecule.pop('geometry_file', None)
+            molecule['xyz_file'] = xyz_path.name
+            molecule['units'] = 'angstrom'
+        input_path = self.workdir / f"{job_name}.inp"
+        input_path.write_text(self.converter.convert(config), encoding='utf-8')
+        step.input_file = str(input_path)
+        return input_path
+
+    @staticmethod
+    def _parent_geometry(parent: WorkflowStep) -> Any:
+        """从已完成的上游步骤的输出中取出最终几何结构"""
+        from ..analysis.parser import BDFOutputParser
+
+        output_file = (parent.result or {}).get('output_file')
+        if not output_file or not Path(output_file).exists():
+            raise ValueError(f"Step {parent.name} has no output file to take the geometry from")
+        geometry = BDFOutputParser().parse(output_file, fields=['geometry']).get('geometry')
+        if not geometry:
+            raise ValueError(f"No geometry found in {output_file}")
+        return geometry
+
+    def _reset(self) -> List[WorkflowStep]:
+        order = self.order()
+        for step in order:
+            step.status, step.input_file, step.job_id, step.result = PENDING, None, None, None
+        return order
+
+    def run(
+        self,
+        runner: Any,
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        on_step: Optional[Callable[[WorkflowStep], None]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        运行工作流：上游步骤成功后，用其输出中的几何结构生成并提交下游步骤；
+        互不依赖的步骤同时运行。上游失败时下游步骤标记为 'skipped'。
+
+        Args:
+            runner: 任意提供 submit() 的 runner（BDFDirectRunner、SSHRemoteRunner 等）
+            timeout: 整个工作流的最长等待时间（秒）
+            poll_interval: 轮询间隔（默认取作业句柄的 poll_interval）
+            on_step: 每个步骤开始运行或结束时调用 on_step(step)
+
+        Returns:
+            {步骤名: step.to_dict()}
+
+        Raises:
+            TimeoutError: 超过 timeout 时仍有步骤未结束（作业本身不会被取消）
+        """
+        order = self._reset()
+        deadline = None if timeout is None else time.time() + timeout
+        running: Dict[str, JobHandle] = {}
+
+        def notify(step: WorkflowStep) -> None:
+            if on_step is not None:
+                on_step(step)
+
+        def finish(step: WorkflowStep, status: str, result: Dict[str, Any]) -> None:
+            step.status, step.result = status, result
+            notify(step)
+
+        while True:
+            for step in order:
+                if step.status != PENDING:
+                    continue
+                parents = [self.steps[p] for p in step.depends_on]
+                if any(p.status == SKIPPED or (p.status in FINAL_STATES and p.status != SUCCESS) for p in parents):
+                    finish(step, SKIPPED, {'status': SKIPPED, 'error': 'upstream step did not succeed'})
+                elif all(p.status == SUCCESS for p in parents):
+                    try:
+                        geometry = self._parent_geometry(self.steps[step.geometry_from]) if step.geometry_from else None
+                        input_file = self.write_input(step, geometry)
+                    except Exception as e:
+                        finish(step, FAILED, {'status': FAILED, 'error': str(e)})
+                        continue
+                    running[step.name] = runner.submit(str(input_file), **step.options)
+                    step.status = RUNNING
+                    notify(step)
+            if not running:
+                break
+            for name, handle in list(running.items()):
+                if handle.poll() in FINAL_STATES:
+                    del running[name]
+                    finish(self.steps[name], handle.status, handle.result())
+            if not running:
+                continue
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"{len(running)} workflow step(s) still running after {timeout} seconds")
+            interval = poll_interval
+            if interval is None:
+                interval = min(h.poll_interval for h in running.values())
+            if deadline is not None:
+                interval = max(0.0, min(interval, deadline - time.time()))
+            time.sleep(interval)
+        return self.summary()
+
+    def geometry_prologue(self, runner: Any, step: WorkflowStep, log_name: str = "{job_name}.log") -> str:
+        """
+        构造作业脚本片段：从上游作业的远程日志中取出最后一个优化结构写入本步骤的 .xyz
+        （找不到结构时作业以非零状态退出，不会用占位结构计算）
+
+        Args:
+            runner: SSHSlurmRunner（使用其 workdir 定位远程作业目录）
+            step: 从上游取几何结构的步骤
+            log_name: 远程日志文件名（{job_name} 替换为上游作业名，应与作业脚本模板一致）
+        """
+        parent_job = self.job_name(self.steps[step.geometry_from])
+        parent_log = f"{runner.workdir}/{parent_job}/{log_name.format(job_name=parent_job)}"
+        xyz = f"{runner.workdir}/{self.job_name(step)}/{self.job_name(step)}.xyz"
+        return (
+            f"# 工作流 {self.name}：从步骤 {step.geometry_from} 的输出中取出优化后的几何结构\n"
+            f"awk '{_GEOMETRY_AWK}' {parent_log} > {xyz}.tmp && [ -s {xyz}.tmp ] && mv {xyz}.tmp {xyz} "
+            f"|| {{ echo \"No geometry found in {parent_log}\" >&2; exit 1; }}\n"
+        )
+
+    def queue(
+        self,
+        runner: Any,
+        monitor: Any = None,
+        log_name: str = "{job_name}.log",
+        **kwargs: Any,
+    ) -> Dict[str, JobHandle]:
+        """
+        将整个工作流一次提交到 Slurm：下游步骤以 --dependency=afterok:<上游 jobid> 排队，
+        并在作业开始时从上游日志中取出几何结构。任一上游失败时 Slurm 取消其下游作业。
+
+        Args:
+            runner: SSHSlurmRunner
+            monitor: 可选的 SlurmMonitor，提交成功的作业加入其状态文件
+            log_name: 远程日志文件名（见 geometry_prologue()）
+            **kwargs: 传给 runner.submit()（如 timeout、poll_interval），步骤的 options 优先
+
+        Returns:
+            {步骤名: 作业句柄}（提交失败的步骤为已结束的句柄；上游提交失败的步骤不提交）
+        """
+        handles: Dict[str, JobHandle] = {}
+        for step in self._reset():
+            dependency = [self.steps[p].job_id for p in step.depends_on]
+            if not all(dependency):
+                step.status = SKIPPED
+                step.result = {'status': SKIPPED, 'error': 'upstream step was not submitted'}
+                continue
+            options = {**kwargs, **step.options}
+            if dependency:
+                options['dependency'] = dependency
+            if step.geometry_from:
+                options['prologue'] = self.geometry_prologue(runner, step, log_name)
+            try:
+                input_file = self.write_input(step)
+            except Exception as e:
+                step.status, step.result = FAILED, {'status': FAILED, 'error': str(e)}
+                continue
+            handle = runner.submit(str(input_file), **options)
+            handles[step.name] = handle
+            if handle.done():
+                step.status, step.result = handle.status, handle.result()
+                continue
+            step.status = PENDING
+            step.job_id = handle.job_id
+            step.result = handle._submission
+            if monitor is not None:
+                monitor.track(handle._submission, self.job_name(step), self.workdir)
+        if monitor is not None:
+            monitor.save()
+        return handles
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """{步骤名: step.to_dict()}（按依赖顺序）"""
+        return {step.name: step.to_dict() for step in self.order()}
@@ -6,6 +6,7 @@ from BDF calculation outputs, designed for integration with BDFAgent.
 """
 
 from .extractor import BDFResultExtractor
+from .batch import extract_batch, find_output_files
 from .metrics import (
     CalculationMetrics,
     GeometryMetrics,
@@ -15,6 +16,8 @@ from .metrics import (
 
 __all__ = [
     'BDFResultExtractor',
+    'extract_batch',
+    'find_output_files',
     'CalculationMetrics',
     'GeometryMetrics',
     'FrequencyMetrics',
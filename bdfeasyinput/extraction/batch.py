@@ -0,0 +1,224 @@
+"""
+Batch Metrics Extraction
+
+This module extracts CalculationMetrics from many BDF output files at once,
+distributing chunks of files over a process pool and capturing per-file
+errors so that a single broken log does not abort the whole batch. A worker
+that dies outright (OOM kill, segfault) breaks the pool; the pool is then
+recreated, finished chunks are kept, and only the files that keep killing
+their worker are reported as failed.
+"""
+
+import csv
+import glob
+import json
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..analysis.parser.cache import ParseCache
+from .extractor import BDFResultExtractor
+
+
+# 默认查找的输出文件模式
+DEFAULT_OUTPUT_PATTERNS = ('*.log',)
+
+# 每个进程分配的块数（块越多负载越均衡，块越少调度开销越小）
+CHUNKS_PER_WORKER = 4
+
+# 工作进程内复用的提取器（每个进程按缓存配置只初始化一次）
+_WORKER_EXTRACTOR: Optional[BDFResultExtractor] = None
+_WORKER_CACHE_CONFIG: Optional[Tuple[bool, Optional[str]]] = None
+
+
+def find_output_files(
+    targets: Iterable[str],
+    patterns: Sequence[str] = DEFAULT_OUTPUT_PATTERNS,
+) -> List[Path]:
+    """
+    收集待提取的输出文件
+
+    Args:
+        targets: 目录、文件或 glob 模式（支持 ``**`` 递归）
+        patterns: 目录中递归查找时使用的文件名模式
+
+    Returns:
+        去重并排序后的文件路径列表
+    """
+    found = set()
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            for pattern in patterns:
+                found.update(p for p in path.rglob(pattern) if p.is_file())
+        elif path.is_file():
+            found.add(path)
+        else:
+            found.update(Path(p) for p in glob.glob(target, recursive=True) if Path(p).is_file())
+    return sorted(found)
+
+
+def _extract_one(extractor: BDFResultExtractor, path: Path, task_type: Optional[str]) -> Dict[str, Any]:
+    """提取单个文件，异常被记录到结果中而不是抛出"""
+    try:
+        metrics = extractor.extract_metrics(str(path), task_type)
+    except Exception as e:
+        return {
+            'file': str(path),
+            'status': 'failed',
+            'error': f"{type(e).__name__}: {e}",
+        }
+    return {
+        'file': str(path),
+        'status': 'success',
+        'error': None,
+        **metrics.to_dict(),
+    }
+
+
+def _make_extractor(use_cache: bool, cache_dir: Optional[str]) -> BDFResultExtractor:
+    return BDFResultExtractor(cache=ParseCache(cache_dir) if use_cache else None)
+
+
+def _extract_chunk(
+    paths: List[str],
+    task_type: Optional[str],
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """工作进程入口：提取一块文件"""
+    global _WORKER_EXTRACTOR, _WORKER_CACHE_CONFIG
+    if _WORKER_EXTRACTOR is None or _WORKER_CACHE_CONFIG != (use_cache, cache_dir):
+        _WORKER_EXTRACTOR = _make_extractor(use_cache, cache_dir)
+        _WORKER_CACHE_CONFIG = (use_cache, cache_dir)
+    return [_extract_one(_WORKER_EXTRACTOR, Path(p), task_type) for p in paths]
+
+
+def _chunk(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _finished(future: Future) -> bool:
+    """future 已成功完成（进程池崩溃前完成的块保留结果）"""
+    return future.done() and not future.cancelled() and future.exception() is None
+
+
+def _extract_isolated(chunk: List[str], *args: Any) -> List[Dict[str, Any]]:
+    """
+    在独立的单进程池中重新提取一块文件
+
+    整块再次使工作进程崩溃时逐个文件重试，仍然崩溃的文件记为失败，
+    同一块中的其他文件不受影响。
+    """
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return executor.submit(_extract_chunk, chunk, *args).result()
+    except BrokenProcessPool:
+        if len(chunk) > 1:
+            return [record for path in chunk for record in _extract_isolated([path], *args)]
+        return [{
+            'file': chunk[0],
+            'status': 'failed',
+            'error': 'BrokenProcessPool: worker process died while extracting this file',
+        }]
+
+
+def extract_batch(
+    files: Sequence[Path],
+    jobs: int = 1,
+    task_type: Optional[str] = None,
+    chunksize: Optional[int] = None,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    批量提取指标
+
+    Args:
+        files: 输出文件列表
+        jobs: 并行进程数（1 表示在当前进程中顺序处理）
+        task_type: 任务类型（None 表示逐个自动检测）
+        chunksize: 每块文件数（None 时按进程数自动计算）
+        use_cache: 是否使用解析结果磁盘缓存
+        cache_dir: 缓存目录（None 时使用默认目录）
+
+    Yields:
+        每个文件一条记录（与输入顺序一致）：
+        {'file': str, 'status': 'success'|'failed', 'error': Optional[str], **CalculationMetrics.to_dict()}
+    """
+    paths = [str(f) for f in files]
+    if not paths:
+        return
+
+    if jobs <= 1:
+        extractor = _make_extractor(use_cache, cache_dir)
+        for path in paths:
+            yield _extract_one(extractor, Path(path), task_type)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(paths) / (jobs * CHUNKS_PER_WORKER)))
+    chunks = _chunk(paths, chunksize)
+    args = (task_type, use_cache, cache_dir)
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        futures = [executor.submit(_extract_chunk, chunk, *args) for chunk in chunks]
+        for i, chunk in enumerate(chunks):
+            try:
+                records = futures[i].result()
+            except BrokenProcessPool:
+                # 工作进程被杀死（OOM、段错误）：重建进程池并重新提交未完成的块，
+                # 当前块单独重试，因此每次崩溃至少推进一块
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=jobs)
+                for j in range(i + 1, len(chunks)):
+                    if not _finished(futures[j]):
+                        futures[j] = executor.submit(_extract_chunk, chunks[j], *args)
+                records = _extract_isolated(chunk, *args)
+            yield from records
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def flatten_record(record: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """
+    将嵌套记录展平为 CSV 列（键以 '.' 连接，列表序列化为 JSON）
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, prefix=f"{name}."))
+        elif isinstance(value, (list, tuple)):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], stream: IO[str]) -> int:
+    """逐条写出 JSON Lines，返回写出的记录数"""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False))
+        stream.write('\n')
+        count += 1
+    return count
+
+
+def write_csv(records: Iterable[Dict[str, Any]], stream: IO[str]) -> int:
+    """写出 CSV（列为所有记录展平后键的并集），返回写出的记录数"""
+    rows = [flatten_record(record) for record in records]
+    fieldnames: List[str] = []
+    seen = set()
+    for row in rows:
+        for key in row:
+            if key not in seen:
+                seen.add(key)
+                fieldnames.append(key)
+    writer = csv.DictWriter(stream, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+    return len(rows)
@@ -0,0 +1,470 @@
+"""
+Columnar Export of Extracted Metrics
+
+This module writes CalculationMetrics records column by column into Parquet
+(pyarrow), HDF5 (h5py) or NumPy .npz files. Per-calculation scalars become
+one column each, and variable-length data (frequencies, excited-state
+energies, final geometries) are stored as ragged arrays, so dataset builds
+can load whole columns instead of millions of JSON objects. When pyarrow or
+h5py is not installed the writer falls back to .npz.
+"""
+
+import warnings
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import h5py
+    H5PY_AVAILABLE = True
+except ImportError:
+    h5py = None
+    H5PY_AVAILABLE = False
+
+from ..analysis.parser.geometry import Geometry
+from .metrics import CalculationMetrics
+
+
+# 支持的列式格式及按后缀推断的规则
+COLUMNAR_FORMATS = ('parquet', 'hdf5', 'npz')
+FORMAT_SUFFIXES = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.h5': 'hdf5',
+    '.hdf5': 'hdf5',
+    '.npz': 'npz',
+}
+
+# 每次写出（Parquet 行组 / HDF5 扩容）的记录数
+DEFAULT_BATCH_SIZE = 1024
+
+# 标量列：(列名, 类型)，列名按 '.' 拆分即为记录中的路径
+SCALAR_COLUMNS = (
+    ('file', 'str'),
+    ('status', 'str'),
+    ('error', 'str'),
+    ('task_type', 'str'),
+    ('geometry.max_force', 'float'),
+    ('geometry.rms_force', 'float'),
+    ('geometry.final_energy', 'float'),
+    ('geometry.scf_converged', 'bool'),
+    ('geometry.optimization_converged', 'bool'),
+    ('geometry.n_iterations', 'int'),
+    ('frequency.min_freq', 'float'),
+    ('frequency.max_freq', 'float'),
+    ('frequency.imaginary_count', 'int'),
+    ('excited.n_states_converged', 'int'),
+)
+
+# 变长列：(列名, 类型)；geometry.* 由 final_geometry 生成（坐标统一为 Angstrom）
+RAGGED_COLUMNS = (
+    ('frequency.frequencies', 'float'),
+    ('frequency.vibrations', 'float'),
+    ('frequency.translations_rotations', 'float'),
+    ('excited.energies', 'float'),
+    ('excited.oscillator_strengths', 'float'),
+    ('excited.wavelengths', 'float'),
+    ('geometry.elements', 'str'),
+    ('geometry.coords', 'xyz'),
+)
+
+# NumPy 格式（HDF5/npz）中缺失值的表示
+MISSING_INT = -1  # int 列；bool 列存为 int8（1/0，缺失为 -1）
+
+RecordLike = Union[CalculationMetrics, Dict[str, Any]]
+
+
+def _require(available: bool, package: str, fmt: str) -> None:
+    if not available:
+        raise ImportError(
+            f"{package} is required for {fmt} export. "
+            f"Install it with: pip install {package}"
+        )
+
+
+def infer_format(path: Union[str, Path]) -> Optional[str]:
+    """按文件后缀推断列式格式（无法推断时返回 None）"""
+    return FORMAT_SUFFIXES.get(Path(path).suffix.lower())
+
+
+def _lookup(record: Dict[str, Any], name: str) -> Any:
+    value: Any = record
+    for key in name.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _split_record(record: RecordLike) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+    """
+    将一条记录拆分为标量列和变长列的值
+
+    Args:
+        record: CalculationMetrics 或 extract_batch() 的记录字典
+
+    Returns:
+        (标量值字典, 变长值字典)；缺失的标量为 None，缺失的变长值为空列表
+    """
+    if isinstance(record, CalculationMetrics):
+        record = record.to_dict()
+    scalars = {name: _lookup(record, name) for name, _ in SCALAR_COLUMNS}
+    ragged: Dict[str, List[Any]] = {}
+    for name, kind in RAGGED_COLUMNS:
+        if kind in ('float', 'int'):
+            ragged[name] = [v for v in (_lookup(record, name) or []) if isinstance(v, (int, float))]
+    atoms = _lookup(record, 'geometry.final_geometry')
+    if isinstance(atoms, Geometry):
+        geometry = atoms
+    else:
+        geometry = Geometry.from_dicts(atoms) if atoms else None
+    if geometry is not None:
+        geometry = geometry.to_units('angstrom')
+        ragged['geometry.elements'] = geometry.elements.tolist()
+        ragged['geometry.coords'] = geometry.coords.tolist()
+    else:
+        ragged['geometry.elements'] = []
+        ragged['geometry.coords'] = []
+    return scalars, ragged
+
+
+def _numpy_scalars(kind: str, values: List[Any]) -> Any:
+    """将一列 Python 值转换为 NumPy 数组（缺失值见 MISSING_INT / NaN / ''）"""
+    if kind == 'float':
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if kind == 'int':
+        return np.array([MISSING_INT if v is None else v for v in values], dtype=np.int64)
+    if kind == 'bool':
+        return np.array([MISSING_INT if v is None else int(bool(v)) for v in values], dtype=np.int8)
+    return np.array(['' if v is None else str(v) for v in values], dtype=str)
+
+
+def _numpy_ragged(kind: str, rows: List[List[Any]]) -> Tuple[Any, Any]:
+    """将变长列转换为 (拼接后的值, 每行长度)"""
+    lengths = np.array([len(row) for row in rows], dtype=np.int64)
+    flat = [v for row in rows for v in row]
+    if kind == 'xyz':
+        values = np.array(flat, dtype=np.float64).reshape(-1, 3)
+    elif kind == 'str':
+        values = np.array(flat, dtype=str)
+    else:
+        values = np.array(flat, dtype=np.float64)
+    return values, lengths
+
+
+class ColumnarWriter:
+    """
+    列式写出器基类
+
+    记录先按列缓冲，每 batch_size 条写出一次；子类实现 _write_batch() 和 _finish()。
+    支持上下文管理器用法，退出时自动 close()。
+    """
+
+    format: str = ''
+
+    def __init__(self, path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            path: 输出文件路径
+            batch_size: 每次写出的记录数
+        """
+        _require(NUMPY_AVAILABLE, 'numpy', 'columnar')
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.rows_written = 0
+        self._reset_buffers()
+
+    def _reset_buffers(self) -> None:
+        self._scalars: Dict[str, List[Any]] = {name: [] for name, _ in SCALAR_COLUMNS}
+        self._ragged: Dict[str, List[List[Any]]] = {name: [] for name, _ in RAGGED_COLUMNS}
+        self._buffered = 0
+
+    def append(self, record: RecordLike) -> None:
+        """追加一条记录（CalculationMetrics 或 extract_batch() 记录字典）"""
+        scalars, ragged = _split_record(record)
+        for name, value in scalars.items():
+            self._scalars[name].append(value)
+        for name, value in ragged.items():
+            self._ragged[name].append(value)
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def extend(self, records: Iterable[RecordLike]) -> int:
+        """追加多条记录，返回追加的记录数"""
+        count = 0
+        for record in records:
+            self.append(record)
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """写出缓冲区中的记录"""
+        if not self._buffered:
+            return
+        self._write_batch(self._scalars, self._ragged, self._buffered)
+        self.rows_written += self._buffered
+        self._reset_buffers()
+
+    def close(self) -> None:
+        """写出剩余记录并关闭文件"""
+        self.flush()
+        self._finish()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _write_batch(self, scalars: Dict[str, List[Any]], ragged: Dict[str, List[List[Any]]], n_rows: int) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        pass
+
+
+class ParquetColumnarWriter(ColumnarWriter):
+    """Parquet 写出器：每批为一个行组，变长列为 list 类型（缺失标量为 null）"""
+
+    format = 'parquet'
+
+    _ARROW_TYPES = {'str': 'string', 'float': 'float64', 'int': 'int64', 'bool': 'bool_'}
+
+    def __init__(self, path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE):
+        _require(PYARROW_AVAILABLE, 'pyarrow', 'Parquet')
+        super().__init__(path, batch_size)
+        fields = [pa.field(name, getattr(pa, self._ARROW_TYPES[kind])()) for name, kind in SCALAR_COLUMNS]
+        for name, kind in RAGGED_COLUMNS:
+            if kind == 'xyz':
+                item = pa.list_(pa.float64(), 3)
+            else:
+                item = getattr(pa, self._ARROW_TYPES[kind])()
+            fields.append(pa.field(name, pa.list_(item)))
+        self.schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(str(self.path), self.schema)
+
+    def _write_batch(self, scalars, ragged, n_rows):
+        columns = {**scalars, **ragged}
+        table = pa.Table.from_pydict({name: columns[name] for name in self.schema.names}, schema=self.schema)
+        self._writer.write_table(table)
+
+    def _finish(self):
+        self._writer.close()
+
+
+class HDF5ColumnarWriter(ColumnarWriter):
+    """
+    HDF5 写出器：每列一个可扩展数据集；变长列为 '<列名>.values' 和 '<列名>.offsets'
+    （第 i 条记录的值为 values[offsets[i]:offsets[i+1]]）。append=True 时在已有文件末尾追加。
+    """
+
+    format = 'hdf5'
+
+    def __init__(self, path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE, append: bool = False):
+        _require(H5PY_AVAILABLE, 'h5py', 'HDF5')
+        super().__init__(path, batch_size)
+        self._file = h5py.File(str(self.path), 'a' if append else 'w')
+
+    def _extend(self, name: str, data: Any) -> None:
+        if name not in self._file:
+            dtype = h5py.string_dtype('utf-8') if data.dtype.kind == 'U' else data.dtype
+            self._file.create_dataset(
+                name, shape=(0,) + data.shape[1:], maxshape=(None,) + data.shape[1:],
+                dtype=dtype, chunks=True,
+            )
+        dataset = self._file[name]
+        start = dataset.shape[0]
+        dataset.resize(start + len(data), axis=0)
+        if len(data):
+            dataset[start:] = data.astype(object) if data.dtype.kind == 'U' else data
+
+    def _write_batch(self, scalars, ragged, n_rows):
+        for name, kind in SCALAR_COLUMNS:
+            self._extend(name, _numpy_scalars(kind, scalars[name]))
+        for name, kind in RAGGED_COLUMNS:
+            values, lengths = _numpy_ragged(kind, ragged[name])
+            offsets_name = f"{name}.offsets"
+            if offsets_name not in self._file:
+                self._extend(offsets_name, np.zeros(1, dtype=np.int64))
+            last = self._file[offsets_name][-1]
+            self._extend(f"{name}.values", values)
+            self._extend(offsets_name, last + np.cumsum(lengths))
+
+    def _finish(self):
+        self._file.close()
+
+
+class NpzColumnarWriter(ColumnarWriter):
+    """
+    NumPy .npz 写出器（纯 NumPy，无额外依赖）
+
+    .npz 不支持追加，所有记录在 close() 时一次写出；列布局与 HDF5 相同。
+    """
+
+    format = 'npz'
+
+    def __init__(self, path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self._arrays: Dict[str, List[Any]] = {}
+
+    def _write_batch(self, scalars, ragged, n_rows):
+        for name, kind in SCALAR_COLUMNS:
+            self._arrays.setdefault(name, []).append(_numpy_scalars(kind, scalars[name]))
+        for name, kind in RAGGED_COLUMNS:
+            values, lengths = _numpy_ragged(kind, ragged[name])
+            self._arrays.setdefault(f"{name}.values", []).append(values)
+            self._arrays.setdefault(f"{name}.lengths", []).append(lengths)
+
+    def _finish(self):
+        arrays = {}
+        for name, kind in SCALAR_COLUMNS:
+            parts = self._arrays.get(name)
+            arrays[name] = np.concatenate(parts) if parts else _numpy_scalars(kind, [])
+        for name, kind in RAGGED_COLUMNS:
+            empty_values, empty_lengths = _numpy_ragged(kind, [])
+            values = self._arrays.get(f"{name}.values") or [empty_values]
+            lengths = self._arrays.get(f"{name}.lengths") or [empty_lengths]
+            arrays[f"{name}.values"] = np.concatenate(values)
+            arrays[f"{name}.offsets"] = np.concatenate([[0], np.cumsum(np.concatenate(lengths))]).astype(np.int64)
+        # 与 np.savez 相同的未压缩 zip 布局（np.load 按列惰性读取）；
+        # 直接写 zip 是因为列名 'file' 与 np.savez 的参数名冲突
+        with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, array in arrays.items():
+                with archive.open(f"{name}.npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, array, allow_pickle=False)
+
+
+_WRITERS = {
+    'parquet': ParquetColumnarWriter,
+    'hdf5': HDF5ColumnarWriter,
+    'npz': NpzColumnarWriter,
+}
+
+
+def format_available(fmt: str) -> bool:
+    """返回指定列式格式的依赖是否已安装"""
+    if fmt == 'parquet':
+        return PYARROW_AVAILABLE
+    if fmt == 'hdf5':
+        return H5PY_AVAILABLE
+    return NUMPY_AVAILABLE
+
+
+def open_columnar_writer(
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fallback: bool = True,
+) -> ColumnarWriter:
+    """
+    创建列式写出器
+
+    Args:
+        path: 输出文件路径
+        fmt: 格式（'parquet'、'hdf5' 或 'npz'；None 时按后缀推断）
+        batch_size: 每次写出的记录数
+        fallback: 所需依赖未安装时是否改写为同名 .npz 文件（否则抛出 ImportError）
+
+    Returns:
+        写出器（实际输出路径见 writer.path）
+
+    Raises:
+        ValueError: 无法确定格式
+        ImportError: 依赖未安装且 fallback=False
+    """
+    fmt = fmt or infer_format(path)
+    if fmt not in _WRITERS:
+        raise ValueError(
+            f"Cannot determine columnar format for {path}. "
+            f"Supported formats: {', '.join(COLUMNAR_FORMATS)}"
+        )
+    if fallback and fmt != 'npz' and not format_available(fmt):
+        npz_path = Path(path).with_suffix('.npz')
+        warnings.warn(f"{fmt} support is not installed; writing {npz_path} instead")
+        return NpzColumnarWriter(npz_path, batch_size)
+    return _WRITERS[fmt](path, batch_size)
+
+
+def write_columnar(
+    records: Iterable[RecordLike],
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fallback: bool = True,
+) -> Tuple[int, Path]:
+    """
+    将记录写出为列式文件
+
+    Returns:
+        (写出的记录数, 实际输出路径)
+    """
+    with open_columnar_writer(path, fmt, batch_size=batch_size, fallback=fallback) as writer:
+        count = writer.extend(records)
+    return count, writer.path
+
+
+def read_columnar(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    读取列式文件
+
+    Args:
+        path: write_columnar() 写出的 Parquet / HDF5 / npz 文件
+
+    Returns:
+        {列名: 数组}；标量列为 NumPy 数组（缺失值为 NaN / -1 / ''），
+        变长列为每条记录一个 NumPy 数组的列表（npz/HDF5 中为同一数组的视图）
+    """
+    _require(NUMPY_AVAILABLE, 'numpy', 'columnar')
+    path = Path(path)
+    fmt = infer_format(path)
+    columns: Dict[str, Any] = {}
+    if fmt == 'parquet':
+        _require(PYARROW_AVAILABLE, 'pyarrow', 'Parquet')
+        table = pq.read_table(str(path))
+        for name, kind in SCALAR_COLUMNS:
+            columns[name] = _numpy_scalars(kind, table.column(name).to_pylist())
+        for name, kind in RAGGED_COLUMNS:
+            columns[name] = [
+                _numpy_ragged(kind, [row])[0] for row in table.column(name).to_pylist()
+            ]
+        return columns
+
+    if fmt == 'hdf5':
+        _require(H5PY_AVAILABLE, 'h5py', 'HDF5')
+        with h5py.File(str(path), 'r') as f:
+            data = {}
+            for name in f:
+                dataset = f[name]
+                data[name] = dataset.asstr()[()] if h5py.check_string_dtype(dataset.dtype) else dataset[()]
+    elif fmt == 'npz':
+        with np.load(path) as f:
+            data = {name: f[name] for name in f.files}
+    else:
+        raise ValueError(f"Cannot determine columnar format for {path}")
+
+    for name, kind in SCALAR_COLUMNS:
+        columns[name] = np.asarray(data[name], dtype=str) if kind == 'str' else data[name]
+    for name, kind in RAGGED_COLUMNS:
+        values = data[f"{name}.values"]
+        if kind == 'str':
+            values = np.asarray(values, dtype=str)
+        offsets = data[f"{name}.offsets"]
+        columns[name] = [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+    return columns
@@ -6,9 +6,11 @@ from BDF calculation outputs.
 """
 
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 
 from ..analysis.parser.output_parser import BDFOutputParser
+from ..analysis.parser.cache import ParseCache
+from ..analysis.parser.geometry import OptimizationTrajectory
 from .metrics import (
     CalculationMetrics,
     GeometryMetrics,
@@ -17,6 +19,10 @@ from .metrics import (
 )
 
 
+# 计算 CalculationMetrics 所需的解析字段（其余提取器不运行）
+METRICS_FIELDS = ('energy', 'converged', 'geometry', 'frequency_data', 'optimization', 'tddft')
+
+
 class BDFResultExtractor:
     """
     BDF 结果提取器
@@ -24,9 +30,15 @@ class BDFResultExtractor:
     封装 BDFOutputParser，提供统一的指标提取接口。
     """
     
-    def __init__(self):
-        """初始化提取器"""
+    def __init__(self, cache: Optional[ParseCache] = None):
+        """
+        初始化提取器
+        
+        Args:
+            cache: 解析结果磁盘缓存（可选），未改变的输出文件不会被重复解析
+        """
         self.parser = BDFOutputParser()
+        self.cache = cache
     
     def extract_metrics(
         self,
@@ -54,10 +66,30 @@ class BDFResultExtractor:
         
         # 解析输出文件
         try:
-            parsed_data = self.parser.parse(str(output_path))
+            if self.cache is not None:
+                parsed_data = self.cache.parse(str(output_path), self.parser, fields=METRICS_FIELDS)
+            else:
+                parsed_data = self.parser.parse(str(output_path), fields=METRICS_FIELDS)
         except Exception as e:
             raise ValueError(f"Failed to parse BDF output: {e}") from e
         
+        return self.metrics_from_parsed(parsed_data, task_type)
+    
+    def metrics_from_parsed(
+        self,
+        parsed_data: Dict[str, Any],
+        task_type: Optional[str] = None,
+    ) -> CalculationMetrics:
+        """
+        从已解析的数据构建指标（不重新解析文件）
+        
+        Args:
+            parsed_data: BDFOutputParser.parse() 的结果（至少包含 METRICS_FIELDS）
+            task_type: 任务类型（None 时自动检测）
+        
+        Returns:
+            CalculationMetrics: 包含所有提取的指标
+        """
         # 自动检测任务类型（如果未指定）
         if task_type is None:
             task_type = self._detect_task_type(parsed_data)
@@ -93,6 +125,54 @@ class BDFResultExtractor:
             excited=excited,
         )
     
+    def extract_fields(self, output_file: str, fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        只提取指定的原始解析字段
+        
+        Args:
+            output_file: BDF 输出文件路径（.log 文件）
+            fields: 字段名（见 BDFOutputParser.parse 的 fields 参数）
+        
+        Returns:
+            只包含请求字段的解析结果字典
+        
+        Raises:
+            FileNotFoundError: 如果输出文件不存在
+            ValueError: 如果字段名无效或解析失败
+        """
+        output_path = Path(output_file)
+        if not output_path.exists():
+            raise FileNotFoundError(f"Output file not found: {output_file}")
+        fields = list(fields)
+        BDFOutputParser.resolve_fields(fields)  # 无效字段直接报错，不包装为解析失败
+        
+        try:
+            if self.cache is not None:
+                return self.cache.parse(str(output_path), self.parser, fields=fields)
+            return self.parser.parse(str(output_path), fields=fields)
+        except Exception as e:
+            raise ValueError(f"Failed to parse BDF output: {e}") from e
+    
+    def extract_trajectory(self, output_file: str) -> OptimizationTrajectory:
+        """
+        提取完整的结构优化轨迹（每步结构、能量、力与位移，需要 NumPy）
+        
+        Args:
+            output_file: BDF 输出文件路径（.log 文件）
+        
+        Returns:
+            OptimizationTrajectory，可通过 write_xyz() 导出为多帧 XYZ/extxyz
+        
+        Raises:
+            FileNotFoundError: 如果输出文件不存在
+        """
+        output_path = Path(output_file)
+        if not output_path.exists():
+            raise FileNotFoundError(f"Output file not found: {output_file}")
+        with open(output_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        return self.parser.extract_optimization_trajectory(content)
+    
     def _detect_task_type(self, parsed_data: Dict[str, Any]) -> str:
         """
         自动检测任务类型
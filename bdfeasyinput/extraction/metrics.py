@@ -6,7 +6,9 @@ providing a unified interface for extracting and serializing calculation results
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
+
+from ..analysis.parser.geometry import Geometry
 
 
 @dataclass
@@ -18,10 +20,19 @@ class GeometryMetrics:
     scf_converged: Optional[bool] = None
     optimization_converged: Optional[bool] = None
     n_iterations: Optional[int] = None
-    final_geometry: Optional[List[Dict[str, Any]]] = None
+    final_geometry: Optional[Union[List[Dict[str, Any]], Geometry]] = None
+
+    def geometry(self) -> Optional[Geometry]:
+        """以 Geometry（NumPy 数组）形式返回最终几何结构"""
+        if self.final_geometry is None or isinstance(self.final_geometry, Geometry):
+            return self.final_geometry
+        return Geometry.from_dicts(self.final_geometry)
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
+        final_geometry = self.final_geometry
+        if isinstance(final_geometry, Geometry):
+            final_geometry = final_geometry.to_dicts()
         return {
             'max_force': self.max_force,
             'rms_force': self.rms_force,
@@ -29,7 +40,7 @@ class GeometryMetrics:
             'scf_converged': self.scf_converged,
             'optimization_converged': self.optimization_converged,
             'n_iterations': self.n_iterations,
-            'final_geometry': self.final_geometry,
+            'final_geometry': final_geometry,
         }
 
     @classmethod
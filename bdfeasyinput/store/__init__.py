@@ -0,0 +1,9 @@
+"""
+BDF Results Store Module
+
+This module provides a SQLite database for parsed BDF calculation results.
+"""
+
+from .database import ResultStore, default_db_path, hill_formula, read_input_keywords
+
+__all__ = ['ResultStore', 'default_db_path', 'hill_formula', 'read_input_keywords']
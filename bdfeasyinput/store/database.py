@@ -0,0 +1,517 @@
+"""
+SQLite Results Store
+
+This module ingests parsed BDF output files into a local SQLite database
+with normalized tables for calculations, final geometries, SCF energy
+components, frequencies and excited states. Columns used for lookups
+(formula, method, basis, task type, energy, lowest excitation energy) are
+indexed so that queries across thousands of runs do not re-parse any log.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..analysis.parser.cache import ParseCache
+from ..analysis.parser.geometry import BOHR_TO_ANGSTROM
+from ..analysis.parser.output_parser import BDFOutputParser, PARSER_VERSION
+from ..extraction.extractor import BDFResultExtractor
+
+
+# 数据库路径的环境变量与默认位置
+DB_PATH_ENV = 'BDFEASYINPUT_DB'
+DEFAULT_DB_PATH = Path.home() / '.bdfeasyinput' / 'results.db'
+
+# 表结构版本（PRAGMA user_version），修改表结构时递增
+SCHEMA_VERSION = 1
+
+# 输入回显中查找方法/基组时最多扫描的行数（输入回显位于输出开头）
+INPUT_ECHO_MAX_LINES = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calculations (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER,
+    mtime_ns INTEGER,
+    parser_version TEXT,
+    ingested_at REAL,
+    task_type TEXT,
+    formula TEXT COLLATE NOCASE,
+    n_atoms INTEGER,
+    method TEXT COLLATE NOCASE,
+    scf_method TEXT COLLATE NOCASE,
+    functional TEXT COLLATE NOCASE,
+    basis TEXT COLLATE NOCASE,
+    energy REAL,
+    scf_energy REAL,
+    converged INTEGER,
+    optimization_converged INTEGER,
+    n_opt_steps INTEGER,
+    n_imaginary INTEGER,
+    s1_energy_ev REAL,
+    n_warnings INTEGER,
+    n_errors INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_calculations_formula ON calculations (formula);
+CREATE INDEX IF NOT EXISTS idx_calculations_method_basis ON calculations (method, basis);
+CREATE INDEX IF NOT EXISTS idx_calculations_basis ON calculations (basis);
+CREATE INDEX IF NOT EXISTS idx_calculations_task_type ON calculations (task_type);
+CREATE INDEX IF NOT EXISTS idx_calculations_energy ON calculations (energy);
+CREATE INDEX IF NOT EXISTS idx_calculations_s1 ON calculations (s1_energy_ev);
+
+CREATE TABLE IF NOT EXISTS geometries (
+    calc_id INTEGER NOT NULL REFERENCES calculations (id) ON DELETE CASCADE,
+    atom_index INTEGER NOT NULL,
+    element TEXT,
+    x REAL,
+    y REAL,
+    z REAL,
+    PRIMARY KEY (calc_id, atom_index)
+);
+
+CREATE TABLE IF NOT EXISTS scf_components (
+    calc_id INTEGER NOT NULL REFERENCES calculations (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (calc_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS frequencies (
+    calc_id INTEGER NOT NULL REFERENCES calculations (id) ON DELETE CASCADE,
+    mode_index INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    frequency REAL,
+    PRIMARY KEY (calc_id, kind, mode_index)
+);
+CREATE INDEX IF NOT EXISTS idx_frequencies_value ON frequencies (frequency);
+
+CREATE TABLE IF NOT EXISTS excited_states (
+    calc_id INTEGER NOT NULL REFERENCES calculations (id) ON DELETE CASCADE,
+    block_index INTEGER NOT NULL,
+    state_index INTEGER NOT NULL,
+    block_method TEXT,
+    isf INTEGER,
+    symmetry TEXT,
+    energy_ev REAL,
+    wavelength_nm REAL,
+    oscillator_strength REAL,
+    PRIMARY KEY (calc_id, block_index, state_index)
+);
+CREATE INDEX IF NOT EXISTS idx_excited_states_energy ON excited_states (energy_ev);
+"""
+
+# 结构化查询的过滤条件：参数名 -> SQL 条件
+QUERY_FILTERS = {
+    'formula': 'c.formula = ?',
+    'method': 'c.method = ?',
+    'basis': 'c.basis = ?',
+    'task_type': 'c.task_type = ?',
+    'energy_min': 'c.energy >= ?',
+    'energy_max': 'c.energy <= ?',
+    's1_min': 'c.s1_energy_ev >= ?',
+    's1_max': 'c.s1_energy_ev <= ?',
+}
+
+# 查询时的任务类型别名（提取器将 TDDFT 计算记为 'excited'）
+TASK_TYPE_ALIASES = {'tddft': 'excited'}
+
+_INPUT_BLOCK = re.compile(r'^\s*\$(COMPASS|SCF|TDDFT)\b', re.IGNORECASE)
+_INPUT_BLOCK_END = re.compile(r'^\s*\$END\b', re.IGNORECASE)
+_ELEMENT = re.compile(r'[A-Za-z]+')
+
+
+def default_db_path() -> Path:
+    """返回数据库路径（优先使用环境变量 BDFEASYINPUT_DB）"""
+    env = os.environ.get(DB_PATH_ENV)
+    return Path(env).expanduser() if env else DEFAULT_DB_PATH
+
+
+def hill_formula(elements: Iterable[str]) -> Optional[str]:
+    """
+    按 Hill 规则生成分子式（含碳时 C、H 在前，其余按字母顺序）
+
+    Args:
+        elements: 元素符号（可带编号，如 'C1'）
+
+    Returns:
+        分子式字符串，如 'CH2O'；没有原子时返回 None
+    """
+    counts: Dict[str, int] = {}
+    for element in elements:
+        match = _ELEMENT.match(element.strip())
+        if not match:
+            continue
+        symbol = match.group(0).capitalize()
+        counts[symbol] = counts.get(symbol, 0) + 1
+    if not counts:
+        return None
+    if 'C' in counts:
+        order = ['C'] + (['H'] if 'H' in counts else []) + sorted(k for k in counts if k not in ('C', 'H'))
+    else:
+        order = sorted(counts)
+    return ''.join(f"{symbol}{counts[symbol] if counts[symbol] > 1 else ''}" for symbol in order)
+
+
+def read_input_keywords(lines: Iterable[str], max_lines: int = INPUT_ECHO_MAX_LINES) -> Dict[str, Optional[str]]:
+    """
+    从 BDF 输入（或输出开头的输入回显）中读取基组和泛函
+
+    逐行扫描 $COMPASS / $SCF 块，找到 "Basis" 与 "DFT [functional]" 关键词的下一行，
+    两者都找到或超过 max_lines 行后停止。
+
+    Returns:
+        {'basis': Optional[str], 'functional': Optional[str]}
+    """
+    found: Dict[str, Optional[str]] = {'basis': None, 'functional': None}
+    block = None
+    pending = None
+    for n, line in enumerate(lines):
+        if n >= max_lines or (found['basis'] and found['functional']):
+            break
+        stripped = line.strip()
+        if not stripped:
+            continue
+        match = _INPUT_BLOCK.match(line)
+        if match:
+            block = match.group(1).upper()
+            pending = None
+            continue
+        if _INPUT_BLOCK_END.match(line):
+            block = None
+            pending = None
+            continue
+        if pending:
+            if not found[pending]:
+                found[pending] = stripped.split()[0]
+            pending = None
+            continue
+        keyword = stripped.lower()
+        if block == 'COMPASS' and keyword == 'basis':
+            pending = 'basis'
+        elif block == 'SCF' and keyword in ('dft', 'dft functional'):
+            pending = 'functional'
+    return found
+
+
+def _as_int(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+class ResultStore:
+    """
+    BDF 计算结果的 SQLite 存储
+
+    每个输出文件对应 calculations 表中的一行（以路径为唯一键），
+    最终几何、SCF 能量分量、频率和激发态分别存入子表。
+    未改变（大小与修改时间相同）的文件在重复导入时被跳过。
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        cache: Optional[ParseCache] = None,
+    ):
+        """
+        Args:
+            db_path: 数据库文件路径（为空则使用 default_db_path()；':memory:' 为内存数据库）
+            cache: 解析结果磁盘缓存（可选）
+        """
+        if db_path == ':memory:':
+            self.db_path = db_path
+        else:
+            self.db_path = Path(db_path).expanduser() if db_path else default_db_path()
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL' if db_path != ':memory:' else 'PRAGMA journal_mode = MEMORY')
+        self.parser = BDFOutputParser()
+        self.extractor = BDFResultExtractor()
+        self.cache = cache
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database {self.db_path} uses schema version {version}, "
+                f"newer than supported version {SCHEMA_VERSION}"
+            )
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 导入
+    # ------------------------------------------------------------------
+    def ingest(self, output_file: Union[str, Path], force: bool = False) -> Optional[int]:
+        """
+        导入单个输出文件（单独的事务）
+
+        Args:
+            output_file: BDF 输出文件路径
+            force: 即使文件未改变也重新导入
+
+        Returns:
+            calculations 表中的 id；文件未改变而被跳过时返回 None
+        """
+        with self.conn:
+            return self._ingest(Path(output_file), force)
+
+    def ingest_many(
+        self,
+        output_files: Iterable[Union[str, Path]],
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        在同一个事务中批量导入输出文件
+
+        每个文件在各自的 SAVEPOINT 中导入：单个文件失败（包括写入到一半时）
+        会回滚到该文件开始前的状态，记录错误后继续，不留下部分写入的行。
+
+        Args:
+            output_files: 输出文件路径
+            force: 即使文件未改变也重新导入
+
+        Returns:
+            {'inserted': int, 'skipped': int, 'failed': [(path, error), ...]}
+        """
+        summary: Dict[str, Any] = {'inserted': 0, 'skipped': 0, 'failed': []}
+        with self.conn:
+            # 显式开始外层事务，否则第一个 SAVEPOINT 会自己开启事务并在 RELEASE 时提交
+            if not self.conn.in_transaction:
+                self.conn.execute('BEGIN')
+            for output_file in output_files:
+                self.conn.execute('SAVEPOINT ingest_file')
+                try:
+                    calc_id = self._ingest(Path(output_file), force)
+                except Exception as e:
+                    self.conn.execute('ROLLBACK TO ingest_file')
+                    self.conn.execute('RELEASE ingest_file')
+                    summary['failed'].append((str(output_file), f"{type(e).__name__}: {e}"))
+                    continue
+                self.conn.execute('RELEASE ingest_file')
+                summary['inserted' if calc_id is not None else 'skipped'] += 1
+        return summary
+
+    def _ingest(self, path: Path, force: bool) -> Optional[int]:
+        """导入一个文件（调用方负责事务）"""
+        stat = path.stat()
+        resolved = str(path.resolve())
+        row = self.conn.execute(
+            'SELECT id, size, mtime_ns, parser_version FROM calculations WHERE path = ?', (resolved,)
+        ).fetchone()
+        if (
+            row is not None and not force
+            and row['size'] == stat.st_size and row['mtime_ns'] == stat.st_mtime_ns
+            and row['parser_version'] == PARSER_VERSION
+        ):
+            return None
+
+        if self.cache is not None:
+            parsed = self.cache.parse(str(path), self.parser)
+        else:
+            parsed = self.parser.parse(str(path))
+        metrics = self.extractor.metrics_from_parsed(parsed)
+        keywords = self._input_keywords(path)
+
+        if row is not None:
+            # 子表通过 ON DELETE CASCADE 一并删除
+            self.conn.execute('DELETE FROM calculations WHERE id = ?', (row['id'],))
+
+        geometry = self._final_geometry(parsed)
+        scf_method = (parsed.get('properties', {}).get('scf_method') or {}).get('method')
+        functional = keywords['functional']
+        tddft = parsed.get('tddft') or []
+        first_states = tddft[0].get('states', []) if tddft else parsed.get('excited_states') or []
+        s1_candidates = [s['energy_ev'] for s in first_states if s.get('energy_ev') is not None]
+        optimization = parsed.get('optimization') or {}
+        frequency_data = parsed.get('frequency_data') or {}
+
+        cursor = self.conn.execute(
+            """
+            INSERT INTO calculations (
+                path, size, mtime_ns, parser_version, ingested_at, task_type, formula, n_atoms,
+                method, scf_method, functional, basis, energy, scf_energy, converged,
+                optimization_converged, n_opt_steps, n_imaginary, s1_energy_ev, n_warnings, n_errors
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                resolved, stat.st_size, stat.st_mtime_ns, PARSER_VERSION, time.time(),
+                metrics.task_type,
+                hill_formula(atom[0] for atom in geometry),
+                len(geometry) or None,
+                functional or scf_method,
+                scf_method,
+                functional,
+                keywords['basis'],
+                parsed.get('energy'),
+                parsed.get('scf_energy'),
+                _as_int(parsed.get('converged')),
+                _as_int(optimization.get('converged')) if optimization.get('steps') else None,
+                len(optimization.get('steps') or []) or None,
+                sum(1 for f in frequency_data.get('vibrations', []) if f < 0) if frequency_data else None,
+                min(s1_candidates) if s1_candidates else None,
+                len(parsed.get('warnings') or []),
+                len(parsed.get('errors') or []),
+            ),
+        )
+        calc_id = cursor.lastrowid
+
+        self.conn.executemany(
+            'INSERT INTO geometries (calc_id, atom_index, element, x, y, z) VALUES (?, ?, ?, ?, ?, ?)',
+            [(calc_id, i, *atom) for i, atom in enumerate(geometry, start=1)],
+        )
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO scf_components (calc_id, name, value) VALUES (?, ?, ?)',
+            [(calc_id, name, value) for name, value in self._scf_components(parsed).items()],
+        )
+        self.conn.executemany(
+            'INSERT INTO frequencies (calc_id, mode_index, kind, frequency) VALUES (?, ?, ?, ?)',
+            [
+                (calc_id, i, kind, value)
+                for kind, key in (('vibration', 'vibrations'), ('translation_rotation', 'translations_rotations'))
+                for i, value in enumerate(frequency_data.get(key, []), start=1)
+            ],
+        )
+        blocks = tddft or ([{'states': first_states}] if first_states else [])
+        self.conn.executemany(
+            """
+            INSERT INTO excited_states (
+                calc_id, block_index, state_index, block_method, isf, symmetry,
+                energy_ev, wavelength_nm, oscillator_strength
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    calc_id, b, i, block.get('method'), block.get('isf'), state.get('symmetry'),
+                    state.get('energy_ev'), state.get('wavelength_nm'), state.get('oscillator_strength'),
+                )
+                for b, block in enumerate(blocks)
+                for i, state in enumerate(block.get('states', []), start=1)
+            ],
+        )
+        return calc_id
+
+    @staticmethod
+    def _final_geometry(parsed: Dict[str, Any]) -> List[Tuple[str, float, float, float]]:
+        """最终几何结构（Angstrom）"""
+        atoms = (parsed.get('optimization') or {}).get('final_geometry') or parsed.get('geometry') or []
+        rows = []
+        for atom in atoms:
+            factor = BOHR_TO_ANGSTROM if atom.get('units') == 'bohr' else 1.0
+            rows.append((atom.get('element'), atom.get('x', 0.0) * factor, atom.get('y', 0.0) * factor, atom.get('z', 0.0) * factor))
+        return rows
+
+    @staticmethod
+    def _scf_components(parsed: Dict[str, Any]) -> Dict[str, float]:
+        """SCF 能量分量（E_tot、E_ele 等；优化任务优先使用最后一次 SCF 的分量）"""
+        properties = parsed.get('properties') or {}
+        components = {
+            name: value for name, value in properties.items()
+            if name.startswith('E_') and isinstance(value, (int, float))
+        }
+        final = properties.get('final_scf_components') or {}
+        components.update({
+            name: value for name, value in final.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        })
+        return components
+
+    @staticmethod
+    def _input_keywords(path: Path) -> Dict[str, Optional[str]]:
+        """从输出开头的输入回显读取基组/泛函，缺失时尝试同名 .inp 文件"""
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            keywords = read_input_keywords(f)
+        input_path = path.with_suffix('.inp')
+        if (keywords['basis'] is None or keywords['functional'] is None) and input_path.exists():
+            with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
+                from_input = read_input_keywords(f)
+            keywords = {key: keywords[key] or from_input[key] for key in keywords}
+        return keywords
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        columns: Sequence[str] = ('id', 'path', 'task_type', 'formula', 'method', 'basis', 'energy', 's1_energy_ev'),
+        order_by: str = 'energy',
+        limit: Optional[int] = None,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        按条件查询计算（使用索引列，不读取子表）
+
+        Args:
+            columns: 返回的 calculations 列
+            order_by: 排序列（calculations 中的列名）
+            limit: 最大返回行数
+            **filters: 见 QUERY_FILTERS（formula/method/basis/task_type 不区分大小写，
+                       task_type 接受 TASK_TYPE_ALIASES 中的别名；
+                       energy_min/energy_max 单位 Hartree，s1_min/s1_max 单位 eV）
+
+        Returns:
+            每行一个字典
+
+        Raises:
+            ValueError: 未知的过滤条件或列名
+        """
+        unknown = sorted(set(filters) - set(QUERY_FILTERS))
+        if unknown:
+            raise ValueError(
+                f"Unknown query filter(s): {', '.join(unknown)}. "
+                f"Supported filters: {', '.join(QUERY_FILTERS)}"
+            )
+        valid_columns = self._calculation_columns()
+        for column in list(columns) + [order_by]:
+            if column not in valid_columns:
+                raise ValueError(f"Unknown column: {column}")
+        if filters.get('task_type'):
+            task_type = filters['task_type'].lower()
+            filters['task_type'] = TASK_TYPE_ALIASES.get(task_type, task_type)
+        conditions = []
+        params: List[Any] = []
+        for name, value in filters.items():
+            if value is not None:
+                conditions.append(QUERY_FILTERS[name])
+                params.append(value)
+        sql = f"SELECT {', '.join('c.' + col for col in columns)} FROM calculations c"
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += f" ORDER BY c.{order_by}"
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """执行任意 SQL（如需要连接子表的查询），返回每行一个字典"""
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def excited_states(self, calc_id: int) -> List[Dict[str, Any]]:
+        """返回某个计算的所有激发态"""
+        return self.execute(
+            'SELECT * FROM excited_states WHERE calc_id = ? ORDER BY block_index, state_index', (calc_id,)
+        )
+
+    def count(self) -> int:
+        """返回已导入的计算数"""
+        return self.conn.execute('SELECT COUNT(*) FROM calculations').fetchone()[0]
+
+    def _calculation_columns(self) -> List[str]:
+        return [row['name'] for row in self.conn.execute('PRAGMA table_info(calculations)')]
@@ -0,0 +1,221 @@
+"""
+Compiled Input Templates
+
+This module provides InputTemplate, which converts a YAML configuration
+once and then stamps out BDF inputs that differ only in their coordinates.
+The converter output is split around the COMPASS geometry block into a
+fixed prefix and suffix, so generating another input is a single string
+format of the coordinate lines instead of a full validate-and-generate
+pass. Charge and multiplicity can also vary per input: each distinct
+(elements, charge, multiplicity) combination is converted once and cached,
+because they change more than one line (e.g. RKS vs UKS, relativistic
+Hamiltonian for heavy elements).
+"""
+
+import copy
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import yaml
+
+from .utils import BOHR_TO_ANGSTROM, COORDINATE_LINE_FORMAT
+
+
+# Molecule keys replaced by the geometry slot
+_GEOMETRY_KEYS = ('coordinates', 'xyz_file', 'geometry_file')
+
+
+class InputTemplate:
+    """
+    A YAML configuration compiled for repeated rendering with new geometries.
+
+    Example:
+        template = compile_template("benzene_tddft.yaml")
+        for i, conformer in enumerate(conformers):
+            template.write(f"conf_{i:05d}.inp", conformer)
+
+    Every rendered input is identical to what BDFConverter.convert() would
+    produce for the configuration with the same coordinates, charge and
+    multiplicity.
+    """
+
+    def __init__(self, config: Dict[str, Any], converter: Any = None):
+        """
+        Args:
+            config: YAML configuration dictionary (molecule coordinates are optional;
+                    they only serve as the default geometry)
+            converter: BDFConverter used to build each variant (default: a new one
+                       with input validation enabled)
+        """
+        if converter is None:
+            from .converter import BDFConverter
+            converter = BDFConverter()
+        self.converter = converter
+        self.config = copy.deepcopy(config)
+        molecule = self.config.setdefault('molecule', {})
+        self.units = str(molecule.get('units', 'angstrom')).lower()
+        self.charge = molecule.get('charge', 0)
+        self.multiplicity = molecule.get('multiplicity', 1)
+        self.default_coordinates = molecule.get('coordinates') or None
+        for key in _GEOMETRY_KEYS:
+            molecule.pop(key, None)
+        self._variants: Dict[Tuple[Tuple[str, ...], Any, Any], Tuple[str, str]] = {}
+
+    @property
+    def variants(self) -> int:
+        """Number of compiled (elements, charge, multiplicity) variants"""
+        return len(self._variants)
+
+    def _atoms(self, coordinates: Any, elements: Optional[Sequence[str]]) -> Tuple[List[str], List[Any]]:
+        """Normalize a geometry to (elements, [[x, y, z], ...]) in the template units."""
+        if hasattr(coordinates, 'elements') and hasattr(coordinates, 'coords'):
+            # analysis.parser.Geometry
+            geometry = coordinates.to_units(self.units)
+            return [str(e) for e in geometry.elements], geometry.coords.tolist()
+        if elements is not None:
+            rows = coordinates.tolist() if hasattr(coordinates, 'tolist') else list(coordinates)
+            return [str(e) for e in elements], rows
+        symbols, rows = [], []
+        for atom in coordinates:
+            parts = atom.split() if isinstance(atom, str) else list(atom)
+            if len(parts) != 4:
+                raise ValueError(f"Expected 'ELEMENT X Y Z', got: {atom!r}")
+            symbols.append(str(parts[0]))
+            rows.append([float(v) for v in parts[1:]])
+        return symbols, rows
+
+    def _variant(self, symbols: List[str], rows: List[Any], charge: Any, multiplicity: Any) -> Tuple[str, str]:
+        key = (tuple(symbols), charge, multiplicity)
+        variant = self._variants.get(key)
+        if variant is not None:
+            return variant
+        # First input of this variant: a full conversion, split around the geometry block
+        config = copy.deepcopy(self.config)
+        molecule = config['molecule']
+        molecule.update(charge=charge, multiplicity=multiplicity)
+        molecule['coordinates'] = [f"{s} {x!r} {y!r} {z!r}" for s, (x, y, z) in zip(symbols, rows)]
+        lines = self.converter.convert(config).split('\n')
+        try:
+            start = lines.index('Geometry')
+            end = lines.index('End geometry', start)
+        except ValueError:
+            raise ValueError("Converted input has no inline geometry block to template") from None
+        if end - start - 1 != len(symbols):
+            raise ValueError(
+                f"Geometry block has {end - start - 1} lines for {len(symbols)} atoms; "
+                f"cannot build a template from this configuration"
+            )
+        variant = ('\n'.join(lines[:start + 1]) + '\n', '\n' + '\n'.join(lines[end:]))
+        self._variants[key] = variant
+        return variant
+
+    def render(
+        self,
+        coordinates: Any = None,
+        charge: Optional[int] = None,
+        multiplicity: Optional[int] = None,
+        elements: Optional[Sequence[str]] = None,
+    ) -> str:
+        """
+        Render a BDF input for one geometry.
+
+        Args:
+            coordinates: One of
+                - list of "ELEMENT X Y Z" strings (as in YAML)
+                - list of (element, x, y, z) sequences
+                - (n_atoms, 3) array or nested list together with ``elements``
+                - an analysis.parser.Geometry (converted to the template units)
+                None uses the coordinates of the compiled configuration.
+            charge: Molecular charge (default: the configuration's)
+            multiplicity: Spin multiplicity (default: the configuration's)
+            elements: Element symbols when coordinates is a bare array
+
+        Returns:
+            BDF input file content
+        """
+        if coordinates is None:
+            if self.default_coordinates is None:
+                raise ValueError("No coordinates given and the template configuration has none")
+            coordinates = self.default_coordinates
+        symbols, rows = self._atoms(coordinates, elements)
+        if len(rows) != len(symbols):
+            raise ValueError(f"Got {len(rows)} coordinate rows for {len(symbols)} elements")
+        charge = self.charge if charge is None else charge
+        multiplicity = self.multiplicity if multiplicity is None else multiplicity
+        prefix, suffix = self._variant(symbols, rows, charge, multiplicity)
+
+        factor = BOHR_TO_ANGSTROM if self.units == 'bohr' else 1.0
+        values: List[Any] = []
+        for symbol, (x, y, z) in zip(symbols, rows):
+            values.extend((symbol, x * factor, y * factor, z * factor))
+        block = '\n'.join([COORDINATE_LINE_FORMAT] * len(symbols)) % tuple(values)
+        return prefix + block + suffix
+
+    def write(
+        self,
+        output_path: Union[str, Path],
+        coordinates: Any = None,
+        **kwargs: Any,
+    ) -> Path:
+        """
+        Render one input and write it to output_path.
+
+        Args:
+            output_path: BDF input file path
+            coordinates: Geometry (see render())
+            **kwargs: charge, multiplicity, elements (see render())
+
+        Returns:
+            Path to the written file
+        """
+        output_path = Path(output_path)
+        output_path.write_text(self.render(coordinates, **kwargs), encoding='utf-8')
+        return output_path
+
+    def write_many(
+        self,
+        geometries: Iterable[Any],
+        output_dir: Union[str, Path],
+        name_format: str = "conf_{index:05d}.inp",
+        **kwargs: Any,
+    ) -> List[Path]:
+        """
+        Write one input per geometry.
+
+        Args:
+            geometries: Geometries accepted by render()
+            output_dir: Output directory (created if missing)
+            name_format: File name pattern, formatted with ``index`` (0-based)
+            **kwargs: charge, multiplicity, elements shared by all geometries
+
+        Returns:
+            Paths of the written files
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return [
+            self.write(output_dir / name_format.format(index=index), geometry, **kwargs)
+            for index, geometry in enumerate(geometries)
+        ]
+
+
+def compile_template(
+    config: Union[Dict[str, Any], str, Path],
+    validate_input: bool = True,
+) -> InputTemplate:
+    """
+    Compile a YAML configuration (dictionary or file path) into an InputTemplate.
+
+    Args:
+        config: YAML configuration dictionary or path to a YAML file
+        validate_input: Whether each compiled variant is validated (default: True)
+
+    Returns:
+        InputTemplate
+    """
+    from .converter import BDFConverter
+
+    if not isinstance(config, dict):
+        with open(config, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    return InputTemplate(config, converter=BDFConverter(validate_input=validate_input))
@@ -55,6 +55,13 @@ def select_scf_method(
     raise ValueError(f"Invalid method_type: {method_type}")
 
 
+# Coordinate line written into the COMPASS geometry block (atom, x, y, z in Angstrom)
+COORDINATE_LINE_FORMAT = " %4s %12.4f %12.4f %12.4f"
+
+# Bohr -> Angstrom factor used when formatting input coordinates
+BOHR_TO_ANGSTROM = 0.529177
+
+
 def format_coordinates(
     coordinates: List[str],
     units: str = 'angstrom'
@@ -83,11 +90,11 @@ def format_coordinates(
                 # BDF uses Angstrom as default, so we only convert if input is in Bohr
                 if units.lower() == 'bohr':
                     # Convert Bohr to Angstrom (1 Bohr = 0.529177 Angstrom)
-                    x *= 0.529177
-                    y *= 0.529177
-                    z *= 0.529177
+                    x *= BOHR_TO_ANGSTROM
+                    y *= BOHR_TO_ANGSTROM
+                    z *= BOHR_TO_ANGSTROM
                 
-                formatted.append(f" {atom:>4s} {x:12.4f} {y:12.4f} {z:12.4f}")
+                formatted.append(COORDINATE_LINE_FORMAT % (atom, x, y, z))
             else:
                 formatted.append(f" {coord}")
         else:
@@ -41,15 +41,18 @@ class BDFValidator:
                 DeprecationWarning
             )
     
-    def validate(self, config: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    def validate(self, config: Dict[str, Any], as_dict: bool = True) -> Tuple[Any, List[str]]:
         """
         Validate YAML configuration using Pydantic schema.
         
         Args:
             config: YAML configuration dictionary
+            as_dict: Return the validated config as a dictionary (to_yaml_dict()).
+                     When False the EasyInputConfig model is returned as is,
+                     which skips the dictionary round-trip.
             
         Returns:
-            Tuple of (validated_config_dict, warnings_list)
+            Tuple of (validated_config_dict or EasyInputConfig, warnings_list)
             
         Raises:
             ValidationError: If validation fails
@@ -63,6 +66,9 @@ class BDFValidator:
             # Perform additional compatibility checks
             self._check_compatibility(easyinput_config)
             
+            if not as_dict:
+                return easyinput_config, self.warnings
+
             # Convert to dictionary for return (maintains interface compatibility)
             validated_dict = easyinput_config.to_yaml_dict()
             
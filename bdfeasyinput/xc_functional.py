@@ -38,13 +38,22 @@ Design principles
      and check whether given names appear as X / C / XC functionals.
    - Validation is **soft**: it returns warnings but should not prevent
      generation of BDF input.
+   - The database is loaded once per process and indexed, so each name
+     lookup is a set membership test. A pickled copy is kept in the user
+     cache directory and rebuilt when the YAML file changes, so later
+     processes skip the YAML parse as well.
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
+import tempfile
+from collections.abc import Mapping as MappingABC
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Mapping, MutableMapping, Optional, Tuple, Union
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 import yaml
 
@@ -159,11 +168,119 @@ def build_dft_functional_lines(method_section: Mapping[str, Any]) -> Optional[Tu
 
 # Optional validation ----------------------------------------------------------
 
+# Default binary cache location for the parsed database
+DEFAULT_XC_CACHE_DIR = Path.home() / ".cache" / "bdfeasyinput" / "xc"
+
+# Bump when the pickled XCDatabase layout changes
+_XC_CACHE_FORMAT = 1
+
+# Process-wide databases: resolved YAML path -> ((st_mtime_ns, st_size), database)
+_XC_DATABASES: Dict[str, Tuple[Tuple[int, int], "XCDatabase"]] = {}
+
+
+class XCDatabase(MappingABC):
+    """
+    Read-only ``macro_name -> functional_info`` mapping with lookup indexes.
+
+    Besides behaving like the plain dict previously returned by
+    :func:`load_xc_database`, it carries:
+
+    - ``short_names``: ``short_name -> macros``;
+    - ``suffixes``: ``macro suffix -> macros``, where a suffix is any
+      ``_``-separated tail of the macro (``ACGGA``, ``C_ACGGA``, ...);
+    - ``role_names``: ``role -> frozenset`` of all short names and suffixes
+      of that role, so :meth:`matches` is O(1) per role.
+
+    Instances are shared process-wide and must not be modified.
+    """
+
+    def __init__(self, functionals: Mapping[str, Mapping[str, Any]]):
+        self._functionals: Dict[str, Mapping[str, Any]] = dict(functionals)
+        short_names: Dict[str, List[str]] = {}
+        suffixes: Dict[str, List[str]] = {}
+        role_names: Dict[str, set] = {}
+        for macro, info in self._functionals.items():
+            names = role_names.setdefault(str(info.get("role", "")).upper(), set())
+            short_name = str(info.get("short_name", ""))
+            if short_name:
+                short_names.setdefault(short_name, []).append(macro)
+                names.add(short_name)
+            parts = macro.split("_")
+            for i in range(1, len(parts)):
+                suffix = "_".join(parts[i:])
+                suffixes.setdefault(suffix, []).append(macro)
+                names.add(suffix)
+        self.short_names: Dict[str, Tuple[str, ...]] = {k: tuple(v) for k, v in short_names.items()}
+        self.suffixes: Dict[str, Tuple[str, ...]] = {k: tuple(v) for k, v in suffixes.items()}
+        self.role_names: Dict[str, FrozenSet[str]] = {k: frozenset(v) for k, v in role_names.items()}
+
+    def __getitem__(self, macro: str) -> Mapping[str, Any]:
+        return self._functionals[macro]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._functionals)
+
+    def __len__(self) -> int:
+        return len(self._functionals)
+
+    def matches(self, name: str, roles: Tuple[str, ...]) -> bool:
+        """Return True if `name` is a short name or macro suffix of an entry with role in `roles`."""
+        target = name.strip()
+        if not target:
+            return False
+        return any(target in self.role_names.get(role.upper(), ()) for role in roles)
+
+
+def _default_xc_yaml() -> Path:
+    # bdfeasyinput/xc_functional.py -> project_root/research/mapping_tables
+    root = Path(__file__).resolve().parents[1]
+    return root / "research" / "mapping_tables" / "xc_functionals.yaml"
+
+
+def _parse_xc_yaml(yaml_path: Path) -> XCDatabase:
+    data = yaml.load(yaml_path.read_text(encoding="utf-8"), Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    funcs = data.get("functionals") if isinstance(data, Mapping) else None
+    if not isinstance(funcs, MutableMapping):
+        raise ValueError(f"Unexpected xc_functionals.yaml structure at {yaml_path}")
+    return XCDatabase(funcs)
+
+
+def _read_xc_cache(cache_file: Path, stamp: Tuple[int, int]) -> Optional[XCDatabase]:
+    """Return the pickled database if it was built from a YAML with this (mtime, size)."""
+    try:
+        with open(cache_file, "rb") as f:
+            fmt, cached_stamp, database = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, TypeError):
+        return None
+    if fmt != _XC_CACHE_FORMAT or tuple(cached_stamp) != stamp or not isinstance(database, XCDatabase):
+        return None
+    return database
+
+
+def _write_xc_cache(cache_file: Path, stamp: Tuple[int, int], database: XCDatabase) -> None:
+    """Atomically write the binary cache; failures only cost the next process a YAML parse."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((_XC_CACHE_FORMAT, stamp, database), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_file)
+    except OSError:
+        pass
+
+
 def load_xc_database(
     path: Union[str, Path, None] = None,
-) -> Dict[str, Dict[str, Any]]:
+    cache_dir: Union[str, Path, None] = None,
+    use_cache: bool = True,
+) -> XCDatabase:
     """
-    Load the xc_functionals.yaml database as a plain dict.
+    Load the xc_functionals.yaml database.
+
+    The result is cached for the whole process and revalidated against the
+    YAML file's modification time and size on every call. On a process-level
+    miss a pickled copy in ``cache_dir`` is used when it matches the YAML;
+    otherwise the YAML is parsed and the pickle regenerated.
 
     Parameters
     ----------
@@ -171,37 +288,52 @@ def load_xc_database(
         Path to ``xc_functionals.yaml``. If omitted, will look for
         ``research/mapping_tables/xc_functionals.yaml`` relative to the
         project root (two directories above this file).
+    cache_dir
+        Directory of the binary cache (default: ``DEFAULT_XC_CACHE_DIR``).
+    use_cache
+        If False, always parse the YAML and leave both caches untouched.
 
     Returns
     -------
-    Dict[str, Dict[str, Any]]
-        Mapping ``macro_name -> functional_info``.
+    XCDatabase
+        Read-only mapping ``macro_name -> functional_info`` with lookup indexes.
     """
-    if path is None:
-        # bdfeasyinput/xc_functional.py -> project_root/research/mapping_tables
-        root = Path(__file__).resolve().parents[1]
-        path = root / "research" / "mapping_tables" / "xc_functionals.yaml"
-
-    yaml_path = Path(path)
+    yaml_path = Path(path) if path is not None else _default_xc_yaml()
     if not yaml_path.exists():
         raise FileNotFoundError(f"xc_functionals.yaml not found at: {yaml_path}")
+    if not use_cache:
+        return _parse_xc_yaml(yaml_path)
 
-    data = yaml.safe_load(yaml_path.read_text(encoding="utf-8"))
-    funcs = data.get("functionals")
-    if not isinstance(funcs, MutableMapping):
-        raise ValueError(f"Unexpected xc_functionals.yaml structure at {yaml_path}")
-    return dict(funcs)
+    key = str(yaml_path.resolve())
+    stat = yaml_path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _XC_DATABASES.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    cache_file = Path(cache_dir or DEFAULT_XC_CACHE_DIR) / (hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".pkl")
+    database = _read_xc_cache(cache_file, stamp)
+    if database is None:
+        database = _parse_xc_yaml(yaml_path)
+        _write_xc_cache(cache_file, stamp, database)
+    _XC_DATABASES[key] = (stamp, database)
+    return database
 
 
 def _match_name_against_db(name: str, db: Mapping[str, Mapping[str, Any]], roles: Tuple[str, ...]) -> bool:
     """Return True if `name` matches any entry in `db` with role in `roles`."""
+    if isinstance(db, XCDatabase):
+        return db.matches(name, roles)
+
+    # Plain mappings (e.g. hand-built test tables): linear scan
     target = name.strip()
     if not target:
         return False
 
+    wanted = {r.upper() for r in roles}
     for macro, info in db.items():
         role = str(info.get("role", "")).upper()
-        if role not in {r.upper() for r in roles}:
+        if role not in wanted:
             continue
 
         short_name = str(info.get("short_name", ""))
@@ -227,7 +359,8 @@ def validate_functional(
         Final functional string that will be written after ``dft functional``,
         e.g. ``"B3LYP"`` or ``"PBE LYP"``.
     xc_db
-        Database loaded via :func:`load_xc_database`.
+        Database loaded via :func:`load_xc_database` (plain mappings of the
+        same shape are accepted but scanned linearly).
 
     Returns
     -------
@@ -278,6 +411,7 @@ def validate_functional(
 __all__ = [
     "FunctionalInput",
     "FunctionalValidationResult",
+    "XCDatabase",
     "process_functional_input",
     "build_dft_functional_lines",
     "load_xc_database",
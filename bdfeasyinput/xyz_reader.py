@@ -0,0 +1,192 @@
+"""
+Streaming Multi-Frame XYZ Reader
+
+This module reads XYZ and extended XYZ (extxyz) files frame by frame, as
+written by MD codes, CREST conformer searches or
+Trajectory.write_xyz(). Frames are yielded one at a time so arbitrarily
+long trajectories can be converted without loading them into memory.
+Key=value pairs on extxyz comment lines are parsed into ``info``. A
+frame's charge and multiplicity are taken from them when present
+(``charge``, ``multiplicity``/``mult``), and the ``Properties`` key
+locates the species and position columns.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+# File name pattern for per-frame outputs: {name} is the source stem, {index} the 0-based frame
+FRAME_NAME_FORMAT = "{name}_{index:05d}"
+
+# Comment-line keys recognised as charge / spin multiplicity
+CHARGE_KEYS = ('charge', 'total_charge')
+MULTIPLICITY_KEYS = ('multiplicity', 'mult', 'spin_multiplicity')
+
+_INFO_PAIR = re.compile(r'([A-Za-z_][\w:-]*)(?:\s*=\s*("[^"]*"|\{[^}]*\}|\S+))?')
+
+
+def _info_value(text: str) -> Any:
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text[1:-1]
+    if text in ('T', 'True', 'true'):
+        return True
+    if text in ('F', 'False', 'false'):
+        return False
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_extxyz_comment(comment: str) -> Dict[str, Any]:
+    """
+    Parse the key=value pairs of an extended XYZ comment line.
+
+    Plain XYZ comments (no ``=`` at all) give an empty dict.
+
+    Returns:
+        {key: value}; numbers become int/float, T/F become bool, quotes are removed
+    """
+    if '=' not in comment:
+        return {}
+    info: Dict[str, Any] = {}
+    for match in _INFO_PAIR.finditer(comment):
+        key, value = match.group(1), match.group(2)
+        info[key] = True if value is None else _info_value(value)
+    return info
+
+
+def _columns(info: Dict[str, Any]) -> Tuple[int, int]:
+    """Column offsets of the species and position fields (from extxyz Properties)."""
+    properties = info.get('Properties')
+    if not isinstance(properties, str):
+        return 0, 1
+    parts = properties.split(':')
+    species, pos, offset = 0, 1, 0
+    for i in range(0, len(parts) - 2, 3):
+        name, count = parts[i], int(parts[i + 2])
+        if name == 'species':
+            species = offset
+        elif name == 'pos':
+            pos = offset
+        offset += count
+    return species, pos
+
+
+@dataclass
+class XYZFrame:
+    """
+    One structure from an XYZ file.
+
+    Attributes:
+        index: 0-based frame index in the file
+        symbols: Element symbols
+        coordinates: (x, y, z) per atom in Angstrom
+        comment: Raw comment line
+        info: Parsed extxyz key=value pairs (empty for plain XYZ)
+    """
+    index: int
+    symbols: List[str]
+    coordinates: List[Tuple[float, float, float]]
+    comment: str = ''
+    info: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def n_atoms(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def charge(self) -> Optional[int]:
+        """Charge from the comment line, if given"""
+        for key in CHARGE_KEYS:
+            if key in self.info:
+                return int(self.info[key])
+        return None
+
+    @property
+    def multiplicity(self) -> Optional[int]:
+        """Spin multiplicity from the comment line, if given"""
+        for key in MULTIPLICITY_KEYS:
+            if key in self.info:
+                return int(self.info[key])
+        return None
+
+    def coordinate_lines(self) -> List[str]:
+        """Coordinates as YAML-style "ELEMENT X Y Z" strings"""
+        return [f"{s} {x:.10f} {y:.10f} {z:.10f}" for s, (x, y, z) in zip(self.symbols, self.coordinates)]
+
+
+def _parse_atom(line: str, species: int, pos: int, path: Path, line_no: int) -> Tuple[str, Tuple[float, float, float]]:
+    parts = line.split()
+    try:
+        return parts[species], (float(parts[pos]), float(parts[pos + 1]), float(parts[pos + 2]))
+    except (IndexError, ValueError):
+        raise ValueError(f"{path}:{line_no}: invalid atom line: {line.strip()!r}") from None
+
+
+def iter_xyz_frames(path: Union[str, Path]) -> Iterator[XYZFrame]:
+    """
+    Read the frames of an XYZ/extxyz file one at a time.
+
+    Each frame is an atom-count line, a comment line and that many atom
+    lines; blank lines between frames are ignored. A file whose first line
+    is not an atom count is read the legacy way, as a single frame: one
+    comment line followed by atom lines.
+
+    Args:
+        path: XYZ or extxyz file
+
+    Yields:
+        XYZFrame per structure
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If a frame is truncated or an atom line is malformed
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"XYZ file not found: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        line_no = 0
+        index = 0
+        for line in f:
+            line_no += 1
+            header = line.strip()
+            if not header:
+                continue
+            if not header.isdigit():
+                if index > 0:
+                    raise ValueError(f"{path}:{line_no}: expected the atom count of frame {index}, got {header!r}")
+                # No atom-count line: the first line is a comment, every remaining line with 4+ fields is an atom
+                symbols, coordinates = [], []
+                for rest in f:
+                    line_no += 1
+                    if len(rest.split()) >= 4:
+                        symbol, xyz = _parse_atom(rest, 0, 1, path, line_no)
+                        symbols.append(symbol)
+                        coordinates.append(xyz)
+                yield XYZFrame(0, symbols, coordinates, header, parse_extxyz_comment(header))
+                return
+            n_atoms = int(header)
+            comment = next(f, None)
+            line_no += 1
+            if comment is None:
+                raise ValueError(f"{path}: frame {index} is truncated (missing comment line)")
+            comment = comment.rstrip('\n')
+            info = parse_extxyz_comment(comment)
+            species, pos = _columns(info)
+            symbols, coordinates = [], []
+            for _ in range(n_atoms):
+                atom_line = next(f, None)
+                line_no += 1
+                if atom_line is None:
+                    raise ValueError(f"{path}: frame {index} is truncated ({len(symbols)} of {n_atoms} atoms)")
+                symbol, xyz = _parse_atom(atom_line, species, pos, path, line_no)
+                symbols.append(symbol)
+                coordinates.append(xyz)
+            yield XYZFrame(index, symbols, coordinates, comment.strip(), info)
+            index += 1
@@ -5,12 +5,15 @@ This module provides utilities for generating BDF calculation task YAML files
 from various input formats and templates.
 """
 
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
+import collections
+import itertools
 import yaml
 import re
 
 from .validator import BDFValidator, ValidationError
+from .xyz_reader import FRAME_NAME_FORMAT, XYZFrame, iter_xyz_frames
 
 
 class YAMLGenerator:
@@ -67,7 +70,7 @@ class YAMLGenerator:
         # Validate if enabled
         if self.validate_output and self.validator:
             try:
-                validated_model, warnings = self.validator.validate(config)
+                validated_model, warnings = self.validator.validate(config, as_dict=False)
                 for warning in warnings:
                     import warnings as py_warnings
                     py_warnings.warn(warning, UserWarning)
@@ -80,64 +83,98 @@ class YAMLGenerator:
         self,
         xyz_path: Union[str, Path],
         task_type: str = 'energy',
-        charge: int = 0,
-        multiplicity: int = 1,
+        charge: Optional[int] = None,
+        multiplicity: Optional[int] = None,
         method: Optional[Dict[str, Any]] = None,
         settings: Optional[Dict[str, Any]] = None,
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        frame: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Generate YAML configuration from XYZ file.
         
         Args:
-            xyz_path: Path to XYZ file
+            xyz_path: Path to XYZ or extended XYZ file
             task_type: Type of calculation (default: 'energy')
-            charge: Molecular charge (default: 0)
-            multiplicity: Spin multiplicity (default: 1)
+            charge: Molecular charge (default: from the extxyz comment line, else 0)
+            multiplicity: Spin multiplicity (default: from the extxyz comment line, else 1)
             method: Method configuration (if None, uses default)
             settings: Optional settings dictionary
             name: Optional molecule name (if None, uses filename)
+            frame: Frame index (0-based, negative counts from the end) for
+                   multi-frame files; required when the file has more than one frame
         
         Returns:
             YAML configuration dictionary
+        
+        Raises:
+            ValueError: If the file has several frames and no frame is given,
+                        or the requested frame does not exist
         """
         xyz_path = Path(xyz_path)
-        if not xyz_path.exists():
-            raise FileNotFoundError(f"XYZ file not found: {xyz_path}")
-        
-        # Read XYZ file
-        with open(xyz_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Parse XYZ format
-        # First line: number of atoms (optional)
-        # Second line: comment/name (optional)
-        # Remaining lines: atom_symbol x y z
-        
-        coordinates = []
-        start_idx = 0
-        
-        # Skip first line if it's a number
-        if len(lines) > 0 and lines[0].strip().isdigit():
-            start_idx = 2  # Skip number and comment line
-        elif len(lines) > 0:
-            start_idx = 1  # Skip comment line
-        
-        # Parse coordinates
-        for line in lines[start_idx:]:
-            line = line.strip()
-            if not line:
-                continue
-            
-            parts = line.split()
-            if len(parts) >= 4:
-                atom_symbol = parts[0]
-                x, y, z = map(float, parts[1:4])
-                coordinates.append(f"{atom_symbol} {x:.10f} {y:.10f} {z:.10f}")
-        
-        # Determine molecule name
-        if name is None:
-            name = xyz_path.stem
+        if frame is None:
+            frames = list(itertools.islice(iter_xyz_frames(xyz_path), 2))
+            if len(frames) > 1:
+                raise ValueError(
+                    f"{xyz_path} contains multiple frames; select one with frame= "
+                    f"or use iter_from_xyz() to generate one configuration per frame"
+                )
+            selected = frames[0] if frames else None
+        elif frame >= 0:
+            selected = next(itertools.islice(iter_xyz_frames(xyz_path), frame, None), None)
+        else:
+            selected = collections.deque(iter_xyz_frames(xyz_path), maxlen=-frame)
+            selected = selected[0] if len(selected) == -frame else None
+        if selected is None:
+            raise ValueError(f"{xyz_path} has no frame {frame if frame is not None else 0}")
+        
+        return self._config_from_frame(
+            selected, name or xyz_path.stem, task_type, charge, multiplicity, method, settings
+        )
+    
+    def iter_from_xyz(
+        self,
+        xyz_path: Union[str, Path],
+        task_type: str = 'energy',
+        charge: Optional[int] = None,
+        multiplicity: Optional[int] = None,
+        method: Optional[Dict[str, Any]] = None,
+        settings: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate one YAML configuration per frame of a (multi-frame) XYZ file.
+        
+        Frames are read lazily, so trajectories of any length can be
+        processed. Arguments are as for generate_from_xyz(); charge and
+        multiplicity default to each frame's extxyz metadata.
+        
+        Yields:
+            (frame_name, config) where frame_name is "<name>_<index:05d>"
+        """
+        xyz_path = Path(xyz_path)
+        name = name or xyz_path.stem
+        for xyz_frame in iter_xyz_frames(xyz_path):
+            frame_name = FRAME_NAME_FORMAT.format(name=name, index=xyz_frame.index)
+            yield frame_name, self._config_from_frame(
+                xyz_frame, frame_name, task_type, charge, multiplicity, method, settings
+            )
+    
+    def _config_from_frame(
+        self,
+        xyz_frame: XYZFrame,
+        name: str,
+        task_type: str,
+        charge: Optional[int],
+        multiplicity: Optional[int],
+        method: Optional[Dict[str, Any]],
+        settings: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the configuration for one XYZ frame (explicit charge/multiplicity win over metadata)."""
+        if charge is None:
+            charge = xyz_frame.charge if xyz_frame.charge is not None else 0
+        if multiplicity is None:
+            multiplicity = xyz_frame.multiplicity if xyz_frame.multiplicity is not None else 1
         
         # Default method if not provided
         if method is None:
@@ -152,7 +189,7 @@ class YAMLGenerator:
             'name': name,
             'charge': charge,
             'multiplicity': multiplicity,
-            'coordinates': coordinates,
+            'coordinates': xyz_frame.coordinate_lines(),
             'units': 'angstrom'
         }
         
@@ -407,12 +444,13 @@ class YAMLGenerator:
 def generate_yaml_from_xyz(
     xyz_path: Union[str, Path],
     task_type: str = 'energy',
-    charge: int = 0,
-    multiplicity: int = 1,
+    charge: Optional[int] = None,
+    multiplicity: Optional[int] = None,
     method: Optional[Dict[str, Any]] = None,
     settings: Optional[Dict[str, Any]] = None,
     output_path: Optional[Union[str, Path]] = None,
-    validate: bool = True
+    validate: bool = True,
+    frame: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Convenience function to generate YAML from XYZ file.
@@ -420,12 +458,13 @@ def generate_yaml_from_xyz(
     Args:
         xyz_path: Path to XYZ file
         task_type: Type of calculation
-        charge: Molecular charge
-        multiplicity: Spin multiplicity
+        charge: Molecular charge (default: extxyz metadata, else 0)
+        multiplicity: Spin multiplicity (default: extxyz metadata, else 1)
         method: Method configuration
         settings: Optional settings
         output_path: Optional path to save YAML file
         validate: Whether to validate output
+        frame: Frame index for multi-frame files
     
     Returns:
         YAML configuration dictionary
@@ -437,7 +476,8 @@ def generate_yaml_from_xyz(
         charge=charge,
         multiplicity=multiplicity,
         method=method,
-        settings=settings
+        settings=settings,
+        frame=frame
     )
     
     if output_path:
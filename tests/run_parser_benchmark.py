@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+BDF 输出解析器微基准
+
+对 tests/ 下的输出文件（*.log / *.out，以及解析器测试中的合成日志）逐个计时，
+比较基线版本与当前工作区的 BDFOutputParser.parse()：
+- before：基线版本的解析器（默认为引入 PATTERNS 注册表之前的提交，
+  通过 git worktree 检出到临时目录；也可用 --baseline-tree 指定已有源码树）
+- after ：当前工作区的解析器
+
+两者各在独立的子进程中导入和计时，互不共享模块与 re 缓存。
+
+用法：
+    python tests/run_parser_benchmark.py [--repeat 50] [--top 15] [额外的输出文件 ...]
+    python tests/run_parser_benchmark.py --baseline <git 版本>
+    python tests/run_parser_benchmark.py --baseline-tree /path/to/old/BDFEasyInput
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+tests_dir = Path(__file__).resolve().parent
+
+# 引入 PATTERNS 注册表的文件，其首次提交的父提交即默认基线
+REGISTRY_FILE = "bdfeasyinput/analysis/parser/patterns.py"
+
+
+def collect_fixtures(extra, workdir: Path):
+    """收集基准使用的输出文件"""
+    files = []
+    for suffix in ("*.log", "*.out"):
+        files.extend(sorted(tests_dir.rglob(suffix)))
+    files.extend(Path(p) for p in extra)
+
+    sys.path.insert(0, str(tests_dir))
+    sys.path.insert(0, str(project_root))
+    try:
+        from test_output_parser_sections import SAMPLES
+    except ImportError:
+        SAMPLES = {}
+    for name, content in sorted(SAMPLES.items()):
+        if not content:
+            continue
+        path = workdir / f"{name}.log"
+        path.write_text(content, encoding="utf-8")
+        files.append(path)
+    return files
+
+
+def time_parse(parser, path: Path, repeat: int) -> float:
+    """返回单次解析的平均耗时（毫秒）"""
+    parser.parse(str(path))  # 预热
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parser.parse(str(path))
+    return (time.perf_counter() - start) * 1000.0 / repeat
+
+
+def default_baseline() -> str:
+    """返回首次添加 REGISTRY_FILE 的提交的父提交"""
+    added = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "--", REGISTRY_FILE],
+        cwd=project_root, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    if not added:
+        raise RuntimeError(f"{REGISTRY_FILE} not found in git history; use --baseline or --baseline-tree")
+    return f"{added[-1]}^"
+
+
+def time_tree(tree: Path, files, repeat: int) -> dict:
+    """在子进程中从源码树 tree 导入解析器并计时，返回 {文件路径: 毫秒}"""
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker", str(tree),
+         "--repeat", str(repeat), *[str(p) for p in files]],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Timing parser from {tree} failed:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def worker(tree: str, files, repeat: int) -> int:
+    """子进程入口：只导入 tree 中的 bdfeasyinput 并逐个计时"""
+    sys.path.insert(0, tree)
+    from bdfeasyinput.analysis.parser import BDFOutputParser
+
+    loaded = Path(sys.modules["bdfeasyinput"].__file__).resolve()
+    if Path(tree).resolve() not in loaded.parents:
+        raise RuntimeError(f"bdfeasyinput imported from {loaded}, not from {tree}")
+    parser = BDFOutputParser()
+    print(json.dumps({path: time_parse(parser, Path(path), repeat) for path in files}))
+    return 0
+
+
+def print_pattern_stats(files, top: int) -> None:
+    """解析一遍所有文件，显示当前注册表中调用最多的模式"""
+    sys.path.insert(0, str(project_root))
+    from bdfeasyinput.analysis.parser import BDFOutputParser, PATTERNS
+
+    PATTERNS.reset_stats()
+    parser = BDFOutputParser()
+    for path in files:
+        parser.parse(str(path))
+    print(f"\n已注册模式数: {len(PATTERNS)}")
+    print(f"{'calls':>8} {'hits':>8}  pattern")
+    for row in PATTERNS.stats()[:top]:
+        pattern = row["pattern"].replace("\n", "\\n")
+        print(f"{row['calls']:>8} {row['hits']:>8}  {pattern[:90]}")
+
+
+def main():
+    """主函数"""
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("files", nargs="*", help="额外的 BDF 输出文件")
+    ap.add_argument("--repeat", type=int, default=50, help="每个文件的解析次数")
+    ap.add_argument("--top", type=int, default=15, help="显示调用最多的前 N 个模式")
+    ap.add_argument("--baseline", help="基线 git 版本（默认为引入 PATTERNS 注册表之前的提交）")
+    ap.add_argument("--baseline-tree", help="基线源码树目录（代替 --baseline）")
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        return worker(args.worker, args.files, args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = collect_fixtures(args.files, Path(tmp))
+        if not files:
+            print("✗ 未找到可用的输出文件")
+            return 1
+
+        worktree = None
+        try:
+            if args.baseline_tree:
+                baseline_tree, label = Path(args.baseline_tree), args.baseline_tree
+            else:
+                label = args.baseline or default_baseline()
+                worktree = baseline_tree = Path(tmp) / "baseline"
+                subprocess.run(
+                    ["git", "worktree", "add", "--detach", "--quiet", str(worktree), label],
+                    cwd=project_root, check=True,
+                )
+            before = time_tree(baseline_tree, files, args.repeat)
+            after = time_tree(project_root, files, args.repeat)
+        finally:
+            if worktree is not None:
+                subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=project_root)
+
+        print(f"baseline: {label}")
+        print(f"{'file':<32} {'size':>10} {'before(ms)':>12} {'after(ms)':>12} {'speedup':>8}")
+        print("-" * 78)
+        total_before = total_after = 0.0
+        for path in files:
+            b, a = before[str(path)], after[str(path)]
+            total_before += b
+            total_after += a
+            speedup = b / a if a else float("inf")
+            print(f"{path.name:<32} {path.stat().st_size:>10} {b:>12.3f} {a:>12.3f} {speedup:>7.2f}x")
+
+        print("-" * 78)
+        print(f"{'total':<32} {'':>10} {total_before:>12.3f} {total_after:>12.3f} "
+              f"{(total_before / total_after if total_after else float('inf')):>7.2f}x")
+
+        print_pattern_stats(files, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.conversion_tool import CONVERSION_STAGES, ConversionTool
+
+
+def _config(index):
+    return {
+        "task": {"type": "energy"},
+        "molecule": {
+            "charge": 0,
+            "multiplicity": 1,
+            "coordinates": ["O 0.0 0.0 0.1173", "H 0.0 0.7572 -0.4692", f"H 0.0 -0.7572 {-0.4692 - index * 0.001:.4f}"],
+        },
+        "method": {"type": "dft", "functional": "pbe0", "basis": "cc-pvdz"},
+    }
+
+
+def _yaml_files(directory, count, broken=()):
+    directory.mkdir(parents=True, exist_ok=True)
+    files = []
+    for i in range(count):
+        path = directory / f"conf{i:03d}.yaml"
+        if i in broken:
+            path.write_text("task: [unclosed\n")
+        else:
+            path.write_text(yaml.safe_dump(_config(i)))
+        files.append(path)
+    return files
+
+
+def test_parallel_batch_matches_serial_and_reports_stage_timings(tmp_path):
+    files = _yaml_files(tmp_path / "yaml", 12, broken={5})
+    tool = ConversionTool(validate_input=False)
+
+    serial = list(tool.iter_batch_convert(files, output_dir=tmp_path / "serial"))
+    parallel = list(tool.iter_batch_convert(files, output_dir=tmp_path / "parallel", jobs=3, chunksize=2))
+
+    assert [r["file"] for r in parallel] == [str(f) for f in files]
+    assert [r["status"] for r in parallel] == [r["status"] for r in serial]
+    assert parallel[5]["status"] == "failed" and isinstance(parallel[5]["error"], Exception)
+    for record in parallel:
+        assert set(record["timings"]) == set(CONVERSION_STAGES)
+        if record["status"] == "success":
+            name = Path(record["output"]).name
+            assert (tmp_path / "parallel" / name).read_text() == (tmp_path / "serial" / name).read_text()
+
+    # 已存在的输出在不覆盖时报错（在加载之前检查）
+    results = tool.batch_convert(files[:2], output_dir=tmp_path / "parallel", jobs=2)
+    assert all(isinstance(v, FileExistsError) for v in results.values())
+    results = tool.batch_convert(files[:2], output_dir=tmp_path / "parallel", overwrite=True, jobs=2)
+    assert results == {str(f): tmp_path / "parallel" / f.with_suffix(".inp").name for f in files[:2]}
+
+
+def test_cli_batch_convert_jobs(tmp_path):
+    files = _yaml_files(tmp_path / "yaml", 6)
+    result = CliRunner().invoke(main, [
+        "batch-convert", *map(str, files), "-d", str(tmp_path / "out"), "--no-validate", "-j", "2",
+    ])
+    assert result.exit_code == 0, result.output
+    assert "Success: 6" in result.output
+    for stage in CONVERSION_STAGES + ("wall",):
+        assert f"  {stage}" in result.output
+    assert len(list((tmp_path / "out").glob("*.inp"))) == 6
+
+
+def test_incremental_batch_skips_unchanged_and_regenerates_changed(tmp_path, monkeypatch):
+    from bdfeasyinput import conversion_tool
+
+    files = _yaml_files(tmp_path / "yaml", 4)
+    out = tmp_path / "out"
+    tool = ConversionTool(validate_input=False)
+
+    def run(**kwargs):
+        return {Path(r["file"]).name: r for r in tool.iter_batch_convert(files, output_dir=out, incremental=True, **kwargs)}
+
+    first = run()
+    assert {r["change"] for r in first.values()} == {"new"}
+    assert (out / conversion_tool.MANIFEST_NAME).exists()
+    mtimes = {p.name: p.stat().st_mtime_ns for p in out.glob("*.inp")}
+
+    again = run(jobs=2)
+    assert {r["status"] for r in again.values()} == {"skipped"}
+    assert {p.name: p.stat().st_mtime_ns for p in out.glob("*.inp")} == mtimes
+
+    # 源文件变化：只重新生成这一个（无需 overwrite，因为输出是之前生成的）
+    files[1].write_text(yaml.safe_dump(_config(10)))
+    # 手工修改过的输出不再由清单管理，按常规覆盖规则处理
+    (out / "conf002.inp").write_text("edited\n")
+    changed = run()
+    assert changed["conf001.yaml"]["change"] == "stale" and changed["conf001.yaml"]["status"] == "success"
+    assert "-0.4792" in (out / "conf001.inp").read_text()
+    assert isinstance(changed["conf002.yaml"]["error"], FileExistsError)
+    assert [changed[f"conf00{i}.yaml"]["status"] for i in (0, 3)] == ["skipped", "skipped"]
+
+    # 生成器变化或 --force：全部重新生成
+    monkeypatch.setattr(conversion_tool, "generator_fingerprint", lambda: "other")
+    assert [r["change"] for r in run().values()] == ["stale", "stale", "new", "stale"]
+    assert run(overwrite=True)["conf002.yaml"]["status"] == "success"
+    assert {r["change"] for r in run(force=True).values()} == {"stale"}
+
+
+def test_cli_batch_convert_reports_skipped(tmp_path):
+    files = _yaml_files(tmp_path / "yaml", 3)
+    args = ["batch-convert", *map(str, files), "-d", str(tmp_path / "out"), "--no-validate"]
+    assert CliRunner().invoke(main, args).exit_code == 0
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0, result.output
+    assert "Success: 0" in result.output and "Skipped (unchanged): 3" in result.output
+    result = CliRunner().invoke(main, args + ["--force"])
+    assert "Success: 3" in result.output and "Regenerated: 3" in result.output
@@ -0,0 +1,33 @@
+import json
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.cli import main
+from test_output_parser_sections import SAMPLES
+
+
+def test_watch_once_prints_events(tmp_path):
+    log = tmp_path / "job.log"
+    log.write_text(SAMPLES["opt_freq"], encoding="utf-8")
+
+    result = CliRunner().invoke(main, ["watch", str(log), "--once", "--json"])
+
+    assert result.exit_code == 0, result.output
+    kinds = [json.loads(line)["kind"] for line in result.stdout.splitlines() if line.startswith("{")]
+    assert kinds.count("optimization_step") == 2
+    assert kinds[-1] == "terminated"
+
+
+def test_watch_exits_nonzero_on_errors(tmp_path):
+    log = tmp_path / "job.log"
+    log.write_text(" ERROR: basis set not found\n", encoding="utf-8")
+
+    result = CliRunner().invoke(main, ["watch", str(log), "--interval", "0"])
+
+    assert result.exit_code == 1
+    assert "Error: ERROR: basis set not found" in result.output
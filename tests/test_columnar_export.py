@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.extraction import columnar
+from bdfeasyinput.extraction import extract_batch
+from bdfeasyinput.extraction.columnar import open_columnar_writer, read_columnar, write_columnar
+from test_output_parser_sections import SAMPLES
+
+
+FORMATS = [
+    ("npz", None),
+    ("parquet", "pyarrow"),
+    ("hdf5", "h5py"),
+]
+SUFFIX = {"npz": ".npz", "parquet": ".parquet", "hdf5": ".h5"}
+
+
+def _records(tmp_path: Path):
+    files = []
+    for name in ("single_point", "opt_freq", "tddft_spin_flip"):
+        path = tmp_path / f"{name}.log"
+        path.write_text(SAMPLES[name], encoding="utf-8")
+        files.append(path)
+    return list(extract_batch(files + [tmp_path / "missing.log"]))
+
+
+@pytest.mark.parametrize("fmt, module", FORMATS)
+def test_round_trip(tmp_path, fmt, module):
+    if module:
+        pytest.importorskip(module)
+    records = _records(tmp_path)
+    count, path = write_columnar(records, tmp_path / f"metrics{SUFFIX[fmt]}", batch_size=2)
+    assert count == 4
+
+    columns = read_columnar(path)
+    assert columns["file"].tolist() == [r["file"] for r in records]
+    assert columns["status"].tolist() == ["success", "success", "success", "failed"]
+    assert columns["task_type"].tolist() == [r.get("task_type", "") for r in records]
+
+    opt = records[1]
+    assert columns["frequency.frequencies"][1].tolist() == opt["frequency"]["frequencies"]
+    assert columns["frequency.imaginary_count"][1] == opt["frequency"]["imaginary_count"]
+    assert columns["geometry.final_energy"][1] == opt["geometry"]["final_energy"]
+    assert columns["geometry.scf_converged"][1] == int(opt["geometry"]["scf_converged"])
+    assert columns["geometry.elements"][1].tolist() == [a["element"] for a in opt["geometry"]["final_geometry"]]
+    assert columns["geometry.coords"][1].shape == (3, 3)
+
+    td = records[2]
+    assert columns["excited.energies"][2].tolist() == td["excited"]["energies"]
+    # 缺失值
+    assert np.isnan(columns["geometry.max_force"][3])
+    assert columns["geometry.n_iterations"][3] == -1
+    assert columns["excited.energies"][0].size == 0
+
+
+def test_geometry_coords_are_stored_in_angstrom(tmp_path):
+    record = {
+        "file": "x.log",
+        "geometry": {"final_geometry": [{"element": "H", "x": 0.0, "y": 0.0, "z": 1.0, "units": "bohr"}]},
+    }
+    _, path = write_columnar([record], tmp_path / "geom.npz")
+    assert read_columnar(path)["geometry.coords"][0].tolist() == [[0.0, 0.0, 0.529177]]
+
+
+def test_missing_dependency_falls_back_to_npz(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "PYARROW_AVAILABLE", False)
+    with pytest.warns(UserWarning):
+        writer = open_columnar_writer(tmp_path / "metrics.parquet")
+    assert writer.path == tmp_path / "metrics.npz"
+    writer.close()
+    with pytest.raises(ImportError):
+        open_columnar_writer(tmp_path / "metrics.parquet", fallback=False)
+    with pytest.raises(ValueError):
+        open_columnar_writer(tmp_path / "metrics.txt")
+
+
+def test_hdf5_append_across_writers(tmp_path):
+    pytest.importorskip("h5py")
+    records = _records(tmp_path)
+    path = tmp_path / "metrics.h5"
+    write_columnar(records[:2], path)
+    with columnar.HDF5ColumnarWriter(path, append=True) as writer:
+        writer.extend(records[2:])
+    columns = read_columnar(path)
+    assert columns["file"].tolist() == [r["file"] for r in records]
+    assert columns["excited.energies"][2].tolist() == records[2]["excited"]["energies"]
+
+
+def test_cli_extract_batch_npz(tmp_path):
+    _records(tmp_path)
+    out = tmp_path / "metrics.npz"
+    result = CliRunner(env={"BDFEASYINPUT_CACHE_DIR": str(tmp_path / "cache")}).invoke(
+        main, ["extract-batch", str(tmp_path), "-o", str(out)]
+    )
+    assert result.exit_code == 0, result.output
+    assert len(read_columnar(out)["file"]) == 3
+
+    result = CliRunner().invoke(main, ["extract-batch", str(tmp_path), "--format", "npz"])
+    assert result.exit_code == 1
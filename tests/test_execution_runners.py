@@ -1,5 +1,8 @@
+import hashlib
+import io
 import os
 import sys
+import tarfile
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -104,3 +107,113 @@ def test_bdfautotest_runner_command_and_copy(monkeypatch, tmp_path):
     assert Path(result["output_file"]) == log_path
     assert Path(result.get("error_file", err_path)) == err_path or not result.get("error_file")
 
+
+
+def test_ssh_remote_runner_polls_only_new_log_bytes(monkeypatch, tmp_path):
+    from bdfeasyinput.execution.remote_ssh import SSHRemoteRunner, POLL_NO_ERR_FILE_MARKER
+
+    input_file = tmp_path / "h2o.inp"
+    input_file.write_text("$COMPASS\n$END\n")
+
+    log = (
+        b" Final scf result\n   E_tot =   -76.35000000\n"
+        b" Congratulations! BDF normal termination\n"
+    )
+    chunks = [log[:20], log[20:]]
+    poll_offsets = []
+
+    def fake_run(cmd, check=None, text=None, capture_output=None, **kwargs):
+        class Proc:
+            returncode = 0
+            stdout = "" if text else b""
+            stderr = ""
+        remote = cmd[-1]
+        if "tail -c +" in remote:
+            offset = int(remote.split("tail -c +")[1].split()[0]) - 1
+            poll_offsets.append(offset)
+            Proc.stdout = POLL_NO_ERR_FILE_MARKER.encode() + b"\n" + chunks[len(poll_offsets) - 1]
+        return Proc()
+
+    monkeypatch.setattr("subprocess.run", fake_run)
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    monkeypatch.setenv("BDFEASYINPUT_STAGING_DIR", str(tmp_path / "staging"))
+
+    events = []
+    runner = SSHRemoteRunner(host="cluster", workdir="/scratch", poll_interval=1, download=False)
+    result = runner.run(str(input_file), on_event=events.append)
+
+    assert result["status"] == "success"
+    assert poll_offsets == [0, 20]
+    assert [e.kind for e in events] == ["scf_energy", "terminated"]
+    assert result["progress"]["scf_energy"] == -76.35
+
+
+def test_ssh_runner_multiplexes_connections(monkeypatch, tmp_path):
+    from bdfeasyinput.execution.remote_ssh import SSHRemoteRunner
+
+    input_file = tmp_path / "h2o.inp"
+    input_file.write_text("$COMPASS\nGeometry\n file=h2o.xyz\nEnd geometry\n$END\n")
+    (tmp_path / "h2o.xyz").write_text("3\n\nO 0 0 0\nH 0 0 1\nH 0 1 0\n")
+
+    commands, stdin = [], []
+    remote_digests = {}
+
+    def fake_run(cmd, **kwargs):
+        commands.append(cmd)
+        stdin.append(kwargs.get("input"))
+        class Proc:
+            returncode = 0
+            stdout = ""
+            stderr = ""
+        if cmd[-1].endswith("tar -xzf - -C /scratch"):
+            with tarfile.open(fileobj=io.BytesIO(kwargs["input"]), mode="r:gz") as tar:
+                for name in tar.getnames():
+                    remote_digests[name] = hashlib.sha256(tar.extractfile(name).read()).hexdigest()
+        elif "sha256sum" in cmd[-1]:
+            # 远程核对：返回已上传文件的哈希
+            Proc.stdout = "".join(
+                f"{remote_digests[rel]}  {rel}\n" for rel in kwargs["input"].split() if rel in remote_digests
+            )
+        return Proc()
+
+    monkeypatch.setattr("subprocess.run", fake_run)
+    monkeypatch.setenv("BDFEASYINPUT_STAGING_DIR", str(tmp_path / "staging"))
+
+    control_dir = tmp_path / "ctl"
+    runner = SSHRemoteRunner(host="cluster", port=2222, workdir="/scratch", poll_interval=0, control_dir=str(control_dir))
+    result = runner.run(str(input_file))
+    assert result["status"] == "submitted"
+    assert result["staged_files"] == ["h2o/h2o.inp", "h2o/h2o.xyz"]
+
+    # 一次 ssh 以 tar 流上传输入 + 几何文件，一次 ssh 启动
+    assert len(commands) == 2
+    for cmd in commands:
+        assert cmd[:3] == ["ssh", "-p", "2222"]
+        assert "ControlMaster=auto" in cmd
+        assert f"ControlPath={control_dir}/%C" in cmd
+        assert "ControlPersist=600" in cmd
+    assert commands[0][-1] == "mkdir -p /scratch && tar -xzf - -C /scratch"
+    with tarfile.open(fileobj=io.BytesIO(stdin[0]), mode="r:gz") as tar:
+        assert tar.getnames() == ["h2o/h2o.inp", "h2o/h2o.xyz"]
+        assert tar.extractfile("h2o/h2o.xyz").read() == (tmp_path / "h2o.xyz").read_bytes()
+    assert control_dir.is_dir()
+
+    # 内容未变：远程核对后不再上传；修改输入后只上传输入文件
+    commands.clear()
+    assert runner.run(str(input_file))["staged_files"] == []
+    assert len(commands) == 2 and "sha256sum" in commands[0][-1] and "nohup" in commands[1][-1]
+    assert stdin[-2] == "h2o/h2o.inp\nh2o/h2o.xyz\n"
+    input_file.write_text(input_file.read_text() + "\n")
+    assert runner.run(str(input_file))["staged_files"] == ["h2o/h2o.inp"]
+    # 远程文件被删除后重新上传
+    remote_digests.clear()
+    assert runner.run(str(input_file))["staged_files"] == ["h2o/h2o.inp", "h2o/h2o.xyz"]
+    assert runner.stage([str(input_file)], force=True)["sent"] == ["h2o/h2o.inp", "h2o/h2o.xyz"]
+
+    runner.close()
+    assert commands[-1][-3:] == ["-O", "exit", "cluster"]
+
+    commands.clear()
+    runner = SSHRemoteRunner(host="cluster", workdir="/scratch", poll_interval=0, multiplex=False)
+    runner.run(str(input_file))
+    assert not any("ControlMaster=auto" in cmd for cmd in commands)
@@ -0,0 +1,100 @@
+import csv
+import json
+import os
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.extraction import BDFResultExtractor, extract_batch, find_output_files
+from bdfeasyinput.extraction import batch as batch_module
+from bdfeasyinput.extraction.batch import flatten_record
+from test_output_parser_sections import SAMPLES
+
+
+def _make_tree(root: Path):
+    (root / "a").mkdir(parents=True)
+    (root / "b" / "c").mkdir(parents=True)
+    (root / "a" / "sp.log").write_text(SAMPLES["single_point"], encoding="utf-8")
+    (root / "b" / "opt.log").write_text(SAMPLES["opt_freq"], encoding="utf-8")
+    (root / "b" / "c" / "td.log").write_text(SAMPLES["tddft_spin_flip"], encoding="utf-8")
+    (root / "b" / "c" / "td.out.tmp").write_text("", encoding="utf-8")
+    return sorted([root / "a" / "sp.log", root / "b" / "opt.log", root / "b" / "c" / "td.log"])
+
+
+def test_find_output_files_dirs_and_globs(tmp_path):
+    expected = _make_tree(tmp_path)
+    assert find_output_files([str(tmp_path)]) == expected
+    assert find_output_files([str(tmp_path / "b" / "**" / "*.log")]) == expected[1:]
+    assert find_output_files([str(expected[0]), str(tmp_path / "a")]) == expected[:1]
+
+
+def test_parallel_batch_matches_single_extraction_and_captures_errors(tmp_path):
+    files = _make_tree(tmp_path)
+    missing = tmp_path / "missing.log"
+    inputs = files + [missing]
+
+    records = list(extract_batch(inputs, jobs=2, chunksize=1))
+
+    assert [r["file"] for r in records] == [str(p) for p in inputs]
+    extractor = BDFResultExtractor()
+    for path, record in zip(files, records):
+        assert record["status"] == "success"
+        expected = extractor.extract_metrics(str(path)).to_dict()
+        assert {k: v for k, v in record.items() if k not in ("file", "status", "error")} == expected
+    assert records[-1]["status"] == "failed"
+    assert records[-1]["error"].startswith("FileNotFoundError")
+    assert list(extract_batch(inputs, jobs=1)) == records
+
+
+def test_worker_crash_fails_only_the_crashing_file(tmp_path, monkeypatch):
+    files = _make_tree(tmp_path)
+    crash = tmp_path / "crash.log"
+    crash.write_text(SAMPLES["single_point"], encoding="utf-8")
+    inputs = files[:2] + [crash] + files[2:]
+    extract_one = batch_module._extract_one
+
+    def dying_extract_one(extractor, path, task_type):
+        if path.name == "crash.log":
+            os._exit(1)  # 模拟被 OOM killer 杀死的工作进程
+        return extract_one(extractor, path, task_type)
+
+    # 工作进程由 fork 创建，继承替换后的函数
+    monkeypatch.setattr(batch_module, "_extract_one", dying_extract_one)
+    records = list(extract_batch(inputs, jobs=2, chunksize=2))
+
+    assert [r["file"] for r in records] == [str(p) for p in inputs]
+    assert [r["status"] for r in records] == ["success", "success", "failed", "success"]
+    assert records[2]["error"].startswith("BrokenProcessPool")
+    monkeypatch.setattr(batch_module, "_extract_one", extract_one)
+    expected = list(extract_batch(files, jobs=1))
+    assert [r for r in records if r["status"] == "success"] == expected
+
+
+def test_flatten_record_for_csv():
+    flat = flatten_record({"file": "x", "geometry": {"max_force": 0.1, "final_geometry": [{"element": "H"}]}})
+    assert flat == {"file": "x", "geometry.max_force": 0.1, "geometry.final_geometry": '[{"element": "H"}]'}
+
+
+def test_extract_batch_cli_jsonl_and_csv(tmp_path):
+    files = _make_tree(tmp_path / "runs")
+    runner = CliRunner(env={"BDFEASYINPUT_CACHE_DIR": str(tmp_path / "cache")})
+
+    out_jsonl = tmp_path / "metrics.jsonl"
+    result = runner.invoke(main, ["extract-batch", str(tmp_path / "runs"), "-j", "2", "-o", str(out_jsonl)])
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in out_jsonl.read_text(encoding="utf-8").splitlines()]
+    assert [r["file"] for r in records] == [str(p) for p in files]
+    assert {r["task_type"] for r in records} == {"single_point", "optimize_frequency", "excited"}
+
+    out_csv = tmp_path / "metrics.csv"
+    result = runner.invoke(main, ["extract-batch", str(tmp_path / "runs"), "-o", str(out_csv)])
+    assert result.exit_code == 0, result.output
+    with open(out_csv, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+    assert "geometry.final_energy" in rows[0]
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.analysis.parser import BDFOutputParser, Geometry, Trajectory
+from bdfeasyinput.extraction.metrics import GeometryMetrics
+from test_output_parser_sections import SAMPLES
+
+
+WATER_BOHR = [
+    {"element": "O", "x": 0.0, "y": 0.0, "z": 0.22143, "units": "bohr", "index": 1, "charge": 8.0},
+    {"element": "H", "x": 0.0, "y": 1.43042, "z": -0.88572, "units": "bohr", "index": 2, "charge": 1.0},
+    {"element": "H", "x": 0.0, "y": -1.43042, "z": -0.88572, "units": "bohr", "index": 3, "charge": None},
+]
+
+
+def test_round_trip_matches_parser_dicts():
+    parser = BDFOutputParser()
+    for name in ("single_point", "opt_freq"):
+        atoms = parser.extract_geometry(SAMPLES[name])
+        assert atoms
+        geometry = Geometry.from_dicts(atoms)
+        assert geometry.coords.shape == (len(atoms), 3)
+        assert geometry.coords.dtype == np.float64
+        assert geometry.to_dicts() == atoms
+    assert Geometry.from_dicts(WATER_BOHR).to_dicts() == WATER_BOHR
+
+
+@pytest.mark.parametrize("units", ["angstrom", "bohr"])
+def test_format_matches_dict_formatter(units):
+    parser = BDFOutputParser()
+    geometry = Geometry.from_dicts(WATER_BOHR)
+    expected = parser.format_geometry_for_input(WATER_BOHR, units=units)
+    assert geometry.format(units) == expected
+    assert parser.format_geometry_for_input(geometry, units=units) == expected
+
+
+def test_unit_conversion_is_vectorized_and_reversible():
+    geometry = Geometry.from_dicts(WATER_BOHR)
+    angstrom = geometry.to_units("angstrom")
+    assert angstrom.units == "angstrom"
+    np.testing.assert_allclose(angstrom.coords, geometry.coords * 0.529177)
+    np.testing.assert_allclose(angstrom.to_units("bohr").coords, geometry.coords, rtol=1e-6)
+    assert geometry.to_units("bohr") is geometry
+    with pytest.raises(ValueError):
+        geometry.to_units("pm")
+
+
+def test_trajectory_from_mixed_unit_frames():
+    first = Geometry.from_dicts(WATER_BOHR)
+    second = first.to_units("angstrom")
+    trajectory = Trajectory.from_geometries([WATER_BOHR, second], energies=[-76.3, None])
+    assert trajectory.coords.shape == (2, 3, 3)
+    assert trajectory.units == "bohr"
+    np.testing.assert_allclose(trajectory.coords[1], first.coords, rtol=1e-6)
+    assert np.isnan(trajectory.energies[1])
+    assert trajectory.final.format("bohr") == trajectory.format(units="bohr")
+    assert len(trajectory.to_dicts()) == 2
+
+    other = Geometry(["O", "H"], [[0, 0, 0], [0, 0, 1]])
+    with pytest.raises(ValueError):
+        Trajectory.from_geometries([first, other])
+
+
+def test_geometry_metrics_accepts_geometry_objects():
+    geometry = Geometry.from_dicts(WATER_BOHR)
+    metrics = GeometryMetrics(final_geometry=geometry)
+    assert metrics.to_dict()["final_geometry"] == WATER_BOHR
+    assert GeometryMetrics(final_geometry=WATER_BOHR).geometry() == geometry
@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.analysis.parser.incremental import IncrementalOutputParser
+from bdfeasyinput.analysis.parser.output_parser import BDFOutputParser
+from test_output_parser_sections import SAMPLES, SCF_BLOCK
+
+
+def _kinds(events):
+    return [event.kind for event in events]
+
+
+def _feed_in_chunks(content: str, size: int):
+    tail = IncrementalOutputParser()
+    data = content.encode("utf-8")
+    events = []
+    for i in range(0, len(data), size):
+        events.extend(tail.feed(data[i:i + size]))
+    events.extend(tail.flush())
+    return tail, events
+
+
+def test_chunked_feed_matches_single_feed():
+    content = SAMPLES["opt_freq"] + SAMPLES["tddft_spin_flip"]
+    whole, whole_events = _feed_in_chunks(content, len(content.encode("utf-8")))
+    for size in (1, 7, 64, 4096):
+        tail, events = _feed_in_chunks(content, size)
+        assert [e.to_dict() for e in events] == [e.to_dict() for e in whole_events]
+        assert tail.offset == len(content.encode("utf-8"))
+    assert whole.finished
+
+
+def test_optimization_steps_match_full_parse(tmp_path):
+    content = SAMPLES["opt_freq"]
+    out = tmp_path / "opt.log"
+    out.write_text(content, encoding="utf-8")
+    expected = BDFOutputParser().parse(str(out))["optimization"]["steps"]
+
+    tail, events = _feed_in_chunks(content, 13)
+    step_events = [e.data for e in events if e.kind == "optimization_step"]
+    keys = ("step", "energy", "gradient", "force_rms", "force_max", "step_rms", "step_max")
+    assert [{k: s[k] for k in keys} for s in step_events] == [{k: s[k] for k in keys} for s in expected]
+    assert [len(s["gradient"]) for s in step_events] == [3, 3]
+    assert tail.optimization_converged
+    assert "optimization_converged" in _kinds(events)
+
+
+def test_scf_iterations_and_final_energy():
+    tail, events = _feed_in_chunks(SCF_BLOCK, 5)
+    iterations = [e.data for e in events if e.kind == "scf_iteration"]
+    assert [it["iteration"] for it in iterations] == [1, 2]
+    assert iterations[1]["energy"] == -76.3456789012
+    assert tail.scf_energy == -76.35
+    assert _kinds(events).count("scf_energy") == 1
+
+
+def test_excited_state_tables_are_emitted_per_block(tmp_path):
+    content = SAMPLES["tddft_spin_flip"]
+    out = tmp_path / "td.log"
+    out.write_text(content, encoding="utf-8")
+    parsed = BDFOutputParser().parse(str(out))
+
+    tail, events = _feed_in_chunks(content, 32)
+    tables = [e.data["states"] for e in events if e.kind == "excited_states"]
+    assert len(tables) == len(parsed["tddft"])
+    assert [s["energy_ev"] for s in tables[0]] == [s["energy_ev"] for s in parsed["tddft"][0]["states"]]
+    assert tail.excited_states == tables[-1]
+
+
+def test_update_reads_only_appended_bytes(tmp_path):
+    log = tmp_path / "job.log"
+    tail = IncrementalOutputParser(str(log))
+    assert tail.update() == []
+
+    parts = [SCF_BLOCK[:200], SCF_BLOCK[200:], SAMPLES["opt_freq"]]
+    written = ""
+    seen = []
+    for part in parts:
+        written += part
+        log.write_text(written, encoding="utf-8")
+        seen.extend(tail.update())
+        assert tail.offset == len(written.encode("utf-8"))
+    assert tail.update() == []
+    assert tail.finished
+    assert _kinds(seen).count("terminated") == 1
+
+    # 日志被重写（变短）时从头开始
+    log.write_text(SCF_BLOCK, encoding="utf-8")
+    events = tail.update()
+    assert not tail.finished
+    assert "scf_iteration" in _kinds(events)
+
+
+def test_errors_are_reported():
+    tail = IncrementalOutputParser()
+    events = tail.feed(" Iter 3\n FATAL: SCF not converged\n")
+    assert _kinds(events) == ["error"]
+    assert tail.errors == ["FATAL: SCF not converged"]
+    assert events[0].describe() == "Error: FATAL: SCF not converged"
@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bdfeasyinput.analysis.parser import Geometry
+from bdfeasyinput.converter import BDFConverter
+from bdfeasyinput.template import InputTemplate, compile_template
+
+
+CONFIG = {
+    "task": {"type": "tddft"},
+    "molecule": {
+        "charge": 0,
+        "multiplicity": 1,
+        "coordinates": ["O 0.0 0.0 0.1173", "H 0.0 0.7572 -0.4692", "H 0.0 -0.7572 -0.4692"],
+        "units": "angstrom",
+    },
+    "method": {"type": "dft", "functional": "b3lyp", "basis": "cc-pvdz"},
+    "settings": {"tddft": {"n_states": 5}},
+}
+
+
+class CountingConverter(BDFConverter):
+    def __init__(self):
+        super().__init__(validate_input=False)
+        self.conversions = 0
+
+    def convert(self, config):
+        self.conversions += 1
+        return super().convert(config)
+
+
+def _conformers(n):
+    rng = np.random.default_rng(0)
+    base = np.array([[0.0, 0.0, 0.1173], [0.0, 0.7572, -0.4692], [0.0, -0.7572, -0.4692]])
+    return [base + rng.normal(scale=0.05, size=base.shape) for _ in range(n)]
+
+
+def _reference(coords, **molecule):
+    config = yaml.safe_load(yaml.safe_dump(CONFIG))
+    config["molecule"].update(molecule)
+    config["molecule"]["coordinates"] = [f"{e} {x!r} {y!r} {z!r}" for e, (x, y, z) in zip("OHH", coords.tolist())]
+    return BDFConverter(validate_input=False).convert(config)
+
+
+def test_rendered_inputs_match_full_conversion_with_one_conversion_per_variant():
+    converter = CountingConverter()
+    template = converter.compile_template(CONFIG)
+    conformers = _conformers(20)
+
+    for coords in conformers:
+        assert template.render(coords, elements=["O", "H", "H"]) == _reference(coords)
+    assert converter.conversions == 1
+
+    # 其他坐标格式得到相同的结果
+    coords = conformers[3]
+    as_strings = [f"{e} {x!r} {y!r} {z!r}" for e, (x, y, z) in zip("OHH", coords.tolist())]
+    as_tuples = [(e, *row) for e, row in zip("OHH", coords.tolist())]
+    expected = _reference(coords)
+    assert template.render(as_strings) == expected
+    assert template.render(as_tuples) == expected
+    assert template.render(Geometry(["O", "H", "H"], coords / 0.529177, units="bohr")) == expected
+    assert template.render() == BDFConverter(validate_input=False).convert(CONFIG)
+    assert converter.conversions == 1
+
+    # 电荷/多重度变化会改变 SCF 方法等多处内容：每个组合单独编译一次
+    cation = template.render(coords, elements="OHH", charge=1, multiplicity=2)
+    assert cation == _reference(coords, charge=1, multiplicity=2)
+    assert "UKS" in cation and "RKS" not in cation
+    template.render(conformers[4], elements="OHH", charge=1, multiplicity=2)
+    assert converter.conversions == 2
+    assert template.variants == 2
+
+
+def test_write_many_and_compile_from_file(tmp_path):
+    path = tmp_path / "h2o.yaml"
+    path.write_text(yaml.safe_dump(CONFIG))
+    template = compile_template(path, validate_input=False)
+    assert isinstance(template, InputTemplate)
+    conformers = _conformers(5)
+    written = template.write_many([[(e, *row) for e, row in zip("OHH", c.tolist())] for c in conformers], tmp_path / "out")
+    assert [p.name for p in written] == [f"conf_{i:05d}.inp" for i in range(5)]
+    assert written[2].read_text() == _reference(conformers[2])
+
+
+def test_template_errors():
+    template = InputTemplate({**CONFIG, "molecule": {"charge": 0, "multiplicity": 1}}, converter=BDFConverter(validate_input=False))
+    with pytest.raises(ValueError, match="No coordinates"):
+        template.render()
+    with pytest.raises(ValueError, match="ELEMENT X Y Z"):
+        template.render(["O 0.0 0.0"])
+    with pytest.raises(ValueError, match="coordinate rows"):
+        template.render([[0.0, 0.0, 0.0]], elements=["O", "H"])
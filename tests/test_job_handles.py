@@ -0,0 +1,532 @@
+import asyncio
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bdfeasyinput.execution import BDFDirectRunner, as_completed
+from bdfeasyinput.execution.bdfautotest import BDFAutotestRunner
+from bdfeasyinput.execution.remote_slurm import SSHSlurmRunner
+from bdfeasyinput.execution.remote_ssh import SSHRemoteRunner
+
+
+def _script(path: Path, content: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+FAKE_BDF = """#!/bin/sh
+echo "start $2"
+case "$2" in
+  slow*) sleep 30 ;;
+  fail*) exit 2 ;;
+  *) sleep 0.2 ;;
+esac
+echo "done $2"
+"""
+
+# 假的 ssh：忽略选项和主机名，在本地执行远程命令
+FAKE_SSH = """#!/bin/sh
+while [ $# -gt 1 ]; do
+  case "$1" in
+    -p|-o|-S) shift 2 ;;
+    -*) shift ;;
+    *) host="$1"; shift; break ;;
+  esac
+done
+exec sh -c "$*"
+"""
+
+FAKE_RUNX = """#!/bin/sh
+sleep 0.3
+echo " Final scf result"
+echo "   E_tot =   -76.35000000"
+echo " Congratulations! BDF normal termination"
+"""
+
+
+def _inputs(directory: Path, *names: str):
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        path = directory / f"{name}.inp"
+        path.write_text("$COMPASS\n$END\n")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def direct_runner(tmp_path):
+    bdf_home = tmp_path / "bdfhome"
+    _script(bdf_home / "sbin" / "bdf.drv", FAKE_BDF)
+    return BDFDirectRunner(bdf_home=str(bdf_home), bdf_tmpdir=str(tmp_path / "tmp" / "$RANDOM"), omp_num_threads=1)
+
+
+def test_direct_submit_many_in_one_loop(direct_runner, tmp_path):
+    handles = [direct_runner.submit(p, poll_interval=0.05) for p in _inputs(tmp_path / "work", "a", "b", "c", "fail")]
+    assert all(h.status == "running" for h in handles)
+
+    finished = list(as_completed(handles, timeout=20))
+    assert {h.name for h in finished} == {"a", "b", "c", "fail"}
+    results = {h.name: h.result() for h in handles}
+    assert results["a"]["status"] == "success"
+    assert "done a" in results["a"]["stdout"]
+    assert results["fail"]["status"] == "failed"
+    assert results["fail"]["exit_code"] == 2
+    # 与 run() 的结果格式一致
+    assert set(results["a"]) == set(direct_runner.run(_inputs(tmp_path / "work", "d")[0]))
+
+
+def test_direct_wait_timeout_cancel_and_job_timeout(direct_runner, tmp_path):
+    slow, slow2 = _inputs(tmp_path / "work", "slow", "slow2")
+    handle = direct_runner.submit(slow, poll_interval=0.05)
+    with pytest.raises(TimeoutError):
+        handle.wait(timeout=0.2)
+    callbacks = []
+    handle.add_done_callback(callbacks.append)
+    assert handle.cancel()
+    assert handle.status == "cancelled"
+    assert handle.result()["status"] == "cancelled"
+    assert handle.process.poll() is not None
+    assert callbacks == [handle]
+    assert not handle.cancel()
+
+    timed = direct_runner.submit(slow2, timeout=1, poll_interval=0.05)
+    assert timed.result(timeout=20)["status"] == "timeout"
+
+
+def test_handles_are_awaitable(direct_runner, tmp_path):
+    paths = _inputs(tmp_path / "work", "x", "y", "z")
+
+    async def main():
+        handles = [direct_runner.submit(p, poll_interval=0.05) for p in paths]
+        return await asyncio.gather(*handles)
+
+    start = time.time()
+    results = asyncio.run(main())
+    assert [r["status"] for r in results] == ["success"] * 3
+    # 并发运行：总时间远小于串行时间
+    assert time.time() - start < 3 * 0.2 + 2
+
+
+def test_bdfautotest_submit(tmp_path):
+    root = tmp_path / "BDFAutoTest"
+    (root / "config").mkdir(parents=True)
+    (root / "config" / "config.yaml").write_text("dummy: true\n")
+    (root / "src").mkdir()
+    (root / "src" / "__init__.py").write_text("")
+    (root / "src" / "orchestrator.py").write_text(
+        "import sys\nfrom pathlib import Path\n"
+        "inp = Path(sys.argv[2])\n"
+        "inp.with_suffix('.log').write_text('log')\n"
+        "print('ran', inp.name)\n"
+    )
+    input_file = _inputs(tmp_path / "inputs", "sample")[0]
+    handle = BDFAutotestRunner(bdfautotest_path=str(root)).submit(input_file, poll_interval=0.05)
+    result = handle.result(timeout=20)
+    assert result["status"] == "success", result
+    assert "ran sample.inp" in result["stdout"]
+    assert result["output_file"].endswith("sample.log")
+
+
+@pytest.fixture
+def fake_remote(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    _script(bin_dir / "ssh", FAKE_SSH)
+    monkeypatch.setenv("PATH", f"{bin_dir}:{Path('/usr/bin')}:{Path('/bin')}")
+    monkeypatch.setenv("BDFEASYINPUT_SSH_CONTROL_DIR", str(tmp_path / "ctl"))
+    monkeypatch.setenv("BDFEASYINPUT_STAGING_DIR", str(tmp_path / "staging"))
+    return bin_dir
+
+
+def test_ssh_submit_polls_in_background(fake_remote, tmp_path):
+    runx = _script(tmp_path / "remote_bin" / "run.x", FAKE_RUNX)
+    remote = tmp_path / "remote"
+    runner = SSHRemoteRunner(host="cluster", workdir=str(remote), bdf_command=str(runx), poll_interval=1)
+    handle = runner.submit(_inputs(tmp_path / "local", "h2o")[0])
+    handle.poll_interval = 0.05
+    assert handle.poll() == "running"
+    events = []
+    handle._on_event = events.append
+    result = handle.result(timeout=20)
+    assert result["status"] == "success"
+    assert result["progress"]["scf_energy"] == -76.35
+    assert (tmp_path / "local" / "h2o.log").exists()
+    assert (remote / "h2o" / "h2o.pid").exists()
+    assert "terminated" in [e.kind for e in events]
+
+
+def test_ssh_cancel_kills_remote_process(fake_remote, tmp_path):
+    slow = _script(tmp_path / "remote_bin" / "slow.x", "#!/bin/sh\nsleep 30\n")
+    runner = SSHRemoteRunner(host="cluster", workdir=str(tmp_path / "remote"), bdf_command=str(slow), poll_interval=1)
+    handle = runner.submit(_inputs(tmp_path / "local", "slow")[0])
+    pid = int((tmp_path / "remote" / "slow" / "slow.pid").read_text())
+    assert handle.cancel()
+    assert handle.status == "cancelled"
+    deadline = time.time() + 5
+    while Path(f"/proc/{pid}").exists() and time.time() < deadline:
+        time.sleep(0.05)
+    assert not Path(f"/proc/{pid}").exists() or "Z" in Path(f"/proc/{pid}/stat").read_text().split()[2]
+
+
+def test_slurm_submit_tracks_squeue_and_sacct(fake_remote, tmp_path):
+    state = tmp_path / "slurm_state"
+    state.write_text("PENDING")
+    _script(fake_remote / "sbatch", "#!/bin/sh\necho 'Submitted batch job 4242'\n")
+    _script(fake_remote / "squeue", f"#!/bin/sh\ns=$(cat {state}); case $s in PENDING|RUNNING) echo \"4242|$s\" ;; esac\n")
+    _script(fake_remote / "sacct", f"#!/bin/sh\necho 4242\\|$(cat {state})\n")
+    _script(fake_remote / "scancel", f"#!/bin/sh\necho CANCELLED > {state}\n")
+    template = tmp_path / "job.sh"
+    template.write_text("#!/bin/bash\n#SBATCH -J {{JOB_NAME}}\n{{BDF_COMMAND}} {{INPUT_FILE}}\n")
+
+    runner = SSHSlurmRunner(host="cluster", workdir=str(tmp_path / "remote"), job_script_template=str(template))
+    handle = runner.submit(_inputs(tmp_path / "local", "job")[0], poll_interval=0.05)
+    assert handle.job_id == "4242"
+    assert handle.status == "pending"
+
+    handle.poll()
+    time.sleep(0.2)
+    assert handle.poll() == "pending"
+    state.write_text("RUNNING")
+    with pytest.raises(TimeoutError):
+        handle.wait(timeout=0.3)
+    assert handle.status == "running"
+    state.write_text("COMPLETED")
+    result = handle.result(timeout=20)
+    assert result["status"] == "success"
+    assert result["slurm_state"] == "COMPLETED"
+
+    state.write_text("RUNNING")
+    handle = runner.submit(_inputs(tmp_path / "local", "job2")[0], poll_interval=0.05)
+    assert handle.cancel()
+    assert state.read_text().strip() == "CANCELLED"
+    assert handle.result()["slurm_state"] == "CANCELLED"
+
+
+def test_poller_checks_all_jobs_on_a_host_with_one_ssh_call(fake_remote, tmp_path):
+    from bdfeasyinput.execution import StatusPoller
+
+    calls = tmp_path / "ssh_calls"
+    _script(fake_remote / "ssh", FAKE_SSH.replace("exec sh", f'echo "$*" >> {calls}\nexec sh'))
+    runx = _script(tmp_path / "remote_bin" / "run.x", FAKE_RUNX)
+    runner = SSHRemoteRunner(host="cluster", workdir=str(tmp_path / "remote"), bdf_command=str(runx), poll_interval=1)
+    completed, callbacks = [], []
+    poller = StatusPoller(min_interval=0.05, max_interval=0.2, on_complete=completed.append)
+    handles = [
+        poller.submit(runner, path, callback=callbacks.append)
+        for path in _inputs(tmp_path / "local", "a", "b", "c")
+    ]
+    launches = len(calls.read_text().splitlines())
+
+    finished = list(poller.as_completed(timeout=20))
+    assert {h.name for h in finished} == {"a", "b", "c"}
+    assert all(h.result()["status"] == "success" for h in handles)
+    assert all(h.result()["progress"]["scf_energy"] == -76.35 for h in handles)
+    assert sorted(completed, key=id) == sorted(callbacks, key=id) == sorted(handles, key=id)
+    # 每轮一次 ssh 查询所有作业，而不是每个作业一次
+    polls = [c for c in calls.read_text().splitlines()[launches:] if "__BDF_JOB__" in c]
+    assert len(polls) == poller.remote_calls
+    assert sum(len(re.findall(r"; q \d+ ", p)) for p in polls) > len(polls)
+
+
+def test_batch_poll_command_stays_small_and_is_split(fake_remote, tmp_path):
+    from bdfeasyinput.execution import StatusPoller
+
+    # 300 个作业、较长的工作目录：单个远程命令参数必须远小于 MAX_ARG_STRLEN (128 KiB)
+    workdir = "/scratch/" + "project_directory/" * 4 + "conformer_search"
+    jobs = [(f"{workdir}/conf_{i:05d}", f"conf_{i:05d}", 10 ** 9 + i) for i in range(300)]
+    for compress in (False, True):
+        runner = SSHRemoteRunner(host="cluster", workdir=workdir, compress=compress)
+        cmd = runner._build_batch_poll_cmd(jobs)
+        assert len(cmd.encode()) < 16 * 1024
+        assert cmd.count(workdir) == 1
+
+    # 命令在远程 shell 中执行：缺失目录的作业 n=0，存在的作业返回新增日志
+    remote = tmp_path / "remote"
+    (remote / "b").mkdir(parents=True)
+    (remote / "b" / "b.log").write_bytes(b"0123456789")
+    (remote / "b" / "b.err").write_text("")
+    runner = SSHRemoteRunner(host="cluster", workdir=str(remote))
+    cmd = runner._build_batch_poll_cmd([(f"{remote}/a", "a", 0), (f"{remote}/b", "b", 4)])
+    stdout = subprocess.run(["sh", "-c", cmd], capture_output=True).stdout
+    assert SSHRemoteRunner._split_batch_poll_output(stdout, 2) == [(False, b"", 0), (True, b"456789", 6)]
+
+    # 到期作业超过 max_batch 时分为多个查询
+    calls = tmp_path / "ssh_calls"
+    _script(fake_remote / "ssh", FAKE_SSH.replace("exec sh", f'echo "$*" >> {calls}\nexec sh'))
+    runx = _script(tmp_path / "remote_bin" / "run.x", FAKE_RUNX)
+    runner = SSHRemoteRunner(host="cluster", workdir=str(remote), bdf_command=str(runx), poll_interval=1)
+    poller = StatusPoller(min_interval=0.05, max_interval=0.2, max_batch=2)
+    for path in _inputs(tmp_path / "local", "c1", "c2", "c3"):
+        poller.submit(runner, path)
+    launches = len(calls.read_text().splitlines())
+    assert len(poller.wait_all(timeout=20)) == 3
+    polls = [c for c in calls.read_text().splitlines()[launches:] if "__BDF_JOB__" in c]
+    assert polls and max(len(re.findall(r"; q \d+ ", p)) for p in polls) <= 2
+    assert any(len(re.findall(r"; q \d+ ", p)) == 1 for p in polls)
+
+
+def test_batch_poll_output_is_length_prefixed():
+    marker_in_log = b"__BDF_JOB__ 1 1 99\n"
+    stdout = b"__BDF_JOB__ 0 0 19\n" + marker_in_log + b"__BDF_JOB__ 1 1 3\nabc__BDF_JOB__ 2 0 10\nshort"
+    parsed = SSHRemoteRunner._split_batch_poll_output(stdout, 3)
+    assert parsed == [(False, marker_in_log, 19), (True, b"abc", 3), None]
+
+
+def test_poller_backs_off_idle_jobs_and_batches_slurm(fake_remote, tmp_path):
+    from bdfeasyinput.execution import StatusPoller
+
+    states = tmp_path / "states"
+    states.mkdir()
+    counter = tmp_path / "next_id"
+    counter.write_text("100")
+    _script(fake_remote / "sbatch", f"#!/bin/sh\ni=$(cat {counter}); echo $((i + 1)) > {counter}; echo RUNNING > {states}/$i; echo \"Submitted batch job $i\"\n")
+    _script(fake_remote / "squeue", f"#!/bin/sh\necho \"$@\" >> {tmp_path}/squeue_calls\nfor f in {states}/*; do s=$(cat $f); [ $s = RUNNING ] && echo \"${{f##*/}}|$s\"; done; true\n")
+    _script(fake_remote / "sacct", f"#!/bin/sh\nfor f in {states}/*; do echo \"${{f##*/}}|$(cat $f)\"; done\n")
+    template = tmp_path / "job.sh"
+    template.write_text("#!/bin/bash\n{{BDF_COMMAND}} {{INPUT_FILE}}\n")
+
+    runner = SSHSlurmRunner(host="cluster", workdir=str(tmp_path / "remote"), job_script_template=str(template))
+    poller = StatusPoller(min_interval=0.05, max_interval=0.4, backoff=2)
+    handles = [poller.submit(runner, p) for p in _inputs(tmp_path / "local", "j1", "j2")]
+    assert [h.job_id for h in handles] == ["100", "101"]
+
+    deadline = time.time() + 5
+    while time.time() < deadline and poller._watches and max(w.interval for w in poller._iter_watches()) < 0.4:
+        poller.poll()
+        time.sleep(0.02)
+    # 无进展时间隔按倍数增长直到上限
+    assert all(w.interval == 0.4 for w in poller._iter_watches())
+    assert all(h.status == "running" for h in handles)
+
+    (states / "100").write_text("COMPLETED")
+    (states / "101").write_text("FAILED")
+    results = poller.wait_all(timeout=20)
+    assert sorted(r["slurm_state"] for r in results) == ["COMPLETED", "FAILED"]
+    assert handles[0].status == "success" and handles[1].status == "failed"
+    # 两个作业总是在同一次 squeue 中查询
+    assert all("-j 100,101" in line for line in (tmp_path / "squeue_calls").read_text().splitlines())
+
+
+FAKE_RUNX_BIG = """#!/bin/sh
+i=0
+while [ $i -lt 400 ]; do
+  echo " SCF iteration $i  residual 0.000000000000 stable and repetitive line"
+  i=$((i + 1))
+done
+sleep 0.3
+echo " Final scf result"
+echo "   E_tot =   -76.35000000"
+echo " Congratulations! BDF normal termination"
+"""
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_compressed_log_deltas_mirror_remote_log(fake_remote, tmp_path, batched):
+    from bdfeasyinput.execution import StatusPoller
+
+    runx = _script(tmp_path / "remote_bin" / "run.x", FAKE_RUNX_BIG)
+    remote = tmp_path / "remote"
+    runner = SSHRemoteRunner(host="cluster", workdir=str(remote), bdf_command=str(runx), poll_interval=1, compress=True)
+    handle = runner.submit(_inputs(tmp_path / "local", "big")[0])
+    handle.poll_interval = 0.05
+    if batched:
+        StatusPoller(min_interval=0.05).add(handle)
+    result = handle.result(timeout=20)
+
+    assert result["status"] == "success"
+    remote_log = (remote / "big" / "big.log").read_bytes()
+    assert Path(result["output_file"]).read_bytes() == remote_log
+    assert result["progress"]["offset"] == len(remote_log)
+    # 重复性很强的日志压缩后传输量远小于原始大小
+    assert result["log_bytes_transferred"] < len(remote_log) / 4
+
+
+def test_remote_log_tail_fetches_only_appended_bytes(fake_remote, tmp_path):
+    from bdfeasyinput.execution.remote_log import RemoteLogTail
+    from bdfeasyinput.execution.ssh import SSHConnection
+
+    remote_log = tmp_path / "remote" / "job.log"
+    remote_log.parent.mkdir()
+    remote_log.write_bytes(b" Final scf result\n")
+    calls = tmp_path / "ssh_calls"
+    _script(fake_remote / "ssh", FAKE_SSH.replace("exec sh", f'echo "$*" >> {calls}\nexec sh'))
+
+    tail = RemoteLogTail(SSHConnection("cluster"), str(remote_log), local_path=tmp_path / "job.log")
+    tail.fetch()
+    assert tail.offset == remote_log.stat().st_size
+    with open(remote_log, "ab") as f:
+        f.write(b"   E_tot =   -76.35000000\n")
+    events = tail.fetch()
+    assert [e.kind for e in events] == ["scf_energy"]
+    assert tail.download().read_bytes() == remote_log.read_bytes()
+    assert [c.split("tail -c +")[1].split()[0] for c in calls.read_text().splitlines()] == ["1", "19", "45"]
+
+
+def test_slurm_stage_many_jobs_in_one_transfer(fake_remote, tmp_path):
+    calls = tmp_path / "ssh_calls"
+    _script(fake_remote / "ssh", FAKE_SSH.replace("exec sh", f'printf "%s\\n" "$*" >> {calls}\nexec sh'))
+    _script(fake_remote / "sbatch", "#!/bin/sh\necho 'Submitted batch job 7'\n")
+    template = tmp_path / "job.sh"
+    template.write_text("#!/bin/bash\n{{BDF_COMMAND}} {{INPUT_FILE}}\n")
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "mol.xyz").write_text("1\n\nHe 0 0 0\n")
+    inputs = _inputs(local, "s1", "s2", "s3")
+    Path(inputs[0]).write_text("$COMPASS\nGeometry\n file=mol.xyz\nEnd geometry\n$END\n")
+    remote = tmp_path / "remote"
+
+    runner = SSHSlurmRunner(host="cluster", workdir=str(remote), job_script_template=str(template))
+    staged = runner.stage(inputs)
+    assert len(staged["sent"]) == 7 and staged["skipped"] == []
+    assert len(calls.read_text().splitlines()) == 1
+    assert (remote / "s1" / "mol.xyz").read_text() == "1\n\nHe 0 0 0\n"
+    assert (remote / "s3" / "s3.slurm.sh").exists()
+
+    # 已暂存的作业提交时不再上传：一次远程核对加一次 sbatch
+    results = [runner.run(p) for p in inputs]
+    assert [r["staged_files"] for r in results] == [[], [], []]
+    lines = calls.read_text().splitlines()
+    assert len(lines) == 1 + 3 * 2
+    assert sum("sha256sum" in line for line in lines) == 3 and not any("tar -xzf" in line for line in lines[1:])
+
+
+def test_stager_verifies_remote_before_skipping(fake_remote, tmp_path):
+    from bdfeasyinput.execution.ssh import SSHConnection
+    from bdfeasyinput.execution.staging import Stager, StagingManifest
+
+    local = tmp_path / "local"
+    local.mkdir()
+    files = {}
+    for name in ["a.inp", "b.xyz", "c.sh"]:
+        (local / name).write_text(f"{name}\n")
+        files[f"job/{name}"] = local / name
+    remote = tmp_path / "remote"
+    stager = Stager(SSHConnection("cluster"))
+    assert sorted(stager.stage(str(remote), files)["sent"]) == sorted(files)
+    assert stager.stage(str(remote), files)["sent"] == []
+
+    # 远程被清理：目录重新创建，全部重新上传
+    shutil.rmtree(remote)
+    assert sorted(stager.stage(str(remote), files)["sent"]) == sorted(files)
+    # 远程单个文件丢失或被改动：只重传这些文件
+    (remote / "job" / "b.xyz").unlink()
+    (remote / "job" / "c.sh").write_text("edited\n")
+    staged = stager.stage(str(remote), files)
+    assert sorted(staged["sent"]) == ["job/b.xyz", "job/c.sh"] and staged["skipped"] == ["job/a.inp"]
+    assert (remote / "job" / "c.sh").read_text() == "c.sh\n"
+    # 另一个 Stager（如另一台机器上运行过）的清单不影响核对结果
+    assert Stager(SSHConnection("cluster")).stage(str(remote), files)["skipped"] == sorted(files)
+
+    # 共用清单的两个 runner 不会覆盖彼此的条目
+    first, second = StagingManifest(tmp_path / "m.json"), StagingManifest(tmp_path / "m.json")
+    first.update({"/r/a": "1"})
+    second.update({"/r/b": "2"})
+    assert StagingManifest(tmp_path / "m.json").entries == {"/r/a": "1", "/r/b": "2"}
+    assert sorted(p.name for p in tmp_path.glob("m.*")) == ["m.json", "m.lock"]
+
+
+def test_slurm_array_submits_once_and_returns_task_handles(fake_remote, tmp_path):
+    states = tmp_path / "states"
+    states.mkdir()
+    sbatch_args = tmp_path / "sbatch_args"
+    # 假的 sbatch：按 --array=0-N 依次同步执行每个任务，并记录任务的最终状态
+    _script(fake_remote / "sbatch", f"""#!/bin/sh
+echo "$@" > {sbatch_args}
+spec=${{1#--array=}}; spec=${{spec%%%*}}; last=${{spec#0-}}
+i=0
+while [ $i -le $last ]; do
+  if SLURM_SUBMIT_DIR=$PWD SLURM_ARRAY_TASK_ID=$i sh $2; then s=COMPLETED; else s=FAILED; fi
+  echo $s > {states}/500_$i
+  i=$((i + 1))
+done
+echo "Submitted batch job 500"
+""")
+    _script(fake_remote / "squeue", "#!/bin/sh\ntrue\n")
+    _script(fake_remote / "sacct", f"#!/bin/sh\nfor f in {states}/*; do echo \"${{f##*/}}|$(cat $f)\"; done\n")
+    bdf = _script(tmp_path / "remote_bin" / "bdf", "#!/bin/sh\necho \"ran $1 in $(basename $PWD)\"\ncase $1 in fail*) exit 2 ;; esac\n")
+    template = tmp_path / "job.sh"
+    template.write_text(
+        "#!/bin/bash\n#SBATCH -J {{JOB_NAME}}\n#SBATCH -c {{CPUS_PER_TASK}}\n\n"
+        "{{BDF_COMMAND}} {{INPUT_FILE}} > {{JOB_NAME}}.log\n"
+    )
+    remote = tmp_path / "remote"
+    runner = SSHSlurmRunner(
+        host="cluster", workdir=str(remote), job_script_template=str(template),
+        default_slurm={"bdf_command": str(bdf), "cpus_per_task": 4},
+    )
+    inputs = _inputs(tmp_path / "local", "c0", "c1", "fail2")
+
+    handles = runner.submit_array(inputs, array_name="confs", max_parallel=2, poll_interval=0.05)
+    assert [h.job_id for h in handles] == ["500_0", "500_1", "500_2"]
+    assert sbatch_args.read_text().split() == ["--array=0-2%2", "confs.slurm.sh"]
+    script = (remote / "confs" / "confs.slurm.sh").read_text()
+    assert "#SBATCH -J confs\n#SBATCH -c 4\n" in script
+    assert (remote / "confs" / "c1" / "c1.log").read_text() == "ran c1.inp in c1\n"
+
+    results = [h.result(timeout=20) for h in handles]
+    assert [r["status"] for r in results] == ["success", "success", "failed"]
+    assert results[1]["remote_workdir"] == f"{remote}/confs/c1"
+    assert results[2]["slurm_state"] == "FAILED"
+
+    with pytest.raises(ValueError):
+        runner.submit_array(inputs + _inputs(tmp_path / "other", "c0"))
+
+
+def test_slurm_array_split_by_max_array_size(fake_remote, tmp_path):
+    sbatch_calls = tmp_path / "sbatch_calls"
+    # 假的 sbatch：每次调用分配新的作业号，按 --array=0-N 同步执行任务（脚本参数为偏移）
+    _script(fake_remote / "sbatch", f"""#!/bin/sh
+echo "$@" >> {sbatch_calls}
+id=$((600 + $(wc -l < {sbatch_calls})))
+spec=${{1#--array=}}; last=${{spec#0-}}
+i=0
+while [ $i -le $last ]; do
+  SLURM_SUBMIT_DIR=$PWD SLURM_ARRAY_TASK_ID=$i sh $2 $3 || exit 1
+  i=$((i + 1))
+done
+echo "Submitted batch job $id"
+""")
+    bdf = _script(tmp_path / "remote_bin" / "bdf", "#!/bin/sh\necho \"$1 in $(basename $PWD)\" > ran.txt\n")
+    template = tmp_path / "job.sh"
+    template.write_text("#!/bin/bash\n#SBATCH -J {{JOB_NAME}}\n\n{{BDF_COMMAND}} {{INPUT_FILE}}\n")
+    remote = tmp_path / "remote"
+    runner = SSHSlurmRunner(
+        host="cluster", workdir=str(remote), job_script_template=str(template),
+        default_slurm={"bdf_command": str(bdf)}, max_array_size=3,
+    )
+    names = [f"m{i}" for i in range(8)]
+    inputs = _inputs(tmp_path / "local", *names)
+
+    handles = runner.submit_array(inputs, array_name="big")
+    assert [h.name for h in handles] == names
+    assert [h.job_id for h in handles] == ["601_0", "601_1", "601_2", "602_0", "602_1", "602_2", "603_0", "603_1"]
+    assert sbatch_calls.read_text().splitlines() == [
+        "--array=0-2 big.slurm.sh", "--array=0-2 big.slurm.sh 3", "--array=0-1 big.slurm.sh 6",
+    ]
+    # 每个任务都在自己的目录中运行了自己的输入
+    for name in names:
+        assert (remote / "big" / name / "ran.txt").read_text() == f"{name}.inp in {name}\n"
+
+    # 后面的数组提交失败时，只有它们的句柄失败
+    _script(fake_remote / "sbatch", f"""#!/bin/sh
+echo "$@" >> {sbatch_calls}
+[ -z "$3" ] || {{ echo "array too large" >&2; exit 1; }}
+echo "Submitted batch job 700"
+""")
+    handles = runner.submit_array(inputs, array_name="big")
+    assert [h.job_id for h in handles[:3]] == ["700_0", "700_1", "700_2"]
+    failed = [h.result(timeout=5) for h in handles[3:]]
+    assert all(r["status"] == "failed" and r["job_id"] is None for r in failed)
+
+    with pytest.raises(ValueError):
+        SSHSlurmRunner(host="cluster", max_array_size=0)
@@ -0,0 +1,107 @@
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.execution import BDFDirectRunner, LocalScheduler
+
+
+FAKE_BDF = """#!/bin/sh
+echo "threads=$OMP_NUM_THREADS"
+echo "tmpdir=$BDF_TMPDIR"
+grep Cpus_allowed_list /proc/self/status 2>/dev/null
+sleep 0.2
+case "$2" in
+  fail*) exit 3 ;;
+esac
+"""
+
+
+def _fake_bdf_home(tmp_path: Path) -> Path:
+    bdf_home = tmp_path / "bdfhome"
+    (bdf_home / "sbin").mkdir(parents=True)
+    exe = bdf_home / "sbin" / "bdf.drv"
+    exe.write_text(FAKE_BDF)
+    exe.chmod(exe.stat().st_mode | stat.S_IXUSR)
+    return bdf_home
+
+
+def _inputs(tmp_path: Path, names):
+    paths = []
+    for name in names:
+        path = tmp_path / f"{name}.inp"
+        path.write_text("$COMPASS\n$END\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_jobs_are_packed_without_oversubscription(tmp_path):
+    runner = BDFDirectRunner(bdf_home=str(_fake_bdf_home(tmp_path)), bdf_tmpdir=str(tmp_path / "tmp"), omp_num_threads=2)
+    scheduler = LocalScheduler(runner, total_cores=5)
+    completed = []
+    report = scheduler.run(
+        _inputs(tmp_path, [f"job{i}" for i in range(6)]),
+        on_complete=lambda job: completed.append("threads=2" in job.result["stdout"]),
+    )
+
+    assert report.succeeded == 6 and not report.failed
+    assert completed == [True] * 6
+    # 回调之后不再保留日志文本
+    assert not any("stdout" in job.result or "stderr" in job.result for job in report.jobs)
+    # 5 个核、每个作业 2 线程：最多 2 个作业并发
+    assert report.peak_concurrency == 2
+    assert 0.0 < report.utilization <= 0.8 + 1e-6
+    assert report.throughput > 0
+    for job in report.jobs:
+        log = Path(job.result["output_file"]).read_text()
+        assert "threads=2" in log
+        # 固定的临时目录模板按作业拆分为子目录
+        assert f"tmpdir={tmp_path / 'tmp'}/{Path(job.input_file).stem}-{job.index}" in log
+        assert len(job.cpus) == 2
+
+
+def test_threads_are_capped_at_total_cores_and_failures_reported(tmp_path):
+    runner = BDFDirectRunner(bdf_home=str(_fake_bdf_home(tmp_path)), omp_num_threads=64)
+    scheduler = LocalScheduler(runner, total_cores=4)
+    assert scheduler.threads_per_job == 4
+    report = scheduler.run(_inputs(tmp_path, ["ok", "fail"]))
+    assert report.peak_concurrency == 1
+    assert [job.status for job in report.failed] == ["failed"]
+    assert report.to_dict()["job_results"][1]["exit_code"] == 3
+    with pytest.raises(ValueError):
+        LocalScheduler(runner, total_cores=0)
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="CPU affinity not supported")
+def test_pinned_jobs_run_on_assigned_cpus(tmp_path):
+    runner = BDFDirectRunner(bdf_home=str(_fake_bdf_home(tmp_path)), omp_num_threads=1)
+    report = LocalScheduler(runner, total_cores=1, pin=True).run(_inputs(tmp_path, ["pinned"]))
+    job = report.jobs[0]
+    log = Path(job.result["output_file"]).read_text()
+    assert f"Cpus_allowed_list:\t{job.cpus[0]}" in log
+
+
+def test_cli_run_many(tmp_path):
+    bdf_home = _fake_bdf_home(tmp_path)
+    _inputs(tmp_path, ["a", "b", "c"])
+    report_path = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        main,
+        ["run-many", str(tmp_path / "*.inp"), "--bdf-home", str(bdf_home),
+         "--cores", "2", "--threads", "1", "--report", str(report_path)],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Core utilization" in result.output
+    report = json.loads(report_path.read_text())
+    assert report["jobs"] == 3 and report["succeeded"] == 3
+    assert report["peak_concurrency"] == 2
+
+    result = CliRunner().invoke(main, ["run-many", str(tmp_path / "a.inp")])
+    assert result.exit_code == 1
@@ -0,0 +1,112 @@
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.analysis.parser import PATTERNS, BDFOutputParser
+from bdfeasyinput.analysis.parser.output_parser import _OPT_STEP_HEADER
+from bdfeasyinput.cli import main
+from bdfeasyinput.extraction import BDFResultExtractor
+from test_output_parser_sections import COMPASS_BLOCK, SAMPLES
+
+
+def _opt_step(step: int) -> str:
+    shift = 0.001 * step
+    return f"""
+ Geometry Optimization step :  {step:3d}
+ Energy =      {-76.3 - shift:.10f}
+ Gradient=
+    O        0.0000000000    0.0000000000   -0.0123456789
+    H        0.0000000000    0.0045678901    0.0061728394
+    H        0.0000000000   -0.0045678901    0.0061728394
+
+    Current values  :  {0.71 / step:.4E}   {1.23 / step:.4E}   {1.5 / step:.4E}   {2.6 / step:.4E}
+    Geom. converge  :     No          No           No           No
+
+   Molecular Cartesian Coordinates (X,Y,Z) in Angstrom :
+      O          0.00000000       0.00000000       {0.1173 + shift:.8f}
+      H          0.00000000       0.75720000      -0.46920000
+      H          0.00000000      -0.75720000      -0.46920000
+
+"""
+
+
+def _long_optimization(n_steps: int) -> str:
+    return COMPASS_BLOCK + "".join(_opt_step(i) for i in range(1, n_steps + 1))
+
+
+def test_trajectory_matches_step_dicts():
+    parser = BDFOutputParser()
+    content = _long_optimization(20)
+    steps = parser.extract_optimization_info(content)["steps"]
+    trajectory = parser.extract_optimization_trajectory(content)
+
+    assert trajectory.steps.tolist() == [s["step"] for s in steps] == list(range(1, 21))
+    assert trajectory.energies.tolist() == [s["energy"] for s in steps]
+    assert trajectory.force_max.tolist() == [s["force_max"] for s in steps]
+    assert trajectory.step_rms.tolist() == [s["step_rms"] for s in steps]
+    # 第 0 帧为 compass 输出的初始结构（Bohr 换算为 Angstrom）
+    assert trajectory.frame_steps.tolist() == list(range(0, 21))
+    assert trajectory.trajectory.coords.shape == (21, 3, 3)
+    assert trajectory.trajectory.coords[0, 0, 2] == pytest.approx(0.221665 * 0.529177)
+    assert trajectory.trajectory.coords[20, 0, 2] == pytest.approx(0.1173 + 0.020)
+    assert all(len(s["gradient"]) == 3 for s in steps)
+
+
+def test_step_boundaries_are_scanned_once():
+    parser = BDFOutputParser()
+    content = _long_optimization(200)
+    PATTERNS.reset_stats()
+    steps = parser.extract_optimization_info(content)["steps"]
+    calls = {row["pattern"]: row["calls"] for row in PATTERNS.stats()}
+    assert len(steps) == 200
+    assert calls[_OPT_STEP_HEADER] == 1
+
+
+def test_parse_without_per_step_coordinates():
+    trajectory = BDFOutputParser().extract_optimization_trajectory(SAMPLES["opt_freq"])
+    assert trajectory.steps.tolist() == [1, 2]
+    assert trajectory.frame_steps.tolist() == [0, 2]
+    assert BDFOutputParser().extract_optimization_trajectory(SAMPLES["single_point"]).trajectory is None
+
+
+def _read_xyz(text: str):
+    lines = text.splitlines()
+    frames = []
+    i = 0
+    while i < len(lines):
+        n = int(lines[i])
+        frames.append((lines[i + 1], [line.split() for line in lines[i + 2:i + 2 + n]]))
+        i += 2 + n
+    return frames
+
+
+def test_xyz_and_extxyz_export(tmp_path):
+    log = tmp_path / "opt.log"
+    log.write_text(_long_optimization(5), encoding="utf-8")
+    trajectory = BDFResultExtractor().extract_trajectory(str(log))
+
+    frames = _read_xyz(trajectory.write_xyz(tmp_path / "opt.xyz").read_text(encoding="utf-8"))
+    assert len(frames) == 6
+    assert frames[3][0].startswith("step=3 energy=-76.303")
+    assert [atom[0] for atom in frames[3][1]] == ["O", "H", "H"]
+    assert float(frames[5][1][0][3]) == pytest.approx(0.1223)
+
+    frames = _read_xyz(trajectory.write_xyz(tmp_path / "opt.extxyz").read_text(encoding="utf-8"))
+    assert frames[1][0].startswith("Properties=species:S:1:pos:R:3 step=1 energy=-76.301 force_max=1.23")
+    assert frames[0][0] == 'Properties=species:S:1:pos:R:3 step=0 pbc="F F F"'
+
+
+def test_cli_extract_trajectory(tmp_path):
+    log = tmp_path / "opt.log"
+    log.write_text(_long_optimization(3), encoding="utf-8")
+    out = tmp_path / "traj.extxyz"
+    result = CliRunner().invoke(main, ["extract", str(log), "--no-cache", "--trajectory", str(out)])
+    assert result.exit_code == 0, result.output
+    assert len(_read_xyz(out.read_text(encoding="utf-8"))) == 4
@@ -0,0 +1,122 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.analysis.parser import BDFOutputParser, ParseCache
+from bdfeasyinput.analysis.parser.output_parser import PROPERTY_FIELDS, RESULT_FIELDS
+from bdfeasyinput.cli import main
+from bdfeasyinput.extraction import BDFResultExtractor
+from test_output_parser_sections import SAMPLES
+
+
+class RecordingParser(BDFOutputParser):
+    """记录实际运行了哪些提取器"""
+
+    def __init__(self):
+        super().__init__()
+        self.called = set()
+        for name in dir(BDFOutputParser):
+            if name.startswith("extract_") or name == "check_convergence":
+                setattr(self, name, self._wrap(name, getattr(self, name)))
+
+    def _wrap(self, name, method):
+        def wrapper(*args, **kwargs):
+            self.called.add(name)
+            return method(*args, **kwargs)
+        return wrapper
+
+
+@pytest.fixture(params=sorted(SAMPLES))
+def sample_log(request, tmp_path):
+    path = tmp_path / f"{request.param}.log"
+    path.write_text(SAMPLES[request.param], encoding="utf-8")
+    return path
+
+
+def test_each_field_matches_full_parse(sample_log):
+    parser = BDFOutputParser()
+    full = parser.parse(str(sample_log))
+    for field in RESULT_FIELDS:
+        result = parser.parse(str(sample_log), fields=[field])
+        assert list(result) == ([field] if field in full else [])
+        if field in full:
+            assert result[field] == full[field]
+    for field in PROPERTY_FIELDS:
+        result = parser.parse(str(sample_log), fields=[field])
+        expected = {field: full["properties"][field]} if field in full["properties"] else {}
+        assert result == {"properties": expected}
+    assert parser.parse(str(sample_log), fields=["properties"]) == {"properties": full["properties"]}
+
+
+def test_only_needed_extractors_run(tmp_path):
+    log = tmp_path / "opt.log"
+    log.write_text(SAMPLES["opt_freq"], encoding="utf-8")
+
+    parser = RecordingParser()
+    assert parser.parse(str(log), fields=["energy"]) == {"energy": parser.extract_energy(SAMPLES["opt_freq"])}
+    assert parser.called == {"extract_energy"}
+
+    # occupation 依赖 scf_method，但结果中只出现请求的字段
+    parser = RecordingParser()
+    result = parser.parse(str(log), fields="occupation")
+    assert {"extract_occupation_info", "extract_scf_method"} <= parser.called
+    assert "extract_frequencies" not in parser.called
+    assert set(result) == {"properties"}
+    assert "scf_method" not in result["properties"]
+
+
+def test_parse_stream_accepts_fields(tmp_path):
+    log = tmp_path / "td.log"
+    log.write_text(SAMPLES["tddft_spin_flip"], encoding="utf-8")
+    parser = BDFOutputParser()
+    expected = parser.parse(str(log), fields=["tddft", "symmetry"])
+    with open(log, encoding="utf-8") as f:
+        assert parser.parse_stream(f, str(log), fields=["tddft", "symmetry"]) == expected
+
+
+def test_unknown_field_is_rejected(tmp_path):
+    log = tmp_path / "sp.log"
+    log.write_text(SAMPLES["single_point"], encoding="utf-8")
+    with pytest.raises(ValueError, match="bogus"):
+        BDFOutputParser().parse(str(log), fields=["energy", "bogus"])
+
+
+def test_cache_keys_field_subsets_separately(tmp_path):
+    log = tmp_path / "sp.log"
+    log.write_text(SAMPLES["single_point"], encoding="utf-8")
+    cache = ParseCache(tmp_path / "cache")
+    energy = cache.parse(str(log), fields=["energy"])
+    assert cache.parse(str(log), fields=("energy",)) == energy
+    assert cache.hits == 1
+    assert cache.parse(str(log)) == BDFOutputParser().parse(str(log))
+    assert cache.hits == 1
+
+
+def test_metrics_unchanged_by_field_selection(tmp_path):
+    log = tmp_path / "opt.log"
+    log.write_text(SAMPLES["opt_freq"], encoding="utf-8")
+    extractor = BDFResultExtractor()
+    parsed = BDFOutputParser().parse(str(log))
+    expected_type = extractor._detect_task_type(parsed)
+    metrics = extractor.extract_metrics(str(log))
+    assert metrics.task_type == expected_type
+    assert metrics.geometry is not None and metrics.frequency is not None
+
+
+def test_cli_extract_fields(tmp_path):
+    log = tmp_path / "sp.log"
+    log.write_text(SAMPLES["single_point"], encoding="utf-8")
+    runner = CliRunner()
+    result = runner.invoke(main, ["extract", str(log), "--no-cache", "--fields", "energy,converged"])
+    assert result.exit_code == 0, result.output
+    full = BDFOutputParser().parse(str(log))
+    assert json.loads(result.stdout) == {"energy": full["energy"], "converged": full["converged"]}
+
+    result = runner.invoke(main, ["extract", str(log), "--no-cache", "--fields", "nope"])
+    assert result.exit_code == 1
@@ -0,0 +1,338 @@
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bdfeasyinput.analysis.parser.output_parser import BDFOutputParser
+from bdfeasyinput.analysis.parser.section_index import SectionIndex
+
+
+COMPASS_BLOCK = """
+ |******************************************************************************|
+    Start running module compass
+ |******************************************************************************|
+ gsym: C02V, noper=    4
+ Point group name C(2V)
+ User set point group as C(2V)
+ Largest Abelian Subgroup C(2V)                       4
+ Symmetry check OK
+
+ Atom   Cartcoord(Bohr)               Charge Basis Auxbas Uatom Nstab Alink  Mass
+  O     0.000000   0.000000   0.221665   8.00     1     0     0     1   E   15.9949
+  H     0.000000   1.430901  -0.886659   1.00     2     0     0     1   E    1.0078
+  H     0.000000  -1.430901  -0.886659   1.00     2     0     0     1   E    1.0078
+
+ Total number of basis functions:      24      24
+
+ Number of irreps:   4
+ Irrep :   A1        A2        B1        B2
+ Norb  :     11         2         4         7
+"""
+
+SCF_BLOCK = """
+ |******************************************************************************|
+    Start running module scf
+ |******************************************************************************|
+ $SCF
+ RKS
+ $END
+ THRENE = 1.0E-08  THRDEN = 5.0E-06
+
+ Iter. idiis vshift    SCF Energy            DeltaE          RMSDeltaD
+    1      0    0.000   -76.1234567890   -76.1234567890    0.0123
+    2      1    0.000   -76.3456789012    -0.2222221122    0.0045
+ diis/vshift is closed at iter =   9
+
+ Final DeltaE = -2.1E-09
+ Final DeltaD = 1.1E-06
+
+ [Final occupation pattern: ]
+
+ Irreps:        A1      A2      B1      B2
+
+ detailed occupation for iden/irep:      1   1
+    1.00 1.00 1.00 0.00 0.00
+ Alpha       3.00    0.00    1.00    1.00
+
+ SCF State symmetry : A1
+
+ HOMO-LUMO gap:       0.30000000 au       8.16339000 eV
+ Alpha   HOMO energy:      -0.31000000 au      -8.43550000 eV  Irrep: B2
+ Alpha   LUMO energy:      -0.01000000 au      -0.27211000 eV  Irrep: A1
+
+ Final scf result
+   E_tot =               -76.35000000
+   E_ele =               -85.53953376
+   E_nn  =                 9.18953376
+   E_1e  =              -123.14140856
+   E_ne  =              -199.12814462
+   E_kin =                75.98673606
+   E_ee  =                37.92510274
+   E_xc  =                -8.90000000
+  Virial Ratio      2.00052700
+
+ [Mulliken Population Analysis]
+  Atomic charges and Spin densities :
+     1O      -0.6412    0.0000
+     2H       0.3206    0.0000
+     3H       0.3206    0.0000
+ Sum of charges:     0.0000
+
+ [Dipole moment: Debye]
+  Totl:    0.0000    0.0000    2.0132    2.0132
+"""
+
+OPT_BLOCK = """
+ |******************************************************************************|
+    Start running module bdfopt
+ |******************************************************************************|
+ Geometry Optimization step :    1
+ Energy =      -76.3500000000
+ Gradient=
+    O        0.0000000000    0.0000000000   -0.0123456789
+    H        0.0000000000    0.0045678901    0.0061728394
+    H        0.0000000000   -0.0045678901    0.0061728394
+
+                      Force-RMS    Force-Max     Step-RMS     Step-Max
+    Conv. tolerance :  0.2000E-03   0.3000E-03   0.8000E-03   0.1200E-02
+    Current values  :  0.7100E-02   0.1230E-01   0.1500E-01   0.2600E-01
+    Geom. converge  :     No          No           No           No
+
+ Geometry Optimization step :    2
+ Energy =      -76.3600000000
+ Gradient=
+    O        0.0000000000    0.0000000000   -0.0000123456
+    H        0.0000000000    0.0000045678    0.0000061728
+    H        0.0000000000   -0.0000045678    0.0000061728
+
+    Current values  :  0.7100E-05   0.1230E-04   0.1500E-04   0.2600E-04
+    Geom. converge  :     Yes         Yes          Yes          Yes
+
+ Good Job, Geometry Optimization converged in     2 iterations!
+
+   Molecular Cartesian Coordinates (X,Y,Z) in Angstrom :
+      O          0.00000000       0.00000000       0.11730000
+      H          0.00000000       0.75720000      -0.46920000
+      H          0.00000000      -0.75720000      -0.46920000
+
+"""
+
+FREQ_BLOCK = """
+ Results of vibrations:
+     Normal frequencies (cm^-1), reduced masses (AMU), force constants (mDyn/A)
+
+                                                   1                         2                         3
+          Irreps                                  A1                        A1                        B2
+     Frequencies                           1625.3072                 3650.1122                 3740.2211
+
+ Results of translations and rotations:
+     Frequencies                             -0.0012                    0.0008                    0.0021
+
+ Thermal Contributions to Energies, Enthalpy, and Free Energy
+
+ Temperature =   298.150 Kelvin         Pressure =   1.00000 Atm
+ ====================================================================
+ Zero-point Energy                          :        0.021344         13.3935
+ Thermal correction to Energy               :        0.024180         15.1732
+ Thermal correction to Enthalpy             :        0.025124         15.7656
+ Thermal correction to Gibbs Free Energy    :        0.003691          2.3164
+ Sum of electronic and zero-point Energies  :      -76.338656
+ Sum of electronic and thermal Energies     :      -76.335820
+ Sum of electronic and thermal Enthalpies   :      -76.334876
+ Sum of electronic and thermal Free Energies:      -76.356309
+ ====================================================================
+"""
+
+TDDFT_BLOCK_TEMPLATE = """
+ |******************************************************************************|
+    Start running module tddft
+ |******************************************************************************|
+ [method]
+  {method}
+ isf= {isf}
+ ialda= {ialda}
+ itda= {itda}
+ Estimated memory for JK operator:  0.141 M
+ Maximum memory to calculate JK operator:  512.000 M
+ Allow to calculate    2 roots at one pass for RPA
+ Allow to calculate    4 roots at one pass for TDA
+ Nexit:    3
+
+ Spin change: {isf}
+
+  No. Pair   ExSym   ExEnergies     Wavelengths      f     D<S^2>          Dominant Excitations             IPA   Ova     En-E1
+
+    1   A2    1   A2    {e1:.4f} eV    163.22 nm   0.0000   0.0000  95.3%  CV(0):   B2(   1 )->  B1(   2 )   9.331 0.409    0.0000
+    2   B2    2   B2    {e2:.4f} eV    134.53 nm   0.0233   0.0000  98.7%  CV(0):   B2(   1 )->  A1(   3 )  10.104 0.548    1.6197
+    3   B1    3   B1    {e3:.4f} eV    128.32 nm   0.0561   0.0000  96.2%  CV(0):   A1(   3 )->  B1(   2 )  11.107 0.473    2.0625
+
+ *** Time consumed in tddft ***
+"""
+
+TAIL_BLOCK = """
+ WARNING: Small basis set used
+ Congratulations! BDF normal termination
+"""
+
+
+def _tddft_block(isf, ialda, itda, method, energies):
+    e1, e2, e3 = energies
+    return TDDFT_BLOCK_TEMPLATE.format(
+        isf=isf, ialda=ialda, itda=itda, method=method, e1=e1, e2=e2, e3=e3
+    )
+
+
+def _legacy_parse(parser: BDFOutputParser, content: str) -> dict:
+    """按重构前的方式（每个提取器扫描全文）组装 parse() 结果，作为对照基准"""
+    result = {
+        'energy': parser.extract_energy(content),
+        'scf_energy': parser.extract_scf_energy(content),
+        'converged': parser.check_convergence(content),
+        'geometry': parser.extract_geometry(content),
+    }
+    freq_data = parser.extract_frequencies(content)
+    result['frequencies'] = freq_data.get('all', [])
+    result['frequency_data'] = freq_data
+    result['properties'] = parser.extract_properties(content)
+    scf_method = parser.extract_scf_method(content)
+    if scf_method:
+        result['properties']['scf_method'] = scf_method
+    thermochemistry = parser.extract_thermochemistry(content)
+    if thermochemistry:
+        result['properties']['thermochemistry'] = thermochemistry
+    result['optimization'] = parser.extract_optimization_info(content)
+    result['tddft'] = parser.extract_tddft_calculations(content)
+    if result['tddft']:
+        result['excited_states'] = result['tddft'][0].get('states', [])
+    else:
+        result['excited_states'] = parser.extract_excited_states(content)
+    resp_gradient_info = parser.extract_resp_gradient_info(content)
+    if resp_gradient_info:
+        result['properties']['resp_gradient'] = resp_gradient_info
+    symmetry_info = parser.extract_symmetry_info(content)
+    if symmetry_info:
+        result['properties']['symmetry'] = symmetry_info
+    irrep_info = parser.extract_irrep_info(content)
+    if irrep_info:
+        result['properties']['irreps'] = irrep_info
+    occupation_info = parser.extract_occupation_info(content, scf_method=scf_method)
+    if occupation_info:
+        result['properties']['occupation'] = occupation_info
+    scf_state_symmetry = parser.extract_scf_state_symmetry(content)
+    if scf_state_symmetry:
+        result['properties']['scf_state_symmetry'] = scf_state_symmetry
+    result['warnings'] = parser.extract_warnings(content)
+    result['errors'] = parser.extract_errors(content)
+    return result
+
+
+SAMPLES = {
+    'empty': "",
+    'single_point': COMPASS_BLOCK + SCF_BLOCK + TAIL_BLOCK,
+    'opt_freq': COMPASS_BLOCK + SCF_BLOCK + OPT_BLOCK + SCF_BLOCK + FREQ_BLOCK + TAIL_BLOCK,
+    'tddft_spin_flip': (
+        COMPASS_BLOCK + SCF_BLOCK
+        + _tddft_block(-1, 0, 0, "RPA", (0.0462, 1.2000, 2.3000))
+        + _tddft_block(1, 0, 1, "TDA", (10.7005, 11.0000, 12.0000))
+        + _tddft_block(1, 2, 1, "TDA", (10.6044, 11.5000, 12.5000))
+        + TAIL_BLOCK
+    ),
+    'excited_table_only': SCF_BLOCK + TDDFT_BLOCK_TEMPLATE.split(" Spin change")[0] + """
+  No. Pair   ExSym   ExEnergies     Wavelengths      f     D<S^2>          Dominant Excitations
+
+    1   B2    1   B2    7.5963 eV    163.22 nm   0.0233   0.0000  98.7%  CV(0):   B2(   1 )->  A1(   3 )
+
+""",
+    'uhf_no_method_hint': SCF_BLOCK.replace("RKS", "").replace(
+        " Alpha       3.00", " Alpha       3.00    0.00    1.00    1.00\n Beta        2.00"
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_parse_matches_full_content_extractors(name, tmp_path):
+    content = SAMPLES[name]
+    log_path = tmp_path / f"{name}.log"
+    log_path.write_text(content)
+
+    parser = BDFOutputParser()
+    assert parser.parse(str(log_path)) == _legacy_parse(parser, content)
+
+
+def test_section_index_single_pass_positions():
+    content = SAMPLES['opt_freq']
+    index = SectionIndex.build(content)
+
+    assert index.count('opt_step') == 2
+    assert len(index.spans('final_scf')) == 2
+    assert index.has('compass', 'irreps', 'occupation', 'vibrations', 'thermochemistry')
+    assert not index.has('tddft')
+    assert index.first('opt_step') == content.index("Geometry Optimization step")
+
+    # 切片从标记所在行的行首开始
+    section = index.section(content, 'vibrations')
+    assert section.startswith(" Results of vibrations:")
+    assert index.section(content, 'tddft') == ''
+
+
+def test_section_index_lookbehind_keeps_metadata():
+    content = SAMPLES['tddft_spin_flip']
+    index = SectionIndex.build(content)
+    assert index.count('tddft') == 3
+
+    section = index.section(content, 'tddft', lookbehind=200)
+    first = content.index(" Spin change")
+    last = content.rindex("  No. Pair")
+    assert section == content[first - 200:last]
+
+
+def test_section_spans_end_at_next_section():
+    content = SAMPLES['opt_freq']
+    index = SectionIndex.build(content)
+
+    # 每个 Final scf result 段落在其后的布居分析处结束，而不是延伸到文件末尾
+    spans = index.spans('final_scf')
+    mulliken = [m.start() for m in re.finditer(r" \[Mulliken", content)]
+    assert [end for _, end in spans] == mulliken
+    assert content[spans[0][0]:].startswith(" Final scf result")
+
+    # 振动分析段落在热化学段落之前结束
+    start, end = index.span('vibrations')
+    assert end == content.index(" Thermal Contributions")
+    assert 'Zero-point' not in index.section(content, 'vibrations')
+
+    # 优化步骤只在 opt_step 标记处划分
+    parser = BDFOutputParser()
+    steps = list(parser._iter_optimization_steps(content, index))
+    assert [step for step, _, _ in steps] == [1, 2]
+    assert steps[-1][2] == index.span('opt_step', 'optimization', 'opt_geometry')[1]
+    assert steps[-1][2] < content.index(" Results of vibrations")
+
+
+def test_section_index_positions_survive_case_mapping_changes():
+    # "İ".lower() 为两个字符，小写后位置无法对应，应退回到忽略大小写的扫描
+    content = "\u0130 header\n" + SAMPLES['single_point']
+    index = SectionIndex.build(content)
+    reference = SectionIndex.build(SAMPLES['single_point'])
+    offset = len("\u0130 header\n")
+
+    assert index.positions['final_scf'] == [pos + offset for pos in reference.positions['final_scf']]
+    assert index.first('messages') == content.index("WARNING")
+
+
+def test_parse_tddft_sections(tmp_path):
+    log_path = tmp_path / "td.log"
+    log_path.write_text(SAMPLES['tddft_spin_flip'])
+
+    result = BDFOutputParser().parse(str(log_path))
+    tddft = result["tddft"]
+    assert len(tddft) == 3
+    assert tddft[0]["jk_max_memory_mb"] == pytest.approx(512.0)
+    assert tddft[0]["n_exit"] == 3
+    energies_first = [c["states"][0]["energy_ev"] for c in tddft]
+    assert energies_first == pytest.approx([0.0462, 10.7005, 10.6044], rel=1e-4)
+    assert result["properties"]["symmetry"]["detected_group"] == "C(2V)"
+    assert [ir["irrep"] for ir in result["properties"]["irreps"]["irreps"]] == ["A1", "A2", "B1", "B2"]
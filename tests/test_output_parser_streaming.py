@@ -0,0 +1,110 @@
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.analysis.parser.output_parser import BDFOutputParser
+from test_output_parser_sections import SAMPLES, SCF_BLOCK
+
+
+TMP_CONTENT = """
+ Final scf result
+   E_tot =              -114.37036631
+   E_ele =              -145.00000000
+ Virial Ratio      2.00100000
+ [Final occupation pattern: ]
+   E_tot =              -999.00000000
+
+ Geometry Optimization step :    2
+ Final scf result
+   E_tot =              -114.38000000
+   E_nn  =                30.62963369
+ Final scf result
+ Final scf result
+   E_xc  =               -12.50000000
+   E_tot =              -114.38500000
+   E_tot =              -114.38600000
+"""
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_parse_stream_matches_text_mode(name, tmp_path):
+    out = tmp_path / f"{name}.log"
+    out.write_text(SAMPLES[name], encoding="utf-8")
+    parser = BDFOutputParser()
+
+    expected = parser.parse(str(out))
+    with open(out, "r", encoding="utf-8") as f:
+        assert parser.parse_stream(f, output_file=str(out)) == expected
+
+
+def test_parse_stream_handles_crlf_and_empty_input(tmp_path):
+    parser = BDFOutputParser()
+    content = SAMPLES["opt_freq"]
+    unix = tmp_path / "unix.log"
+    unix.write_text(content, encoding="utf-8")
+    dos = tmp_path / "dos.log"
+    dos.write_bytes(content.replace("\n", "\r\n").encode("utf-8"))
+    with open(dos, "r", encoding="utf-8", newline="") as f:
+        assert parser.parse_stream(f) == parser.parse(str(unix))
+
+    empty = tmp_path / "empty.log"
+    empty.write_text("", encoding="utf-8")
+    assert parser.parse_stream([]) == parser.parse(str(empty))
+
+
+def test_compact_lines_keeps_last_row_of_numeric_tables():
+    compacted = BDFOutputParser._compact_lines(SCF_BLOCK.splitlines(keepends=True))
+    assert "-76.1234567890" not in compacted
+    assert "    2      1    0.000   -76.3456789012" in compacted
+    # 非数值行与空行原样保留
+    assert " Iter. idiis vshift    SCF Energy            DeltaE          RMSDeltaD" in compacted
+    assert "\n\n" in compacted
+    assert BDFOutputParser._compact_lines([]) == ""
+
+
+@pytest.mark.parametrize("mode", ["gzip", "mmap"])
+def test_parse_rejects_unknown_mode(mode, tmp_path):
+    out = tmp_path / "x.log"
+    out.write_text("", encoding="utf-8")
+    with pytest.raises(ValueError):
+        BDFOutputParser().parse(str(out), mode=mode)
+
+
+def test_tmp_readers_stream_like_full_content_regex(tmp_path):
+    tmp_file = tmp_path / "mol.out.tmp"
+    tmp_file.write_text(TMP_CONTENT, encoding="utf-8")
+    parser = BDFOutputParser()
+
+    legacy_energies = [
+        float(m.group(1))
+        for m in re.finditer(
+            r"Final\s+scf\s+result.*?E_tot\s*=\s*([-+]?\d+\.?\d*[Ee]?[-+]?\d*)",
+            TMP_CONTENT,
+            re.IGNORECASE | re.DOTALL,
+        )
+    ]
+    assert parser.extract_scf_energies_from_tmp(str(tmp_file)) == legacy_energies
+    assert legacy_energies == [-114.37036631, -114.38, -114.385]
+
+    assert parser.extract_final_scf_energy_components(str(tmp_file)) == {
+        "E_xc": -12.5,
+        "E_tot": -114.385,
+    }
+    assert parser.extract_scf_energies_from_tmp(str(tmp_path / "missing.out.tmp")) == []
+    assert parser.extract_final_scf_energy_components(str(tmp_path / "missing.out.tmp")) is None
+
+
+def test_tmp_components_stop_at_final_marker(tmp_path):
+    tmp_file = tmp_path / "single.out.tmp"
+    tmp_file.write_text(TMP_CONTENT.split(" Geometry Optimization")[0], encoding="utf-8")
+    components = BDFOutputParser().extract_final_scf_energy_components(str(tmp_file))
+    assert components == {
+        "E_tot": -114.37036631,
+        "E_ele": -145.0,
+        "virial_ratio": 2.001,
+    }
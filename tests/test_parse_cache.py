@@ -0,0 +1,140 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.analysis.parser import BDFOutputParser, ParseCache
+from bdfeasyinput.analysis.parser import cache as cache_module
+from bdfeasyinput.extraction import BDFResultExtractor
+from test_output_parser_sections import SAMPLES
+
+
+class CountingParser(BDFOutputParser):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse(self, output_file, mode="text", fields=None):
+        self.calls += 1
+        return super().parse(output_file, mode=mode, fields=fields)
+
+
+def _write(path: Path, content: str, mtime_ns: int = None) -> Path:
+    path.write_text(content, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_cache_hit_returns_identical_result_without_reparsing(tmp_path):
+    log = _write(tmp_path / "sp.log", SAMPLES["single_point"])
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+
+    first = cache.parse(str(log), parser)
+    second = cache.parse(str(log), parser)
+
+    assert first == second == BDFOutputParser().parse(str(log))
+    assert parser.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get(str(log)) == first
+
+
+def test_cache_invalidated_by_content_tmp_file_and_parser_version(tmp_path, monkeypatch):
+    log = _write(tmp_path / "opt.log", SAMPLES["opt_freq"], mtime_ns=10**18)
+    cache = ParseCache(tmp_path / "cache")
+    parser = CountingParser()
+    cache.parse(str(log), parser)
+
+    # 大小和修改时间不变但内容不同
+    _write(log, SAMPLES["opt_freq"].replace("-76.36", "-76.37"), mtime_ns=10**18)
+    assert cache.get(str(log)) is None
+    assert cache.parse(str(log), parser)["optimization"]["steps"][1]["energy"] == -76.37
+    assert parser.calls == 2
+
+    # 同名 *.out.tmp 出现
+    _write(tmp_path / "opt.out.tmp", " Final scf result\n   E_tot = -76.4\n")
+    assert cache.parse(str(log), parser)["optimization"]["steps"][0]["scf_energy"] == -76.4
+    assert parser.calls == 3
+
+    monkeypatch.setattr(cache_module, "PARSER_VERSION", "test")
+    assert cache.get(str(log)) is None
+
+    # 不同字段集合分别缓存
+    cache.parse(str(log), parser, fields=["energy"])
+    assert parser.calls == 4
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = ParseCache(tmp_path / "cache", max_bytes=0)
+    logs = [_write(tmp_path / f"{name}.log", content) for name, content in sorted(SAMPLES.items()) if content]
+    for log in logs:
+        cache.parse(str(log))
+    sizes = sorted(p.stat().st_size for p in (tmp_path / "cache").glob("*.pkl"))
+    assert len(sizes) == len(logs)
+
+    # 访问第一个条目使其成为最近使用，其余条目按写入顺序淘汰
+    entries = sorted((tmp_path / "cache").glob("*.pkl"), key=lambda p: p.stat().st_mtime_ns)
+    for i, entry in enumerate(entries):
+        os.utime(entry, ns=(10**18 + i, 10**18 + i))
+    cache.get(str(logs[0]))
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() >= 1
+    assert cache.size() <= cache.max_bytes
+    assert cache.get(str(logs[0])) is not None
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_writes_scan_cache_directory_only_when_estimate_crosses_cap(tmp_path, monkeypatch):
+    scans = []
+    scan = ParseCache._scan
+    monkeypatch.setattr(ParseCache, "_scan", lambda self: scans.append(1) or scan(self))
+    result = {"energy": -1.0, "padding": "x" * 1000}
+    logs = [_write(tmp_path / f"{i}.log", f"log {i}\n") for i in range(100)]
+
+    cache = ParseCache(tmp_path / "cache", max_bytes=10**9)
+    for log in logs[:50]:
+        cache.put(str(log), result)
+    assert len(scans) == 1  # 仅首次写入时扫描一次
+
+    # 容量降到现有大小后，每次淘汰删到 90%，约每 5 次写入才扫描一次
+    cache.max_bytes = sum(size for _, size, _ in scan(cache))
+    scans.clear()
+    for log in logs[50:]:
+        cache.put(str(log), result)
+    assert 1 <= len(scans) <= 15
+    assert sum(size for _, size, _ in scan(cache)) <= cache.max_bytes
+
+    # 其他进程写入的条目在下次重新扫描时计入
+    monkeypatch.setattr(cache_module, "EVICT_RESCAN_WRITES", 1)
+    other = ParseCache(tmp_path / "cache", max_bytes=0)
+    for log in logs[:50]:
+        other.put(str(log), result)
+    cache.put(str(logs[50]), result)
+    assert sum(size for _, size, _ in scan(cache)) <= cache.max_bytes
+
+
+def test_corrupt_entry_is_treated_as_miss(tmp_path):
+    log = _write(tmp_path / "sp.log", SAMPLES["single_point"])
+    cache = ParseCache(tmp_path / "cache")
+    cache.parse(str(log))
+    for entry in (tmp_path / "cache").glob("*.pkl"):
+        entry.write_bytes(b"not a pickle")
+    assert cache.get(str(log)) is None
+    assert cache.parse(str(log)) == BDFOutputParser().parse(str(log))
+
+
+def test_extractor_uses_cache(tmp_path):
+    log = _write(tmp_path / "td.log", SAMPLES["tddft_spin_flip"])
+    cache = ParseCache(tmp_path / "cache")
+    extractor = BDFResultExtractor(cache=cache)
+
+    first = extractor.extract_metrics(str(log)).to_dict()
+    second = extractor.extract_metrics(str(log)).to_dict()
+
+    assert first == second == BDFResultExtractor().extract_metrics(str(log)).to_dict()
+    assert cache.hits == 1
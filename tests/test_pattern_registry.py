@@ -0,0 +1,48 @@
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.analysis.parser import BDFOutputParser, PATTERNS, PatternRegistry
+from test_output_parser_sections import SAMPLES
+
+
+def test_registry_compiles_once_and_counts_hits():
+    registry = PatternRegistry()
+    text = "E_tot = -1.0\nE_tot = -2.0\n"
+
+    assert registry.search(r"E_tot\s*=\s*(\S+)", text).group(1) == "-1.0"
+    assert registry.findall(r"E_tot\s*=\s*(\S+)", text) == ["-1.0", "-2.0"]
+    assert [m.group(1) for m in registry.finditer(r"E_tot\s*=\s*(\S+)", text)] == ["-1.0", "-2.0"]
+    assert registry.match(r"missing", text) is None
+    assert registry.get(r"E_tot\s*=\s*(\S+)") is registry.get(r"E_tot\s*=\s*(\S+)")
+    assert registry.get("x", re.IGNORECASE) is not registry.get("x")
+
+    stats = {row["pattern"]: row for row in registry.stats()}
+    assert stats[r"E_tot\s*=\s*(\S+)"]["calls"] == 3
+    assert stats[r"E_tot\s*=\s*(\S+)"]["hits"] == 5
+    assert stats["missing"]["hits"] == 0
+
+    registry.reset_stats()
+    assert registry.stats() == []
+    assert len(registry) == 4
+
+
+def test_parser_uses_shared_registry(tmp_path):
+    out = tmp_path / "sp.log"
+    out.write_text(SAMPLES["single_point"], encoding="utf-8")
+    parser = BDFOutputParser()
+
+    PATTERNS.reset_stats()
+    expected = parser.parse(str(out))
+    stats = {row["pattern"]: row for row in PATTERNS.stats()}
+    assert stats[parser.energy_patterns[0]]["hits"] >= 1
+
+    # 关闭缓存（基准对比用）不影响解析结果
+    PATTERNS.cache_enabled = False
+    try:
+        assert parser.parse(str(out)) == expected
+    finally:
+        PATTERNS.cache_enabled = True
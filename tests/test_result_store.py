@@ -0,0 +1,163 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.store import ResultStore, hill_formula, read_input_keywords
+from test_output_parser_sections import SAMPLES
+
+
+INPUT_ECHO = """
+ $COMPASS
+ Title
+  water
+ Basis
+  cc-pVDZ
+ Geometry
+  O 0.0 0.0 0.1173
+ End geometry
+ $END
+
+ $SCF
+ RKS
+ dft functional
+  PBE0
+ $END
+"""
+
+
+def _write_runs(tmp_path: Path):
+    paths = {}
+    for name in ("single_point", "opt_freq", "tddft_spin_flip"):
+        path = tmp_path / f"{name}.log"
+        path.write_text(INPUT_ECHO + SAMPLES[name], encoding="utf-8")
+        paths[name] = path
+    return paths
+
+
+def test_hill_formula_and_input_keywords():
+    assert hill_formula(["O", "H", "H"]) == "H2O"
+    assert hill_formula(["H", "C1", "O", "H"]) == "CH2O"
+    assert hill_formula([]) is None
+    assert read_input_keywords(INPUT_ECHO.splitlines()) == {"basis": "cc-pVDZ", "functional": "PBE0"}
+    assert read_input_keywords(["$SCF", "RHF", "$END"]) == {"basis": None, "functional": None}
+
+
+def test_ingest_normalized_tables(tmp_path):
+    paths = _write_runs(tmp_path)
+    with ResultStore(tmp_path / "results.db") as store:
+        summary = store.ingest_many(list(paths.values()) + [tmp_path / "missing.log"])
+        assert summary["inserted"] == 3
+        assert len(summary["failed"]) == 1
+
+        rows = {Path(r["path"]).stem: r for r in store.query(columns=("path", "formula", "method", "basis", "task_type", "s1_energy_ev"))}
+        assert rows["single_point"]["formula"] == "H2O"
+        assert rows["single_point"]["method"] == "PBE0"
+        assert rows["single_point"]["basis"] == "cc-pVDZ"
+        assert rows["opt_freq"]["task_type"] == "optimize_frequency"
+        assert rows["single_point"]["s1_energy_ev"] is None
+
+        calc_id = store.execute("SELECT id FROM calculations WHERE path LIKE '%tddft_spin_flip.log'")[0]["id"]
+        states = store.excited_states(calc_id)
+        assert states
+        assert rows["tddft_spin_flip"]["s1_energy_ev"] == min(s["energy_ev"] for s in states if s["block_index"] == 0)
+        assert store.execute("SELECT COUNT(*) AS n FROM geometries WHERE calc_id = ?", (calc_id,))[0]["n"] == 3
+        assert store.execute("SELECT value FROM scf_components WHERE calc_id = ? AND name = 'E_tot'", (calc_id,))
+        freqs = store.execute(
+            "SELECT COUNT(*) AS n FROM frequencies f JOIN calculations c ON c.id = f.calc_id "
+            "WHERE c.task_type = 'optimize_frequency' AND f.kind = 'vibration'"
+        )
+        assert freqs[0]["n"] > 0
+
+
+def test_reingest_skips_unchanged_and_replaces_changed(tmp_path):
+    paths = _write_runs(tmp_path)
+    with ResultStore(tmp_path / "results.db") as store:
+        store.ingest_many(paths.values())
+        assert store.ingest_many(paths.values())["skipped"] == 3
+
+        path = paths["single_point"]
+        path.write_text(SAMPLES["single_point"], encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert store.ingest(path) is not None
+        assert store.count() == 3
+        row = store.query(columns=("path", "basis"), formula="H2O", basis=None)
+        assert sorted(r["basis"] is None for r in row) == [False, False, True]
+        assert store.ingest(path, force=True) is not None
+        assert store.execute("SELECT COUNT(*) AS n FROM geometries")[0]["n"] == 9
+
+
+def test_failure_partway_through_a_file_rolls_back_only_that_file(tmp_path, monkeypatch):
+    paths = _write_runs(tmp_path)
+    with ResultStore(tmp_path / "results.db") as store:
+        store.ingest(paths["single_point"])
+        before = dict(store.execute("SELECT * FROM calculations")[0])
+        n_geometries = store.execute("SELECT COUNT(*) AS n FROM geometries")[0]["n"]
+
+        # 除 opt_freq 外的文件在 calculations 与 geometries 已写入之后失败（single_point 为替换旧记录）
+        current = []
+        input_keywords, scf_components = store._input_keywords, store._scf_components
+
+        def recording(path):
+            current.append(path.stem)
+            return input_keywords(path)
+
+        def failing(parsed):
+            if current[-1] != "opt_freq":
+                raise RuntimeError("injected")
+            return scf_components(parsed)
+
+        monkeypatch.setattr(store, "_input_keywords", recording)
+        monkeypatch.setattr(store, "_scf_components", failing)
+        path = paths["single_point"]
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        summary = store.ingest_many([paths["opt_freq"], path, paths["tddft_spin_flip"]])
+        assert summary["inserted"] == 1
+        assert [e for _, e in summary["failed"]] == ["RuntimeError: injected"] * 2
+
+        # 失败的文件没有残留行；本应被替换的旧记录（及其子表）保持不变
+        rows = {Path(r["path"]).stem: dict(r) for r in store.execute("SELECT * FROM calculations")}
+        assert sorted(rows) == ["opt_freq", "single_point"]
+        assert rows["single_point"] == before
+        geometries = store.execute("SELECT calc_id, COUNT(*) AS n FROM geometries GROUP BY calc_id ORDER BY calc_id")
+        assert [(g["calc_id"], g["n"]) for g in geometries] == [(before["id"], n_geometries), (rows["opt_freq"]["id"], 3)]
+        assert not store.conn.in_transaction
+
+
+def test_query_filters_are_case_insensitive(tmp_path):
+    paths = _write_runs(tmp_path)
+    with ResultStore(tmp_path / "results.db") as store:
+        store.ingest_many(paths.values())
+        rows = store.query(method="pbe0", basis="CC-PVDZ", task_type="TDDFT", s1_max=100.0)
+        assert [Path(r["path"]).stem for r in rows] == ["tddft_spin_flip"]
+        assert store.query(s1_max=0.0) == []
+        with pytest.raises(ValueError):
+            store.query(functional="PBE0")
+        with pytest.raises(ValueError):
+            store.query(order_by="energy; DROP TABLE calculations")
+
+
+def test_cli_ingest_and_query(tmp_path):
+    _write_runs(tmp_path)
+    db_path = tmp_path / "results.db"
+    runner = CliRunner(env={"BDFEASYINPUT_CACHE_DIR": str(tmp_path / "cache")})
+    result = runner.invoke(main, ["db", "ingest", str(tmp_path), "--db", str(db_path)])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(
+        main,
+        ["db", "query", "--db", str(db_path), "--method", "PBE0", "--basis", "cc-pVDZ",
+         "--task-type", "tddft", "--s1-max", "100", "--json"],
+    )
+    assert result.exit_code == 0, result.output
+    rows = json.loads(result.stdout)
+    assert [Path(r["path"]).stem for r in rows] == ["tddft_spin_flip"]
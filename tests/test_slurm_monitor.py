@@ -0,0 +1,138 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.execution.remote_slurm import SSHSlurmRunner
+from bdfeasyinput.execution.slurm_monitor import SlurmMonitor
+from test_job_handles import FAKE_SSH, _inputs, _script
+
+
+@pytest.fixture
+def cluster(tmp_path, monkeypatch):
+    """假的 Slurm 集群：sbatch 递增作业号，sacct 从 accounting 目录读取每个作业的记录"""
+    bin_dir = tmp_path / "bin"
+    calls = tmp_path / "ssh_calls"
+    _script(bin_dir / "ssh", FAKE_SSH.replace("exec sh", f'echo "$*" >> {calls}\nexec sh'))
+    acct = tmp_path / "acct"
+    acct.mkdir()
+    counter = tmp_path / "next_id"
+    counter.write_text("300")
+    _script(bin_dir / "sbatch", f"#!/bin/sh\ni=$(cat {counter}); echo $((i + 1)) > {counter}\n"
+                                f"echo \"$i|PENDING|2026-01-01T10:00:00|Unknown|Unknown|short|4\" > {acct}/$i\n"
+                                f"echo \"Submitted batch job $i\"\n")
+    _script(bin_dir / "squeue", "#!/bin/sh\ntrue\n")
+    _script(bin_dir / "sacct", f"#!/bin/sh\ncat {acct}/* 2>/dev/null\n")
+    monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin")
+    monkeypatch.setenv("BDFEASYINPUT_SSH_CONTROL_DIR", str(tmp_path / "ctl"))
+    monkeypatch.setenv("BDFEASYINPUT_STAGING_DIR", str(tmp_path / "staging"))
+    template = tmp_path / "job.sh"
+    template.write_text("#!/bin/bash\n#SBATCH -J {{JOB_NAME}}\n{{BDF_COMMAND}} {{INPUT_FILE}}\n")
+    return {"acct": acct, "calls": calls, "template": template, "remote": tmp_path / "remote"}
+
+
+def _account(cluster, job_id, state, start="Unknown", end="Unknown", partition="short", cpus=4):
+    (cluster["acct"] / job_id).write_text(f"{job_id}|{state}|2026-01-01T10:00:00|{start}|{end}|{partition}|{cpus}\n")
+
+
+def test_monitor_tracks_transitions_downloads_and_timing(cluster, tmp_path):
+    runner = SSHSlurmRunner(host="cluster", workdir=str(cluster["remote"]), job_script_template=str(cluster["template"]))
+    state_file = tmp_path / "jobs.json"
+    monitor = SlurmMonitor(runner, state_file=state_file)
+    local = tmp_path / "local"
+    assert monitor.submit(_inputs(local, "a", "b")) == ["300", "301"]
+
+    transitions = []
+    assert monitor.refresh(lambda job_id, job: transitions.append((job_id, job["state"]))) == ["300", "301"]
+    assert transitions == [("300", "PENDING"), ("301", "PENDING")]
+
+    _account(cluster, "300", "RUNNING", start="2026-01-01T10:01:00")
+    _account(cluster, "301", "RUNNING", start="2026-01-01T10:05:00", partition="long", cpus=16)
+    calls_before = len(cluster["calls"].read_text().splitlines())
+    assert monitor.refresh() == ["300", "301"]
+    # 所有作业一次 ssh 查询
+    assert len(cluster["calls"].read_text().splitlines()) == calls_before + 1
+    assert monitor.jobs["300"]["queue_wait"] == 60
+
+    (cluster["remote"] / "a" / "a.log").write_text("done a\n")
+    _account(cluster, "300", "COMPLETED", start="2026-01-01T10:01:00", end="2026-01-01T10:11:00")
+    assert monitor.refresh() == ["300"]
+    assert monitor.active() == ["301"]
+    assert (local / "a.log").read_text() == "done a\n"
+    assert monitor.jobs["300"]["downloaded"] == [str(local / "a.log")]
+    assert [h[0] for h in monitor.jobs["300"]["history"]] == ["SUBMITTED", "PENDING", "RUNNING", "COMPLETED"]
+
+    rows = {r["job_id"]: r for r in monitor.report()}
+    assert rows["300"]["queue_wait"] == 60 and rows["300"]["run_time"] == 600
+    assert rows["301"]["queue_wait"] == 300 and rows["301"]["run_time"] is None
+    summary = {r["partition"]: r for r in monitor.summary()}
+    assert summary["short"]["core_hours"] == pytest.approx(600 * 4 / 3600)
+    assert summary["long"]["finished"] == 0
+
+    # 状态保存在文件中，新的监视器可以继续跟踪
+    reloaded = SlurmMonitor(runner, state_file=state_file)
+    assert reloaded.active() == ["301"]
+    assert reloaded.forget() == 1
+    assert list(json.loads(state_file.read_text())) == ["301"]
+
+
+def test_concurrent_monitors_merge_the_shared_state_file(cluster, tmp_path):
+    runner = SSHSlurmRunner(host="cluster", workdir=str(cluster["remote"]), job_script_template=str(cluster["template"]))
+    state_file = tmp_path / "jobs.json"
+    local = tmp_path / "local"
+    SlurmMonitor(runner, state_file=state_file).submit(_inputs(local, "a"))
+
+    # 一个会话在 watch，另一个会话同时提交新作业
+    watcher = SlurmMonitor(runner, state_file=state_file)
+    submitter = SlurmMonitor(runner, state_file=state_file)
+    assert submitter.submit(_inputs(local, "b")) == ["301"]
+    _account(cluster, "300", "RUNNING", start="2026-01-01T10:01:00")
+    # watcher 刷新前重新读取状态文件，新提交的作业在同一次查询中被跟踪
+    assert watcher.refresh() == ["300", "301"]
+
+    jobs = json.loads(state_file.read_text())
+    assert sorted(jobs) == ["300", "301"]
+    assert jobs["300"]["state"] == "RUNNING" and jobs["301"]["state"] == "PENDING"
+    assert watcher.active() == ["300", "301"]
+
+    # forget 删除的作业不会被其他会话的 save() 写回
+    _account(cluster, "300", "COMPLETED", start="2026-01-01T10:01:00", end="2026-01-01T10:02:00")
+    watcher.refresh()
+    assert submitter.forget() == 1
+    watcher.save()
+    assert sorted(json.loads(state_file.read_text())) == ["301"]
+    assert not list(tmp_path.glob("jobs.json*.tmp"))
+
+
+def test_slurm_cli_submit_and_status(cluster, tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"execution": {"type": "remote_slurm", "remote_slurm": {
+        "host": "cluster", "workdir": str(cluster["remote"]), "job_script_template": str(cluster["template"]),
+    }}}))
+    state = ["--state-file", str(tmp_path / "jobs.json")]
+    inputs = _inputs(tmp_path / "local", "x1", "x2")
+
+    result = CliRunner().invoke(main, ["slurm", "submit", *inputs, "-c", str(config), "--array", "xs", "--max-parallel", "1", *state])
+    assert result.exit_code == 0, result.output
+    assert result.stdout.split() == ["300_0", "300_1"]
+
+    _account(cluster, "300_0", "COMPLETED", start="2026-01-01T10:00:30", end="2026-01-01T10:01:30")
+    _account(cluster, "300_1", "FAILED", start="2026-01-01T10:00:30", end="2026-01-01T10:00:40")
+    result = CliRunner().invoke(main, ["slurm", "status", "-c", str(config), "--watch", "--interval", "0", "--json", *state])
+    assert result.exit_code == 0, result.output
+    rows = json.loads(result.stdout)
+    assert [(r["job_id"], r["state"], r["queue_wait"], r["run_time"]) for r in rows] == [
+        ("300_0", "COMPLETED", 30, 60),
+        ("300_1", "FAILED", 30, 10),
+    ]
+
+    result = CliRunner().invoke(main, ["slurm", "status", "-c", str(config), "--summary", *state])
+    assert result.exit_code == 0, result.output
+    assert "short" in result.stdout and "0:00:35" in result.stdout
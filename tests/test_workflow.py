@@ -0,0 +1,216 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.converter import BDFConverter
+from bdfeasyinput.execution.bdf_direct import BDFDirectRunner
+from bdfeasyinput.execution.remote_slurm import SSHSlurmRunner
+from bdfeasyinput.execution.workflow import Workflow
+from test_job_handles import FAKE_SSH, _script
+
+
+# 假的 BDF：优化步骤输出一个移动过的结构，失败步骤以非零状态退出，其余步骤输出输入文件
+FAKE_BDF = """#!/bin/sh
+case "$2" in
+  *fail*) exit 2 ;;
+  *opt*)
+    echo "   Molecular Cartesian Coordinates (X,Y,Z) in Angstrom :"
+    echo "      O          0.00000000       0.00000000       0.50000000"
+    echo "      H          0.00000000       0.80000000      -0.40000000"
+    echo "      H          0.00000000      -0.80000000      -0.40000000"
+    echo ""
+    echo " Good Job, Geometry Optimization converged"
+    ;;
+  *) cat "$2" ;;
+esac
+"""
+
+OPT_LOG = """ Geometry Optimization step :    2
+   Molecular Cartesian Coordinates (X,Y,Z) in Angstrom :
+      O          0.00000000       0.00000000       0.11730000
+      H          0.00000000       0.75720000      -0.46920000
+      H          0.00000000      -0.75720000      -0.46920000
+
+ Good Job, Geometry Optimization converged
+"""
+
+BASE = {
+    "molecule": {
+        "charge": 0,
+        "multiplicity": 1,
+        "coordinates": ["O 0.0 0.0 0.1173", "H 0.0 0.7572 -0.4692", "H 0.0 -0.7572 -0.4692"],
+        "units": "angstrom",
+    },
+    "method": {"type": "dft", "functional": "b3lyp", "basis": "cc-pvdz"},
+}
+
+
+def _config(task_type):
+    return {**BASE, "task": {"type": task_type}}
+
+
+def _workflow(tmp_path, name="h2o"):
+    wf = Workflow(name, workdir=tmp_path / "wf", converter=BDFConverter(validate_input=False))
+    wf.add_step("opt", _config("optimize"))
+    wf.add_step("freq", _config("frequency"), depends_on="opt")
+    wf.add_step("td", _config("tddft"), depends_on=["opt"])
+    return wf
+
+
+def test_order_validation_and_geometry_source(tmp_path):
+    wf = _workflow(tmp_path)
+    wf.add_step("single", _config("energy"), geometry_from="freq", depends_on="td")
+    assert [s.name for s in wf.order()] == ["opt", "freq", "td", "single"]
+    assert wf.steps["single"].depends_on == ["freq", "td"]
+    assert wf.steps["single"].geometry_from == "freq"
+    assert wf.steps["opt"].geometry_from is None
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        wf.add_step("opt", _config("energy"))
+    wf.add_step("orphan", _config("energy"), depends_on="missing")
+    with pytest.raises(ValueError, match="unknown step"):
+        wf.order()
+    del wf.steps["orphan"]
+    wf.steps["opt"].depends_on = ["single"]
+    with pytest.raises(ValueError, match="cycle"):
+        wf.order()
+
+
+def test_run_passes_optimized_geometry_and_skips_after_failure(tmp_path):
+    bdf_home = tmp_path / "bdfhome"
+    _script(bdf_home / "sbin" / "bdf.drv", FAKE_BDF)
+    runner = BDFDirectRunner(bdf_home=str(bdf_home), bdf_tmpdir=str(tmp_path / "tmp"), omp_num_threads=1)
+
+    wf = _workflow(tmp_path)
+    wf.add_step("fail", _config("energy"), depends_on="opt", inherit_geometry=False)
+    wf.add_step("after_fail", _config("energy"), depends_on="fail")
+    events = []
+    summary = wf.run(runner, timeout=30, poll_interval=0.05, on_step=lambda s: events.append((s.name, s.status)))
+
+    assert {name: row["status"] for name, row in summary.items()} == {
+        "opt": "success", "freq": "success", "td": "success", "fail": "failed", "after_fail": "skipped",
+    }
+    assert events[0] == ("opt", "running")
+    assert ("after_fail", "skipped") in events
+
+    # 下游输入引用 .xyz，其中是上游输出的优化结构
+    freq_input = Path(summary["freq"]["input_file"])
+    assert "file=h2o_freq.xyz" in freq_input.read_text()
+    xyz = (tmp_path / "wf" / "h2o_freq.xyz").read_text().splitlines()
+    assert xyz[0] == "3"
+    assert [float(v) for v in xyz[2].split()[1:]] == [0.0, 0.0, 0.5]
+    # 不从上游取结构的步骤保留原始坐标
+    assert "file=" not in (tmp_path / "wf" / "h2o_fail.inp").read_text()
+
+
+@pytest.fixture
+def slurm_runner(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    _script(bin_dir / "ssh", FAKE_SSH)
+    counter = tmp_path / "next_id"
+    counter.write_text("500")
+    _script(bin_dir / "sbatch", f"#!/bin/sh\ni=$(cat {counter}); echo $((i + 1)) > {counter}\n"
+                                f"echo \"$*\" > sbatch_args\necho \"Submitted batch job $i\"\n")
+    monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin")
+    monkeypatch.setenv("BDFEASYINPUT_SSH_CONTROL_DIR", str(tmp_path / "ctl"))
+    monkeypatch.setenv("BDFEASYINPUT_STAGING_DIR", str(tmp_path / "staging"))
+    template = tmp_path / "job.sh"
+    template.write_text("#!/bin/bash\n#SBATCH -J {{JOB_NAME}}\n{{BDF_COMMAND}} {{INPUT_FILE}}\n")
+    return SSHSlurmRunner(
+        host="cluster",
+        workdir=str(tmp_path / "remote"),
+        job_script_template=str(template),
+        default_slurm={"bdf_command": "cat"},
+    )
+
+
+def test_queue_submits_chain_with_afterok_and_fills_geometry_at_start(tmp_path, slurm_runner):
+    wf = _workflow(tmp_path)
+    handles = wf.queue(slurm_runner)
+    assert {name: h.job_id for name, h in handles.items()} == {"opt": "500", "freq": "501", "td": "502"}
+    assert all(s.status == "pending" for s in wf.steps.values())
+
+    remote = tmp_path / "remote"
+    assert "--dependency" not in (remote / "h2o_opt" / "sbatch_args").read_text()
+    freq_args = (remote / "h2o_freq" / "sbatch_args").read_text()
+    assert "--dependency=afterok:500 --kill-on-invalid-dep=yes h2o_freq.slurm.sh" in freq_args
+
+    # 上游结束前子作业的 .xyz 只是占位；作业开始时从上游日志取出结构，找不到时失败
+    script = remote / "h2o_freq" / "h2o_freq.slurm.sh"
+    assert script.read_text().startswith("#!/bin/bash\n#SBATCH -J h2o_freq\n# ")
+    assert (remote / "h2o_freq" / "h2o_freq.xyz").read_text().startswith("0\n")
+    assert subprocess.run(["sh", str(script)], cwd=script.parent, capture_output=True).returncode == 1
+
+    (remote / "h2o_opt" / "h2o_opt.log").write_text(OPT_LOG)
+    proc = subprocess.run(["sh", str(script)], cwd=script.parent, capture_output=True, text=True)
+    assert proc.returncode == 0
+    assert "file=h2o_freq.xyz" in proc.stdout
+    xyz = (remote / "h2o_freq" / "h2o_freq.xyz").read_text().splitlines()
+    assert xyz[0] == "3"
+    assert xyz[3].split() == ["H", "0.00000000", "0.75720000", "-0.46920000"]
+
+
+def test_queue_skips_downstream_of_failed_submission(tmp_path, slurm_runner):
+    _script(tmp_path / "bin" / "sbatch", "#!/bin/sh\necho 'sbatch: error: invalid partition' >&2\nexit 1\n")
+    wf = _workflow(tmp_path)
+    handles = wf.queue(slurm_runner)
+    assert list(handles) == ["opt"]
+    assert {name: row["status"] for name, row in wf.summary().items()} == {
+        "opt": "failed", "freq": "skipped", "td": "skipped",
+    }
+
+
+def test_from_yaml_merges_base_and_step_files(tmp_path):
+    (tmp_path / "td.yaml").write_text(yaml.safe_dump({"task": {"type": "tddft"}, "settings": {"tddft": {"n_states": 5}}}))
+    spec = tmp_path / "chain.yaml"
+    spec.write_text(yaml.safe_dump({
+        "workflow": {"name": "chain", "workdir": "runs"},
+        "base": BASE,
+        "steps": [
+            {"name": "opt", "config": {"task": {"type": "optimize"}}},
+            {"name": "td", "yaml": "td.yaml", "depends_on": ["opt"], "options": {"slurm": {"time": "04:00:00"}}},
+        ],
+    }))
+    wf = Workflow.from_yaml(spec, converter=BDFConverter(validate_input=False))
+    assert wf.name == "chain"
+    assert wf.workdir == tmp_path / "runs"
+    td = wf.steps["td"]
+    assert td.config["method"]["functional"] == "b3lyp"
+    assert td.config["settings"]["tddft"]["n_states"] == 5
+    assert td.geometry_from == "opt"
+    assert td.options == {"slurm": {"time": "04:00:00"}}
+
+    assert "file=chain_td.xyz" in wf.write_input(td).read_text()
+
+
+def test_cli_chain_queues_on_slurm(tmp_path, slurm_runner, monkeypatch):
+    spec = tmp_path / "chain.yaml"
+    spec.write_text(yaml.safe_dump({
+        "workflow": {"name": "cli"},
+        "base": BASE,
+        "steps": [
+            {"name": "opt", "config": {"task": {"type": "optimize"}}},
+            {"name": "freq", "config": {"task": {"type": "frequency"}}, "depends_on": ["opt"]},
+        ],
+    }))
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"execution": {"type": "remote_slurm", "remote_slurm": {
+        "host": "cluster",
+        "workdir": slurm_runner.workdir,
+        "job_script_template": slurm_runner.job_script_template,
+    }}}))
+    monkeypatch.setenv("BDFEASYINPUT_SLURM_STATE", str(tmp_path / "jobs.json"))
+    # 只测试 CLI 的连接，不依赖 schema 包的校验
+    monkeypatch.setattr(Workflow, "converter", BDFConverter(validate_input=False))
+    result = CliRunner().invoke(main, ["chain", str(spec), "-c", str(config), "--workdir", str(tmp_path / "inputs"), "--json"])
+    assert result.exit_code == 0, result.output
+    assert '"job_id": "501"' in result.output
+    assert "afterok:500" in (tmp_path / "remote" / "cli_freq" / "sbatch_args").read_text()
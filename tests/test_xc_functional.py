@@ -0,0 +1,83 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bdfeasyinput import xc_functional
+from bdfeasyinput.xc_functional import XCDatabase, load_xc_database, validate_functional
+
+
+TABLE = {
+    "XC_GGA_X_PBE": {"role": "X", "short_name": "X_PBE"},
+    "XC_GGA_C_LYP": {"role": "C", "short_name": "C_LYP"},
+    "XC_HYB_GGA_XC_B3LYP": {"role": "XC", "short_name": "B3LYP"},
+    "XC_GGA_C_PBE": {"role": "C", "short_name": "C_PBE"},
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_cache():
+    xc_functional._XC_DATABASES.clear()
+    yield
+    xc_functional._XC_DATABASES.clear()
+
+
+def _write_table(path, table):
+    path.write_text(yaml.safe_dump({"functionals": table}))
+    return path
+
+
+def test_indexes_match_linear_scan():
+    db = XCDatabase(TABLE)
+    assert dict(db) == TABLE
+    assert db.short_names["B3LYP"] == ("XC_HYB_GGA_XC_B3LYP",)
+    assert db.suffixes["PBE"] == ("XC_GGA_X_PBE", "XC_GGA_C_PBE")
+    assert db.role_names["C"] >= {"C_LYP", "LYP", "GGA_C_LYP", "PBE"}
+    for name in ["PBE", "LYP", "B3LYP", "X_PBE", "C_PBE", "XC_B3LYP", "BLYP", " PBE ", ""]:
+        for roles in [("XC",), ("X", "XC"), ("c", "xc")]:
+            assert xc_functional._match_name_against_db(name, db, roles) == \
+                xc_functional._match_name_against_db(name, TABLE, roles), (name, roles)
+    assert validate_functional("PBE LYP", db).ok
+    assert not validate_functional("LYP PBE0", db).ok
+
+
+def test_database_cached_per_process_and_on_disk(tmp_path, monkeypatch):
+    path = _write_table(tmp_path / "xc.yaml", TABLE)
+    cache_dir = tmp_path / "cache"
+    db = load_xc_database(path, cache_dir=cache_dir)
+    assert load_xc_database(path, cache_dir=cache_dir) is db
+    assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+    # 新进程（清空进程缓存）直接读取二进制缓存，不再解析 YAML
+    xc_functional._XC_DATABASES.clear()
+    parse = xc_functional._parse_xc_yaml
+    monkeypatch.setattr(xc_functional, "_parse_xc_yaml", lambda p: pytest.fail("YAML parsed despite cache"))
+    cached = load_xc_database(path, cache_dir=cache_dir)
+    assert cached is not db and dict(cached) == TABLE and cached.matches("B3LYP", ("XC",))
+
+    # YAML 修改后两级缓存都失效并重新生成
+    monkeypatch.setattr(xc_functional, "_parse_xc_yaml", parse)
+    _write_table(path, {**TABLE, "XC_GGA_XC_NEW": {"role": "XC", "short_name": "NEW"}})
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    updated = load_xc_database(path, cache_dir=cache_dir)
+    assert updated.matches("NEW", ("XC",))
+    xc_functional._XC_DATABASES.clear()
+    assert load_xc_database(path, cache_dir=cache_dir).matches("NEW", ("XC",))
+
+    assert load_xc_database(path, use_cache=False) is not updated
+    with pytest.raises(FileNotFoundError):
+        load_xc_database(tmp_path / "missing.yaml", cache_dir=cache_dir)
+
+
+def test_bundled_database(tmp_path):
+    db = load_xc_database(cache_dir=tmp_path)
+    assert len(db) > 500
+    assert validate_functional("B3LYP", db).ok
+    assert validate_functional("PBE LYP", db).ok
+    result = validate_functional("NOT_A_FUNCTIONAL", db)
+    assert not result.ok and "NOT_A_FUNCTIONAL" in result.warnings[0]
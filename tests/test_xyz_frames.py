@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bdfeasyinput.cli import main
+from bdfeasyinput.conversion_tool import CONVERSION_STAGES, ConversionTool
+from bdfeasyinput.converter import BDFConverter
+from bdfeasyinput.xyz_reader import iter_xyz_frames, parse_extxyz_comment
+from bdfeasyinput.yaml_generator import YAMLGenerator
+
+
+BASE = {
+    "task": {"type": "energy"},
+    "molecule": {"charge": 0, "multiplicity": 1, "units": "angstrom"},
+    "method": {"type": "dft", "functional": "b3lyp", "basis": "cc-pvdz"},
+}
+
+
+def _frame(dz, comment="step"):
+    return (
+        f"3\n{comment}\n"
+        f"O 0.0 0.0 {0.1173 + dz:.4f}\n"
+        "H 0.0 0.7572 -0.4692\n"
+        "H 0.0 -0.7572 -0.4692\n"
+    )
+
+
+def _trajectory(path, n, comment=lambda i: f"step {i}"):
+    # 帧之间的空行应被忽略
+    path.write_text("\n".join(_frame(i * 0.01, comment(i)) for i in range(n)))
+    return path
+
+
+def test_reader_streams_frames_with_extxyz_metadata(tmp_path):
+    info = parse_extxyz_comment('Properties=species:S:1:pos:R:3 energy=-76.4 charge=1 mult=2 pbc="F F F" label=ts1 fixed')
+    assert info == {
+        "Properties": "species:S:1:pos:R:3", "energy": -76.4, "charge": 1, "mult": 2,
+        "pbc": "F F F", "label": "ts1", "fixed": True,
+    }
+    assert parse_extxyz_comment("energy: -76.4 gen 3") == {}
+
+    path = tmp_path / "traj.extxyz"
+    path.write_text(
+        "2\nProperties=id:I:1:species:S:1:pos:R:3 charge=-1 multiplicity=2\n"
+        "1 O 0.0 0.0 0.0\n2 H 0.0 0.0 0.97\n"
+        "\n"
+        "2\nplain comment\nO 0.0 0.0 0.0\nH 0.0 0.0 0.98\n"
+        "2\ntruncated\nO 0.0 0.0 0.0\n"
+    )
+    frames = iter_xyz_frames(path)
+    first = next(frames)
+    assert (first.index, first.symbols, first.coordinates[1]) == (0, ["O", "H"], (0.0, 0.0, 0.97))
+    assert (first.charge, first.multiplicity) == (-1, 2)
+    second = next(frames)
+    assert (second.index, second.comment, second.charge, second.multiplicity) == (1, "plain comment", None, None)
+    # 只有读到截断的帧时才报错，前面的帧已经产出
+    with pytest.raises(ValueError, match="frame 2 is truncated"):
+        next(frames)
+
+    # 没有原子数行的旧格式：整个文件是一个结构
+    legacy = tmp_path / "legacy.xyz"
+    legacy.write_text("water\nO 0.0 0.0 0.1173\nH 0.0 0.7572 -0.4692\nH 0.0 -0.7572 -0.4692\n")
+    assert [f.n_atoms for f in iter_xyz_frames(legacy)] == [3]
+
+
+def test_generate_from_xyz_selects_frames_and_reads_metadata(tmp_path):
+    generator = YAMLGenerator(validate_output=False)
+    single = _trajectory(tmp_path / "single.xyz", 1, comment=lambda i: "charge=1 multiplicity=2")
+    config = generator.generate_from_xyz(single)
+    assert (config["molecule"]["charge"], config["molecule"]["multiplicity"]) == (1, 2)
+    assert len(config["molecule"]["coordinates"]) == 3
+    config = generator.generate_from_xyz(single, charge=0, multiplicity=1)
+    assert (config["molecule"]["charge"], config["molecule"]["multiplicity"]) == (0, 1)
+
+    traj = _trajectory(tmp_path / "md.xyz", 4)
+    with pytest.raises(ValueError, match="multiple frames"):
+        generator.generate_from_xyz(traj)
+    assert generator.generate_from_xyz(traj, frame=2)["molecule"]["coordinates"][0] == "O 0.0000000000 0.0000000000 0.1373000000"
+    assert generator.generate_from_xyz(traj, frame=-1)["molecule"]["coordinates"][0].endswith("0.1473000000")
+    with pytest.raises(ValueError, match="no frame 4"):
+        generator.generate_from_xyz(traj, frame=4)
+
+    named = list(generator.iter_from_xyz(traj))
+    assert [n for n, _ in named] == [f"md_{i:05d}" for i in range(4)]
+    assert named[3][1]["molecule"]["name"] == "md_00003"
+
+
+def test_iter_convert_frames_serial_and_parallel(tmp_path):
+    traj = _trajectory(tmp_path / "md.xyz", 7, comment=lambda i: "charge=1 mult=2" if i == 3 else f"step {i}")
+    tool = ConversionTool(validate_input=False)
+
+    serial = list(tool.iter_convert_frames(BASE, traj, output_dir=tmp_path / "serial"))
+    parallel = list(tool.iter_convert_frames(BASE, traj, output_dir=tmp_path / "parallel", jobs=2, chunksize=2))
+    assert [r["frame"] for r in parallel] == list(range(7))
+    assert all(r["status"] == "success" for r in serial + parallel)
+    assert all(set(r["timings"]) == set(CONVERSION_STAGES) for r in parallel)
+
+    generator = YAMLGenerator(validate_output=False)
+    for index in range(7):
+        name = f"md_{index:05d}.inp"
+        content = (tmp_path / "serial" / name).read_text()
+        assert content == (tmp_path / "parallel" / name).read_text()
+        # 与逐帧生成 YAML 再完整转换的结果一致
+        config = generator.generate_from_xyz(traj, frame=index, method=BASE["method"])
+        config["task"] = BASE["task"]
+        del config["molecule"]["name"]
+        assert content == BDFConverter(validate_input=False).convert(config)
+    assert "UKS" in (tmp_path / "serial" / "md_00003.inp").read_text()
+
+    rerun = list(tool.iter_convert_frames(BASE, traj, output_dir=tmp_path / "serial"))
+    assert all(isinstance(r["error"], FileExistsError) for r in rerun)
+
+
+def test_cli_from_xyz_all_frames_and_batch_convert_with_base(tmp_path):
+    traj = _trajectory(tmp_path / "md.xyz", 3)
+    runner = CliRunner()
+    result = runner.invoke(main, ["yaml", "from-xyz", str(traj), "--no-validate"])
+    assert result.exit_code == 1 and "multiple frames" in result.output
+
+    result = runner.invoke(main, ["yaml", "from-xyz", str(traj), "--no-validate", "--all-frames", "-d", str(tmp_path / "yaml")])
+    assert result.exit_code == 0, result.output
+    assert sorted(p.name for p in (tmp_path / "yaml").iterdir()) == ["md_00000.yaml", "md_00001.yaml", "md_00002.yaml"]
+
+    result = runner.invoke(main, ["yaml", "from-xyz", str(traj), "--no-validate", "--all-frames"])
+    assert len(list(yaml.safe_load_all(result.output))) == 3
+
+    base = tmp_path / "base.yaml"
+    base.write_text(yaml.safe_dump(BASE))
+    result = runner.invoke(main, ["batch-convert", str(traj), "-d", str(tmp_path / "out"), "--no-validate"])
+    assert result.exit_code == 1 and "--base" in result.output
+    single = tmp_path / "h2o.yaml"
+    single.write_text((tmp_path / "yaml" / "md_00001.yaml").read_text())
+    result = runner.invoke(main, [
+        "batch-convert", str(traj), str(single), "--base", str(base), "-d", str(tmp_path / "out"), "--no-validate",
+    ])
+    assert result.exit_code == 0, result.output
+    assert "Success: 4" in result.output
+    assert "(4 files" in result.output
+    assert (tmp_path / "out" / "h2o.inp").exists()
+    assert len(list((tmp_path / "out").glob("md_0000?.inp"))) == 3